@@ -0,0 +1 @@
+"""성능 측정용 벤치마크 스크립트 모음 (프로젝트 루트에서 `python -m benchmarks.<name>`으로 실행)"""
@@ -0,0 +1,70 @@
+"""기사 레코드 표현 방식별 메모리 사용량 비교 벤치마크
+
+기존 딕셔너리 방식과 core.models.Article(__slots__) 방식으로 N건의 기사를 만들어
+tracemalloc으로 측정한 기사 1건당 메모리 사용량을 출력합니다.
+
+사용법:
+    python -m benchmarks.article_memory --count 100000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Callable, List
+
+from core.models import Article
+
+FEED_URL = "https://example.com/rss.xml"
+
+
+def _make_dict(i: int) -> dict:
+    return {
+        'title': f"기사 제목 {i}",
+        'link': f"https://example.com/news/{i}",
+        'summary': f"기사 요약 {i}",
+        'published': "Mon, 19 Oct 2026 09:00:00 +0900",
+        'source_url': FEED_URL,
+        'dopamine_points': [],
+        'status': 'new',
+    }
+
+
+def _make_article(i: int) -> Article:
+    return Article(
+        title=f"기사 제목 {i}",
+        link=f"https://example.com/news/{i}",
+        summary=f"기사 요약 {i}",
+        published="Mon, 19 Oct 2026 09:00:00 +0900",
+        source_url=FEED_URL,
+    )
+
+
+def measure(factory: Callable[[int], object], count: int) -> int:
+    """factory로 count건을 생성했을 때 증가한 메모리(bytes)를 반환합니다."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items: List[object] = [factory(i) for i in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 레코드 1건당 메모리 사용량을 비교합니다.")
+    parser.add_argument("--count", type=int, default=100_000, help="생성할 기사 수 (기본값: 100000)")
+    args = parser.parse_args()
+
+    results = {
+        'dict': measure(_make_dict, args.count),
+        'Article(slots)': measure(_make_article, args.count),
+    }
+    print(f"기사 {args.count:,}건 기준 메모리 사용량")
+    for name, total in results.items():
+        print(f"  {name:<16} 총 {total / 1024 / 1024:8.2f} MiB / 건당 {total / args.count:7.1f} bytes")
+    saved = results['dict'] - results['Article(slots)']
+    print(f"  절감량           총 {saved / 1024 / 1024:8.2f} MiB ({saved / results['dict'] * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
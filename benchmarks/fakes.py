@@ -0,0 +1,233 @@
+"""벤치마크용 가짜 Gemini/Imagen 백엔드
+
+google.generativeai(GenerativeModel, caching.CachedContent)와 google.genai(Client.models.generate_images)를
+지연 시간, 오류율, 이미지 크기를 조절할 수 있는 가짜 구현으로 바꿔치기합니다.
+가짜 Gemini도 실제 API처럼 system instruction/캐시된 콘텐츠를 입력 토큰에 포함하고, 캐시에서 읽은 토큰은
+usage_metadata.cached_content_token_count로 알려 줍니다.
+AiProcessor/ImageGenerator는 해당 모듈을 지연 임포트하므로, 파이프라인 모듈을 사용하기 전에
+install_fake_backends()를 호출하면 실제 API 대신 가짜 백엔드가 사용됩니다.
+
+사용 예:
+    from benchmarks.fakes import FakeBackendConfig, install_fake_backends
+    install_fake_backends(llm=FakeBackendConfig(latency_ms=300, error_rate=0.02),
+                          image=FakeBackendConfig(latency_ms=4000, image_size=256))
+"""
+import io
+import random
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass
+from typing import Optional
+
+POINTS_RESPONSE = "1. 예상 밖의 반전 포인트\n2. 숫자로 보는 핵심 변화\n3. 독자가 바로 써먹을 수 있는 팁"
+KEYWORDS_RESPONSE = "경제, 반도체, 수출"
+
+
+class FakeApiError(Exception):
+    """가짜 백엔드가 error_rate 확률로 발생시키는 오류 (예: 429/503 응답 대용)"""
+
+
+@dataclass
+class FakeBackendConfig:
+    """가짜 백엔드 동작 설정
+
+    Args:
+        latency_ms (float): 호출당 평균 지연 시간 (±jitter 비율만큼 균등 분포로 흔들림)
+        jitter (float): 지연 시간 변동 비율 (0.5면 평균의 50%~150%)
+        error_rate (float): 호출이 FakeApiError로 실패할 확률 (0~1)
+        image_size (int): 생성할 이미지 한 변의 픽셀 수 (Imagen 백엔드만 사용)
+        seed (Optional[int]): 난수 시드 (재현 가능한 오류/지연 패턴)
+    """
+    latency_ms: float = 0.0
+    jitter: float = 0.5
+    error_rate: float = 0.0
+    image_size: int = 64
+    seed: Optional[int] = 42
+
+
+class _Behaviour:
+    """지연 시간과 오류 발생을 담당하는 공통 부분 (여러 스레드에서 호출해도 안전)"""
+
+    def __init__(self, config: FakeBackendConfig):
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+
+    def call(self):
+        with self._lock:
+            jitter = 1 + self.config.jitter * (2 * self._random.random() - 1)
+            fail = self._random.random() < self.config.error_rate
+        if self.config.latency_ms > 0:
+            time.sleep(self.config.latency_ms * jitter / 1000)
+        if fail:
+            raise FakeApiError("fake backend error (injected)")
+
+
+class _UsageMetadata:
+    __slots__ = ('prompt_token_count', 'candidates_token_count', 'total_token_count', 'cached_content_token_count')
+
+    def __init__(self, prompt: str, text: str, cached: str = ''):
+        # 한국어 기준 대략 글자 2개당 1토큰으로 근사. prompt_token_count는 캐시에서 읽은 토큰을 포함
+        self.prompt_token_count = max(1, len(prompt) // 2)
+        self.candidates_token_count = max(1, len(text) // 2)
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+        self.cached_content_token_count = len(cached) // 2
+
+
+class _GenerateContentResponse:
+    __slots__ = ('text', 'usage_metadata')
+
+    def __init__(self, prompt: str, text: str, cached: str = ''):
+        self.text = text
+        self.usage_metadata = _UsageMetadata(prompt, text, cached)
+
+
+class FakeCachedContent:
+    """google.generativeai.caching.CachedContent 대용 (create만 제공, 유지 시간은 무시)"""
+
+    def __init__(self, model: str, system_instruction: str, display_name: str = ''):
+        self.model = model
+        self.system_instruction = system_instruction
+        self.display_name = display_name
+        self.name = f"cachedContents/{display_name or 'fake'}"
+
+    @classmethod
+    def create(cls, model: str, system_instruction: Optional[str] = None, display_name: str = '',
+               **kwargs) -> "FakeCachedContent":
+        return cls(model, system_instruction or '', display_name)
+
+
+class FakeGenerativeModel:
+    """google.generativeai.GenerativeModel 대용. 프롬프트 종류에 맞는 고정 응답을 돌려줍니다."""
+    behaviour: Optional[_Behaviour] = None
+
+    def __init__(self, model_name: str = 'fake-gemini', system_instruction: Optional[str] = None, **kwargs):
+        self.model_name = model_name
+        self.system_instruction = system_instruction or ''
+        self.cached_content: Optional[FakeCachedContent] = None
+
+    @classmethod
+    def from_cached_content(cls, cached_content: FakeCachedContent, **kwargs) -> "FakeGenerativeModel":
+        model = cls(cached_content.model, cached_content.system_instruction)
+        model.cached_content = cached_content
+        return model
+
+    def generate_content(self, prompt, **kwargs) -> _GenerateContentResponse:
+        self.behaviour.call()
+        full_prompt = self.system_instruction + str(prompt)
+        text = KEYWORDS_RESPONSE if '키워드' in full_prompt else POINTS_RESPONSE
+        return _GenerateContentResponse(full_prompt, text, self.system_instruction if self.cached_content else '')
+
+
+def make_png(size: int, seed: int = 0) -> bytes:
+    """크로마키 처리 경로를 그대로 타도록 녹색 배경에 무작위 점이 찍힌 size x size PNG를 만듭니다."""
+    from PIL import Image
+    rng = random.Random(seed)
+    image = Image.new('RGB', (size, size), (0, 255, 0))
+    pixels = image.load()
+    for _ in range(size * size // 4):
+        pixels[rng.randrange(size), rng.randrange(size)] = (0, 0, 0)
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class _Image:
+    __slots__ = ('image_bytes',)
+
+    def __init__(self, image_bytes: bytes):
+        self.image_bytes = image_bytes
+
+
+class _GeneratedImage:
+    __slots__ = ('image',)
+
+    def __init__(self, image_bytes: bytes):
+        self.image = _Image(image_bytes)
+
+
+class _GenerateImagesResponse:
+    __slots__ = ('generated_images',)
+
+    def __init__(self, image_bytes: bytes):
+        self.generated_images = [_GeneratedImage(image_bytes)]
+
+
+class _FakeModels:
+    def __init__(self, behaviour: _Behaviour, image_bytes: bytes):
+        self._behaviour = behaviour
+        self._image_bytes = image_bytes
+
+    def generate_images(self, model: str, prompt: str, config=None, **kwargs) -> _GenerateImagesResponse:
+        self._behaviour.call()
+        return _GenerateImagesResponse(self._image_bytes)
+
+
+class FakeGenaiClient:
+    """google.genai.Client 대용 (models.generate_images만 제공)"""
+    behaviour: Optional[_Behaviour] = None
+    image_bytes: bytes = b''
+
+    def __init__(self, api_key: Optional[str] = None, **kwargs):
+        self.models = _FakeModels(self.behaviour, self.image_bytes)
+
+
+class FakeGenerateImagesConfig:
+    def __init__(self, number_of_images: int = 1, **kwargs):
+        self.number_of_images = number_of_images
+
+
+def install_fake_backends(llm: Optional[FakeBackendConfig] = None, image: Optional[FakeBackendConfig] = None):
+    """sys.modules의 google.generativeai / google.genai를 가짜 백엔드로 교체합니다.
+
+    Args:
+        llm (Optional[FakeBackendConfig]): GenerativeModel 설정 (생략하면 지연/오류 없음)
+        image (Optional[FakeBackendConfig]): generate_images 설정 (생략하면 지연/오류 없음, 64px)
+    """
+    llm = llm or FakeBackendConfig()
+    image = image or FakeBackendConfig()
+    FakeGenerativeModel.behaviour = _Behaviour(llm)
+    FakeGenaiClient.behaviour = _Behaviour(image)
+    FakeGenaiClient.image_bytes = make_png(image.image_size, seed=image.seed or 0)
+
+    install_backend_modules(FakeGenerativeModel, FakeGenaiClient, cached_content_cls=FakeCachedContent)
+
+
+def install_backend_modules(generative_model_cls, client_cls, cached_content_cls=None):
+    """sys.modules의 google.generativeai / google.genai를 주어진 클래스를 제공하는 모듈로 교체합니다.
+
+    Args:
+        generative_model_cls: google.generativeai.GenerativeModel 대신 사용할 클래스
+        client_cls: google.genai.Client 대신 사용할 클래스
+        cached_content_cls: google.generativeai.caching.CachedContent 대신 사용할 클래스
+            (생략하면 caching 모듈이 없어 AiProcessor의 'cached' 방식이 system instruction으로 물러남)
+    """
+    generativeai = types.ModuleType('google.generativeai')
+    generativeai.GenerativeModel = generative_model_cls
+    generativeai.configure = lambda **kwargs: None
+    if cached_content_cls is not None:
+        caching = types.ModuleType('google.generativeai.caching')
+        caching.CachedContent = cached_content_cls
+        generativeai.caching = caching
+
+    genai_types = types.ModuleType('google.genai.types')
+    genai_types.GenerateImagesConfig = FakeGenerateImagesConfig
+    genai = types.ModuleType('google.genai')
+    genai.Client = client_cls
+    genai.types = genai_types
+
+    try:
+        import google # 설치된 google 네임스페이스 패키지가 있으면 그대로 사용
+    except ImportError:
+        google = types.ModuleType('google')
+        google.__path__ = []
+        sys.modules['google'] = google
+    google.generativeai = generativeai
+    google.genai = genai
+    sys.modules.update({
+        'google.generativeai': generativeai,
+        'google.genai': genai,
+        'google.genai.types': genai_types,
+    })
@@ -0,0 +1,161 @@
+"""RSS/Atom 피드 파싱 벤치마크
+
+수 MB 크기의 합성 피드(HTML 요약 포함)를 다음 방식으로 파싱해 처리 시간과 최대 메모리 사용량을 비교합니다.
+- feedparser: feedparser.parse (빠른 경로를 끈 parse_feed, 이전 RssScraper 방식)
+- fast_path: iterparse 빠른 경로 (feed_parser.parse_feed)
+- fast_path.first_entry: 빠른 경로에서 첫 항목이 나올 때까지의 시간 (문서 전체를 읽기 전에 항목을 돌려주는지 확인)
+- inline.x<N> / pool<W>.x<N>: 같은 피드 N개를 현재 프로세스에서 차례로 파싱 vs 프로세스 풀(W개)에서 파싱
+  (풀은 미리 띄워 둔 상태에서 측정하며, 본문 전달/결과 반환 비용은 포함)
+
+사용법:
+    python -m benchmarks.feed_parse                               # rss/atom, 항목 2000/10000개
+    python -m benchmarks.feed_parse --items 10000 --kinds rss --feeds 8 --workers 4 --compare
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email.utils import formatdate
+from typing import Callable, Dict
+from xml.sax.saxutils import escape
+
+from benchmarks.feed_server import BASE_TIMESTAMP, SUMMARY_WORDS
+from core.data_acquisition.feed_parser import iter_entries, parse_feed
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "feed_parse.json")
+FEED_URL = "https://example.com/feed.xml"
+CONTENT_TYPE = "application/xml; charset=utf-8"
+
+
+def make_feed(kind: str, items: int, summary_words: int = 60) -> bytes:
+    """항목마다 문단/링크/이미지가 든 HTML 요약을 가진 RSS 2.0 또는 Atom 문서"""
+    entries = []
+    for i in range(items - 1, -1, -1):
+        words = [SUMMARY_WORDS[(i + k) % len(SUMMARY_WORDS)] for k in range(summary_words)]
+        summary = (f'<p>{" ".join(words[:summary_words // 2])} <a href="/tag/{words[0]}">#{words[0]}</a></p>'
+                   f'<p><img src="/images/{i}.jpg" alt="{words[1]}"> {" ".join(words[summary_words // 2:])}</p>')
+        title = f"합성 기사 {i}: {words[0]} & {words[1]} 시장 동향"
+        if kind == 'atom':
+            entries.append(
+                f"<entry><title>{escape(title)}</title><link href=\"https://example.com/news/{i}\"/>"
+                f"<id>urn:news:{i}</id><published>{datetime.fromtimestamp(BASE_TIMESTAMP + i * 60).isoformat()}Z</published>"
+                f"<summary type=\"html\">{escape(summary)}</summary></entry>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{escape(title)}</title><link>https://example.com/news/{i}</link>"
+                f"<guid>https://example.com/news/{i}</guid><pubDate>{formatdate(BASE_TIMESTAMP + i * 60)}</pubDate>"
+                f"<description><![CDATA[{summary}]]></description></item>"
+            )
+    if kind == 'atom':
+        head = '<feed xmlns="http://www.w3.org/2005/Atom"><title>합성 피드</title><id>urn:feed</id>'
+        tail = '</feed>'
+    else:
+        head = '<rss version="2.0"><channel><title>합성 피드</title><link>https://example.com/</link><description>benchmark</description>'
+        tail = '</channel></rss>'
+    return ('<?xml version="1.0" encoding="UTF-8"?>' + head + "".join(entries) + tail).encode('utf-8')
+
+
+def first_entry(body: bytes):
+    return next(iter_entries(body, FEED_URL, CONTENT_TYPE))
+
+
+def parse_in_pool(pool: ProcessPoolExecutor, body: bytes, feeds: int) -> int:
+    futures = [pool.submit(parse_feed, body, FEED_URL, CONTENT_TYPE) for _ in range(feeds)]
+    return sum(len(future.result()) for future in futures)
+
+
+def measure(func: Callable[[], object], repeat: int, trace_memory: bool = True) -> Dict:
+    """func를 repeat회 실행한 최단 시간과, 별도 1회 실행의 tracemalloc 최대 메모리를 측정합니다."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        del result
+    result = {'seconds': round(best, 4)}
+    if trace_memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_mib'] = round(peak / 2**20, 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RSS/Atom 피드 파싱 시간과 메모리 사용량을 측정합니다.")
+    parser.add_argument("--items", default="2000,10000", help="쉼표로 구분한 피드당 항목 수 (기본값: 2000,10000)")
+    parser.add_argument("--kinds", default="rss,atom", help="쉼표로 구분한 피드 형식 (기본값: rss,atom)")
+    parser.add_argument("--feeds", type=int, default=4, help="inline/pool 비교에서 파싱할 피드 수 (기본값: 4)")
+    parser.add_argument("--workers", type=int, default=2, help="프로세스 풀 크기 (기본값: 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 최단 시간 기록 (기본값: 3)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.WARNING) # 파싱 경고 로그 제외
+
+    scenarios = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            scenarios = json.load(f).get('scenarios', {})
+
+    pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        parse_in_pool(pool, make_feed('rss', 10), args.workers) # 워커 기동/임포트는 측정에서 제외
+        for kind in args.kinds.split(','):
+            for items in (int(value) for value in args.items.split(',')):
+                body = make_feed(kind, items)
+                scenario = f"{kind}-{items}"
+                baseline = scenarios.get(scenario, {})
+                expected = parse_feed(body, FEED_URL, CONTENT_TYPE, fast_path=False)
+                if parse_feed(body, FEED_URL, CONTENT_TYPE) != expected:
+                    raise SystemExit(f"{scenario}: 빠른 경로 결과가 feedparser와 다릅니다.")
+
+                cases: Dict[str, tuple] = {
+                    'feedparser': (lambda: parse_feed(body, FEED_URL, CONTENT_TYPE, fast_path=False), True),
+                    'fast_path': (lambda: parse_feed(body, FEED_URL, CONTENT_TYPE), True),
+                    'fast_path.first_entry': (lambda: first_entry(body), True),
+                    f'inline.x{args.feeds}': (lambda: [parse_feed(body, FEED_URL, CONTENT_TYPE) for _ in range(args.feeds)], False),
+                    f'pool{args.workers}.x{args.feeds}': (lambda: parse_in_pool(pool, body, args.feeds), False),
+                }
+                print(f"=== {kind} 항목 {items:,}개 ({len(body) / 2**20:.1f} MiB) ===")
+                results = {}
+                for case, (func, trace_memory) in cases.items():
+                    result = measure(func, args.repeat, trace_memory)
+                    results[case] = result
+                    previous = baseline.get(case, {}).get('seconds')
+                    delta = f" (기준 {previous:.3f}s)" if previous else ""
+                    peak = f"peak {result['peak_mib']:>8.2f} MiB" if 'peak_mib' in result else ""
+                    print(f"{case:<24} {result['seconds']:>8.3f}s {peak}{delta}")
+                results['feed_mib'] = round(len(body) / 2**20, 2)
+                scenarios[scenario] = {**baseline, **results}
+    finally:
+        pool.shutdown()
+
+    if not args.compare:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+                'settings': {'repeat': args.repeat, 'feeds': args.feeds, 'workers': args.workers},
+                'scenarios': scenarios,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
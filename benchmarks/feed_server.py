@@ -0,0 +1,198 @@
+"""벤치마크용 합성 RSS 피드 HTTP 서버
+
+/feed/<번호>.xml?gen=<세대> 요청에 items_per_feed개 항목을 가진 RSS 2.0 문서를 돌려줍니다.
+항목 link(/article/<피드>/<기사>)는 본문이 든 HTML 기사 페이지이며 ETag 조건부 요청에 304로 응답합니다.
+세대(gen)가 1 늘어날 때마다 피드 항목 중 change_rate 비율이 새 기사로 바뀌므로,
+gen=0으로 첫 실행(전부 신규)을, gen=1로 다음 실행(일부만 신규)을 재현할 수 있습니다.
+같은 (피드, 세대)에는 항상 같은 문서가 나가므로 결과가 재현 가능합니다.
+
+단독 실행:
+    python -m benchmarks.feed_server --feeds 3 --items 100 --port 8765
+"""
+import argparse
+import threading
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+SUMMARY_WORDS = ("반도체", "수출", "금리", "인공지능", "스타트업", "소비자", "플랫폼", "투자", "규제", "시장")
+BASE_TIMESTAMP = 1_790_000_000 # 발행일 계산 기준 (epoch seconds)
+
+
+class SyntheticFeedServer:
+    """합성 RSS 피드를 제공하는 로컬 HTTP 서버
+
+    Args:
+        feeds (int): 피드 수
+        items_per_feed (int): 피드당 항목 수
+        change_rate (float): 세대가 바뀔 때 새 기사로 교체되는 항목 비율 (0~1)
+        summary_chars (int): 항목 요약(description) 길이 (대략적인 글자 수)
+        host (str): 바인딩할 주소
+        port (int): 포트 (0이면 임의의 빈 포트)
+    """
+
+    def __init__(self, feeds: int = 1, items_per_feed: int = 100, change_rate: float = 0.1,
+                 summary_chars: int = 200, host: str = '127.0.0.1', port: int = 0):
+        self.feeds = feeds
+        self.items_per_feed = items_per_feed
+        self.change_rate = change_rate
+        self.summary_chars = summary_chars
+        self.requests_served = 0
+        self.article_requests = 0
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_urls(self, generation: int = 0) -> List[str]:
+        """세대별 피드 URL 목록"""
+        return [f"{self.base_url}/feed/{index}.xml?gen={generation}" for index in range(self.feeds)]
+
+    def new_items_per_generation(self) -> int:
+        return round(self.items_per_feed * self.change_rate)
+
+    @lru_cache(maxsize=256)
+    def render(self, feed_index: int, generation: int) -> bytes:
+        """feed_index번 피드의 generation 세대 RSS 문서 (최신 항목이 앞)"""
+        first = generation * self.new_items_per_generation()
+        items = []
+        for item_id in range(first + self.items_per_feed - 1, first - 1, -1):
+            link = f"{self.base_url}/article/{feed_index}/{item_id}"
+            words = [SUMMARY_WORDS[(item_id + k) % len(SUMMARY_WORDS)] for k in range(max(1, self.summary_chars // 4))]
+            items.append(
+                "<item>"
+                f"<title>{escape(f'[피드 {feed_index}] 합성 기사 {item_id}: {words[0]} 시장 동향')}</title>"
+                f"<link>{link}</link>"
+                f"<guid>{link}</guid>"
+                f"<description>{escape(' '.join(words))}</description>"
+                f"<pubDate>{formatdate(BASE_TIMESTAMP + item_id * 60)}</pubDate>"
+                "</item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0"><channel>'
+            f"<title>합성 피드 {feed_index}</title><link>{self.base_url}</link><description>benchmark</description>"
+            + "".join(items) +
+            "</channel></rss>"
+        ).encode('utf-8')
+
+    @lru_cache(maxsize=4096)
+    def render_article(self, feed_index: int, item_id: int) -> bytes:
+        """기사 페이지 HTML (메뉴/링크 목록 사이에 본문 문단이 있는 일반적인 뉴스 페이지 구조)"""
+        paragraphs = "".join(
+            f"<p>{escape(' '.join(SUMMARY_WORDS[(item_id + k + n) % len(SUMMARY_WORDS)] for n in range(40)))}</p>"
+            for k in range(8)
+        )
+        return (
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f"<title>합성 기사 {item_id}</title><script>var tracking = 1;</script></head><body>"
+            '<nav><a href="/">홈</a> <a href="/economy">경제</a> <a href="/tech">IT</a></nav>'
+            f'<div class="content"><h1>[피드 {feed_index}] 합성 기사 {item_id}</h1>'
+            f'<div class="article_body">{paragraphs}</div></div>'
+            '<footer>Copyright 합성 뉴스. 무단 전재 및 재배포 금지.</footer></body></html>'
+        ).encode('utf-8')
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                parts = url.path.strip('/').split('/')
+                if len(parts) == 3 and parts[0] == 'article':
+                    self._send_article(parts[1], parts[2])
+                    return
+                if len(parts) != 2 or parts[0] != 'feed' or not parts[1].endswith('.xml'):
+                    self.send_error(404)
+                    return
+                try:
+                    feed_index = int(parts[1][:-4])
+                    generation = int(parse_qs(url.query).get('gen', ['0'])[0])
+                except ValueError:
+                    self.send_error(400)
+                    return
+                if not 0 <= feed_index < server.feeds:
+                    self.send_error(404)
+                    return
+                body = server.render(feed_index, generation)
+                server.requests_served += 1
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_article(self, feed_index: str, item_id: str):
+                if not (feed_index.isdigit() and item_id.isdigit()) or int(feed_index) >= server.feeds:
+                    self.send_error(404)
+                    return
+                server.article_requests += 1
+                etag = f'"article-{feed_index}-{item_id}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                body = server.render_article(int(feed_index), int(item_id))
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args): # 요청마다 stderr에 출력하지 않음
+                pass
+
+        return Handler
+
+    def start(self) -> "SyntheticFeedServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name='feed-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 서버를 실행합니다 (단독 실행용)."""
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SyntheticFeedServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 RSS 피드를 제공하는 로컬 HTTP 서버를 실행합니다.")
+    parser.add_argument("--feeds", type=int, default=1, help="피드 수 (기본값: 1)")
+    parser.add_argument("--items", type=int, default=100, help="피드당 항목 수 (기본값: 100)")
+    parser.add_argument("--change-rate", type=float, default=0.1, help="세대마다 새로 바뀌는 항목 비율 (기본값: 0.1)")
+    parser.add_argument("--summary-chars", type=int, default=200, help="항목 요약 길이 (기본값: 200)")
+    parser.add_argument("--port", type=int, default=8765, help="포트 (기본값: 8765)")
+    args = parser.parse_args()
+
+    server = SyntheticFeedServer(args.feeds, args.items, args.change_rate, args.summary_chars, port=args.port)
+    for url in server.feed_urls():
+        print(url)
+    print("Ctrl+C로 종료합니다.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""포맷터 렌더링 벤치마크
+
+N건의 기사를 다음 방식으로 렌더링해 처리량과 최대 메모리 사용량을 비교합니다.
+- legacy_concat: 이전 DefaultFormatter 방식 (중첩 루프에서 문자열 += 로 누적)
+- <템플릿>.format: TemplateFormatter.format (조각을 "".join 해 전체 문자열 생성)
+- <템플릿>.stream: TemplateFormatter.render 조각을 바로 파일(os.devnull)에 기록 (전체 문자열을 만들지 않음)
+
+사용법:
+    python -m benchmarks.formatter_render                         # 100k 기사, 모든 템플릿
+    python -m benchmarks.formatter_render --articles 10000 --templates text,html --compare
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from core.formatting.template_formatter import TEMPLATES, TemplateFormatter
+from core.models import Article
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "formatter_render.json")
+
+
+def make_articles(count: int) -> List[Article]:
+    return [
+        Article(
+            title=f"합성 기사 {i}: 반도체 수출 동향과 금리 전망 <속보>",
+            link=f"https://example.com/news/{i}?ref=rss&page=1",
+            dopamine_points=[] if i % 10 == 0 else ["예상 밖의 반전 포인트", "숫자로 보는 핵심 변화", "독자가 바로 써먹을 수 있는 팁"],
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_format(data: List[Article]) -> str:
+    """이전 DefaultFormatter.format 구현 (비교 기준)"""
+    formatted_output = ""
+    for i, item in enumerate(data):
+        formatted_output += f"{i+1:02d}. '{item.title or '제목 없음'}'\n{item.link or '링크 없음'}\n\n"
+        formatted_output += "도파민 포인트\n"
+        if item.dopamine_points:
+            for j, point in enumerate(item.dopamine_points):
+                formatted_output += f"{j+1}. {point}\n"
+        else:
+            formatted_output += "- 추출된 포인트 없음\n"
+        formatted_output += "\n"
+    return formatted_output.strip()
+
+
+def stream_to_devnull(formatter: TemplateFormatter, data: List[Article]) -> int:
+    written = 0
+    with open(os.devnull, "w", encoding="utf-8") as f:
+        for chunk in formatter.render(data):
+            written += f.write(chunk)
+    return written
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict:
+    """func를 repeat회 실행한 최단 시간과, 별도 1회 실행의 tracemalloc 최대 메모리를 측정합니다."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': round(best, 4), 'peak_mib': round(peak / 2**20, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="포맷터 렌더링 처리량과 메모리 사용량을 측정합니다.")
+    parser.add_argument("--articles", type=int, default=100_000, help="렌더링할 기사 수 (기본값: 100000)")
+    parser.add_argument("--templates", default=",".join(TEMPLATES), help=f"쉼표로 구분한 템플릿 (기본값: {','.join(TEMPLATES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 최단 시간 기록 (기본값: 3)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            baseline = json.load(f).get('scenarios', {}).get(str(args.articles), {})
+
+    articles = make_articles(args.articles)
+    cases: Dict[str, Callable[[], object]] = {'legacy_concat': lambda: legacy_format(articles)}
+    for name in args.templates.split(','):
+        formatter = TemplateFormatter(name)
+        cases[f"{name}.format"] = lambda formatter=formatter: formatter.format(articles)
+        cases[f"{name}.stream"] = lambda formatter=formatter: stream_to_devnull(formatter, articles)
+
+    import logging
+    logging.disable(logging.INFO) # 포맷 완료 로그 제외
+    print(f"=== 기사 {args.articles:,}건 ===")
+    results = {}
+    for case, func in cases.items():
+        output = func()
+        result = measure(func, args.repeat)
+        result['chars'] = output if isinstance(output, int) else len(output)
+        result['articles_per_second'] = round(args.articles / result['seconds']) if result['seconds'] > 0 else None
+        results[case] = result
+        previous = baseline.get(case, {}).get('articles_per_second')
+        delta = f" (기준 {previous:,}/s)" if previous else ""
+        print(f"{case:<22} {result['seconds']:>8.3f}s {result['articles_per_second'] or 0:>10,} articles/s "
+              f"peak {result['peak_mib']:>8.2f} MiB {result['chars']:>12,} chars{delta}")
+
+    if not args.compare:
+        scenarios = {}
+        if os.path.exists(RESULTS_FILE):
+            with open(RESULTS_FILE, encoding="utf-8") as f:
+                scenarios = json.load(f).get('scenarios', {})
+        scenarios[str(args.articles)] = {**baseline, **results}
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'settings': {'repeat': args.repeat},
+                'scenarios': scenarios,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""오프라인 엔드투엔드 파이프라인 벤치마크
+
+합성 RSS 피드 서버(benchmarks.feed_server)와 가짜 Gemini/Imagen 백엔드(benchmarks.fakes)로
+실제 피드나 유료 API 없이 main()과 batch_generate_missing_images()를 실행하고
+단계별 처리량, 지연 시간 백분위수(traces 테이블 기준), 최대 RSS를 측정합니다.
+
+시나리오(기사 수)마다 새 프로세스와 임시 DB에서 다음 단계를 차례로 실행합니다.
+    main_cold         모든 기사가 신규인 첫 실행 (피드 세대 0)
+    main_incremental  change_rate 비율만 새 기사인 다음 실행 (피드 세대 1)
+    batch_images      gen_image가 없는 기사의 일괄 이미지 생성
+
+결과는 시나리오별로 benchmarks/results/pipeline_e2e.json에 저장(갱신)되며 --compare로 기준값과 비교할 수 있습니다.
+
+사용법:
+    python -m benchmarks.pipeline_e2e                              # 10, 1k, 100k 기사
+    python -m benchmarks.pipeline_e2e --scenarios 10,1000 --llm-latency-ms 300 --llm-error-rate 0.02
+    python -m benchmarks.pipeline_e2e --scenarios 1000 --compare   # 기준값과 비교만 (파일 갱신 안 함)
+    python -m benchmarks.pipeline_e2e --scenarios 1000 --prompt-mode cached --compare  # 템플릿별 호출당 캐시 토큰 비교
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "pipeline_e2e.json")
+DEFAULT_SCENARIOS = "10,1000,100000"
+MAX_ITEMS_PER_FEED = 1_000 # 이보다 많은 기사는 여러 피드로 나눔
+PHASES = ("main_cold", "main_incremental", "batch_images")
+
+
+def _peak_rss_mib() -> Optional[float]:
+    try:
+        import resource
+    except ImportError: # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024 / (1024 if sys.platform == 'darwin' else 1), 1) # macOS는 bytes, Linux는 KiB
+
+
+def _run_phase(name: str, func: Callable[[], int]) -> Dict:
+    """func를 실행하고 (처리 건수, 소요 시간, 처리량, 단계별 지연 시간, 최대 RSS)를 반환합니다."""
+    from utils.database import get_trace_durations
+    from utils.tracing import flush_traces, percentile, tracer
+
+    tracer.run_id = f"bench-{name}-{uuid.uuid4().hex[:8]}" # 단계별로 traces를 구분
+    start = time.perf_counter()
+    items = func()
+    seconds = time.perf_counter() - start
+    flush_traces()
+    stages = {
+        stage: {
+            'count': len(values),
+            'p50_ms': round(percentile(values, 50), 3),
+            'p95_ms': round(percentile(values, 95), 3),
+            'p99_ms': round(percentile(values, 99), 3),
+        }
+        for stage, values in get_trace_durations(last_runs=1).items()
+    }
+    return {
+        'items': items,
+        'seconds': round(seconds, 3),
+        'items_per_second': round(items / seconds, 1) if seconds > 0 else None,
+        'peak_rss_mib': _peak_rss_mib(), # 프로세스 시작 이후 최대값 (이전 단계 포함)
+        'stages': stages,
+    }
+
+
+def _worker(spec_path: str):
+    """시나리오 하나를 현재 프로세스에서 실행하고 결과를 spec['result_path']에 기록합니다."""
+    with open(spec_path, encoding='utf-8') as f:
+        spec = json.load(f)
+
+    from benchmarks.fakes import FakeBackendConfig, install_fake_backends
+    install_fake_backends(llm=FakeBackendConfig(**spec['llm']), image=FakeBackendConfig(**spec['image']))
+
+    import main as pipeline
+    from core.tasks import GENERATED_IMAGES_DIR, batch_generate_missing_images
+    from configs.settings import get_config, reload_config
+
+    def use_feeds(urls: List[str]):
+        for i, url in enumerate(urls, start=1):
+            os.environ[f'RSS_FEED_{i}'] = url
+        reload_config()
+
+    def run_main(urls: List[str]) -> Callable[[], int]:
+        def run() -> int:
+            use_feeds(urls)
+            pipeline.main()
+            return spec['articles']
+        return run
+
+    def run_batch() -> int:
+        before = len(os.listdir(GENERATED_IMAGES_DIR)) if os.path.isdir(GENERATED_IMAGES_DIR) else 0
+        batch_generate_missing_images(get_config(), limit=spec['image_limit'])
+        return len(os.listdir(GENERATED_IMAGES_DIR)) - before
+
+    results = {
+        'main_cold': _run_phase('main_cold', run_main(spec['feed_urls'][0])),
+        'main_incremental': _run_phase('main_incremental', run_main(spec['feed_urls'][1])),
+        'batch_images': _run_phase('batch_images', run_batch),
+    }
+    from utils.metrics import prompt_usage_summary
+    results['prompts'] = prompt_usage_summary() # 모든 단계의 프롬프트 템플릿별 호출당 입력/캐시 토큰
+    with open(spec['result_path'], 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+
+
+def run_scenario(articles: int, args: argparse.Namespace) -> Dict:
+    """합성 피드 서버를 띄우고 새 프로세스에서 시나리오를 실행한 뒤 결과를 반환합니다."""
+    from benchmarks.feed_server import SyntheticFeedServer
+
+    feeds = max(1, math.ceil(articles / MAX_ITEMS_PER_FEED))
+    items_per_feed = math.ceil(articles / feeds)
+    with SyntheticFeedServer(feeds, items_per_feed, args.change_rate, args.summary_chars) as server, \
+            tempfile.TemporaryDirectory(prefix='bench-e2e-') as workdir:
+        spec = {
+            'articles': feeds * items_per_feed,
+            'feed_urls': [server.feed_urls(0), server.feed_urls(1)],
+            'image_limit': args.image_limit if args.image_limit is not None else articles,
+            'llm': {'latency_ms': args.llm_latency_ms, 'error_rate': args.llm_error_rate},
+            'image': {'latency_ms': args.image_latency_ms, 'error_rate': args.image_error_rate, 'image_size': args.image_size},
+            'result_path': os.path.join(workdir, 'result.json'),
+        }
+        spec_path = os.path.join(workdir, 'spec.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+
+        env = {key: value for key, value in os.environ.items()
+               if not key.startswith(('RSS_FEED_', 'METRICS_', 'SLACK_', 'DELIVERY_', 'FULLTEXT_'))}
+        env.update({
+            'PYTHONPATH': os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')])),
+            'GEMINI_API_KEY': 'fake-key',
+            'DATABASE_FILE_NAME': os.path.join(workdir, 'bench.db'),
+            'LOG_LEVEL': args.log_level,
+            # 합성 기사 제목은 번호만 달라 거의 모두 한 묶음이 되므로, 기사별 AI 처리량을 재도록 묶기는 끔
+            # (묶기 효과는 benchmarks.story_clustering 참고)
+            'CLUSTERING_ENABLED': 'false',
+            'GEMINI_PROMPT_MODE': args.prompt_mode,
+        })
+        log_path = os.path.join(workdir, 'worker.log')
+        with open(log_path, 'w', encoding='utf-8') as log:
+            # 작업 디렉토리를 임시 디렉토리로 두어 저장소의 .env와 generated_images를 건드리지 않음
+            proc = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.pipeline_e2e', '--worker', spec_path],
+                cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=log,
+            )
+        if proc.returncode != 0:
+            with open(log_path, encoding='utf-8', errors='replace') as f:
+                tail = f.read()[-4000:]
+            raise RuntimeError(f"{articles}건 시나리오 실행 실패 (exit {proc.returncode}):\n{tail}")
+        with open(spec['result_path'], encoding='utf-8') as f:
+            result = json.load(f)
+        result['feeds'] = feeds
+        result['feed_requests'] = server.requests_served
+        result['article_requests'] = server.article_requests
+        return result
+
+
+def _print_result(articles: int, result: Dict, baseline: Dict):
+    print(f"=== {articles}건 (피드 {result['feeds']}개) ===")
+    for phase in PHASES:
+        item = result[phase]
+        previous = baseline.get(phase, {}).get('items_per_second')
+        delta = ""
+        if previous and item['items_per_second']:
+            delta = f" (기준 {previous}/s, {(item['items_per_second'] / previous - 1) * 100:+.1f}%)"
+        print(f"{phase:<17} {item['items']:>7}건 {item['seconds']:>9.2f}s {item['items_per_second'] or 0:>10.1f}/s"
+              f"  peak RSS {item['peak_rss_mib']} MiB{delta}")
+        for stage, stats in sorted(item['stages'].items(), key=lambda kv: kv[1]['p50_ms'] * kv[1]['count'], reverse=True)[:6]:
+            print(f"    {stage:<22} n={stats['count']:<7} p50 {stats['p50_ms']:>9.2f}  p95 {stats['p95_ms']:>9.2f}  p99 {stats['p99_ms']:>9.2f} ms")
+    for template, usage in result.get('prompts', {}).items():
+        print(f"prompt {template:<20} {usage['calls']:>7}건  호출당 입력 {usage['input_tokens_per_call']:g}토큰, "
+              f"캐시 {usage['cached_tokens_per_call']:g}토큰")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 피드/API 백엔드로 파이프라인 처리량을 측정합니다.")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS, help=f"쉼표로 구분한 기사 수 목록 (기본값: {DEFAULT_SCENARIOS})")
+    parser.add_argument("--change-rate", type=float, default=0.1, help="두 번째 실행에서 새 기사 비율 (기본값: 0.1)")
+    parser.add_argument("--summary-chars", type=int, default=200, help="합성 기사 요약 길이 (기본값: 200)")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="가짜 Gemini 호출 평균 지연 (기본값: 0)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="가짜 Gemini 호출 실패 확률 (기본값: 0)")
+    parser.add_argument("--image-latency-ms", type=float, default=0.0, help="가짜 Imagen 호출 평균 지연 (기본값: 0)")
+    parser.add_argument("--image-error-rate", type=float, default=0.0, help="가짜 Imagen 호출 실패 확률 (기본값: 0)")
+    parser.add_argument("--image-size", type=int, default=64, help="가짜 이미지 한 변 픽셀 수 (기본값: 64)")
+    parser.add_argument("--image-limit", type=int, help="batch_images 단계 처리 건수 (기본값: 시나리오 기사 수)")
+    parser.add_argument("--prompt-mode", default="system", choices=("inline", "system", "cached"),
+                        help="프롬프트 지시문 전송 방식 GEMINI_PROMPT_MODE (기본값: system)")
+    parser.add_argument("--log-level", default="WARNING", help="워커 로그 레벨 (기본값: WARNING)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    parser.add_argument("--worker", metavar="SPEC", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker)
+        return
+
+    baseline = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            baseline = json.load(f).get('scenarios', {})
+
+    settings = {key: value for key, value in vars(args).items() if key not in ('scenarios', 'compare', 'worker')}
+    results = {}
+    for articles in (int(value) for value in args.scenarios.split(',')):
+        results[str(articles)] = {**run_scenario(articles, args), 'settings': settings}
+        _print_result(articles, results[str(articles)], baseline.get(str(articles), {}))
+
+    if not args.compare:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'scenarios': {**baseline, **results}, # 이번에 실행하지 않은 시나리오의 기준값은 유지
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
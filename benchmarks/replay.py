@@ -0,0 +1,220 @@
+"""카세트 재생 벤치마크
+
+`python main.py --record <카세트>` 또는 `python batch_image_processor.py --record <카세트>`로 기록한
+실제 실행의 피드 본문, LLM 프롬프트/응답, 이미지 바이트를 오프라인으로 재생하면서
+RssScraper, AiProcessor, ImageGenerator를 기록된 호출 순서대로 다시 실행합니다.
+
+외부 호출 지연은 기록된 소요 시간 x --time-scale만큼 재현됩니다 (1.0=원래 속도, 0=대기 없음).
+기록 당시와 프롬프트가 달라져 카세트에서 응답을 찾지 못한 호출은 miss로 집계됩니다.
+
+사용법:
+    python -m benchmarks.replay cassettes/run.jsonl.gz                    # 원래 속도로 재생
+    python -m benchmarks.replay cassettes/run.jsonl.gz --time-scale 0 --profile
+    python -m benchmarks.replay cassettes/run.jsonl.gz --output benchmarks/results/replay.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from typing import Deque, Dict, List, Optional
+
+from utils.cassette import decode_bytes, read_cassette
+
+
+class CassetteMiss(Exception):
+    """카세트에 해당 요청의 기록이 없는 경우"""
+
+
+class CassetteReplayError(Exception):
+    """기록 당시 실패했던 호출을 재생할 때 발생시키는 오류 (원래 예외 메시지 포함)"""
+
+
+class CassettePlayer:
+    """카세트 항목을 요청(URL/프롬프트)별로 모아 두고 기록된 응답과 지연을 돌려주는 재생기
+
+    같은 요청이 여러 번 기록된 경우 기록 순서대로 하나씩 소비합니다.
+
+    Args:
+        entries (List[Dict]): read_cassette()로 읽은 항목
+        time_scale (float): 기록된 소요 시간에 곱할 배율 (0이면 대기 없음)
+    """
+
+    def __init__(self, entries: List[Dict], time_scale: float = 1.0):
+        self.entries = entries
+        self.time_scale = time_scale
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._queues: Dict[tuple, Deque[Dict]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for entry in entries:
+            key = entry['url'] if entry['kind'] == 'feed' else entry['prompt']
+            self._queues[(entry['kind'], key)].append(entry)
+
+    def take(self, kind: str, key: str) -> Dict:
+        """kind/key에 해당하는 다음 기록을 꺼내고, 기록된 소요 시간만큼 기다립니다."""
+        with self._lock:
+            queue = self._queues.get((kind, key))
+            entry = queue.popleft() if queue else None
+            if entry is None:
+                self.misses[kind] += 1
+        if entry is None:
+            raise CassetteMiss(f"카세트에 기록되지 않은 {kind} 요청입니다: {key[:80]}")
+        if self.time_scale > 0:
+            time.sleep(entry.get('elapsed', 0) * self.time_scale)
+        return entry
+
+    def install(self):
+        """RssScraper.fetch와 google.generativeai / google.genai를 카세트 재생 구현으로 교체합니다."""
+        from benchmarks.fakes import install_backend_modules
+        from core.data_acquisition.rss_scraper import FeedDocument, RssScraper
+
+        player = self
+
+        def fetch(scraper, url: str):
+            try:
+                entry = player.take('feed', url)
+            except CassetteMiss as e:
+                return FeedDocument(url, error=str(e)) # 네트워크 오류와 같은 결과
+            if entry.get('error'):
+                return FeedDocument(url, error=entry['error'])
+            return FeedDocument(url, decode_bytes(entry['body']), entry.get('content_type', ''))
+
+        class ReplayGenerativeModel:
+            # 캐시된 콘텐츠(from_cached_content)는 제공하지 않으므로 'cached' 방식은 system instruction으로 재생됨
+            def __init__(self, model_name: str = 'replay', system_instruction: Optional[str] = None, **kwargs):
+                self.model_name = model_name
+                self.system_instruction = system_instruction or ''
+
+            def generate_content(self, prompt, **kwargs):
+                entry = player.take('llm', self.system_instruction + str(prompt)) # 카세트에는 지시문 + 본문으로 기록됨
+                if entry.get('error'):
+                    raise CassetteReplayError(entry['error'])
+                return SimpleNamespace(text=entry['text'], usage_metadata=SimpleNamespace(**entry.get('usage', {})))
+
+        class ReplayModels:
+            def generate_images(self, model: str, prompt: str, config=None, **kwargs):
+                entry = player.take('image', prompt)
+                if entry.get('error'):
+                    raise CassetteReplayError(entry['error'])
+                image = SimpleNamespace(image_bytes=decode_bytes(entry.get('image')))
+                return SimpleNamespace(generated_images=[SimpleNamespace(image=image)] if image.image_bytes else [])
+
+        class ReplayClient:
+            def __init__(self, api_key=None, **kwargs):
+                self.models = ReplayModels()
+
+        RssScraper.fetch = fetch
+        install_backend_modules(ReplayGenerativeModel, ReplayClient)
+
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    try:
+        func(*args)
+    except Exception: # 기록 당시 실패한 호출은 재생에서도 실패하는 것이 정상
+        pass
+    return (time.perf_counter() - start) * 1000
+
+
+def _summarize(durations: List[float], seconds: float) -> Dict:
+    from utils.tracing import percentile
+    values = sorted(durations)
+    return {
+        'calls': len(values),
+        'seconds': round(seconds, 3),
+        'calls_per_second': round(len(values) / seconds, 1) if seconds > 0 else None,
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+    }
+
+
+def replay(path: str, time_scale: float = 1.0, profile: bool = False) -> Dict:
+    """카세트를 재생하며 RssScraper/AiProcessor/ImageGenerator를 구성 요소별로 실행하고 측정 결과를 반환합니다."""
+    entries = list(read_cassette(path))
+    player = CassettePlayer(entries, time_scale)
+    player.install()
+
+    from core.data_acquisition.rss_scraper import RssScraper
+    from core.processing.ai_processor import AiProcessor
+    from core.processing.image_generator import ImageGenerator
+    from utils.profiling import Profiler
+
+    profiler = Profiler(enabled=profile)
+    llm_entries = [entry for entry in entries if entry['kind'] == 'llm' and entry.get('call')]
+    image_entries = [entry for entry in entries if entry['kind'] == 'image' and entry.get('call')]
+    model_name = llm_entries[0]['model'] if llm_entries else 'replay'
+    image_model_name = image_entries[0]['model'] if image_entries else 'replay'
+
+    results = {}
+    scraper = RssScraper()
+    durations: List[float] = []
+    start = time.perf_counter()
+    with profiler.stage('scrape'):
+        for entry in (entry for entry in entries if entry['kind'] == 'feed'):
+            durations.append(_timed(scraper.scrape, entry['url']))
+    results['scrape'] = _summarize(durations, time.perf_counter() - start)
+
+    processor = AiProcessor(api_key='replay', model_name=model_name)
+    durations = []
+    start = time.perf_counter()
+    with profiler.stage('llm'):
+        for entry in llm_entries:
+            durations.append(_timed(getattr(processor, entry['call']['method']), *entry['call']['args']))
+    results['llm'] = _summarize(durations, time.perf_counter() - start)
+
+    generator = ImageGenerator(image_model_name=image_model_name, api_key='replay')
+    durations = []
+    with tempfile.TemporaryDirectory(prefix='replay-images-') as image_dir:
+        start = time.perf_counter()
+        with profiler.stage('image'):
+            for index, entry in enumerate(image_entries):
+                output_path = os.path.join(image_dir, f"replay_{index}.png")
+                durations.append(_timed(generator.generate_halftone_image, *entry['call']['args'], output_path))
+        results['image'] = _summarize(durations, time.perf_counter() - start)
+
+    for component, kind in (('scrape', 'feed'), ('llm', 'llm'), ('image', 'image')):
+        results[component]['misses'] = player.misses.get(kind, 0)
+    results['recorded_seconds'] = {
+        kind: round(sum(entry.get('elapsed', 0) for entry in entries if entry['kind'] == kind), 3)
+        for kind in ('feed', 'llm', 'image')
+    }
+    profiler.report()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기록된 카세트를 재생하며 수집/AI 처리/이미지 생성 성능을 측정합니다.")
+    parser.add_argument("cassette", help="재생할 카세트 파일 (.jsonl.gz)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="기록된 외부 호출 지연 배율 (기본값: 1.0, 0이면 대기 없음)")
+    parser.add_argument("--profile", action="store_true", help="구성 요소별 cProfile/tracemalloc 프로파일을 수집합니다.")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    from configs.settings import get_config
+    from utils.logger import setup_logging
+    from utils.tracing import configure_tracing
+    setup_logging(**{**get_config().get('logging', {}), 'level': 'WARNING'})
+    configure_tracing(False) # 재생 중 span을 traces 테이블에 남기지 않음
+
+    results = replay(args.cassette, args.time_scale, args.profile)
+    print(f"카세트: {args.cassette} (time scale {args.time_scale})")
+    for component in ('scrape', 'llm', 'image'):
+        stats = results[component]
+        print(f"{component:<7} {stats['calls']:>6}회 {stats['seconds']:>9.2f}s {stats['calls_per_second'] or 0:>9.1f}/s  "
+              f"p50 {stats['p50_ms']:>9.2f}  p95 {stats['p95_ms']:>9.2f}  p99 {stats['p99_ms']:>9.2f} ms  miss {stats['misses']}")
+    print(f"기록 당시 외부 호출 합계(s): {results['recorded_seconds']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'cassette': args.cassette, 'time_scale': args.time_scale, 'results': results}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""샤드 수에 따른 파이프라인 처리량 확장 벤치마크
+
+합성 RSS 피드 서버(benchmarks.feed_server)와 가짜 Gemini/Imagen 백엔드(benchmarks.fakes)로
+`main.py --shards N`과 같은 감독 프로세스(main.run_sharded)를 N마다 새 임시 DB에서 실행하고,
+전체 소요 시간과 N=1 대비 처리량 배율(speedup)을 측정합니다.
+각 샤드 워커는 이 모듈의 --worker 모드로 실행되어 가짜 백엔드를 설치한 뒤 main.main(shard=...)을 호출합니다.
+
+결과는 benchmarks/results/shard_scaling.json에 저장되며 --compare로 기준값과 비교할 수 있습니다.
+가짜 백엔드 지연(--llm-latency-ms, --image-latency-ms)은 대기 시간이므로 CPU 수보다 많은 샤드에서도 확장되지만,
+파싱/DB 저장 등 CPU 작업은 코어 수만큼만 확장됩니다 (결과의 cpus 참고).
+
+사용법:
+    python -m benchmarks.shard_scaling                                   # 2000건, 샤드 1/2/4개
+    python -m benchmarks.shard_scaling --articles 4000 --shards 1,2,4,8 --llm-latency-ms 50 --compare
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "shard_scaling.json")
+
+
+def _worker(spec_path: str, shard_spec: str):
+    """샤드 워커: 가짜 백엔드를 설치하고 자기 몫의 파이프라인을 실행합니다."""
+    with open(spec_path, encoding='utf-8') as f:
+        spec = json.load(f)
+
+    from benchmarks.fakes import FakeBackendConfig, install_fake_backends
+    install_fake_backends(llm=FakeBackendConfig(**spec['llm']), image=FakeBackendConfig(**spec['image']))
+
+    import main as pipeline
+    from utils.sharding import Shard
+    pipeline.main(shard=Shard.parse(shard_spec))
+
+
+def _supervise(spec_path: str, shards: int):
+    """감독 프로세스: 워커를 띄우고 모두 끝나면 결과를 모아 전송합니다."""
+    import main as pipeline
+    ok = pipeline.run_sharded(shards, ['-m', 'benchmarks.shard_scaling', '--worker', spec_path])
+    sys.exit(0 if ok else 1)
+
+
+def _count_results(db_path: str) -> Dict:
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        articles, processed, images = conn.execute(
+            "SELECT COUNT(*), SUM(status = 'processed'), SUM(gen_image IS NOT NULL AND gen_image != '') FROM articles"
+        ).fetchone()
+        delivered = conn.execute("SELECT COUNT(DISTINCT article_id) FROM article_deliveries").fetchone()[0]
+    finally:
+        conn.close()
+    return {'articles': articles or 0, 'processed': processed or 0, 'images': images or 0, 'delivered': delivered or 0}
+
+
+def run_shards(shards: int, server, args: argparse.Namespace) -> Dict:
+    """새 임시 DB에서 샤드 shards개로 한 번 실행하고 (소요 시간, 처리 건수)를 반환합니다."""
+    from utils.sharding import Shard
+
+    urls = server.feed_urls(0)
+    with tempfile.TemporaryDirectory(prefix='bench-shards-') as workdir:
+        spec = {
+            'llm': {'latency_ms': args.llm_latency_ms, 'error_rate': 0.0},
+            'image': {'latency_ms': args.image_latency_ms, 'error_rate': 0.0, 'image_size': args.image_size},
+        }
+        spec_path = os.path.join(workdir, 'spec.json')
+        with open(spec_path, 'w', encoding='utf-8') as f:
+            json.dump(spec, f)
+
+        db_path = os.path.join(workdir, 'bench.db')
+        env = {key: value for key, value in os.environ.items()
+               if not key.startswith(('RSS_', 'METRICS_', 'SLACK_', 'DELIVERY_', 'FULLTEXT_', 'SITE_'))}
+        env.update({f'RSS_FEED_{i}': url for i, url in enumerate(urls, start=1)})
+        env.update({
+            'PYTHONPATH': os.pathsep.join(filter(None, [PROJECT_ROOT, env.get('PYTHONPATH')])),
+            'GEMINI_API_KEY': 'fake-key',
+            'DATABASE_FILE_NAME': db_path,
+            'LOG_LEVEL': args.log_level,
+            'FULLTEXT_ENABLED': 'false', # 샤드 분할 효과만 보도록 원문 요청과 기사 묶기는 제외
+            'CLUSTERING_ENABLED': 'false',
+            'DELIVERY_CHANNELS': 'console',
+        })
+        log_path = os.path.join(workdir, 'supervisor.log')
+        start = time.perf_counter()
+        with open(log_path, 'w', encoding='utf-8') as log:
+            # 작업 디렉토리를 임시 디렉토리로 두어 저장소의 .env와 generated_images를 건드리지 않음
+            proc = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.shard_scaling', '--supervise', spec_path, '--shards', str(shards)],
+                cwd=workdir, env=env, stdout=subprocess.DEVNULL, stderr=log,
+            )
+        seconds = time.perf_counter() - start
+        if proc.returncode != 0:
+            with open(log_path, encoding='utf-8', errors='replace') as f:
+                tail = f.read()[-4000:]
+            raise RuntimeError(f"샤드 {shards}개 실행 실패 (exit {proc.returncode}):\n{tail}")
+        counts = _count_results(db_path)
+
+    return {
+        **counts,
+        'seconds': round(seconds, 3),
+        'articles_per_second': round(counts['processed'] / seconds, 1) if seconds > 0 else None,
+        'feeds_per_shard': [len(Shard(index, shards).select_urls(urls)) for index in range(shards)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 워커 수에 따른 파이프라인 처리량을 측정합니다.")
+    parser.add_argument("--articles", type=int, default=2000, help="전체 기사 수 (기본값: 2000)")
+    parser.add_argument("--feeds", type=int, default=32, help="피드 수, 샤드 간 균형을 위해 샤드 수보다 충분히 크게 (기본값: 32)")
+    parser.add_argument("--shards", default="1,2,4", help="쉼표로 구분한 샤드 수 목록 (기본값: 1,2,4)")
+    parser.add_argument("--llm-latency-ms", type=float, default=20.0, help="가짜 Gemini 호출 평균 지연 (기본값: 20)")
+    parser.add_argument("--image-latency-ms", type=float, default=50.0, help="가짜 Imagen 호출 평균 지연 (기본값: 50)")
+    parser.add_argument("--image-size", type=int, default=64, help="가짜 이미지 한 변 픽셀 수 (기본값: 64)")
+    parser.add_argument("--log-level", default="WARNING", help="워커 로그 레벨 (기본값: WARNING)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    parser.add_argument("--worker", metavar="SPEC", help=argparse.SUPPRESS)
+    parser.add_argument("--shard", help=argparse.SUPPRESS)
+    parser.add_argument("--supervise", metavar="SPEC", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker(args.worker, args.shard)
+        return
+    if args.supervise:
+        _supervise(args.supervise, int(args.shards))
+        return
+
+    from benchmarks.feed_server import SyntheticFeedServer
+
+    scenario = str(args.articles)
+    baseline = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            baseline = json.load(f).get('scenarios', {}).get(scenario, {})
+
+    items_per_feed = -(-args.articles // args.feeds)
+    results = {}
+    with SyntheticFeedServer(args.feeds, items_per_feed) as server:
+        print(f"=== 기사 {args.feeds * items_per_feed:,}건 (피드 {args.feeds}개, CPU {os.cpu_count()}개) ===")
+        for shards in (int(value) for value in args.shards.split(',')):
+            result = run_shards(shards, server, args)
+            single = result['articles_per_second'] if shards == 1 else results.get('1', baseline.get('1', {})).get('articles_per_second')
+            result['speedup'] = round(result['articles_per_second'] / single, 2) if single else None
+            results[str(shards)] = result
+            previous = baseline.get(str(shards), {}).get('articles_per_second')
+            delta = f" (기준 {previous}/s)" if previous else ""
+            print(f"shards={shards:<3} {result['seconds']:>8.2f}s {result['articles_per_second'] or 0:>9.1f} articles/s "
+                  f"x{result['speedup'] or 0:<5} 처리 {result['processed']}건, 이미지 {result['images']}건, "
+                  f"전송 {result['delivered']}건, 샤드별 피드 {result['feeds_per_shard']}{delta}")
+
+    if not args.compare:
+        scenarios = {}
+        if os.path.exists(RESULTS_FILE):
+            with open(RESULTS_FILE, encoding="utf-8") as f:
+                scenarios = json.load(f).get('scenarios', {})
+        scenarios[scenario] = {**baseline, **results}
+        settings = {key: value for key, value in vars(args).items()
+                    if key not in ('articles', 'shards', 'compare', 'worker', 'shard', 'supervise')}
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+                'settings': settings,
+                'scenarios': scenarios,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
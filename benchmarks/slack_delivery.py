@@ -0,0 +1,155 @@
+"""SlackSender 전송 처리량 벤치마크
+
+DefaultFormatter로 N건짜리 다이제스트를 만들고 로컬 Slack 웹훅 대역 서버(benchmarks.slack_webhook)로
+순차 전송(preserve_order)과 동시 전송(max_workers)을 비교합니다.
+서버가 받은 메시지를 이어 붙여 원문이 빠짐없이 도착했는지도 확인합니다.
+slack_blocks 템플릿(Block Kit) 다이제스트도 순차 전송해, 메시지당 블록 50개 제한 안에서 모든 기사 블록이 도착했는지 확인합니다.
+
+사용법:
+    python -m benchmarks.slack_delivery                                  # 1k, 100k 기사
+    python -m benchmarks.slack_delivery --articles 1000 --latency-ms 80 --rate 20 --compare
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from benchmarks.slack_webhook import FakeSlackWebhook
+from core.delivery.slack_sender import SlackSender
+from core.formatting.default_formatter import DefaultFormatter
+from core.formatting.template_formatter import TemplateFormatter
+from core.models import Article
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "slack_delivery.json")
+CHUNK_HEADER = re.compile(r"^\((\d+)/\d+\)\n")
+
+
+def make_articles(count: int) -> List[Article]:
+    return [
+        Article(
+            title=f"합성 기사 {i}: 반도체 수출 동향과 금리 전망",
+            link=f"https://example.com/news/{i}",
+            dopamine_points=["예상 밖의 반전 포인트", "숫자로 보는 핵심 변화", "독자가 바로 써먹을 수 있는 팁"],
+        )
+        for i in range(count)
+    ]
+
+
+def make_digest(count: int) -> str:
+    return DefaultFormatter().format(make_articles(count))
+
+
+def make_blocks_digest(count: int) -> str:
+    return TemplateFormatter('slack_blocks').format(make_articles(count))
+
+
+def _reassemble(messages: List[str]) -> str:
+    """청크 번호 순서대로 머리말을 떼고 이어 붙입니다 (동시 전송으로 도착 순서가 바뀌어도 복원)."""
+    numbered = []
+    for message in messages:
+        match = CHUNK_HEADER.match(message)
+        numbered.append((int(match.group(1)), message[match.end():]) if match else (1, message))
+    return "\n\n".join(text for _, text in sorted(numbered))
+
+
+def run(digest: str, mode: str, workers: int, args: argparse.Namespace) -> Dict:
+    with FakeSlackWebhook(rate_per_second=args.rate, burst=args.burst, latency_ms=args.latency_ms) as webhook:
+        sender = SlackSender(webhook.url, preserve_order=(mode == 'ordered'), max_workers=workers,
+                             min_interval=1 / args.client_rate if args.client_rate > 0 else 0.0)
+        start = time.perf_counter()
+        try:
+            sender.send(digest)
+        finally:
+            sender.close()
+        seconds = time.perf_counter() - start
+        received = _reassemble(webhook.messages)
+    normalize = lambda text: re.sub(r"\s+", " ", text).strip()
+    return {
+        'messages': len(webhook.messages),
+        'seconds': round(seconds, 3),
+        'messages_per_second': round(len(webhook.messages) / seconds, 1) if seconds > 0 else None,
+        'chars_per_second': round(len(digest) / seconds) if seconds > 0 else None,
+        'rate_limited_429': webhook.status_counts.get(429, 0),
+        'complete': normalize(received) == normalize(digest),
+    }
+
+
+def run_blocks(digest: str, args: argparse.Namespace) -> Dict:
+    """Block Kit 다이제스트를 순차 전송하고 기사 블록(section)이 순서대로 모두 도착했는지 확인합니다."""
+    with FakeSlackWebhook(rate_per_second=args.rate, burst=args.burst, latency_ms=args.latency_ms) as webhook:
+        sender = SlackSender(webhook.url, min_interval=1 / args.client_rate if args.client_rate > 0 else 0.0)
+        start = time.perf_counter()
+        try:
+            sender.send(digest)
+        finally:
+            sender.close()
+        seconds = time.perf_counter() - start
+        received = [block for blocks in webhook.block_messages for block in blocks]
+    sections = [block for block in json.loads(digest)['blocks'] if block['type'] == 'section']
+    return {
+        'messages': len(webhook.block_messages),
+        'seconds': round(seconds, 3),
+        'messages_per_second': round(len(webhook.block_messages) / seconds, 1) if seconds > 0 else None,
+        'max_blocks': max((len(blocks) for blocks in webhook.block_messages), default=0),
+        'rate_limited_429': webhook.status_counts.get(429, 0),
+        'complete': [block for block in received if block['type'] == 'section'] == sections,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SlackSender의 대용량 다이제스트 전송 처리량을 측정합니다.")
+    parser.add_argument("--articles", default="1000,100000", help="쉼표로 구분한 다이제스트 기사 수 (기본값: 1000,100000)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 전송 스레드 수 (기본값: 8)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="웹훅 응답 지연 (기본값: 50)")
+    parser.add_argument("--rate", type=float, default=0.0, help="웹훅 서버 초당 허용 요청 수 (기본값: 0=제한 없음)")
+    parser.add_argument("--burst", type=int, default=5, help="웹훅 서버 순간 허용 요청 수 (기본값: 5)")
+    parser.add_argument("--client-rate", type=float, default=0.0, help="SlackSender 초당 요청 상한 (기본값: 0=제한 없음)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            baseline = json.load(f).get('scenarios', {})
+
+    results = {}
+    for count in (int(value) for value in args.articles.split(',')):
+        digest = make_digest(count)
+        print(f"=== {count}건 다이제스트 ({len(digest):,}자) ===")
+        results[str(count)] = {'chars': len(digest)}
+        for mode, workers in (('ordered', 1), ('concurrent', args.workers)):
+            result = run(digest, mode, workers, args)
+            results[str(count)][mode] = result
+            previous = baseline.get(str(count), {}).get(mode, {}).get('messages_per_second')
+            delta = f" (기준 {previous}/s)" if previous else ""
+            print(f"{mode:<11} workers={workers:<3} {result['messages']:>6}건 {result['seconds']:>8.2f}s "
+                  f"{result['messages_per_second'] or 0:>8.1f} msg/s {result['chars_per_second'] or 0:>10,} chars/s "
+                  f"429={result['rate_limited_429']} complete={result['complete']}{delta}")
+        result = run_blocks(make_blocks_digest(count), args)
+        results[str(count)]['blocks'] = result
+        previous = baseline.get(str(count), {}).get('blocks', {}).get('messages_per_second')
+        delta = f" (기준 {previous}/s)" if previous else ""
+        print(f"{'blocks':<11} workers=1   {result['messages']:>6}건 {result['seconds']:>8.2f}s "
+              f"{result['messages_per_second'] or 0:>8.1f} msg/s 최대 블록 {result['max_blocks']}개 "
+              f"429={result['rate_limited_429']} complete={result['complete']}{delta}")
+
+    if not args.compare:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'settings': {key: value for key, value in vars(args).items() if key not in ('articles', 'compare')},
+                'scenarios': {**baseline, **results},
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
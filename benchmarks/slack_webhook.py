@@ -0,0 +1,176 @@
+"""벤치마크/로컬 확인용 Slack Incoming Webhook 대역 서버
+
+실제 Slack 웹훅처럼 JSON {"text": ...} 또는 {"blocks": [...], "text": ...} POST를 받아 다음과 같이 응답합니다.
+    200 ok                 정상
+    400 no_text            text가 비어 있음
+    400 invalid_blocks     blocks가 리스트가 아니거나 비어 있거나 max_blocks(기본 50개) 초과
+    400 invalid_payload    JSON 파싱 실패
+    413 msg_too_long       text가 max_chars(기본 40,000자) 초과
+    429 rate_limited       토큰 버킷(rate_per_second, burst) 초과 (Retry-After 헤더 포함)
+    500 internal_error     error_rate 확률로 발생
+
+단독 실행:
+    python -m benchmarks.slack_webhook --port 8766 --rate 1
+    SLACK_WEBHOOK_URL=http://127.0.0.1:8766/services/T000/B000/XXX python main.py
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+class FakeSlackWebhook:
+    """Slack Incoming Webhook 대역 서버
+
+    Args:
+        rate_per_second (float): 초당 허용 요청 수 (0 이하면 제한 없음)
+        burst (int): 순간적으로 허용하는 요청 수 (토큰 버킷 크기)
+        latency_ms (float): 요청당 응답 지연
+        error_rate (float): 500 응답 확률 (0~1)
+        max_chars (int): 허용하는 text 최대 길이
+        max_blocks (int): 허용하는 blocks 최대 개수
+        host (str): 바인딩할 주소
+        port (int): 포트 (0이면 임의의 빈 포트)
+    """
+
+    def __init__(self, rate_per_second: float = 1.0, burst: int = 5, latency_ms: float = 0.0, error_rate: float = 0.0,
+                 max_chars: int = 40_000, host: str = '127.0.0.1', port: int = 0, max_blocks: int = 50):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.max_chars = max_chars
+        self.max_blocks = max_blocks
+        self.messages: List[str] = []
+        self.block_messages: List[list] = [] # blocks로 받은 메시지의 블록 목록 (도착 순서)
+        self.status_counts = {}
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._random = random.Random(0)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/services/T000/B000/XXXXXXXX"
+
+    def _acquire(self) -> Optional[float]:
+        """요청을 허용하면 None, 제한에 걸리면 다시 시도할 때까지의 초를 반환합니다."""
+        if self.rate_per_second <= 0:
+            return None
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return (1 - self._tokens) / self.rate_per_second
+
+    def _handle(self, body: bytes):
+        """(status, 응답 본문, 추가 헤더)"""
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+        retry_after = self._acquire()
+        if retry_after is not None:
+            return 429, 'rate_limited', {'Retry-After': str(max(1, math.ceil(retry_after)))}
+        with self._lock:
+            fail = self._random.random() < self.error_rate
+        if fail:
+            return 500, 'internal_error', {}
+        try:
+            message = json.loads(body)
+            text = message.get('text', '')
+        except (ValueError, AttributeError):
+            return 400, 'invalid_payload', {}
+        blocks = message.get('blocks')
+        if blocks is not None:
+            if not isinstance(blocks, list) or not blocks or len(blocks) > self.max_blocks:
+                return 400, 'invalid_blocks', {}
+        elif not text:
+            return 400, 'no_text', {}
+        if len(text) > self.max_chars:
+            return 413, 'msg_too_long', {}
+        with self._lock:
+            if blocks is not None:
+                self.block_messages.append(blocks)
+            else:
+                self.messages.append(text)
+        return 200, 'ok', {}
+
+    def _make_handler(self):
+        webhook = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1' # keep-alive (클라이언트 연결 풀 재사용 확인용)
+            disable_nagle_algorithm = True # 헤더/본문을 나눠 쓸 때 지연 ACK로 응답이 40ms 늦어지지 않도록 함
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, text, headers = webhook._handle(body)
+                with webhook._lock:
+                    webhook.status_counts[status] = webhook.status_counts.get(status, 0) + 1
+                payload = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args): # 요청마다 stderr에 출력하지 않음
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeSlackWebhook":
+        self._thread = threading.Thread(target=self._server.serve_forever, name='slack-webhook', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 서버를 실행합니다 (단독 실행용)."""
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeSlackWebhook":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Slack Incoming Webhook 대역 서버를 실행합니다.")
+    parser.add_argument("--rate", type=float, default=1.0, help="초당 허용 요청 수 (기본값: 1, 0이면 제한 없음)")
+    parser.add_argument("--burst", type=int, default=5, help="순간 허용 요청 수 (기본값: 5)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답 지연 (기본값: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 확률 (기본값: 0)")
+    parser.add_argument("--port", type=int, default=8766, help="포트 (기본값: 8766)")
+    args = parser.parse_args()
+
+    webhook = FakeSlackWebhook(args.rate, args.burst, args.latency_ms, args.error_rate, port=args.port)
+    print(webhook.url)
+    print("Ctrl+C로 종료합니다.")
+    try:
+        webhook.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        webhook.stop()
+        print(f"수신 메시지 {len(webhook.messages)}건, 응답 코드별 {webhook.status_counts}")
+
+
+if __name__ == "__main__":
+    main()
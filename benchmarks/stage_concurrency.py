@@ -0,0 +1,109 @@
+"""단계 인터페이스의 일괄/비동기 메서드 처리량 벤치마크
+
+가짜 Gemini 백엔드(benchmarks.fakes)로 지연이 있는 AiProcessor를 만들어
+BaseProcessor.process_many(순차)와 aprocess_many(공유 스레드 풀 어댑터, 동시 실행 수별)의 처리 시간을 비교합니다.
+AiProcessor는 동기 process만 구현하므로 aprocess_many는 core.pipeline.run_in_thread 기본 구현을 거칩니다.
+
+결과는 benchmarks/results/stage_concurrency.json에 저장되며 --compare로 기준값과 비교할 수 있습니다.
+
+사용법:
+    python -m benchmarks.stage_concurrency                              # 기사 200건, 지연 50ms
+    python -m benchmarks.stage_concurrency --articles 500 --concurrency 1,8 --llm-error-rate 0.05 --compare
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Dict, List
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "stage_concurrency.json")
+
+
+def _articles(count: int) -> List:
+    from core.models import Article
+    return [Article(title=f"벤치마크 기사 {i}", link=f"https://example.com/{i}", summary="요약 " * 50)
+            for i in range(count)]
+
+
+def _measure(run) -> Dict:
+    start = time.perf_counter()
+    results = run()
+    seconds = time.perf_counter() - start
+    failed = sum(isinstance(result, BaseException) for result in results)
+    return {
+        'seconds': round(seconds, 3),
+        'items_per_second': round(len(results) / seconds, 1) if seconds > 0 else None,
+        'failed': failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="process_many와 aprocess_many(스레드 풀 어댑터)의 처리량을 비교합니다.")
+    parser.add_argument("--articles", type=int, default=200, help="기사 수 (기본값: 200)")
+    parser.add_argument("--concurrency", default="1,4,8", help="쉼표로 구분한 aprocess_many 동시 실행 수 (기본값: 1,4,8)")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="가짜 Gemini 호출 평균 지연 (기본값: 50)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="가짜 Gemini 호출 실패 확률 (기본값: 0)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.ERROR) # 주입한 오류의 로그는 출력하지 않음
+
+    from benchmarks.fakes import FakeBackendConfig, install_fake_backends
+    install_fake_backends(llm=FakeBackendConfig(latency_ms=args.llm_latency_ms, error_rate=args.llm_error_rate))
+    from core.processing.ai_processor import AiProcessor
+    from core.pipeline import STAGE_THREAD_WORKERS, shutdown_stage_executor
+
+    processor = AiProcessor(api_key='fake-key', model_name='fake-gemini')
+
+    def sequential() -> List:
+        results = []
+        for article in _articles(args.articles):
+            try:
+                results.append(processor.process(article))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    cases = {'process_sequential': _measure(sequential)}
+    for concurrency in (int(value) for value in args.concurrency.split(',')):
+        cases[f'aprocess_many_c{concurrency}'] = _measure(
+            lambda: asyncio.run(processor.aprocess_many(_articles(args.articles), concurrency=concurrency)))
+    shutdown_stage_executor()
+
+    scenario = str(args.articles)
+    scenarios = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            scenarios = json.load(f).get('scenarios', {})
+    baseline = scenarios.get(scenario, {})
+    single = cases['process_sequential']['items_per_second']
+    print(f"=== 기사 {args.articles}건 (지연 {args.llm_latency_ms:g}ms, 스레드 풀 {STAGE_THREAD_WORKERS}개) ===")
+    for case, result in cases.items():
+        result['speedup'] = round(result['items_per_second'] / single, 2) if single else None
+        previous = baseline.get(case, {}).get('items_per_second')
+        delta = f" (기준 {previous}/s)" if previous else ""
+        print(f"{case:<22} {result['seconds']:>8.3f}s {result['items_per_second'] or 0:>9.1f}/s "
+              f"x{result['speedup'] or 0:<5} 실패 {result['failed']}건{delta}")
+
+    if not args.compare:
+        scenarios[scenario] = {**baseline, **cases}
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+                'settings': {'llm_latency_ms': args.llm_latency_ms, 'llm_error_rate': args.llm_error_rate},
+                'scenarios': scenarios,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""엔트리 포인트 임포트(기동) 시간 벤치마크
+
+`python -X importtime`으로 각 엔트리 포인트 모듈을 새 프로세스에서 임포트하여
+전체 임포트 시간과 누적 시간이 큰 상위 모듈을 측정합니다.
+결과는 benchmarks/results/startup_importtime.json에 저장되어 저장소에서 추적되며,
+--compare 옵션으로 저장된 기준값과 비교할 수 있습니다.
+
+사용법:
+    python -m benchmarks.startup_importtime              # 측정 후 결과 파일 갱신
+    python -m benchmarks.startup_importtime --compare    # 기준값과 비교만 (파일 갱신 안 함)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "startup_importtime.json")
+DEFAULT_MODULES = ("main", "batch_image_processor", "retry_queue")
+# 기동 시점에 로드되지 않아야 하는 무거운 모듈 (지연 임포트 대상)
+LAZY_MODULES = ("google.generativeai", "google.genai", "PIL", "numpy", "scipy")
+
+
+def _import_once(module: str) -> Tuple[int, Dict[str, int]]:
+    """새 인터프리터에서 module을 임포트하고 (전체 누적 시간 us, 모듈별 누적 시간 us)를 반환합니다."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line.split(":", 1)[1].split("|", 2)
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative.get(module, 0), cumulative
+
+
+def measure(module: str, repeat: int, top: int) -> Dict:
+    """module 임포트를 repeat회 측정하여 중앙값과 상위 모듈 목록을 반환합니다."""
+    totals: List[int] = []
+    last: Dict[str, int] = {}
+    for _ in range(repeat):
+        total, last = _import_once(module)
+        totals.append(total)
+    top_modules = sorted(
+        ((name, us) for name, us in last.items() if name != module and "." not in name),
+        key=lambda item: item[1], reverse=True,
+    )[:top]
+    return {
+        'median_ms': round(statistics.median(totals) / 1000, 1),
+        'min_ms': round(min(totals) / 1000, 1),
+        'lazy_modules_loaded': [name for name in LAZY_MODULES if name in last],
+        'top_modules_ms': {name: round(us / 1000, 1) for name, us in top_modules},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리 포인트 기동(임포트) 시간을 측정합니다.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_MODULES), help="측정할 모듈 (기본값: 엔트리 포인트 전체)")
+    parser.add_argument("--repeat", type=int, default=5, help="모듈별 반복 측정 횟수 (기본값: 5)")
+    parser.add_argument("--top", type=int, default=8, help="출력할 상위 모듈 수 (기본값: 8)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            baseline = json.load(f).get('modules', {})
+
+    results = {}
+    for module in args.modules:
+        result = measure(module, args.repeat, args.top)
+        results[module] = result
+        previous = baseline.get(module, {}).get('median_ms')
+        delta = f" (기준 {previous} ms, {result['median_ms'] - previous:+.1f} ms)" if previous is not None else ""
+        print(f"{module}: 중앙값 {result['median_ms']} ms / 최소 {result['min_ms']} ms{delta}")
+        if result['lazy_modules_loaded']:
+            print(f"  경고: 지연 임포트 대상이 기동 시 로드됨: {', '.join(result['lazy_modules_loaded'])}")
+        for name, ms in result['top_modules_ms'].items():
+            print(f"  {name:<28} {ms:8.1f} ms")
+
+    if not args.compare:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'modules': results,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
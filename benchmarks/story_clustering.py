@@ -0,0 +1,178 @@
+"""기사 묶기(TF-IDF 클러스터링) 벤치마크
+
+정답 묶음을 아는 합성 기사(같은 소식을 제목/요약만 바꿔 여러 매체가 보도한 형태)로 다음을 측정합니다.
+- tfidf: 기사 N건의 문자 n-gram TF-IDF 행렬 생성 시간
+- assign_cold: 빈 DB에서 기사 N건을 묶는 시간 (새 기사끼리 묶기)
+- assign_incremental: N건이 저장된 뒤 새 기사 N/10건을 최근 묶음에 배정하는 시간
+- llm_calls: 묶음 수 (묶음당 AI 호출 1회), call_reduction: 기사별 호출 대비 줄어든 비율
+- purity: 서로 다른 소식이 섞이지 않은 묶음의 비율, stories_split: 둘 이상의 묶음으로 나뉜 소식의 비율
+
+주체(회사/기관), 대상, 행동 중 일부만 같은 다른 소식을 섞어 넣어, 비슷하지만 다른 소식을 잘못 묶지 않는지 확인합니다.
+결과는 benchmarks/results/story_clustering.json에 저장되며 --compare로 기준값과 비교할 수 있습니다.
+
+사용법:
+    python -m benchmarks.story_clustering                         # 기사 1000/5000건
+    python -m benchmarks.story_clustering --articles 2000 --threshold 0.6 --compare
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "results", "story_clustering.json")
+
+SUBJECTS = ("삼성전자", "현대차", "카카오", "네이버", "SK하이닉스", "LG에너지솔루션", "한국은행", "서울시", "국토부", "공정위",
+            "쿠팡", "배달의민족", "토스", "셀트리온", "포스코", "대한항공", "CJ제일제당", "아모레퍼시픽", "하이브", "KT",
+            "기아", "롯데쇼핑", "신세계", "한화오션", "두산에너빌리티", "크래프톤", "넷마블", "엔씨소프트", "우리은행", "KB금융",
+            "교육부", "환경부", "기상청", "질병관리청", "부산시", "경기도", "현대건설", "GS리테일", "이마트", "무신사")
+OBJECTS = ("전기차 배터리 공장", "개인정보 보호 정책", "대표이사 선임안", "해외 법인", "친환경 포장재", "구독 서비스 요금",
+           "노사 임금 협약", "인공지능 연구소", "중고 거래 플랫폼", "지역 상생 기금", "청년 창업 지원금", "반도체 설비",
+           "보안 관제 센터", "리콜 대상 차량", "우주 발사체", "희망퇴직 프로그램", "탄소 감축 목표", "물류 유통망",
+           "신규 항공 노선", "배당 정책")
+ACTIONS = ("{n}억 규모로 확대", "전면 재검토 착수", "{n}월부터 시행", "{n}% 축소 결정", "도입 {n}년 만에 폐지",
+           "{n}곳에 추가 설립", "협상 최종 타결", "외부 감사 결과 공개", "글로벌 기업과 공동 추진", "당국 승인 획득")
+HEADLINES = ("{s}, {e}", "[속보] {s} {e}", "{s} '{e}'…{w} 주목", "단독 {s} {e}", "{s}도 {e}…업계 {w} 촉각", "{e}한 {s}, {w} 전망은")
+FILLER = ("반도체", "수출", "금리", "인공지능", "스타트업", "소비자", "플랫폼", "투자", "규제", "시장", "실적", "전망", "업계", "정부")
+
+
+def make_corpus(articles: int, seed: int = 7) -> Tuple[List[Tuple[str, str]], List[int]]:
+    """(제목, 요약) 목록과 기사별 정답 소식 번호. 소식마다 1~8개 매체가 제목/요약을 바꿔 보도합니다.
+
+    소식마다 (주체, 대상, 행동) 조합이 다르며, 이 중 한두 가지가 같은 다른 소식이 많이 섞여 있습니다.
+    """
+    rng = random.Random(seed)
+    combinations = [(subject, target, action) for subject in SUBJECTS for target in OBJECTS for action in ACTIONS]
+    rng.shuffle(combinations)
+    docs, labels = [], []
+    story = 0
+    while len(docs) < articles:
+        subject, target, action = combinations[story]
+        event = f"{target} {action.format(n=rng.randint(2, 99))}"
+        for _ in range(min(rng.randint(1, 8), articles - len(docs))):
+            words = rng.sample(FILLER, 6)
+            title = rng.choice(HEADLINES).format(s=subject, e=event, w=words[0])
+            summary = f"{subject}가 {event}했다고 밝혔다. {' '.join(words[1:])} 관련 {rng.choice(('분석', '반응', '평가'))}이 이어졌다."
+            docs.append((title, summary))
+            labels.append(story)
+        story += 1
+    order = list(range(len(docs)))
+    rng.shuffle(order) # 여러 피드에서 섞여 들어오는 순서
+    return [docs[i] for i in order], [labels[i] for i in order]
+
+
+def quality(clusters: List[int], labels: List[int]) -> Dict:
+    """묶음 수, 호출 감소율, 묶음 순도, 여러 묶음으로 나뉜 소식 비율"""
+    labels_by_cluster: Dict[int, set] = {}
+    clusters_by_label: Dict[int, set] = {}
+    for cluster, label in zip(clusters, labels):
+        labels_by_cluster.setdefault(cluster, set()).add(label)
+        clusters_by_label.setdefault(label, set()).add(cluster)
+    return {
+        'llm_calls': len(labels_by_cluster),
+        'stories': len(clusters_by_label),
+        'call_reduction': round(1 - len(labels_by_cluster) / len(clusters), 3),
+        'purity': round(sum(len(found) == 1 for found in labels_by_cluster.values()) / len(labels_by_cluster), 3),
+        'stories_split': round(sum(len(found) > 1 for found in clusters_by_label.values()) / len(clusters_by_label), 3),
+    }
+
+
+def run_scenario(articles: int, threshold: float, repeat: int) -> Dict:
+    from core.models import Article
+    from core.processing.clustering import StoryClusterer, normalize_text, tfidf_matrix
+    from utils.database import save_article
+
+    docs, labels = make_corpus(articles + articles // 10)
+    cold_docs, cold_labels = docs[:articles], labels[:articles]
+    texts = [normalize_text(title, summary) for title, summary in cold_docs]
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tfidf_matrix(texts)
+        best = min(best, time.perf_counter() - start)
+    result = {'tfidf': {'seconds': round(best, 4)}}
+
+    clusterer = StoryClusterer(threshold=threshold)
+    batch = [Article(title=title, link=f"https://example.com/{i}", summary=summary)
+             for i, (title, summary) in enumerate(cold_docs)]
+    start = time.perf_counter()
+    clusterer.assign(batch)
+    result['assign_cold'] = {'seconds': round(time.perf_counter() - start, 4),
+                             **quality([article.cluster_id for article in batch], cold_labels)}
+    for article in batch:
+        save_article(article)
+
+    incremental = [Article(title=title, link=f"https://example.com/{articles + i}", summary=summary)
+                   for i, (title, summary) in enumerate(docs[articles:])]
+    start = time.perf_counter()
+    clusterer.assign(incremental)
+    result['assign_incremental'] = {
+        'seconds': round(time.perf_counter() - start, 4),
+        'articles': len(incremental),
+        'joined_existing': sum(article.cluster_id > 0 for article in incremental), # 새 묶음은 저장 전까지 임시 ID(음수)
+    }
+    # 전체(기존 + 새 기사) 기준 품질: 새 기사가 같은 소식의 기존 묶음에 들어갔는지 포함
+    result['overall'] = quality([article.cluster_id for article in batch + incremental], labels)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="기사 묶기(TF-IDF 클러스터링)의 처리 시간과 AI 호출 감소율을 측정합니다.")
+    parser.add_argument("--articles", default="1000,5000", help="쉼표로 구분한 기사 수 (기본값: 1000,5000)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="같은 묶음으로 볼 최소 코사인 유사도 (기본값: 0.7)")
+    parser.add_argument("--repeat", type=int, default=3, help="TF-IDF 반복 횟수, 최단 시간 기록 (기본값: 3)")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교만 하고 결과 파일은 갱신하지 않습니다.")
+    args = parser.parse_args()
+
+    import logging
+    logging.disable(logging.INFO)
+
+    scenarios = {}
+    if os.path.exists(RESULTS_FILE):
+        with open(RESULTS_FILE, encoding="utf-8") as f:
+            scenarios = json.load(f).get('scenarios', {})
+
+    from configs.settings import reload_config
+    for articles in (int(value) for value in args.articles.split(',')):
+        with tempfile.TemporaryDirectory(prefix='bench-cluster-') as workdir:
+            os.environ['DATABASE_FILE_NAME'] = os.path.join(workdir, 'bench.db')
+            reload_config()
+            from utils.database import initialize_db
+            initialize_db()
+            result = run_scenario(articles, args.threshold, args.repeat)
+        scenario = str(articles)
+        baseline = scenarios.get(scenario, {})
+        print(f"=== 기사 {articles:,}건 (threshold {args.threshold}) ===")
+        for case in ('tfidf', 'assign_cold', 'assign_incremental'):
+            previous = baseline.get(case, {}).get('seconds')
+            delta = f" (기준 {previous:.3f}s)" if previous else ""
+            print(f"{case:<20} {result[case]['seconds']:>8.3f}s{delta}")
+        cold, overall = result['assign_cold'], result['overall']
+        print(f"AI 호출 {cold['llm_calls']}건 / 기사 {articles}건 (소식 {cold['stories']}개, 감소 {cold['call_reduction']:.0%}), "
+              f"순도 {cold['purity']:.3f}, 나뉜 소식 {cold['stories_split']:.1%}")
+        print(f"증분 배정: 새 기사 {result['assign_incremental']['articles']}건 중 기존 묶음 "
+              f"{result['assign_incremental']['joined_existing']}건, 전체 순도 {overall['purity']:.3f}, "
+              f"나뉜 소식 {overall['stories_split']:.1%}")
+        scenarios[scenario] = {**baseline, **result}
+
+    if not args.compare:
+        os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+        with open(RESULTS_FILE, "w", encoding="utf-8") as f:
+            json.dump({
+                'measured_at': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'cpus': os.cpu_count(),
+                'settings': {'threshold': args.threshold, 'repeat': args.repeat},
+                'scenarios': scenarios,
+            }, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"결과 저장: {os.path.relpath(RESULTS_FILE, PROJECT_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import logging
+import argparse
+
+from configs.settings import get_config
+from core.delivery.static_site_sender import StaticSiteSender
+from utils.database import initialize_db
+from utils.logger import setup_logging
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB에 저장된 처리 완료 기사로 정적 다이제스트 사이트를 증분 빌드합니다.")
+    parser.add_argument("--output-dir", help="사이트 출력 디렉토리 (기본값: SITE_OUTPUT_DIR 또는 site)")
+    parser.add_argument("--days", type=int, help="최근 며칠간의 기사로 사이트를 만들지 (0이면 전체, 기본값: SITE_DAYS 또는 30)")
+    parser.add_argument("--full", action="store_true", help="manifest를 무시하고 모든 페이지를 다시 씁니다.")
+    args = parser.parse_args()
+
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+    initialize_db()
+
+    site_config = dict(config_data.get('delivery', {}).get('site') or {'output_dir': 'site'})
+    if args.output_dir:
+        site_config['output_dir'] = args.output_dir
+    if args.days is not None:
+        site_config['days'] = args.days
+    try:
+        StaticSiteSender(**site_config).build(full=args.full)
+    except Exception as e:
+        logging.critical(f"정적 사이트 빌드 중 심각한 오류 발생: {e}", exc_info=True)
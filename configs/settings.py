@@ -1,7 +1,14 @@
 import logging
 import os
+import threading
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional
+
 from dotenv import load_dotenv
-from typing import Dict, Any, List
+
+_config_lock = threading.Lock()
+_config_snapshot: Optional[Mapping[str, Any]] = None
+_config_env_path: str = '.env'
 
 def load_config(env_path: str = '.env') -> Dict[str, Any]:
     """환경 변수 파일(.env)을 로드하여 설정을 구성합니다.
@@ -24,10 +31,8 @@ def load_config(env_path: str = '.env') -> Dict[str, Any]:
         loaded = load_dotenv(dotenv_path=env_path, override=True, verbose=True)
         if loaded:
             logging.info(f".env file loaded successfully from {env_path}")
-            print(f"DEBUG: .env file loaded successfully from {env_path}") # 디버깅 출력
         else:
             logging.warning(f".env file not found or empty at {env_path}")
-            print(f"DEBUG: .env file not found or empty at {env_path}") # 디버깅 출력
     except Exception as e:
         logging.warning(f".env 파일 ({env_path}) 로드 중 오류 발생: {e}")
 
@@ -46,12 +51,32 @@ def load_config(env_path: str = '.env') -> Dict[str, Any]:
     else:
         logging.warning("환경 변수에 RSS 피드 URL(RSS_FEED_n)이 설정되지 않았습니다.")
 
+    # RSS 피드 요청/파싱 설정 (RssScraper)
+    config['rss'] = {}
+    config['rss']['fetch_workers'] = int(os.getenv('RSS_FETCH_WORKERS', '4')) # 동시에 받아올 피드 수
+    config['rss']['parse_workers'] = int(os.getenv('RSS_PARSE_WORKERS', '2')) # 큰 피드를 파싱할 프로세스 수 (0이면 사용 안 함)
+    config['rss']['parse_process_min_bytes'] = int(os.getenv('RSS_PARSE_PROCESS_MIN_BYTES', '1000000')) # 프로세스 풀에서 파싱할 최소 본문 크기
+    config['rss']['fast_path'] = os.getenv('RSS_FAST_PATH', 'true').lower() not in ('0', 'false', 'no') # iterparse 빠른 경로 사용 여부
+    config['rss']['timeout'] = float(os.getenv('RSS_TIMEOUT_SECONDS', '30'))
+
+    # 파이프라인 단계 구현 선택 (core.pipeline 레지스트리의 등록 이름, 전송 채널은 DELIVERY_CHANNELS)
+    config['pipeline'] = {}
+    config['pipeline']['scraper'] = os.getenv('PIPELINE_SCRAPER', 'rss')
+    config['pipeline']['processor'] = os.getenv('PIPELINE_PROCESSOR', 'gemini')
+    config['pipeline']['formatter'] = os.getenv('PIPELINE_FORMATTER', 'template')
+
     # AI 설정
     config['ai'] = {}
-    loaded_api_key = os.getenv('GEMINI_API_KEY')
-    print(f"DEBUG: Value read for GEMINI_API_KEY: {loaded_api_key}") # API 키 값 디버깅 출력
-    config['ai']['api_key'] = loaded_api_key
+    config['ai']['api_key'] = os.getenv('GEMINI_API_KEY')
     config['ai']['model_name'] = os.getenv('GEMINI_MODEL_NAME', "gemini-1.5-flash-preview-04-17")
+    # 프롬프트 템플릿(core.processing.prompts)의 정적 지시문 전송 방식: inline | system | cached (실패 시 다음 방식으로 물러남)
+    config['ai']['prompt_mode'] = os.getenv('GEMINI_PROMPT_MODE', 'system').lower()
+    config['ai']['prompt_cache_ttl_minutes'] = float(os.getenv('GEMINI_PROMPT_CACHE_TTL_MINUTES', '60')) # cached 방식의 캐시 유지 시간
+    config['ai']['prompt_versions'] = {} # 템플릿 이름별 고정 버전 (예: dopamine_points=1,image_keywords=1, 없으면 최신)
+    for pair in os.getenv('PROMPT_VERSIONS', '').split(','):
+        name, _, version = pair.partition('=')
+        if name.strip() and version.strip():
+            config['ai']['prompt_versions'][name.strip()] = int(version)
 
     if config['ai']['api_key']:
         logging.info("환경 변수에서 Gemini API 키를 로드했습니다.")
@@ -59,21 +84,153 @@ def load_config(env_path: str = '.env') -> Dict[str, Any]:
         logging.warning("환경 변수에 Gemini API 키(GEMINI_API_KEY)가 설정되지 않았습니다.")
     logging.info(f"AI 모델: {config['ai']['model_name']}")
 
-    # Slack 설정
+    # 전송 채널 설정 (core.delivery.dispatcher)
+    config['delivery'] = {}
     slack_webhook_url = os.getenv('SLACK_WEBHOOK_URL')
     if slack_webhook_url:
-        config['delivery'] = {'slack': {'webhook_url': slack_webhook_url}}
+        config['delivery']['slack'] = {
+            'webhook_url': slack_webhook_url,
+            'preserve_order': os.getenv('SLACK_PRESERVE_ORDER', 'true').lower() not in ('0', 'false', 'no'), # false면 조각을 동시에 전송
+            'max_workers': int(os.getenv('SLACK_MAX_WORKERS', '4')),
+            'min_interval': float(os.getenv('SLACK_MIN_INTERVAL_SECONDS', '1.0')), # 웹훅당 요청 간 최소 간격
+        }
         logging.info("환경 변수에서 Slack Webhook URL을 로드했습니다.")
+    site_output_dir = os.getenv('SITE_OUTPUT_DIR')
+    if site_output_dir:
+        config['delivery']['site'] = {
+            'output_dir': site_output_dir,
+            'site_title': os.getenv('SITE_TITLE', '도파민 포인트 다이제스트'),
+            'days': int(os.getenv('SITE_DAYS', '30')), # 최근 며칠간의 기사로 사이트 생성 (0이면 전체)
+        }
+    default_channels = ','.join(['console'] + (['slack'] if slack_webhook_url else []) + (['site'] if site_output_dir else []))
+    config['delivery']['channels'] = [name.strip() for name in os.getenv('DELIVERY_CHANNELS', default_channels).split(',') if name.strip()]
+    # 채널별 전송 정책: DELIVERY_<채널>_TIMEOUT_SECONDS 처럼 채널 이름을 붙이면 공통 값보다 우선 적용
+    config['delivery']['policies'] = {}
+    for name in config['delivery']['channels']:
+        prefix = f"DELIVERY_{name.upper()}_"
+        config['delivery']['policies'][name] = {
+            'timeout': float(os.getenv(prefix + 'TIMEOUT_SECONDS', os.getenv('DELIVERY_TIMEOUT_SECONDS', '300'))), # 전송 1회 제한 시간
+            'max_attempts': int(os.getenv(prefix + 'MAX_ATTEMPTS', os.getenv('DELIVERY_MAX_ATTEMPTS', '3'))), # 이 횟수만큼 실패하면 failed
+            'retry_delay': float(os.getenv(prefix + 'RETRY_DELAY_SECONDS', os.getenv('DELIVERY_RETRY_DELAY_SECONDS', '5'))), # 실패할 때마다 2배
+        }
+    config['delivery']['format'] = os.getenv('DELIVERY_FORMAT', 'text') # 출력 템플릿: text, markdown, slack_blocks, html
+    # 채널별 출력 형식: DELIVERY_<채널>_FORMAT이 있으면 DELIVERY_FORMAT보다 우선 (예: DELIVERY_SLACK_FORMAT=slack_blocks)
+    config['delivery']['formats'] = {
+        name: os.getenv(f"DELIVERY_{name.upper()}_FORMAT", config['delivery']['format'])
+        for name in config['delivery']['channels']
+    }
+    config['delivery']['lookback_hours'] = float(os.getenv('DELIVERY_LOOKBACK_HOURS', '48')) # 이 시간 안에 수집된 기사 중 채널별 미전송분만 전송
+    config['delivery']['deadline_seconds'] = float(os.getenv('DELIVERY_DEADLINE_SECONDS', '600')) # 한 번의 전송 전체 제한 시간 (남은 항목은 다음 실행으로)
+    logging.info(f"전송 채널: {', '.join(config['delivery']['channels']) or '(없음)'}")
 
     # 데이터베이스 파일명 설정 (필요하다면)
     config['database'] = {}
     config['database']['file_name'] = os.getenv('DATABASE_FILE_NAME', 'automkt.db') # 기본값 설정
     logging.info(f"데이터베이스 파일명: {config['database']['file_name']}")
 
+    # 실패한 AI 처리/이미지 생성 재시도 정책
+    config['retry'] = {}
+    config['retry']['max_attempts'] = int(os.getenv('RETRY_MAX_ATTEMPTS', '5')) # 이 횟수만큼 실패하면 dead letter로 이동
+    config['retry']['base_delay_seconds'] = int(os.getenv('RETRY_BASE_DELAY_SECONDS', '300')) # 실패할 때마다 2배씩 증가
+    config['retry']['max_delay_seconds'] = int(os.getenv('RETRY_MAX_DELAY_SECONDS', '21600'))
+
+    # 로깅 설정 (utils.logger.setup_logging 인자)
+    config['logging'] = {}
+    config['logging']['level'] = os.getenv('LOG_LEVEL', 'INFO')
+    config['logging']['json_format'] = os.getenv('LOG_FORMAT', 'text').lower() == 'json'
+    config['logging']['item_sample_rate'] = float(os.getenv('LOG_ITEM_SAMPLE_RATE', '0.1')) # 기사 단위 디버그 로그 샘플링 비율
+    config['logging']['item_max_per_second'] = float(os.getenv('LOG_ITEM_MAX_PER_SECOND', '20')) # 로거별 초당 최대 건수
+
+    # 단계별 실행 시간 트레이싱 (traces 테이블 기록)
+    config['tracing'] = {'enabled': os.getenv('TRACING_ENABLED', 'true').lower() not in ('0', 'false', 'no')}
+
+    # API 호출/토큰/할당량 메트릭 내보내기 (utils.metrics)
+    config['metrics'] = {}
+    config['metrics']['textfile'] = os.getenv('METRICS_TEXTFILE') # 예: /var/lib/node_exporter/textfile/workfit.prom
+    config['metrics']['port'] = int(os.getenv('METRICS_PORT', '0')) # 0이면 /metrics 엔드포인트를 띄우지 않음
+    config['metrics']['gemini_daily_quota'] = int(os.getenv('GEMINI_DAILY_QUOTA', '0')) # 일일 호출 할당량 (0이면 비율 게이지 생략)
+    config['metrics']['imagen_daily_quota'] = int(os.getenv('IMAGEN_DAILY_QUOTA', '0'))
+
+    # 기사 원문 본문 가져오기 (core.data_acquisition.article_fetcher)
+    config['fulltext'] = {}
+    config['fulltext']['enabled'] = os.getenv('FULLTEXT_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+    config['fulltext']['max_workers'] = int(os.getenv('FULLTEXT_MAX_WORKERS', '8')) # 전체 동시 요청 수
+    config['fulltext']['per_host'] = int(os.getenv('FULLTEXT_PER_HOST', '2')) # 같은 사이트로 보내는 최대 동시 요청 수
+    config['fulltext']['timeout'] = float(os.getenv('FULLTEXT_TIMEOUT_SECONDS', '10')) # 요청 하나의 타임아웃
+    config['fulltext']['deadline'] = float(os.getenv('FULLTEXT_DEADLINE_SECONDS', '60')) # 실행당 원문을 기다리는 최대 시간 (넘으면 요약 사용)
+    config['fulltext']['refresh_hours'] = float(os.getenv('FULLTEXT_REFRESH_HOURS', '24')) # 저장된 본문을 조건부 요청으로 다시 확인하는 주기 (0이면 안 함)
+
+    # 유료 호출 전 기사 우선순위 점수 (core.processing.prioritizer.ArticleScorer)
+    config['priority'] = {}
+    config['priority']['topics'] = [topic.strip() for topic in os.getenv('PRIORITY_TOPICS', '').split(',') if topic.strip()] # 브랜드 주제 키워드
+    config['priority']['source_weights'] = {} # 피드 URL 또는 도메인별 가중치 (예: news.example.com=1.5,blog.example.org=0.5)
+    for pair in os.getenv('PRIORITY_SOURCE_WEIGHTS', '').split(','):
+        key, _, weight = pair.partition('=')
+        if key.strip() and weight.strip():
+            config['priority']['source_weights'][key.strip()] = float(weight)
+    config['priority']['half_life_hours'] = float(os.getenv('PRIORITY_HALF_LIFE_HOURS', '12')) # 최신성 점수가 절반이 되는 시간
+
+    # 호출 예산과 실행 마감 (core.processing.prioritizer.BudgetScheduler, 0이면 제한 없음)
+    config['budget'] = {}
+    config['budget']['gemini_run_calls'] = int(os.getenv('GEMINI_RUN_BUDGET', '0')) # 실행당 최대 AI 처리 호출 수
+    config['budget']['gemini_daily_calls'] = int(os.getenv('GEMINI_DAILY_BUDGET', '0')) # 하루 최대 AI 처리 호출 수 (api_budget 장부 기준)
+    config['budget']['imagen_run_calls'] = int(os.getenv('IMAGEN_RUN_BUDGET', '0'))
+    config['budget']['imagen_daily_calls'] = int(os.getenv('IMAGEN_DAILY_BUDGET', '0'))
+    config['budget']['deadline_seconds'] = float(os.getenv('RUN_DEADLINE_SECONDS', '0')) # 실행 시작부터 유료 호출을 시작할 수 있는 시간
+
+    # 같은 소식을 다룬 기사 묶기 (core.processing.clustering.StoryClusterer, 묶음당 AI 처리 1회)
+    config['clustering'] = {}
+    config['clustering']['enabled'] = os.getenv('CLUSTERING_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+    config['clustering']['threshold'] = float(os.getenv('CLUSTER_SIMILARITY', '0.7')) # 같은 묶음으로 볼 최소 코사인 유사도
+    config['clustering']['window_hours'] = float(os.getenv('CLUSTER_WINDOW_HOURS', '24')) # 새 기사와 비교할 기존 묶음의 범위
+
+    # 기사/이미지 읽기 전용 HTTP API (serve_api.py, utils.api_server)
+    config['api'] = {}
+    config['api']['host'] = os.getenv('API_HOST', '127.0.0.1')
+    config['api']['port'] = int(os.getenv('API_PORT', '8081'))
+    config['api']['cache_size'] = int(os.getenv('API_CACHE_SIZE', '256')) # 조회 결과 LRU 캐시 크기 (0이면 캐시하지 않음)
+
     # 필요한 다른 설정들도 유사하게 환경 변수에서 읽거나 기본값 설정
 
     return config
 
-# 예시: 기본 설정 로드
-# loaded_config = load_config()
-# print(loaded_config) 
\ No newline at end of file
+def _freeze(value: Any) -> Any:
+    """dict는 읽기 전용 MappingProxyType으로, list는 tuple로 재귀 변환합니다."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def get_config(env_path: Optional[str] = None) -> Mapping[str, Any]:
+    """프로세스 전체에서 공유하는 읽기 전용 설정 스냅샷을 반환합니다.
+
+    최초 호출 시에만 .env를 읽어 load_config 결과를 고정(immutable)하고,
+    이후 호출은 캐시된 스냅샷을 그대로 반환합니다. 다시 읽으려면 reload_config를 사용합니다.
+
+    Args:
+        env_path (Optional[str]): .env 파일 경로. 이미 로드된 경로와 다르면 해당 경로로 다시 로드합니다.
+
+    Returns:
+        Mapping[str, Any]: 읽기 전용 설정 (하위 dict는 Mapping, list는 tuple)
+    """
+    snapshot = _config_snapshot
+    if snapshot is not None and (env_path is None or env_path == _config_env_path):
+        return snapshot
+    return reload_config(env_path)
+
+def reload_config(env_path: Optional[str] = None) -> Mapping[str, Any]:
+    """.env와 환경 변수를 다시 읽어 설정 스냅샷을 교체합니다.
+
+    Args:
+        env_path (Optional[str]): .env 파일 경로. 생략하면 마지막으로 사용한 경로를 사용합니다.
+
+    Returns:
+        Mapping[str, Any]: 새로 로드된 읽기 전용 설정
+    """
+    global _config_snapshot, _config_env_path
+    with _config_lock:
+        if env_path is not None:
+            _config_env_path = env_path
+        _config_snapshot = _freeze(load_config(_config_env_path))
+        return _config_snapshot 
\ No newline at end of file
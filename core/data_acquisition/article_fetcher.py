@@ -0,0 +1,260 @@
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlsplit
+
+from core.models import Article, ArticleContent
+from utils.database import get_article_contents, save_article_content, touch_article_content
+from utils.logger import get_item_logger
+from utils.tracing import span
+
+item_log = get_item_logger(__name__) # 기사별 원문 요청 디버그 로그 (샘플링 대상)
+# requests/bs4는 임포트 비용이 커서 실제로 원문을 가져오는 시점에 지연 임포트합니다.
+
+# 본문이 아닌 영역 (제거 후 본문 후보를 찾음)
+NON_CONTENT_TAGS = ('script', 'style', 'noscript', 'iframe', 'nav', 'header', 'footer', 'aside', 'form', 'button', 'svg', 'figure')
+# 국내외 뉴스 사이트에서 흔한 본문 컨테이너 (앞에 있을수록 우선)
+MAIN_CONTENT_SELECTORS = (
+    '[itemprop="articleBody"]', '#articleBody', '#article-view-content-div', '#newsct_article', '#dic_area',
+    '#articeBody', '.article_body', '.article-body', '.news_body', '#news_body_area', 'article',
+)
+MIN_BODY_CHARS = 200 # 이보다 짧으면 본문 추출 실패로 보고 요약만 사용
+MIN_TEXT_NODE_CHARS = 25 # 본문 밀도 계산에 포함할 텍스트 조각의 최소 길이 (메뉴/버튼 문구 제외)
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+
+def extract_main_text(html: bytes, encoding: Optional[str] = None, max_chars: int = 20_000) -> str:
+    """HTML에서 기사 본문 텍스트를 추출합니다.
+
+    알려진 본문 컨테이너(MAIN_CONTENT_SELECTORS)를 먼저 찾고, 없거나 너무 짧으면
+    링크가 아닌 긴 텍스트 조각이 가장 많이 모인 요소를 본문으로 고릅니다.
+
+    Args:
+        html (bytes): 응답 본문 (인코딩은 Content-Type의 charset 또는 문서의 meta charset으로 판별)
+        encoding (Optional[str]): Content-Type 헤더에 명시된 charset
+        max_chars (int): 반환할 최대 글자 수
+
+    Returns:
+        str: 문단을 줄바꿈으로 구분한 본문. 찾지 못하면 빈 문자열
+    """
+    from bs4 import BeautifulSoup # 첫 사용 시점에 지연 임포트
+
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+
+    text = ''
+    for selector in MAIN_CONTENT_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None:
+            text = _node_text(node)
+            if len(text) >= MIN_BODY_CHARS:
+                break
+    if len(text) < MIN_BODY_CHARS:
+        node = _densest_node(soup)
+        text = _node_text(node) if node is not None else ''
+    return text[:max_chars] if len(text) >= MIN_BODY_CHARS else ''
+
+
+def _node_text(node) -> str:
+    lines = (line.strip() for line in node.get_text('\n').splitlines())
+    return _BLANK_LINES.sub('\n', '\n'.join(line for line in lines if line))
+
+
+def _densest_node(soup):
+    """링크 밖의 긴 텍스트 조각 길이를 부모 블록별로 합산해 가장 큰 요소를 반환합니다.
+
+    <p>/<span> 등 문단 단위 태그 안의 텍스트는 그 문단을 담은 블록에 합산하므로,
+    <p>로 나뉜 본문과 <br>로만 나뉜 본문(국내 사이트에 흔함)을 모두 하나의 컨테이너로 찾습니다.
+    """
+    scores: Dict[int, list] = {}
+    for string in soup.find_all(string=True):
+        length = len(string.strip())
+        if length < MIN_TEXT_NODE_CHARS or string.find_parent('a') is not None:
+            continue
+        parent = string.parent
+        while parent is not None and parent.name in ('p', 'span', 'b', 'strong', 'em', 'i', 'font', 'u'):
+            parent = parent.parent
+        if parent is None:
+            continue
+        entry = scores.setdefault(id(parent), [0, parent])
+        entry[0] += length
+    if not scores:
+        return None
+    return max(scores.values(), key=lambda entry: entry[0])[1]
+
+
+class ArticleFetcher:
+    """기사 link를 따라가 원문 본문을 추출하고 article_contents에 압축 저장하는 클래스
+
+    - 이미 저장된 본문은 네트워크 요청 없이 재사용하며, refresh_hours가 지난 본문만
+      If-None-Match/If-Modified-Since 조건부 요청으로 다시 확인합니다 (304면 저장된 본문 사용).
+    - requests.Session 연결 풀을 재사용하고, 전체 동시 요청은 max_workers, 호스트당 동시 요청은 per_host로 제한합니다.
+    - fetch()는 기사를 입력 순서대로 돌려주되, deadline(초)이 지나면 남은 기사는 기다리지 않고
+      요약만으로 다음 단계에 넘깁니다. 이미 시작된 요청은 백그라운드에서 끝까지 진행되어 다음 실행에서 재사용됩니다.
+
+    Args:
+        max_workers (int): 동시 요청 스레드 수 (연결 풀 크기)
+        per_host (int): 같은 호스트로 보내는 최대 동시 요청 수
+        timeout (float): 요청 하나의 연결/읽기 타임아웃 (초)
+        deadline (float): fetch() 호출 하나가 원문을 기다리는 최대 시간 (초)
+        refresh_hours (float): 저장된 본문을 조건부 요청으로 다시 확인하기까지의 시간 (0이면 다시 확인하지 않음)
+        max_bytes (int): 읽을 최대 응답 크기 (넘는 부분은 버림)
+        user_agent (str): 요청 User-Agent 헤더
+    """
+
+    def __init__(self, max_workers: int = 8, per_host: int = 2, timeout: float = 10.0, deadline: float = 60.0,
+                 refresh_hours: float = 24.0, max_bytes: int = 2_000_000,
+                 user_agent: str = "Mozilla/5.0 (compatible; workfit-agent/1.0)"):
+        import requests # 첫 사용 시점에 지연 임포트
+        from requests.adapters import HTTPAdapter
+
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+        self.timeout = timeout
+        self.deadline = deadline
+        self.refresh_hours = refresh_hours
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.per_host) # 호스트별 연결 풀
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='article-fetcher')
+        self._host_queues: Dict[str, deque] = {} # 호스트 -> 아직 풀에 넘기지 않은 (link, 저장된 본문, Future)
+        self._host_active: Dict[str, int] = {}   # 호스트 -> 진행 중인 요청 수
+        self._host_lock = threading.Lock()
+        self._closed = False
+        self.stats = {'cached': 0, 'fetched': 0, 'not_modified': 0, 'failed': 0, 'timed_out': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, articles: Iterable[Article]) -> Iterator[Article]:
+        """기사마다 원문 본문을 채워(article.content) 입력 순서대로 돌려줍니다.
+
+        저장된 본문을 한 번에 조회한 뒤, 새로 가져오거나 다시 확인해야 하는 기사만 스레드 풀에 요청합니다.
+        앞쪽 기사를 다음 단계가 처리하는 동안 뒤쪽 기사의 요청이 동시에 진행됩니다.
+        본문을 가져오지 못한 기사는 content가 비어 있는 채로 전달됩니다 (요약만 사용).
+        """
+        articles = list(articles)
+        stored = get_article_contents([article.link for article in articles])
+        refresh_before = (datetime.now() - timedelta(hours=self.refresh_hours)).isoformat(sep=' ', timespec='seconds') \
+            if self.refresh_hours > 0 else None
+        futures: Dict[str, Future] = {}
+        for article in articles:
+            content = stored.get(article.link)
+            if content is not None and (refresh_before is None or (content.fetched_at or '') >= refresh_before):
+                article.content = content.text
+                self._count('cached')
+            elif article.link.startswith(('http://', 'https://')) and article.link not in futures:
+                futures[article.link] = self._enqueue(article.link, content)
+
+        deadline_at = time.monotonic() + self.deadline
+        for article in articles:
+            future = futures.get(article.link)
+            if future is not None:
+                try:
+                    article.content = future.result(timeout=max(0.0, deadline_at - time.monotonic())) or ''
+                except FutureTimeoutError:
+                    self._count('timed_out')
+                    item_log.debug("원문 대기 시간 초과, 요약만 사용: %s", article.link)
+            yield article
+
+        pending = sum(1 for future in futures.values() if not future.done())
+        logging.info(f"원문 본문: 재사용 {self.stats['cached']}건, 새로 가져옴 {self.stats['fetched']}건, "
+                     f"변경 없음(304) {self.stats['not_modified']}건, 실패 {self.stats['failed']}건, "
+                     f"대기 시간 초과 {self.stats['timed_out']}건" + (f" (백그라운드 진행 중 {pending}건)" if pending else ""))
+
+    def _enqueue(self, link: str, stored: Optional[ArticleContent]) -> Future:
+        """link를 호스트별 대기열 끝에 넣고, 결과를 받을 Future를 반환합니다."""
+        future: Future = Future()
+        host = urlsplit(link).netloc.lower()
+        with self._host_lock:
+            self._host_queues.setdefault(host, deque()).append((link, stored, future))
+        self._dispatch(host)
+        return future
+
+    def _dispatch(self, host: str):
+        """호스트의 진행 중 요청이 per_host보다 적으면 대기열 앞의 요청을 스레드 풀에 넘깁니다.
+
+        풀 스레드가 호스트 제한을 기다리며 막혀 있지 않으므로 다른 호스트 요청이 밀리지 않고,
+        같은 호스트 안에서는 입력 순서대로 요청되어 fetch()가 앞쪽 기사를 오래 기다리지 않습니다.
+        """
+        with self._host_lock:
+            queue = self._host_queues.get(host)
+            while queue and self._host_active.get(host, 0) < self.per_host and not self._closed:
+                link, stored, future = queue.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._host_active[host] = self._host_active.get(host, 0) + 1
+                self._executor.submit(self._run, host, link, stored, future)
+
+    def _run(self, host: str, link: str, stored: Optional[ArticleContent], future: Future):
+        try:
+            future.set_result(self._fetch_one(link, stored))
+        finally:
+            with self._host_lock:
+                self._host_active[host] -= 1
+            self._dispatch(host)
+
+    def _fetch_one(self, link: str, stored: Optional[ArticleContent]) -> Optional[str]:
+        """원문 하나를 가져와 본문을 추출/저장하고 반환합니다. 실패하면 저장된 본문(있으면) 또는 None."""
+        with span('fetch.article', article_link=link):
+            try:
+                return self._request(link, stored)
+            except Exception as e:
+                self._count('failed')
+                logging.warning(f"원문 가져오기 실패 ({link}): {type(e).__name__}: {e}")
+                return stored.text if stored else None
+
+    def _request(self, link: str, stored: Optional[ArticleContent]) -> Optional[str]:
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers['If-None-Match'] = stored.etag
+            if stored.last_modified:
+                headers['If-Modified-Since'] = stored.last_modified
+        with self.session.get(link, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and stored is not None:
+                self._count('not_modified')
+                touch_article_content(link)
+                return stored.text
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type', '')
+            if 'html' not in content_type:
+                raise ValueError(f"HTML이 아닌 응답입니다 ({content_type or 'Content-Type 없음'})")
+            body = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                body += chunk
+                if len(body) >= self.max_bytes:
+                    break
+            # charset이 명시되지 않으면 requests 기본값(ISO-8859-1) 대신 문서의 meta charset으로 판별
+            encoding = response.encoding if 'charset' in content_type.lower() else None
+            etag, last_modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+        text = extract_main_text(bytes(body), encoding)
+        if not text:
+            raise ValueError("본문을 찾지 못했습니다.")
+        save_article_content(link, text, etag, last_modified)
+        self._count('fetched')
+        item_log.debug("원문 본문 %d자 저장: %s", len(text), link)
+        return text
+
+    def close(self):
+        """아직 시작하지 않은 요청은 취소하고, 진행 중인 요청(각각 timeout 이내)이 끝나면 세션을 닫습니다."""
+        with self._host_lock:
+            self._closed = True
+            for queue in self._host_queues.values():
+                for _, _, future in queue:
+                    future.cancel()
+                queue.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
@@ -1,7 +1,24 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Tuple
+
+from core.pipeline import run_in_thread
 
 class BaseScraper(ABC):
+    """수집 단계의 기본 클래스. scrape만 구현하면 나머지 메서드는 기본 구현(순차 실행/스레드 풀)을 사용합니다."""
+
     @abstractmethod
     def scrape(self, source: str):
         """지정된 소스에서 데이터를 스크랩합니다."""
-        pass 
\ No newline at end of file
+        pass
+
+    def scrape_many(self, sources: Iterable[str]) -> Iterator[Tuple[str, list]]:
+        """여러 소스를 스크랩해 (소스, 결과)를 sources 순서대로 돌려줍니다. 기본 구현은 하나씩 순서대로 실행합니다."""
+        for source in sources:
+            yield source, self.scrape(source)
+
+    async def ascrape(self, source: str):
+        """scrape의 비동기 버전. 기본 구현은 scrape를 공유 스레드 풀에서 실행합니다."""
+        return await run_in_thread(self.scrape, source)
+
+    def close(self):
+        """사용한 연결/프로세스 풀 등을 정리합니다 (기본 구현은 아무것도 하지 않음)."""
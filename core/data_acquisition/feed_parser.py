@@ -0,0 +1,226 @@
+"""RSS/Atom 피드 본문(바이트)을 기사 항목으로 파싱하는 함수
+
+RssScraper가 네트워크에서 받은 피드 본문을 넘기면 (제목, 링크, 요약, 발행일) 튜플 목록을 돌려줍니다.
+큰 피드는 프로세스 풀에서 실행되므로 이 모듈은 임포트 시 부수 효과(로깅 설정, SSL 설정 등)가 없어야 합니다.
+
+- iter_entries: 잘 구성된(well-formed) RSS 2.0/Atom 1.0을 xml.etree.ElementTree.iterparse로 스트리밍 파싱해
+  항목을 하나씩 돌려주는 빠른 경로. feedparser와 같은 규칙(링크 결정, 요약 선택, HTML 정리)을 따릅니다.
+- parse_feed: 빠른 경로를 먼저 시도하고, XML 오류(bozo)나 지원하지 않는 형식이면 feedparser로 다시 파싱합니다.
+  빠른 경로가 쓰는 feedparser 내부 함수는 설치된 버전에 따라 없을 수 있어(ImportError) 그때도 feedparser로 파싱합니다.
+"""
+import io
+import logging
+import re
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Optional, Tuple
+
+# (title, link, summary, published)
+FeedEntry = Tuple[str, str, str, str]
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+XML_BASE = '{http://www.w3.org/XML/1998/namespace}base'
+# expat이 직접 처리하는 인코딩 (그 외 인코딩/HTTP charset은 feedparser로 처리)
+FAST_PATH_ENCODINGS = ('utf-8', 'utf8', 'us-ascii', 'ascii')
+_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]*encoding\s*=\s*["\']([\w.:-]+)', re.I)
+
+
+class FastPathUnsupported(Exception):
+    """빠른 경로로 처리할 수 없는 피드 (feedparser로 다시 파싱)"""
+
+
+def parse_feed(body: bytes, url: str, content_type: str = '', fast_path: bool = True) -> List[FeedEntry]:
+    """피드 본문을 (title, link, summary, published) 목록으로 파싱합니다.
+
+    Args:
+        body (bytes): 피드 응답 본문
+        url (str): 피드 URL (상대 링크 해석 기준)
+        content_type (str): 응답 Content-Type 헤더 (charset 판별)
+        fast_path (bool): iterparse 빠른 경로를 먼저 시도할지 여부
+
+    Returns:
+        List[FeedEntry]: 링크가 있는 항목만, 피드에 나온 순서대로
+    """
+    if fast_path:
+        try:
+            return list(iter_entries(body, url, content_type))
+        except (ET.ParseError, FastPathUnsupported) as e:
+            logging.debug(f"빠른 경로로 파싱할 수 없어 feedparser로 파싱합니다 ({url}): {e}")
+        except ImportError as e:
+            # 빠른 경로는 feedparser 내부 함수를 빌려 쓰므로, 버전이 바뀌어 사라졌으면 feedparser 파싱으로 대신함
+            logging.warning(f"빠른 경로에 필요한 feedparser 내부 함수를 찾을 수 없어 feedparser로 파싱합니다 ({url}): {e}")
+    return _parse_with_feedparser(body, url, content_type)
+
+
+def _parse_with_feedparser(body: bytes, url: str, content_type: str) -> List[FeedEntry]:
+    import feedparser # 빠른 경로만 쓰는 경우 임포트하지 않음
+
+    feed = feedparser.parse(body, response_headers={'content-type': content_type, 'content-location': url})
+    if feed.bozo:
+        # bozo가 1이면 파싱 중 문제가 있었음을 의미 (예: 잘못된 형식). entries가 있을 수 있으므로 계속 진행
+        logging.warning(f"RSS 피드 파싱 중 잠재적 문제 발생 (bozo=1): {url}. 이유: {feed.bozo_exception}")
+    return [
+        (entry.get('title', '제목 없음'), entry.get('link', ''), entry.get('summary', ''), entry.get('published', ''))
+        for entry in feed.entries
+    ]
+
+
+def iter_entries(body: bytes, url: str, content_type: str = '') -> Iterator[FeedEntry]:
+    """RSS 2.0/Atom 1.0 피드 항목을 문서를 끝까지 읽기 전에 하나씩 돌려줍니다.
+
+    항목 요소는 처리한 뒤 비우므로 피드 크기와 관계없이 메모리 사용량이 항목 하나 수준입니다.
+
+    Raises:
+        ET.ParseError: XML이 잘못된 경우 (feedparser의 bozo에 해당)
+        FastPathUnsupported: RSS 2.0/Atom 1.0이 아니거나, feedparser만 처리하는 기능
+                             (expat 미지원 인코딩, xml:base, xhtml 본문 등)을 쓰는 경우
+    """
+    _check_encoding(body, content_type)
+    from feedparser.html import _cp1252 # feedparser와 같은 문자 보정 규칙 사용
+    fix_text = _TextFixer(_cp1252)
+
+    events = ET.iterparse(io.BytesIO(body), events=('start', 'end'))
+    _, root = next(events)
+    if root.tag == 'rss':
+        if not root.get('version', '').startswith('2.'):
+            raise FastPathUnsupported(f"RSS {root.get('version') or '(버전 없음)'}")
+        item_tag, parse_item = 'item', _rss_item
+    elif root.tag == f'{ATOM_NS}feed':
+        item_tag, parse_item = f'{ATOM_NS}entry', _atom_entry
+    else:
+        raise FastPathUnsupported(f"지원하지 않는 루트 요소: {root.tag}")
+
+    depth = 0
+    for event, element in events:
+        if event == 'start':
+            depth += 1
+            if XML_BASE in element.attrib:
+                raise FastPathUnsupported("xml:base 사용")
+            continue
+        depth -= 1
+        if element.tag == item_tag:
+            entry = parse_item(element, url, fix_text)
+            if entry is not None:
+                yield entry
+            element.clear()
+        if depth == 0:
+            root.clear() # 처리가 끝난 channel/feed 자식을 버림
+
+
+def _check_encoding(body: bytes, content_type: str):
+    match = _CHARSET.search(content_type)
+    if match and match.group(1).lower() not in FAST_PATH_ENCODINGS:
+        raise FastPathUnsupported(f"HTTP charset {match.group(1)}")
+    match = _XML_ENCODING.match(body[:200])
+    if match and match.group(1).decode('ascii').lower() not in FAST_PATH_ENCODINGS:
+        raise FastPathUnsupported(f"XML encoding {match.group(1).decode('ascii')}")
+    if body[:2] in (b'\xff\xfe', b'\xfe\xff'):
+        raise FastPathUnsupported("UTF-16")
+
+
+class _TextFixer:
+    """feedparser가 텍스트 값에 적용하는 후처리 (앞뒤 공백 제거, HTML 정리, 문자 보정)"""
+
+    def __init__(self, cp1252):
+        self.cp1252 = cp1252
+
+    def __call__(self, value: Optional[str], html: bool, base: str) -> str:
+        value = (value or '').strip()
+        if html and ('<' in value or '&' in value):
+            # 마크업/엔티티가 없는 텍스트는 상대 URI 해석과 정리가 그대로 통과하므로 생략
+            from feedparser.sanitizer import _sanitize_html
+            from feedparser.urls import resolve_relative_uris
+            value = resolve_relative_uris(value, base, 'utf-8', 'text/html')
+            value = _sanitize_html(value, 'utf-8', 'text/html')
+        try:
+            # UTF-8 바이트를 ISO-8859-1로 잘못 디코딩해 다시 인코딩한 피드 보정 (feedparser와 동일)
+            value = value.encode('iso-8859-1').decode('utf-8')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+        return value.translate(self.cp1252)
+
+
+def _looks_like_html(value: str) -> bool:
+    from feedparser.mixin import _FeedParserMixin
+    return bool(_FeedParserMixin.looks_like_html(value.strip()))
+
+
+def _resolve_link(link: str, base: str) -> str:
+    from feedparser.urls import _urljoin
+    link = _urljoin(base, link.strip()) if link.strip() else ''
+    return re.sub("&([A-Za-z0-9_]+);", r"&\g<1>", link.replace('&amp;', '&'))
+
+
+def _rss_item(item: ET.Element, url: str, fix_text: _TextFixer) -> Optional[FeedEntry]:
+    title = link = summary = content = published = guid = None
+    guid_is_link = False
+    for child in item:
+        tag = child.tag
+        if tag == 'title' and title is None:
+            title = child.text or ''
+        elif tag == 'link' and link is None:
+            link = child.text or ''
+        elif tag == 'description' and summary is None:
+            summary = child.text or ''
+        elif tag == CONTENT_ENCODED and content is None:
+            content = child.text or ''
+        elif tag == 'pubDate' and published is None:
+            published = (child.text or '').strip()
+        elif tag == 'guid' and guid is None:
+            guid = child.text or ''
+            guid_is_link = child.get('isPermaLink', 'true') == 'true'
+    if link is None and guid_is_link:
+        link = guid
+    link = _resolve_link(link or '', url)
+    if not link:
+        return None
+    if summary is None:
+        summary = content
+    title_html = title is not None and _looks_like_html(title)
+    return (
+        fix_text(title, title_html, url) if title is not None else '제목 없음',
+        link,
+        fix_text(summary, True, url),
+        fix_text(published, False, url),
+    )
+
+
+def _atom_entry(entry: ET.Element, url: str, fix_text: _TextFixer) -> Optional[FeedEntry]:
+    title = summary = content = published = None
+    title_html = summary_html = content_html = False
+    link = None
+    for child in entry:
+        tag = child.tag
+        if tag == f'{ATOM_NS}title' and title is None:
+            title, title_html = _atom_text(child)
+        elif tag == f'{ATOM_NS}link':
+            if link is None and child.get('rel', 'alternate') == 'alternate':
+                link = child.get('href', '')
+        elif tag == f'{ATOM_NS}summary' and summary is None:
+            summary, summary_html = _atom_text(child)
+        elif tag == f'{ATOM_NS}content' and content is None:
+            content, content_html = _atom_text(child)
+        elif tag == f'{ATOM_NS}published' and published is None:
+            published = (child.text or '').strip()
+    link = _resolve_link(link or '', url)
+    if not link:
+        return None
+    if summary is None:
+        summary, summary_html = content, content_html
+    return (
+        fix_text(title, title_html, url) if title is not None else '제목 없음',
+        link,
+        fix_text(summary, summary_html, url),
+        fix_text(published, False, url),
+    )
+
+
+def _atom_text(element: ET.Element) -> Tuple[str, bool]:
+    """Atom 텍스트 구문(type=text/html)의 값과 HTML 여부. xhtml/기타 타입은 feedparser로 처리"""
+    kind = element.get('type', 'text').lower()
+    if kind in ('text', 'text/plain', 'plain'):
+        return element.text or '', False
+    if kind in ('html', 'text/html'):
+        return element.text or '', True
+    raise FastPathUnsupported(f"Atom {kind} 본문")
@@ -1,8 +1,22 @@
 import feedparser
+import gzip
 import logging
-from typing import List, Dict
+import multiprocessing
+import threading
+import time
+import urllib.request
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
 import ssl
 from .base_scraper import BaseScraper
+from .feed_parser import FeedEntry, parse_feed
+from core.models import Article
+from utils.logger import get_item_logger
+from utils.tracing import span
+
+item_log = get_item_logger(__name__) # 항목별 디버그 로그 (샘플링 대상)
 
 # 경고: SSL 검증 비활성화 (보안 위험!)
 # 이 코드는 개발 환경에서 다른 해결 방법이 없을 때 임시로만 사용해야 합니다.
@@ -18,68 +32,172 @@ else:
     logging.warning("경고: 전역 SSL 인증서 검증이 비활성화되었습니다! 보안에 매우 취약한 상태입니다.")
     logging.warning("*****************************************************")
 
+
+@dataclass(slots=True)
+class FeedDocument:
+    """네트워크에서 받아온 피드 원본 (파싱 전)"""
+    url: str
+    body: bytes = b''
+    content_type: str = ''
+    error: Optional[str] = None # 요청 실패 시 원인 (body는 비어 있음)
+
+
 class RssScraper(BaseScraper):
-    """RSS 피드에서 기사를 스크랩하는 클래스"""
-    def scrape(self, url: str) -> List[Dict]:
+    """RSS 피드에서 기사를 스크랩하는 클래스
+
+    피드 수집은 네트워크 요청(fetch)과 파싱(parse) 두 단계로 나뉩니다.
+    파싱은 잘 구성된 RSS 2.0/Atom 피드를 iterparse 빠른 경로로 처리하고, 그 외에는 feedparser를 사용합니다.
+    본문이 parse_process_min_bytes 이상인 피드는 GIL을 점유하지 않도록 프로세스 풀에서 파싱합니다.
+
+    Args:
+        fetch_workers (int): scrape_many에서 동시에 받아올 피드 수
+        parse_workers (int): 큰 피드를 파싱할 프로세스 수 (0이면 항상 현재 프로세스에서 파싱)
+        parse_process_min_bytes (int): 프로세스 풀에서 파싱할 최소 본문 크기
+        fast_path (bool): iterparse 빠른 경로 사용 여부 (False면 항상 feedparser)
+        timeout (float): 피드 요청 하나의 타임아웃 (초)
+    """
+
+    def __init__(self, fetch_workers: int = 4, parse_workers: int = 2, parse_process_min_bytes: int = 1_000_000,
+                 fast_path: bool = True, timeout: float = 30):
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = parse_workers
+        self.parse_process_min_bytes = parse_process_min_bytes
+        self.fast_path = fast_path
+        self.timeout = timeout
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def scrape(self, url: str) -> List[Article]:
         """주어진 RSS 피드 URL에서 기사 목록을 파싱하여 반환합니다.
 
         Args:
             url (str): 파싱할 RSS 피드의 URL
 
         Returns:
-            List[Dict]: 각 기사의 제목(title), 링크(link), 요약(summary)을 담은 딕셔너리 리스트
+            List[Article]: 제목, 링크, 요약, 발행일, 출처 피드 URL을 담은 Article 리스트
                        파싱 중 오류 발생 시 빈 리스트 반환
         """
-        logging.info(f"'{url}'에서 RSS 피드 스크래핑 시작...")
-        articles = []
-        try:
-            feed = feedparser.parse(url)
-            logging.debug(f"'{url}' 피드 파싱 완료. 상태: {feed.status if hasattr(feed, 'status') else 'N/A'}, 인코딩: {feed.encoding if hasattr(feed, 'encoding') else 'N/A'}, 버전: {feed.version if hasattr(feed, 'version') else 'N/A'}")
-
-            if feed.bozo:
-                # bozo가 1이면 파싱 중 문제가 있었음을 의미 (예: 잘못된 형식)
-                # bozo_exception은 문제의 원인을 담고 있음
-                logging.warning(f"RSS 피드 파싱 중 잠재적 문제 발생 (bozo=1): {url}. 이유: {feed.bozo_exception}")
-                # bozo가 true라도 entries가 있을 수 있으므로 계속 진행
-
-            if not feed.entries:
-                logging.warning(f"'{url}' 피드에서 항목(entries)을 찾을 수 없습니다.")
-                return []
-
-            logging.info(f"'{url}' 피드에서 {len(feed.entries)}개의 항목 발견.")
-
-            for i, entry in enumerate(feed.entries):
-                title = entry.get('title', '제목 없음')
-                link = entry.get('link', '')
-                summary = entry.get('summary', '') # 요약 정보 추출
-                published = entry.get('published', '') # 발행일 정보 추출 (선택적)
-                # published_parsed = entry.get('published_parsed', None) # 파싱된 시간 구조체 (선택적)
-
-                logging.debug(f"항목 {i+1}/{len(feed.entries)} 처리 중: 제목='{title}', 링크='{link}'")
-
-                if not link:
-                    logging.warning(f"항목 '{title}'에 링크가 없어 건너<0xEB><0x9C><0x91>니다.")
-                    continue # 링크가 없는 항목은 제외
-
-                article = {
-                    'title': title,
-                    'link': link,
-                    'summary': summary,
-                    'published': published, # 발행일 추가
-                    # 'published_parsed': published_parsed # 필요시 파싱된 시간 추가
-                    'source_url': url # 출처 URL 추가
-                }
-                articles.append(article)
-                logging.debug(f"기사 '{title}' 추가 완료.")
-                print(f"스크랩된 기사: {article}") # 스크랩된 기사 정보 출력
+        with span('scrape', feed_url=url):
+            logging.info(f"'{url}'에서 RSS 피드 스크래핑 시작...")
+            return self.parse(self.fetch(url))
+
+    def scrape_many(self, urls: List[str]) -> Iterator[Tuple[str, List[Article]]]:
+        """여러 피드를 동시에 받아와 파싱하고, (url, 기사 목록)을 urls 순서대로 돌려줍니다.
 
+        앞쪽 피드를 파싱하는 동안 뒤쪽 피드의 요청이 계속 진행되며,
+        큰 피드의 파싱은 프로세스 풀에 제출되어 다른 피드의 처리와 겹쳐 실행됩니다.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, max(1, len(urls))),
+                                thread_name_prefix='rss-fetch') as executor:
+            fetched = [executor.submit(self._fetch_and_submit, url) for url in urls]
+            for url, future in zip(urls, fetched):
+                try:
+                    document, parsing = future.result()
+                    with span('scrape.parse', feed_url=url):
+                        entries = parsing.result() if parsing else self._parse_entries(document)
+                    yield url, self._build_articles(document, entries)
+                except Exception as e:
+                    logging.error(f"RSS 피드({url}) 처리 중 예상치 못한 오류 발생: {e}", exc_info=True)
+                    yield url, []
+
+    def fetch(self, url: str) -> FeedDocument:
+        """피드 원본을 받아옵니다. 실패해도 예외 대신 error가 채워진 FeedDocument를 돌려줍니다."""
+        start = time.perf_counter()
+        try:
+            request = urllib.request.Request(url, headers={
+                'User-Agent': feedparser.USER_AGENT,
+                'Accept': 'application/atom+xml,application/rss+xml,application/xml;q=0.9,*/*;q=0.1',
+                'Accept-Encoding': 'gzip, deflate',
+            })
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                body = response.read()
+                content_type = response.headers.get('Content-Type', '')
+                encoding = (response.headers.get('Content-Encoding') or '').lower()
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error: # 일부 서버는 zlib 헤더 없는 raw deflate를 보냄
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
         except ssl.SSLCertVerificationError as e:
-             logging.error(f"SSL 인증서 검증 오류 발생 ({url}): {e}. 전역 SSL 검증 비활성화 상태일 수 있습니다.", exc_info=False) # 상세 스택 트레이스는 제외
-             return []
+            logging.error(f"SSL 인증서 검증 오류 발생 ({url}): {e}. 전역 SSL 검증 비활성화 상태일 수 있습니다.", exc_info=False) # 상세 스택 트레이스는 제외
+            return FeedDocument(url, error=f"{type(e).__name__}: {e}")
         except Exception as e:
-            # 일반적인 예외 처리 (네트워크 오류, 파싱 오류 등 포함)
-            logging.error(f"RSS 피드({url}) 처리 중 예상치 못한 오류 발생: {e}", exc_info=True)
+            logging.error(f"RSS 피드({url}) 요청 중 오류 발생: {e}")
+            return FeedDocument(url, error=f"{type(e).__name__}: {e}")
+        logging.debug(f"'{url}' 피드 수신 완료: {len(body)} bytes, {time.perf_counter() - start:.3f}s, Content-Type: {content_type}")
+        return FeedDocument(url, body, content_type)
+
+    def parse(self, document: FeedDocument) -> List[Article]:
+        """받아온 피드 원본을 Article 목록으로 파싱합니다. 오류 발생 시 빈 리스트 반환"""
+        try:
+            if self._use_process_pool(document):
+                entries = self._get_process_pool().submit(
+                    parse_feed, document.body, document.url, document.content_type, self.fast_path).result()
+            else:
+                entries = self._parse_entries(document)
+            return self._build_articles(document, entries)
+        except Exception as e:
+            # 일반적인 예외 처리 (파싱 오류, 프로세스 풀 오류 등 포함)
+            logging.error(f"RSS 피드({document.url}) 처리 중 예상치 못한 오류 발생: {e}", exc_info=True)
             return [] # 오류 발생 시 빈 리스트 반환
 
+    def close(self):
+        """파싱 프로세스 풀을 종료합니다."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True, cancel_futures=True)
+            self._process_pool = None
+
+    def _fetch_and_submit(self, url: str) -> Tuple[FeedDocument, Optional[Future]]:
+        """fetch 스레드에서 실행: 큰 피드는 받아오자마자 프로세스 풀에 파싱을 제출해 앞쪽 피드를 기다리는 동안에도 파싱이 진행되게 함"""
+        with span('scrape.fetch', feed_url=url):
+            document = self.fetch(url)
+        if self._use_process_pool(document):
+            return document, self._get_process_pool().submit(
+                parse_feed, document.body, document.url, document.content_type, self.fast_path)
+        return document, None
+
+    def _use_process_pool(self, document: FeedDocument) -> bool:
+        return self.parse_workers > 0 and len(document.body) >= self.parse_process_min_bytes
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._process_pool is None:
+                # spawn: 스레드(전송/메트릭 서버 등)가 떠 있는 프로세스를 fork하지 않도록 새 인터프리터에서 시작
+                self._process_pool = ProcessPoolExecutor(max_workers=self.parse_workers,
+                                                         mp_context=multiprocessing.get_context('spawn'))
+            return self._process_pool
+
+    def _parse_entries(self, document: FeedDocument) -> List[FeedEntry]:
+        if document.error:
+            return []
+        return parse_feed(document.body, document.url, document.content_type, self.fast_path)
+
+    def _build_articles(self, document: FeedDocument, entries: List[FeedEntry]) -> List[Article]:
+        url = document.url
+        if not entries:
+            logging.warning(f"'{url}' 피드에서 항목(entries)을 찾을 수 없습니다.")
+            return []
+
+        logging.info(f"'{url}' 피드에서 {len(entries)}개의 항목 발견.")
+        articles = []
+        for i, (title, link, summary, published) in enumerate(entries):
+            item_log.debug("항목 %d/%d 처리 중: 제목='%s', 링크='%s'", i + 1, len(entries), title, link)
+
+            if not link:
+                logging.warning(f"항목 '{title}'에 링크가 없어 건너뜁니다.")
+                continue # 링크가 없는 항목은 제외
+
+            article = Article(
+                title=title,
+                link=link,
+                summary=summary,
+                published=published, # 발행일 추가
+                source_url=url, # 출처 URL 추가
+            )
+            articles.append(article)
+            item_log.debug("스크랩된 기사: %s", article)
+
         logging.info(f"'{url}' 스크래핑 완료. 총 {len(articles)}개의 유효한 기사 수집.")
-        return articles
\ No newline at end of file
+        return articles
@@ -1,7 +1,24 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
+
+from core.pipeline import run_in_thread
 
 class BaseSender(ABC):
+    """전송 단계의 기본 클래스. send만 구현하면 일괄/비동기 메서드는 기본 구현(순차 실행/스레드 풀)을 사용합니다."""
+
     @abstractmethod
     def send(self, content):
         """콘텐츠를 지정된 대상으로 전송합니다."""
-        pass 
\ No newline at end of file
+        pass
+
+    def send_many(self, contents: Iterable):
+        """여러 콘텐츠를 순서대로 전송합니다. 한 번에 보낼 수 있는 대상은 재정의합니다."""
+        for content in contents:
+            self.send(content)
+
+    async def asend(self, content):
+        """send의 비동기 버전. 기본 구현은 send를 공유 스레드 풀에서 실행합니다."""
+        return await run_in_thread(self.send, content)
+
+    def close(self):
+        """사용한 연결 등을 정리합니다 (기본 구현은 아무것도 하지 않음)."""
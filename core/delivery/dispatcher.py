@@ -0,0 +1,246 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from .base_sender import BaseSender
+from core.formatting.base_formatter import BaseFormatter
+from core.models import Article, Delivery
+from core.pipeline import STAGE_FACTORIES
+from utils.database import (
+    enqueue_deliveries, get_pending_deliveries, get_undelivered_articles, mark_delivery_sent, record_delivery_failure,
+)
+from utils.tracing import span
+
+
+def one_per_story(articles: List[Article]) -> List[Article]:
+    """같은 묶음(cluster_id)의 기사는 먼저 수집된 기사 하나만 남깁니다 (나머지는 같은 도파민 포인트를 물려받은 기사)."""
+    seen = set()
+    stories = []
+    for article in articles:
+        if article.cluster_id is None or article.cluster_id not in seen:
+            seen.add(article.cluster_id)
+            stories.append(article)
+    return stories
+
+
+# 채널 이름 -> 전송기 생성 함수 (config['delivery']를 받아 BaseSender를 반환).
+# 단계 레지스트리(core.pipeline)의 sender 항목과 같은 dict이므로 register_stage('sender', ...)로 채널을 추가할 수 있음
+SENDER_FACTORIES: Dict[str, Callable[[Mapping], BaseSender]] = STAGE_FACTORIES['sender']
+
+
+@dataclass(slots=True)
+class ChannelPolicy:
+    """채널별 전송 정책 (config['delivery']['policies'][채널])
+
+    Attributes:
+        timeout (float): 전송 1회의 제한 시간 (초). 넘기면 실패로 기록하고, 이번 실행에서는 그 채널로 더 보내지 않음
+        max_attempts (int): 이 횟수만큼 실패하면 outbox 항목을 failed로 바꿈 (실행을 넘어 누적)
+        retry_delay (float): 첫 재시도까지의 대기 시간 (초, 실패할 때마다 2배)
+    """
+    timeout: float = 300.0
+    max_attempts: int = 3
+    retry_delay: float = 5.0
+
+
+class DeliveryDispatcher:
+    """포맷팅된 결과를 여러 채널(BaseSender)로 동시에 전송하는 클래스
+
+    채널마다 아직 전송하지 않은 기사만 골라 포맷팅하고(enqueue_undelivered), delivery_outbox 테이블에
+    채널별로 등록한 뒤 전송(dispatch_pending)합니다. 이미 전송한 기사는 다시 보내지 않으므로
+    전송 크기와 시간은 피드 범위가 아니라 새로 처리된 기사 수에 비례합니다.
+    전송 도중 프로세스가 중단되어도 pending 항목이 남아 있으므로,
+    다음 실행(또는 deliver_outbox.py)에서 수집/AI 처리를 다시 하지 않고 이어서 보냅니다.
+
+    채널끼리는 동시에, 한 채널 안에서는 등록 순서대로 보냅니다.
+    dispatch_pending 한 번은 deadline_seconds 안에 끝납니다. 시간 안에 보내지 못한 항목은 pending으로 남겨
+    다음 실행(또는 deliver_outbox.py)에서 보내고, 같은 실행 안에서 다시 시도하지 않습니다.
+    제한 시간을 넘긴 전송 스레드는 멈출 수 없으므로, 그 스레드가 끝날 때까지 같은 채널로 새 전송을 시작하지 않습니다.
+    늦게 끝난 전송이 성공하면 그때 전송 완료로 표시합니다. 프로세스가 먼저 끝나면 다음 실행에서 다시 보내므로
+    같은 내용이 두 번 도착할 수 있습니다 (at-least-once).
+
+    Args:
+        senders (Dict[str, BaseSender]): 채널 이름 -> 전송기
+        policies (Optional[Dict[str, ChannelPolicy]]): 채널 이름 -> 전송 정책 (없으면 기본값)
+        lookback_hours (float): 이 시간 안에 수집된 기사만 전송 대상 (새 채널을 추가해도 과거 기사 전체를 보내지 않음)
+        deadline_seconds (float): dispatch_pending 한 번의 전체 제한 시간 (초, 0이면 제한 없음)
+        formats (Optional[Dict[str, str]]): 채널 이름 -> 출력 형식 (예: console은 'text', slack은 'slack_blocks', 없으면 'text')
+    """
+
+    def __init__(self, senders: Dict[str, BaseSender], policies: Optional[Dict[str, ChannelPolicy]] = None,
+                 lookback_hours: float = 48.0, deadline_seconds: float = 600.0, formats: Optional[Dict[str, str]] = None):
+        self.senders = senders
+        self.policies = {name: (policies or {}).get(name) or ChannelPolicy() for name in senders}
+        self.formats = {name: (formats or {}).get(name) or 'text' for name in senders}
+        self.lookback_hours = lookback_hours
+        self.deadline_seconds = deadline_seconds
+        self._in_flight: Dict[str, threading.Thread] = {} # 채널 -> 제한 시간을 넘겨 아직 끝나지 않은 전송 스레드
+
+    @classmethod
+    def from_config(cls, delivery_config: Mapping) -> "DeliveryDispatcher":
+        """config['delivery']의 channels/policies로 전송기를 만듭니다. 만들 수 없는 채널은 건너뜁니다."""
+        senders: Dict[str, BaseSender] = {}
+        for name in delivery_config.get('channels', ('console',)):
+            factory = SENDER_FACTORIES.get(name)
+            if factory is None:
+                logging.error(f"알 수 없는 전송 채널입니다: {name} (사용 가능: {', '.join(SENDER_FACTORIES)})")
+                continue
+            try:
+                senders[name] = factory(delivery_config)
+            except Exception as e:
+                logging.error(f"전송 채널 '{name}' 초기화 실패: {e}", exc_info=True)
+        policies = {name: ChannelPolicy(**policy) for name, policy in delivery_config.get('policies', {}).items()}
+        default_format = delivery_config.get('format', 'text')
+        formats = {name: delivery_config.get('formats', {}).get(name, default_format) for name in senders}
+        return cls(senders, policies, delivery_config.get('lookback_hours', 48.0),
+                   delivery_config.get('deadline_seconds', 600.0), formats)
+
+    @property
+    def channels(self) -> List[str]:
+        return list(self.senders)
+
+    def enqueue_undelivered(self, formatter_for: Callable[[str], BaseFormatter]) -> int:
+        """채널별로 아직 전송하지 않은 기사를 채널의 출력 형식으로 포맷팅해 outbox에 등록합니다.
+
+        미전송 기사 목록과 출력 형식이 같은 채널끼리는 한 번만 포맷팅합니다.
+        같은 묶음의 기사는 다이제스트에 한 번만 넣고, 묶음의 모든 기사를 전송한 것으로 기록합니다.
+
+        Args:
+            formatter_for (Callable[[str], BaseFormatter]): 출력 형식 이름 -> 포맷터 (형식마다 한 번만 호출)
+
+        Returns:
+            int: 등록한 outbox 항목 수
+        """
+        since = (datetime.now() - timedelta(hours=self.lookback_hours)).isoformat(sep=' ', timespec='seconds')
+        deltas: Dict[Tuple[Tuple[int, ...], str], Tuple[List[Article], List[str]]] = {}
+        for channel in self.channels:
+            articles = get_undelivered_articles(channel, since)
+            if articles:
+                key = (tuple(article.id for article in articles), self.formats[channel])
+                deltas.setdefault(key, (articles, []))[1].append(channel)
+            else:
+                logging.info(f"'{channel}' 채널로 새로 전송할 기사가 없습니다.")
+
+        enqueued = 0
+        formatters: Dict[str, BaseFormatter] = {}
+        for (article_ids, output_format), (articles, channels) in deltas.items():
+            if output_format not in formatters:
+                formatters[output_format] = formatter_for(output_format)
+            stories = one_per_story(articles)
+            payload = formatters[output_format].format(stories)
+            if payload:
+                enqueued += len(enqueue_deliveries(channels, payload, list(article_ids)))
+                logging.info(f"미전송 기사 {len(articles)}건(소식 {len(stories)}건)을 outbox에 등록했습니다: {', '.join(channels)}")
+        return enqueued
+
+    def dispatch_pending(self) -> Dict[str, int]:
+        """outbox의 pending 항목을 채널별로 동시에 전송합니다 (전체 deadline_seconds 안에서).
+
+        이전 전송 스레드가 아직 끝나지 않은 채널은 이번에는 건너뜁니다 (중복 전송 방지).
+
+        Returns:
+            Dict[str, int]: 채널별 이번에 전송 완료한 항목 수
+        """
+        deadline = time.monotonic() + self.deadline_seconds if self.deadline_seconds > 0 else None
+        busy = [name for name, thread in self._in_flight.items() if thread.is_alive()]
+        if busy:
+            logging.warning(f"이전 전송이 아직 끝나지 않은 채널은 이번에 건너뜁니다: {', '.join(busy)}")
+        by_channel: Dict[str, List[Delivery]] = {}
+        for delivery in get_pending_deliveries([name for name in self.channels if name not in busy]):
+            by_channel.setdefault(delivery.channel, []).append(delivery)
+        if not by_channel:
+            return {}
+
+        logging.info(f"전송 대기 항목: {', '.join(f'{name} {len(items)}건' for name, items in by_channel.items())}")
+        with ThreadPoolExecutor(max_workers=len(by_channel), thread_name_prefix='delivery') as executor:
+            futures = {name: executor.submit(self._deliver_channel, name, items, deadline)
+                       for name, items in by_channel.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+    def _deliver_channel(self, channel: str, deliveries: List[Delivery], deadline: Optional[float]) -> int:
+        """한 채널의 항목을 순서대로 전송합니다. 중간 항목이 실패하면 순서를 지키기 위해 나머지는 다음 실행으로 미룹니다."""
+        sent = 0
+        with span(f'send.{channel}'):
+            for delivery in deliveries:
+                if not self._deliver(delivery, deadline):
+                    logging.info(f"'{channel}' 채널의 남은 항목 {len(deliveries) - sent}건은 다음 실행에서 전송합니다.")
+                    break
+                sent += 1
+        return sent
+
+    def _deliver(self, delivery: Delivery, deadline: Optional[float]) -> bool:
+        """항목 하나를 정책에 따라 재시도하며 전송합니다. 전송했으면 True.
+
+        남은 시간 안에 다시 시도할 수 없거나 전송이 제한 시간을 넘기면 pending으로 두고 False를 반환합니다.
+        """
+        policy = self.policies[delivery.channel]
+        attempt = 0
+        while True:
+            timeout = policy.timeout
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.warning(f"'{delivery.channel}' 채널 전송 시간이 끝나 다음 실행으로 미룹니다 (outbox id={delivery.id})")
+                    return False
+                timeout = min(timeout, remaining)
+            error = self._send_with_timeout(delivery, timeout)
+            if error is None:
+                logging.info(f"'{delivery.channel}' 채널 전송 완료 (outbox id={delivery.id})")
+                return True
+            in_flight = self._in_flight.get(delivery.channel)
+            if in_flight is not None and in_flight.is_alive():
+                # 시간 초과: 전송 스레드가 아직 실행 중이므로 새 시도를 시작하지 않음 (성공하면 스레드가 전송 완료로 표시)
+                if timeout >= policy.timeout: # 실행 마감이 아니라 채널 제한 시간을 넘긴 경우만 실패로 셈
+                    record_delivery_failure(delivery.id, error, policy.max_attempts)
+                logging.warning(f"'{delivery.channel}' 채널 전송이 끝나지 않아 이번 실행에서는 더 보내지 않습니다 "
+                                f"(outbox id={delivery.id}): {error}")
+                return False
+            if record_delivery_failure(delivery.id, error, policy.max_attempts):
+                logging.error(f"'{delivery.channel}' 채널 전송이 {policy.max_attempts}회 실패하여 중단합니다 "
+                              f"(outbox id={delivery.id}): {error}")
+                return False
+            delay = policy.retry_delay * (2 ** attempt)
+            attempt += 1
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                logging.warning(f"'{delivery.channel}' 채널 전송 실패, 남은 시간 안에 재시도할 수 없어 다음 실행으로 미룹니다 "
+                                f"(outbox id={delivery.id}): {error}")
+                return False
+            logging.warning(f"'{delivery.channel}' 채널 전송 실패, {delay:.1f}s 후 재시도 (outbox id={delivery.id}): {error}")
+            time.sleep(delay)
+
+    def _send_with_timeout(self, delivery: Delivery, timeout: float) -> Optional[str]:
+        """send를 별도 데몬 스레드에서 실행해 timeout까지 기다립니다. 성공하면 None, 실패하면 오류 설명을 반환합니다.
+
+        전송에 성공하면 스레드가 outbox 항목을 전송 완료로 표시합니다.
+        제한 시간을 넘긴 스레드는 강제로 멈출 수 없으므로 _in_flight에 남겨 두고(데몬이라 종료를 막지 않음),
+        늦게라도 성공하면 그때 전송 완료로 표시됩니다.
+        """
+        sender = self.senders[delivery.channel]
+        outcome: Dict[str, BaseException] = {}
+
+        def run():
+            try:
+                sender.send(delivery.payload)
+            except Exception as e:
+                outcome['error'] = e
+                return
+            mark_delivery_sent(delivery.id)
+
+        thread = threading.Thread(target=run, name=f'send-{delivery.channel}-{delivery.id}', daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            self._in_flight[delivery.channel] = thread
+            return f"timeout: {timeout:g}s 안에 전송을 마치지 못했습니다."
+        if 'error' in outcome:
+            return f"{type(outcome['error']).__name__}: {outcome['error']}"
+        return None
+
+    def close(self):
+        for sender in self.senders.values():
+            close = getattr(sender, 'close', None)
+            if close:
+                close()
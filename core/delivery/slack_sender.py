@@ -0,0 +1,231 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .base_sender import BaseSender
+from utils.error_handler import DeliveryError
+
+# Slack 메시지 text는 40,000자를 넘으면 잘리고, 4,000자를 넘으면 클라이언트에서 '더 보기'로 접힙니다.
+# 청크 번호 머리말("(12/34)\n")이 들어갈 여유를 두고 나눕니다.
+SLACK_MAX_MESSAGE_CHARS = 3_900
+SLACK_MAX_BLOCKS = 50 # Block Kit 메시지 하나에 넣을 수 있는 블록 수
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def split_message(content: str, max_chars: int = SLACK_MAX_MESSAGE_CHARS) -> List[str]:
+    """content를 max_chars 이하의 조각으로 나눕니다.
+
+    기사 경계(빈 줄) -> 줄 -> 글자 순서로 가능한 한 큰 단위를 유지하며 자릅니다.
+
+    Args:
+        content (str): 전송할 전체 문자열
+        max_chars (int): 조각 하나의 최대 글자 수
+
+    Returns:
+        List[str]: 순서대로 이어 붙이면 원문(구분자 제외)이 되는 조각 목록
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+
+    def flush():
+        nonlocal current, current_len
+        if current:
+            chunks.append("".join(current).strip("\n"))
+        current, current_len = [], 0
+
+    for piece in _pieces(content, max_chars):
+        if current_len + len(piece) > max_chars:
+            flush()
+        current.append(piece)
+        current_len += len(piece)
+    flush()
+    return [chunk for chunk in chunks if chunk]
+
+
+def _pieces(content: str, max_chars: int) -> Iterator[str]:
+    """split_message용: 각각 max_chars 이하인 (구분자를 포함한) 조각을 순서대로 돌려줍니다."""
+    for block in content.split("\n\n"):
+        block += "\n\n"
+        if len(block) <= max_chars:
+            yield block
+            continue
+        for line in block.split("\n"):
+            line += "\n"
+            for start in range(0, len(line), max_chars):
+                yield line[start:start + max_chars]
+
+
+def parse_blocks(content: str) -> Optional[List[Dict]]:
+    """content가 Block Kit 메시지 JSON({"blocks": [...]}, slack_blocks 템플릿 출력)이면 블록 목록을, 아니면 None을 반환합니다."""
+    if not content.lstrip().startswith('{'):
+        return None
+    try:
+        message = json.loads(content)
+    except ValueError:
+        return None
+    blocks = message.get('blocks') if isinstance(message, dict) else None
+    return blocks if isinstance(blocks, list) else None
+
+
+def split_blocks(blocks: List[Dict], max_blocks: int = SLACK_MAX_BLOCKS) -> List[List[Dict]]:
+    """블록 목록을 메시지당 max_blocks개 이하로 나눕니다.
+
+    블록 경계에서만 나누며, 조각의 처음이나 끝에 오는 구분선(divider)은 뺍니다.
+    """
+    chunks: List[List[Dict]] = []
+    current: List[Dict] = []
+    for block in blocks:
+        if len(current) >= max_blocks:
+            chunks.append(current)
+            current = []
+        if not current and block.get('type') == 'divider':
+            continue
+        current.append(block)
+    chunks.append(current)
+    for chunk in chunks:
+        while chunk and chunk[-1].get('type') == 'divider':
+            chunk.pop()
+    return [chunk for chunk in chunks if chunk]
+
+
+class _RateLimiter:
+    """웹훅 단위 전송 간격 제한. 429 응답을 받으면 모든 스레드의 다음 전송을 Retry-After만큼 미룹니다."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class SlackSender(BaseSender):
+    """Slack Incoming Webhook으로 결과를 전송하는 클래스
+
+    긴 다이제스트는 Slack 메시지 크기 제한 이하로 나누어 보내며, 조각이 여러 개면 "(i/n)" 머리말을 붙입니다.
+    Block Kit 메시지 JSON(slack_blocks 템플릿)은 text가 아니라 blocks로 보내고, 메시지당 max_blocks개 이하로
+    블록 경계에서 나눕니다.
+    HTTP 연결은 requests.Session 풀을 재사용하고, 웹훅 전송 간격 제한(min_interval)과
+    429 Retry-After / 5xx 지수 백오프를 지킵니다.
+
+    Args:
+        webhook_url (str): Slack Incoming Webhook URL
+        max_chars (int): 메시지 하나의 최대 글자 수
+        max_blocks (int): Block Kit 메시지 하나의 최대 블록 수
+        preserve_order (bool): True면 조각을 순서대로 하나씩 보내고, False면 max_workers개까지 동시에 보냅니다.
+                               (동시 전송 시 채널에 표시되는 순서가 바뀔 수 있음)
+        max_workers (int): 동시 전송 스레드 수 (연결 풀 크기)
+        min_interval (float): 같은 웹훅으로 보내는 요청 사이의 최소 간격 (초). Slack 권장값은 초당 1건
+        max_retries (int): 조각 하나당 최대 재시도 횟수
+        timeout (float): 요청 하나의 타임아웃 (초)
+        session (Optional[requests.Session]): 재사용할 세션 (생략하면 새로 만들고 close()에서 닫음)
+    """
+
+    def __init__(self, webhook_url: str, max_chars: int = SLACK_MAX_MESSAGE_CHARS, preserve_order: bool = True,
+                 max_workers: int = 4, min_interval: float = 1.0, max_retries: int = 5, timeout: float = 10.0,
+                 session: Optional[requests.Session] = None, max_blocks: int = SLACK_MAX_BLOCKS):
+        if not webhook_url:
+            raise ValueError("Slack webhook URL이 필요합니다 (SLACK_WEBHOOK_URL).")
+        self.webhook_url = webhook_url
+        self.max_chars = max_chars
+        self.max_blocks = max_blocks
+        self.preserve_order = preserve_order
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._limiter = _RateLimiter(min_interval)
+        self._owns_session = session is None
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def send(self, content: str):
+        """content를 크기 제한에 맞게 나누어 Slack으로 전송합니다.
+
+        Args:
+            content (str): 전송할 문자열 콘텐츠 (일반 텍스트 또는 Block Kit 메시지 JSON)
+
+        Raises:
+            DeliveryError: 재시도 후에도 전송하지 못한 조각이 있는 경우
+        """
+        blocks = parse_blocks(content)
+        if blocks is not None:
+            block_chunks = split_blocks(blocks, self.max_blocks)
+            # text는 알림/블록을 표시할 수 없는 클라이언트용 대체 문구
+            chunks = [{'blocks': chunk, 'text': f"도파민 포인트 ({i}/{len(block_chunks)})" if len(block_chunks) > 1
+                       else "도파민 포인트"} for i, chunk in enumerate(block_chunks, start=1)]
+        else:
+            text_chunks = split_message(content, self.max_chars)
+            if len(text_chunks) > 1:
+                text_chunks = [f"({i}/{len(text_chunks)})\n{chunk}" for i, chunk in enumerate(text_chunks, start=1)]
+            chunks = [{'text': chunk} for chunk in text_chunks]
+        if not chunks:
+            logging.warning("Slack으로 전송할 내용이 없습니다.")
+            return
+
+        start = time.perf_counter()
+        if self.preserve_order or self.max_workers == 1 or len(chunks) == 1:
+            failures = [error for error in map(self._post_chunk, chunks) if error]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='slack-sender') as executor:
+                failures = [error for error in executor.map(self._post_chunk, chunks) if error]
+
+        elapsed = time.perf_counter() - start
+        if failures:
+            raise DeliveryError(f"Slack 메시지 {len(failures)}/{len(chunks)}건 전송 실패: {failures[0]}")
+        logging.info(f"Slack으로 메시지 {len(chunks)}건 전송 완료 ({elapsed:.2f}s)")
+
+    def _post_chunk(self, message: Dict) -> Optional[str]:
+        """메시지 조각 하나({'text': ...} 또는 {'blocks': [...], 'text': ...})를 전송합니다.
+        성공하면 None, 최종 실패하면 오류 설명을 반환합니다."""
+        error = None
+        for attempt in range(self.max_retries + 1):
+            self._limiter.wait()
+            try:
+                response = self.session.post(self.webhook_url, json=message, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code == 200:
+                    return None
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code not in RETRYABLE_STATUS:
+                    break # 잘못된 페이로드/웹훅(400, 403, 404 등)은 재시도해도 소용없음
+                delay = self._backoff(attempt)
+                if response.status_code == 429:
+                    delay = max(delay, float(response.headers.get('Retry-After', 1)))
+                    self._limiter.pause(delay)
+            if attempt < self.max_retries:
+                logging.warning(f"Slack 전송 재시도 {attempt + 1}/{self.max_retries} ({delay:.1f}s 후): {error}")
+                time.sleep(delay)
+        logging.error(f"Slack 메시지 전송 실패: {error}")
+        return error
+
+    @staticmethod
+    def _backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+    def close(self):
+        if self._owns_session:
+            self.session.close()
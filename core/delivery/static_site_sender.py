@@ -0,0 +1,277 @@
+import hashlib
+import html
+import json
+import logging
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .base_sender import BaseSender
+from core.models import Article
+from utils.database import get_processed_articles
+
+# 페이지 HTML 구조를 바꾸면 올려서 다음 빌드에서 모든 페이지를 다시 쓰도록 함
+SITE_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+THUMBNAIL_SIZE = (320, 320)
+
+_KEYWORD_PATTERN = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+_KOREAN_PARTICLES = ('에서', '으로', '은', '는', '이', '가', '을', '를', '의', '에', '로', '와', '과', '도')
+_STOPWORDS = {
+    '있는', '없는', '하는', '위한', '대한', '통해', '관련', '오늘', '이번', '지난', '올해', '까지', '부터',
+    'the', 'and', 'for', 'with', 'from', 'that', 'this', 'are', 'was', 'how', 'why', 'what', 'new',
+}
+
+
+@lru_cache(maxsize=65_536)
+def _normalize_word(word: str) -> Optional[str]:
+    """제목 단어 하나를 키워드로 정규화합니다 (조사 제거). 키워드가 아니면 None. 단어는 반복되므로 캐시합니다."""
+    if word.isdigit():
+        return None
+    for particle in _KOREAN_PARTICLES:
+        if len(word) > len(particle) + 1 and word.endswith(particle):
+            word = word[:-len(particle)]
+            break
+    return None if word in _STOPWORDS else word
+
+@lru_cache(maxsize=1_024)
+def _source_host(source_url: str) -> Optional[str]:
+    host = urlparse(source_url).hostname
+    return host.removeprefix('www.') if host else None
+
+def extract_keywords(article: Article) -> List[str]:
+    """태그 색인에 사용할 키워드를 추출합니다: 피드 호스트 + 제목 단어(조사 제거, 불용어 제외)."""
+    host = _source_host(article.source_url) if article.source_url else None
+    keywords = [host] if host else []
+    for word in _KEYWORD_PATTERN.findall(article.title.lower()):
+        word = _normalize_word(word)
+        if word and word not in keywords:
+            keywords.append(word)
+    return keywords
+
+
+def _digest(*parts) -> str:
+    return hashlib.blake2b("\x1f".join(map(str, parts)).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _layout(title: str, body: str, root: str, site_title: str) -> str:
+    return (
+        f'<!DOCTYPE html>\n<html lang="ko">\n<head><meta charset="utf-8">'
+        f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>{html.escape(title)} - {html.escape(site_title)}</title>\n'
+        f'<style>body{{font-family:sans-serif;max-width:860px;margin:2em auto;padding:0 1em;line-height:1.6}}'
+        f'img.thumb{{max-width:160px;float:left;margin:0 1em 1em 0}}li{{clear:both;margin-bottom:1em}}'
+        f'nav a{{margin-right:1em}}</style></head>\n<body>\n'
+        f'<nav><a href="{root}index.html">{html.escape(site_title)}</a><a href="{root}tags/index.html">키워드</a></nav>\n'
+        f'<h1>{html.escape(title)}</h1>\n{body}\n</body>\n</html>\n'
+    )
+
+
+class StaticSiteSender(BaseSender):
+    """DB에 저장된 처리 완료 기사로 정적 다이제스트 사이트를 만드는 전송기
+
+    생성하는 페이지:
+        index.html               날짜별 다이제스트 목록
+        days/<YYYY-MM-DD>.html   날짜별 기사 목록 (썸네일 포함)
+        articles/<id>.html       기사별 페이지 (gen_image 썸네일, 도파민 포인트)
+        tags/index.html          키워드 목록, tags/<키워드 해시>.html 키워드별 기사 목록
+        images/<id>.png          gen_image 썸네일
+
+    증분 빌드: 페이지마다 입력(기사 내용, 이미지 파일 크기/수정 시각, 하위 페이지 해시)의 해시를
+    manifest.json에 기록해 두고, 해시가 바뀐 페이지만 다시 쓰며 더 이상 없는 페이지는 지웁니다.
+    send()로 받은 콘텐츠(미전송 기사 다이제스트)는 빌드 계기로만 쓰고, 사이트는 항상 DB 기준으로 만듭니다.
+
+    Args:
+        output_dir (str): 사이트를 생성할 디렉토리
+        site_title (str): 사이트 제목
+        days (int): 최근 며칠간 수집된 기사로 사이트를 만들지 (0이면 전체)
+        min_tag_articles (int): 키워드 페이지를 만들 최소 기사 수 (기사 하나뿐인 키워드는 색인하지 않음)
+    """
+
+    def __init__(self, output_dir: str, site_title: str = "도파민 포인트 다이제스트", days: int = 30,
+                 min_tag_articles: int = 2):
+        self.output_dir = output_dir
+        self.site_title = site_title
+        self.days = days
+        self.min_tag_articles = min_tag_articles
+        self._with_image = set() # 썸네일이 있는 기사 ID (_plan에서 채움)
+
+    def send(self, content: str):
+        """DB 기준으로 사이트를 증분 빌드합니다 (content는 사용하지 않음)."""
+        self.build()
+
+    def build(self, full: bool = False) -> Dict[str, int]:
+        """사이트를 빌드합니다.
+
+        Args:
+            full (bool): True면 manifest를 무시하고 모든 페이지를 다시 씁니다.
+
+        Returns:
+            Dict[str, int]: written(다시 쓴 파일), unchanged(건너뛴 파일), removed(지운 파일) 수
+        """
+        start = time.perf_counter()
+        since = (datetime.now() - timedelta(days=self.days)).isoformat(sep=' ', timespec='seconds') if self.days else None
+        articles = get_processed_articles(since)
+
+        previous = {} if full else self._load_manifest()
+        pages = self._plan(articles)
+        manifest: Dict[str, str] = {}
+        stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+        for path, (page_hash, write) in pages.items():
+            manifest[path] = page_hash
+            if previous.get(path) == page_hash:
+                stats['unchanged'] += 1
+                continue
+            target = os.path.join(self.output_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if write(target):
+                stats['written'] += 1
+            else:
+                manifest.pop(path) # 쓰지 못한 파일(이미지 변환 실패 등)은 다음 빌드에서 다시 시도
+
+        for path in previous.keys() - manifest.keys():
+            try:
+                os.remove(os.path.join(self.output_dir, path))
+                stats['removed'] += 1
+            except FileNotFoundError:
+                pass
+        self._save_manifest(manifest)
+        logging.info(f"정적 사이트 빌드 완료 ({self.output_dir}): 기사 {len(articles)}건, 파일 {stats['written']}개 갱신, "
+                     f"{stats['unchanged']}개 유지, {stats['removed']}개 삭제 ({(time.perf_counter() - start) * 1000:.1f}ms)")
+        return stats
+
+    def _plan(self, articles: List[Article]) -> Dict[str, Tuple[str, Callable[[str], bool]]]:
+        """사이트의 모든 파일에 대해 경로 -> (입력 해시, 파일을 쓰는 함수)를 만듭니다. 페이지는 여기서 렌더링하지 않습니다."""
+        pages: Dict[str, Tuple[str, Callable[[str], bool]]] = {}
+        by_day: Dict[str, List[Article]] = defaultdict(list)
+        by_tag: Dict[str, List[Article]] = defaultdict(list)
+        article_hashes: Dict[int, str] = {}
+        self._with_image.clear()
+
+        for article in articles:
+            image = self._image_key(article)
+            article_hash = _digest(SITE_VERSION, article.id, article.title, article.link, article.scraped_at,
+                                   *article.dopamine_points, image)
+            article_hashes[article.id] = article_hash
+            pages[f"articles/{article.id}.html"] = (article_hash, lambda target, article=article, image=image:
+                                                    self._write_text(target, self._render_article(article, bool(image))))
+            if image:
+                self._with_image.add(article.id)
+                pages[f"images/{article.id}.png"] = (_digest(SITE_VERSION, image), lambda target, source=article.gen_image:
+                                                     self._write_thumbnail(source, target))
+            by_day[(article.scraped_at or '')[:10] or 'unknown'].append(article)
+            for keyword in extract_keywords(article):
+                by_tag[keyword].append(article)
+
+        for day, day_articles in by_day.items():
+            day_hash = _digest(SITE_VERSION, day, *(article_hashes[article.id] for article in day_articles))
+            pages[f"days/{day}.html"] = (day_hash, lambda target, day=day, day_articles=day_articles:
+                                         self._write_text(target, self._render_day(day, day_articles)))
+
+        tags = {keyword: members for keyword, members in by_tag.items() if len(members) >= self.min_tag_articles}
+        for keyword, members in tags.items():
+            tag_hash = _digest(SITE_VERSION, keyword, *(article_hashes[article.id] for article in members))
+            pages[f"tags/{self._tag_slug(keyword)}.html"] = (tag_hash, lambda target, keyword=keyword, members=members:
+                                                             self._write_text(target, self._render_tag(keyword, members)))
+        tag_counts = sorted(((keyword, len(members)) for keyword, members in tags.items()), key=lambda item: (-item[1], item[0]))
+        pages["tags/index.html"] = (_digest(SITE_VERSION, *(f"{keyword}:{count}" for keyword, count in tag_counts)),
+                                    lambda target: self._write_text(target, self._render_tag_index(tag_counts)))
+
+        day_counts = sorted(((day, len(day_articles)) for day, day_articles in by_day.items()), reverse=True)
+        pages["index.html"] = (_digest(SITE_VERSION, self.site_title, *(f"{day}:{count}" for day, count in day_counts)),
+                               lambda target: self._write_text(target, self._render_index(day_counts)))
+        return pages
+
+    @staticmethod
+    def _image_key(article: Article) -> Optional[str]:
+        """gen_image 파일의 (경로, 크기, 수정 시각). 파일이 없으면 None"""
+        if not article.gen_image:
+            return None
+        try:
+            stat = os.stat(article.gen_image)
+        except OSError:
+            return None
+        return f"{article.gen_image}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @staticmethod
+    def _tag_slug(keyword: str) -> str:
+        return hashlib.blake2b(keyword.encode('utf-8'), digest_size=6).hexdigest()
+
+    # --- 페이지 렌더링 ---
+    def _article_item(self, article: Article, root: str) -> str:
+        thumbnail = (f'<img class="thumb" src="{root}images/{article.id}.png" alt="" loading="lazy">'
+                     if article.id in self._with_image else '')
+        points = "".join(f"<li>{html.escape(point)}</li>" for point in article.dopamine_points)
+        return (f'<li>{thumbnail}<a href="{root}articles/{article.id}.html">{html.escape(article.title)}</a>'
+                f'<ol>{points}</ol></li>')
+
+    def _render_article(self, article: Article, has_image: bool) -> str:
+        day = (article.scraped_at or '')[:10] or 'unknown'
+        image = f'<p><img src="../images/{article.id}.png" alt="{html.escape(article.title)}"></p>\n' if has_image else ''
+        points = "".join(f"<li>{html.escape(point)}</li>" for point in article.dopamine_points) or "<li>추출된 포인트 없음</li>"
+        keywords = ", ".join(html.escape(keyword) for keyword in extract_keywords(article))
+        body = (f'{image}<p><a href="{html.escape(article.link)}">원문 보기</a> · '
+                f'<a href="../days/{day}.html">{day} 다이제스트</a></p>\n'
+                f'<h2>도파민 포인트</h2>\n<ol>{points}</ol>\n<p>키워드: {keywords}</p>')
+        return _layout(article.title, body, "../", self.site_title)
+
+    def _render_day(self, day: str, articles: List[Article]) -> str:
+        items = "\n".join(self._article_item(article, "../") for article in articles)
+        return _layout(f"{day} 다이제스트", f'<ol class="articles">\n{items}\n</ol>', "../", self.site_title)
+
+    def _render_tag(self, keyword: str, articles: List[Article]) -> str:
+        items = "\n".join(self._article_item(article, "../") for article in articles)
+        return _layout(f"키워드: {keyword}", f'<ol class="articles">\n{items}\n</ol>', "../", self.site_title)
+
+    def _render_tag_index(self, tag_counts: List[Tuple[str, int]]) -> str:
+        items = "\n".join(f'<li><a href="{self._tag_slug(keyword)}.html">{html.escape(keyword)}</a> ({count})</li>'
+                          for keyword, count in tag_counts)
+        return _layout("키워드", f"<ul>\n{items}\n</ul>", "../", self.site_title)
+
+    def _render_index(self, day_counts: List[Tuple[str, int]]) -> str:
+        items = "\n".join(f'<li><a href="days/{day}.html">{day}</a> ({count}건)</li>' for day, count in day_counts)
+        return _layout(self.site_title, f"<ul>\n{items}\n</ul>", "", self.site_title)
+
+    # --- 파일 기록 ---
+    @staticmethod
+    def _write_text(target: str, content: str) -> bool:
+        temp_path = f"{target}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, target)
+        return True
+
+    @staticmethod
+    def _write_thumbnail(source: str, target: str) -> bool:
+        try:
+            from PIL import Image # 썸네일을 만들 때만 로드
+            with Image.open(source) as image:
+                image.thumbnail(THUMBNAIL_SIZE)
+                image.save(f"{target}.tmp", format="PNG", optimize=True)
+            os.replace(f"{target}.tmp", target)
+            return True
+        except Exception as e:
+            logging.warning(f"썸네일 생성 실패 ({source}): {e}")
+            return False
+
+    def _load_manifest(self) -> Dict[str, str]:
+        try:
+            with open(os.path.join(self.output_dir, MANIFEST_FILE), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # 페이지 구조나 공통 레이아웃(사이트 제목)이 바뀌었으면 전체를 다시 빌드
+        if manifest.get('version') != SITE_VERSION or manifest.get('site_title') != self.site_title:
+            return {}
+        return manifest.get('pages', {})
+
+    def _save_manifest(self, pages: Dict[str, str]):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write_text(os.path.join(self.output_dir, MANIFEST_FILE),
+                         json.dumps({'version': SITE_VERSION, 'site_title': self.site_title, 'built_at': datetime.now().isoformat(timespec='seconds'),
+                                     'pages': pages}, ensure_ascii=False))
@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
 
+from core.pipeline import run_in_thread
+
 class BaseFormatter(ABC):
+    """포맷 단계의 기본 클래스. format만 구현하면 aformat은 기본 구현(스레드 풀)을 사용합니다."""
+
     @abstractmethod
     def format(self, data):
         """데이터를 특정 형식으로 포맷합니다."""
-        pass 
\ No newline at end of file
+        pass
+
+    async def aformat(self, data):
+        """format의 비동기 버전. 기본 구현은 format을 공유 스레드 풀에서 실행합니다."""
+        return await run_in_thread(self.format, data)
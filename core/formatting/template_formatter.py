@@ -0,0 +1,237 @@
+import html
+import json
+import logging
+import re
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from .base_formatter import BaseFormatter
+from core.models import Article
+
+
+def _identity(value: str) -> str:
+    return value
+
+_MARKDOWN_SPECIAL_CHARS = "\\`*_[]()#<>|" # 백슬래시를 가장 먼저 처리해야 이중 이스케이프되지 않음
+_JSON_SPECIAL = re.compile(r'[\x00-\x1f"\\]')
+
+def _escape_markdown(value: str) -> str:
+    # 특수 문자가 없는 경우가 대부분이므로 문자별 in 검사 후 필요한 것만 replace (translate보다 빠름)
+    for char in _MARKDOWN_SPECIAL_CHARS:
+        if char in value:
+            value = value.replace(char, "\\" + char)
+    return value
+
+def _escape_markdown_url(value: str) -> str:
+    return value.replace(" ", "%20").replace("(", "%28").replace(")", "%29")
+
+def _escape_slack_json(value: str) -> str:
+    """Slack mrkdwn 제어 문자(&, <, >)를 이스케이프한 뒤 JSON 문자열 내부에 넣을 수 있게 변환합니다."""
+    value = value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return json.dumps(value, ensure_ascii=False)[1:-1] if _JSON_SPECIAL.search(value) else value
+
+
+@dataclass(frozen=True)
+class Template:
+    """기사 목록 출력 형식 정의
+
+    item/point는 str.format 문자열이며 다음 필드를 사용할 수 있습니다.
+        item:  {number} (1부터), {title}, {link}, {points} (point를 point_separator로 이어 붙인 문자열)
+        point: {number} (1부터), {point}
+    title/link/point 값은 escape/escape_url을 거친 뒤 채워집니다.
+    header/footer는 기사가 한 건 이상일 때만 출력되며, 기사 사이에는 separator가 들어갑니다.
+    """
+    name: str
+    item: str
+    point: str
+    no_points: str
+    point_separator: str = "\n"
+    separator: str = "\n\n"
+    header: str = ""
+    footer: str = ""
+    escape: Callable[[str], str] = _identity
+    escape_url: Callable[[str], str] = _identity
+
+
+TEMPLATES: Dict[str, Template] = {}
+
+def register_template(template: Template):
+    """템플릿을 이름으로 등록합니다. 같은 이름이 있으면 교체하고 컴파일 캐시를 비웁니다."""
+    TEMPLATES[template.name] = template
+    compile_template.cache_clear()
+
+
+# 컴파일된 렌더 함수의 본문. {point_expr}/{item_expr}에 템플릿에서 변환한 f-string이 들어감
+_RENDER_SOURCE = """
+def render(articles, chunk_size):
+    buffer = []
+    append = buffer.append
+    number = 0
+    for article in articles:
+        number += 1
+        append(header if number == 1 else separator)
+        points = article.dopamine_points
+        if points:
+            points = point_separator.join([{point_expr} for index, point in enumerate({escaped_points}, 1)])
+        else:
+            points = no_points
+        title = {title_expr}
+        link = {link_expr}
+        append({item_expr})
+        if len(buffer) >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+    if number:
+        append(footer)
+    if buffer:
+        yield "".join(buffer)
+"""
+
+
+def _to_fstring(template_text: str, fields: Dict[str, str]) -> str:
+    """str.format 템플릿을 같은 결과를 내는 f-string 소스로 변환합니다.
+
+    Args:
+        template_text (str): 변환할 템플릿 (예: "{number:02d}. {title}")
+        fields (Dict[str, str]): 템플릿 필드 이름 -> 렌더 함수 안의 변수 이름
+    """
+    parts = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template_text):
+        literal = literal.encode('unicode_escape').decode('ascii').replace('"', '\\"')
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field_name is None:
+            continue
+        if field_name not in fields:
+            raise ValueError(f"템플릿에서 지원하지 않는 필드입니다: {{{field_name}}} (사용 가능: {', '.join(fields)})")
+        if '{' in format_spec:
+            raise ValueError(f"중첩된 형식 지정은 지원하지 않습니다: {{{field_name}:{format_spec}}}")
+        parts.append("{" + fields[field_name] + (f"!{conversion}" if conversion else "")
+                     + (f":{format_spec}" if format_spec else "") + "}")
+    return 'f"' + "".join(parts) + '"'
+
+
+class CompiledTemplate:
+    """템플릿을 파이썬 렌더 함수로 컴파일한 결과 (compile_template으로 생성)
+
+    item/point 템플릿을 f-string으로 바꾼 기사 루프 전체를 한 번 compile 해 두므로,
+    렌더링할 때 기사마다 str.format으로 템플릿을 다시 해석하거나 함수를 호출하지 않습니다.
+    """
+
+    def __init__(self, template: Template):
+        self.template = template
+        # 이스케이프가 없는(_identity) 필드는 함수 호출 자체를 생략
+        def escaped(function: Callable[[str], str], name: str, expression: str) -> str:
+            return expression if function is _identity else f"{name}({expression})"
+
+        source = _RENDER_SOURCE.format(
+            escaped_points='points' if template.escape is _identity else 'map(escape, points)',
+            title_expr=escaped(template.escape, 'escape', "article.title or '제목 없음'"),
+            link_expr=escaped(template.escape_url, 'escape_url', "article.link or '링크 없음'"),
+            point_expr=_to_fstring(template.point, {'number': 'index', 'point': 'point'}),
+            item_expr=_to_fstring(template.item, {'number': 'number', 'title': 'title', 'link': 'link', 'points': 'points'}),
+        )
+        namespace = {
+            'header': template.header, 'separator': template.separator, 'footer': template.footer,
+            'point_separator': template.point_separator, 'no_points': template.no_points,
+            'escape': template.escape, 'escape_url': template.escape_url,
+        }
+        exec(compile(source, f"<template {template.name}>", "exec"), namespace)
+        self._render = namespace['render']
+
+    def render(self, articles: Iterable[Article], chunk_size: int = 256) -> Iterator[str]:
+        """기사를 순서대로 렌더링하며 chunk_size건마다 이어 붙인 문자열 조각을 돌려줍니다.
+
+        조각을 모두 "".join 하면 전체 결과가 되며, 기사 전체를 담은 문자열을 한 번에 만들지 않으므로
+        파일/소켓에 바로 쓰면 출력 크기와 관계없이 메모리 사용량이 일정합니다.
+        """
+        return self._render(articles, chunk_size)
+
+
+@lru_cache(maxsize=None)
+def compile_template(name: str) -> CompiledTemplate:
+    """이름으로 등록된 템플릿을 컴파일합니다. 같은 이름은 한 번만 컴파일하고 캐시된 렌더러를 재사용합니다."""
+    template = TEMPLATES.get(name)
+    if template is None:
+        raise ValueError(f"알 수 없는 출력 템플릿입니다: {name} (사용 가능: {', '.join(TEMPLATES)})")
+    return CompiledTemplate(template)
+
+
+# 기본 텍스트 (DefaultFormatter와 같은 형식)
+register_template(Template(
+    name='text',
+    item="{number:02d}. '{title}'\n{link}\n\n도파민 포인트\n{points}",
+    point="{number}. {point}",
+    no_points="- 추출된 포인트 없음",
+))
+register_template(Template(
+    name='markdown',
+    item="## {number:02d}. [{title}]({link})\n\n**도파민 포인트**\n\n{points}",
+    point="{number}. {point}",
+    no_points="- 추출된 포인트 없음",
+    footer="\n",
+    escape=_escape_markdown,
+    escape_url=_escape_markdown_url,
+))
+# Slack Block Kit 메시지 JSON ({"blocks": [...]}). 기사마다 section 블록 하나와 divider
+# (Slack은 메시지당 블록 50개까지 허용하므로 SlackSender가 블록 경계에서 나누어 blocks로 보냄)
+register_template(Template(
+    name='slack_blocks',
+    item='{{"type":"section","text":{{"type":"mrkdwn","text":"*{number:02d}. <{link}|{title}>*\\n{points}"}}}}',
+    point="{number}. {point}",
+    point_separator="\\n",
+    no_points="- 추출된 포인트 없음",
+    separator=',{"type":"divider"},',
+    header='{"blocks":[',
+    footer="]}",
+    escape=_escape_slack_json,
+    escape_url=_escape_slack_json,
+))
+register_template(Template(
+    name='html',
+    item='<li><a href="{link}">{title}</a>\n<ol class="dopamine-points">{points}</ol></li>',
+    point="<li>{point}</li>",
+    point_separator="",
+    no_points='<li class="empty">추출된 포인트 없음</li>',
+    separator="\n",
+    header='<!DOCTYPE html>\n<html lang="ko">\n<head><meta charset="utf-8"><title>도파민 포인트</title></head>\n'
+           '<body>\n<ol class="articles">\n',
+    footer="\n</ol>\n</body>\n</html>\n",
+    escape=html.escape,
+    escape_url=html.escape,
+))
+
+
+class TemplateFormatter(BaseFormatter):
+    """등록된 템플릿(text, markdown, slack_blocks, html)으로 기사 목록을 포맷하는 클래스
+
+    Args:
+        template_name (str): 사용할 템플릿 이름
+        chunk_size (int): render()가 조각 하나에 담는 기사 수
+    """
+
+    def __init__(self, template_name: str = 'text', chunk_size: int = 256):
+        self.template_name = template_name
+        self.chunk_size = chunk_size
+        self.compiled = compile_template(template_name)
+
+    def render(self, data: Iterable[Article]) -> Iterator[str]:
+        """기사 목록을 문자열 조각 단위로 렌더링합니다 (스트리밍 출력용)."""
+        return self.compiled.render(data, self.chunk_size)
+
+    def format(self, data: List[Article]) -> str:
+        """기사 리스트 전체를 하나의 문자열로 포맷합니다. 데이터가 없으면 빈 문자열을 반환합니다.
+
+        Args:
+            data (List[Article]): 포맷할 기사 리스트 (title, link, dopamine_points 사용)
+
+        Returns:
+            str: 포맷팅된 전체 결과 문자열
+        """
+        if not data:
+            logging.warning("포맷할 데이터가 없습니다.")
+            return ""
+        formatted_output = "".join(self.render(data))
+        logging.info(f"총 {len(data)}개 항목에 대한 포맷팅 완료 ({self.template_name})")
+        return formatted_output
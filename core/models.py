@@ -1,4 +1,8 @@
 """데이터베이스 테이블 스키마 (모델) 정의"""
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
 
 # articles 테이블 생성 SQL 문
 ARTICLES_TABLE_SCHEMA = """
@@ -11,10 +15,313 @@ ARTICLES_TABLE_SCHEMA = """
         gen_image TEXT,                        -- 생성된 이미지 경로/URL (선택)
         posting_image TEXT,                    -- 포스팅용 이미지 경로/URL (선택)
         posting_video TEXT,                    -- 포스팅용 비디오 경로/URL (선택)
-        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP -- 스크랩 시간 (자동 기록)
-        -- 필요시 여기에 컬럼 추가 (예: published_date TIMESTAMP)
+        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- 스크랩 시간 (자동 기록)
+        published TEXT,                        -- 피드에 기록된 발행일 (선택)
+        source_url TEXT,                       -- 수집한 피드 URL (선택)
+        status TEXT DEFAULT 'new',             -- 처리 상태 (ArticleStatus)
+        cluster_id INTEGER                     -- 같은 소식을 다룬 기사 묶음 (story_clusters.id)
     )
 """
 
+# 기존 DB에 나중에 추가된 컬럼 (initialize_db에서 ALTER TABLE로 보강)
+ARTICLES_TABLE_MIGRATIONS = {
+    'published': "TEXT",
+    'source_url': "TEXT",
+    'status': "TEXT DEFAULT 'new'",
+    'cluster_id': "INTEGER",
+}
+
+# status 컬럼이 생기기 전 버전이 AI 처리 실패 시 dopamine_points에 대신 저장하던 오류 문구
+# (status 마이그레이션 때 이 문구가 든 기사는 AI_FAILED로 표시하고 재시도 큐에 등록)
+LEGACY_AI_ERROR_MARKERS = ("AI 처리 중 오류 발생", "AI 모델 오류로 추출 실패", "처리/저장 오류")
+
+# 채널별 미전송 기사 조회(status + scraped_at 범위)용 인덱스 (status 컬럼 마이그레이션 이후 생성)
+ARTICLES_STATUS_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_articles_status_scraped ON articles (status, scraped_at)
+"""
+
+# 최신순 기사 목록 조회(get_all_articles, 읽기 전용 API 페이지 조회)용 인덱스
+ARTICLES_SCRAPED_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles (scraped_at)
+"""
+
+# Article.from_row가 기대하는 SELECT 컬럼 순서
+ARTICLE_COLUMNS = (
+    'id', 'title', 'link', 'summary', 'dopamine_points', 'gen_image',
+    'posting_image', 'posting_video', 'scraped_at', 'published', 'source_url', 'status', 'cluster_id',
+)
+ARTICLE_SELECT_COLUMNS = ", ".join(ARTICLE_COLUMNS)
+
+# Article.to_row가 반환하는 INSERT 컬럼 순서
+ARTICLE_INSERT_COLUMNS = (
+    'title', 'link', 'summary', 'dopamine_points', 'published', 'source_url', 'status', 'scraped_at', 'cluster_id',
+)
+
+
+class ArticleStatus:
+    """articles.status 컬럼에 저장되는 처리 상태 값"""
+    NEW = 'new'              # 수집만 된 상태
+    PROCESSED = 'processed'  # AI 처리 완료
+    AI_PENDING = 'ai_pending'  # AI 처리 실패 또는 예산/마감으로 연기, 재시도 큐 대기 중
+    AI_FAILED = 'ai_failed'    # 재시도 한도 초과로 dead letter 처리됨
+
+
+# 재시도 큐 (AI 처리/이미지 생성 실패 기사를 attempt 수와 다음 시도 시각과 함께 보관)
+PROCESSING_QUEUE_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS processing_queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL,           -- articles.id
+        task TEXT NOT NULL,                    -- 작업 종류 (QueueTask)
+        attempts INTEGER NOT NULL DEFAULT 0,   -- 지금까지 실패한 횟수
+        next_attempt_at TIMESTAMP NOT NULL,    -- 다음 재시도 가능 시각
+        last_error TEXT,                       -- 마지막 오류 메시지
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (article_id, task)
+    )
+"""
+PROCESSING_QUEUE_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_processing_queue_due ON processing_queue (task, next_attempt_at)
+"""
+
+# 재시도 한도를 넘긴 작업 (더 이상 API 호출을 낭비하지 않도록 격리)
+DEAD_LETTERS_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dead_letters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL,           -- articles.id
+        task TEXT NOT NULL,                    -- 작업 종류 (QueueTask)
+        attempts INTEGER NOT NULL,             -- 최종 실패 횟수
+        last_error TEXT,                       -- 마지막 오류 메시지
+        failed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (article_id, task)
+    )
+"""
+
+
+class QueueTask:
+    """processing_queue / dead_letters의 task 컬럼 값"""
+    AI = 'ai'        # 도파민 포인트 추출
+    IMAGE = 'image'  # 하프톤 이미지 생성
+
+
+# 파이프라인 단계별 실행 시간 (utils.tracing의 span 기록)
+TRACES_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS traces (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id TEXT NOT NULL,                  -- 실행(프로세스) 단위 식별자
+        stage TEXT NOT NULL,                   -- 단계 이름 (예: scrape, llm.dopamine_points)
+        article_link TEXT,                     -- 대상 기사 링크 (기사 단위 span인 경우)
+        feed_url TEXT,                         -- 대상 피드 URL
+        started_at REAL NOT NULL,              -- 시작 시각 (epoch seconds)
+        duration_ms REAL NOT NULL,             -- 소요 시간 (ms)
+        status TEXT NOT NULL                   -- 'ok' 또는 'error'
+    )
+"""
+TRACES_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_traces_run_stage ON traces (run_id, stage)
+"""
+
+
+# 일별·API·모델별 누적 사용량 (utils.metrics의 할당량 게이지 계산에 사용)
+API_USAGE_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS api_usage (
+        day TEXT NOT NULL,                     -- 날짜 (YYYY-MM-DD)
+        api TEXT NOT NULL,                     -- 'gemini' 또는 'imagen'
+        model TEXT NOT NULL,                   -- 모델 이름
+        calls INTEGER NOT NULL DEFAULT 0,      -- 호출 수 (오류 포함)
+        errors INTEGER NOT NULL DEFAULT 0,     -- 오류 수
+        prompt_tokens INTEGER NOT NULL DEFAULT 0,
+        output_tokens INTEGER NOT NULL DEFAULT 0,
+        image_bytes INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, api, model)
+    )
+"""
+
+# 일별·API별 호출 예산 장부 (core.processing.prioritizer.BudgetScheduler가 유료 호출 전에 예약)
+API_BUDGET_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS api_budget (
+        day TEXT NOT NULL,                     -- 날짜 (YYYY-MM-DD)
+        api TEXT NOT NULL,                     -- 'gemini' 또는 'imagen'
+        spent INTEGER NOT NULL DEFAULT 0,      -- 예산에서 사용한 호출 수 (실행 중에는 예약분 포함)
+        deferred INTEGER NOT NULL DEFAULT 0,   -- 예산/마감 때문에 다음 실행으로 미룬 기사 수
+        updated_at TIMESTAMP,
+        PRIMARY KEY (day, api)
+    )
+"""
+
+
+
+# 같은 소식을 다룬 기사 묶음 (core.processing.clustering.StoryClusterer). 묶음마다 AI 처리는 한 번만 하고
+# 나머지 기사는 묶음의 도파민 포인트를 물려받음
+STORY_CLUSTERS_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS story_clusters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dopamine_points TEXT,                  -- 대표 기사에서 추출한 도파민 포인트 (JSON, 처리 전에는 NULL)
+        representative_id INTEGER,             -- 포인트를 추출한 대표 기사 (articles.id)
+        created_at TIMESTAMP NOT NULL
+    )
+"""
+ARTICLES_CLUSTER_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_articles_cluster ON articles (cluster_id)
+"""
+
+# 전송 outbox (포맷팅된 결과를 채널별로 보관해, 전송 도중 중단되어도 수집/AI 처리 없이 이어서 전송)
+DELIVERY_OUTBOX_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS delivery_outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        channel TEXT NOT NULL,                 -- 전송 채널 이름 (예: console, slack)
+        payload TEXT NOT NULL,                 -- 포맷팅된 전송 내용
+        status TEXT NOT NULL,                  -- OutboxStatus
+        attempts INTEGER NOT NULL DEFAULT 0,   -- 지금까지 실패한 횟수
+        last_error TEXT,                       -- 마지막 오류 메시지
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        delivered_at TIMESTAMP                 -- 전송 완료 시각
+    )
+"""
+DELIVERY_OUTBOX_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_delivery_outbox_pending ON delivery_outbox (status, channel, id)
+"""
+
+# 기사별·채널별 전송 기록. outbox에 등록하는 시점에 행을 만들어 다음 실행에서 같은 기사를 다시 고르지 않도록 하고,
+# 해당 outbox 항목이 전송되면 delivered_at을 채움 (outbox 항목이 failed가 되면 행을 지워 다시 전송 대상이 됨)
+ARTICLE_DELIVERIES_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS article_deliveries (
+        article_id INTEGER NOT NULL,           -- articles.id
+        channel TEXT NOT NULL,                 -- 전송 채널 이름
+        outbox_id INTEGER NOT NULL,            -- delivery_outbox.id
+        delivered_at TIMESTAMP,                -- 전송 완료 시각 (NULL이면 outbox에서 전송 대기 중)
+        PRIMARY KEY (article_id, channel)
+    )
+"""
+ARTICLE_DELIVERIES_INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_article_deliveries_outbox ON article_deliveries (outbox_id)
+"""
+
+# 기사 원문 본문 (ArticleFetcher가 link를 따라가 추출한 본문을 zlib 압축해 보관, 한 번 가져오면 이후 단계/실행에서 재사용)
+# 기사를 articles에 저장하기 전(AI 처리 전)에 가져오므로 link를 키로 사용
+ARTICLE_CONTENTS_TABLE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS article_contents (
+        link TEXT PRIMARY KEY,                 -- articles.link
+        body BLOB NOT NULL,                    -- 추출한 본문 텍스트 (UTF-8, zlib 압축)
+        etag TEXT,                             -- 조건부 요청용 응답 ETag
+        last_modified TEXT,                    -- 조건부 요청용 응답 Last-Modified
+        fetched_at TIMESTAMP NOT NULL          -- 마지막으로 원문을 확인한 시각 (304 응답 포함)
+    )
+"""
+
+
+class OutboxStatus:
+    """delivery_outbox.status 컬럼 값"""
+    PENDING = 'pending'  # 전송 대기 (재시도 포함)
+    SENT = 'sent'        # 전송 완료
+    FAILED = 'failed'    # 채널별 최대 시도 횟수 초과
+
+
+@dataclass(slots=True)
+class Delivery:
+    """delivery_outbox 한 행 (채널 하나로 보낼 전송 내용)"""
+    id: int
+    channel: str
+    payload: str
+    attempts: int = 0
+
+@dataclass(slots=True)
+class ArticleContent:
+    """article_contents 한 행 (압축을 푼 본문)"""
+    link: str
+    text: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: Optional[str] = None
+
+@dataclass(slots=True)
+class Article:
+    """파이프라인 전 단계(수집 → AI 처리 → 저장 → 포맷팅)에서 공유하는 기사 레코드.
+
+    __slots__ 기반이라 인스턴스마다 __dict__가 없고, 키 누락 대신 명시적인 필드를 가집니다.
+    """
+    title: str
+    link: str
+    summary: str = ''
+    published: str = ''
+    source_url: str = ''
+    dopamine_points: List[str] = field(default_factory=list)
+    status: str = ArticleStatus.NEW
+    id: Optional[int] = None
+    gen_image: Optional[str] = None
+    posting_image: Optional[str] = None
+    posting_video: Optional[str] = None
+    scraped_at: Optional[str] = None
+    content: str = ''  # 원문 본문 (article_contents에서 채움, articles 테이블에는 저장하지 않음)
+    cluster_id: Optional[int] = None  # 같은 소식을 다룬 기사 묶음 (StoryClusterer가 채움)
+
+    @classmethod
+    def from_row(cls, row) -> "Article":
+        """ARTICLE_SELECT_COLUMNS 순서로 조회한 DB 행(sqlite3.Row 또는 튜플)에서 Article을 생성합니다.
+
+        중간 딕셔너리를 만들지 않고 행의 값 객체를 그대로 필드에 연결합니다.
+        """
+        (article_id, title, link, summary, dopamine_points_json, gen_image,
+         posting_image, posting_video, scraped_at, published, source_url, status, cluster_id) = row
+        return cls(
+            title=title,
+            link=link,
+            summary=summary or '',
+            published=published or '',
+            source_url=source_url or '',
+            dopamine_points=decode_dopamine_points(dopamine_points_json, link),
+            status=status or ArticleStatus.NEW,
+            id=article_id,
+            gen_image=gen_image,
+            posting_image=posting_image,
+            posting_video=posting_video,
+            scraped_at=scraped_at,
+            cluster_id=cluster_id,
+        )
+
+    def to_row(self, scraped_at: Any = None) -> Tuple[Any, ...]:
+        """ARTICLE_INSERT_COLUMNS 순서의 INSERT 파라미터 튜플을 반환합니다."""
+        return (
+            self.title,
+            self.link,
+            self.summary,
+            json.dumps(self.dopamine_points, ensure_ascii=False),
+            self.published,
+            self.source_url,
+            self.status,
+            scraped_at if scraped_at is not None else self.scraped_at,
+            self.cluster_id,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Article":
+        """이전 방식의 기사 딕셔너리를 Article로 변환합니다 (알 수 없는 키는 무시)."""
+        return cls(
+            title=data.get('title', ''),
+            link=data.get('link', ''),
+            summary=data.get('summary') or '',
+            published=data.get('published') or '',
+            source_url=data.get('source_url') or '',
+            dopamine_points=list(data.get('dopamine_points') or []),
+            status=data.get('status') or ArticleStatus.NEW,
+            id=data.get('id'),
+            gen_image=data.get('gen_image'),
+            posting_image=data.get('posting_image'),
+            posting_video=data.get('posting_video'),
+            scraped_at=data.get('scraped_at'),
+            content=data.get('content') or '',
+            cluster_id=data.get('cluster_id'),
+        )
+
+
+def decode_dopamine_points(raw: Optional[str], link: str = '') -> List[str]:
+    """DB에 JSON 문자열로 저장된 dopamine_points를 리스트로 변환합니다. 파싱 실패 시 빈 리스트."""
+    if not raw:
+        return []
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        logging.warning(f"DB에서 조회한 dopamine_points JSON 파싱 실패: link={link}")
+        return []
+
 # 필요에 따라 다른 테이블 스키마도 여기에 추가할 수 있습니다.
-# USERS_TABLE_SCHEMA = """ ... """ 
\ No newline at end of file
+# USERS_TABLE_SCHEMA = """ ... """
@@ -0,0 +1,153 @@
+"""파이프라인 단계(수집/처리/포맷/전송) 레지스트리와 동기 구현용 비동기 어댑터
+
+네 단계의 기본 클래스(BaseScraper, BaseProcessor, BaseFormatter, BaseSender)는 블로킹 메서드
+(scrape/process/format/send)만 구현하면 되고, 비동기/일괄 메서드(ascrape, aprocess_many, asend 등)의
+기본 구현은 run_in_thread로 동기 메서드를 이 모듈의 공유 스레드 풀에서 실행합니다.
+I/O를 직접 겹칠 수 있는 구현(비동기 HTTP 클라이언트, 일괄 API 등)은 해당 메서드를 재정의하면 됩니다.
+
+main.py는 config['pipeline']에 적힌 이름으로 단계를 만듭니다 (create_stage).
+전송 단계는 DELIVERY_CHANNELS의 채널 이름마다 DeliveryDispatcher가 같은 레지스트리(sender)에서 만듭니다.
+새 구현은 register_stage로 등록하면 설정(PIPELINE_SCRAPER 등)만으로 선택할 수 있습니다.
+"""
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, TypeVar
+
+# asyncio는 임포트 비용이 있어 비동기 메서드를 실제로 사용할 때 지연 임포트합니다.
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+STAGE_THREAD_WORKERS = 8 # 동기 구현을 비동기로 실행하는 공유 스레드 풀 크기 (단계 간 공유)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def stage_executor() -> ThreadPoolExecutor:
+    """동기 단계 메서드를 실행하는 공유 스레드 풀 (처음 사용할 때 생성)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=STAGE_THREAD_WORKERS, thread_name_prefix='stage')
+        return _executor
+
+
+async def run_in_thread(func: Callable[..., R], *args, **kwargs) -> R:
+    """블로킹 함수를 공유 스레드 풀에서 실행하고 결과를 기다립니다.
+
+    호출 시점의 contextvars(article_context 등 트레이싱 문맥)를 복사해 스레드에서도 그대로 사용합니다.
+    """
+    import asyncio
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        stage_executor(), functools.partial(context.run, func, *args, **kwargs),
+    )
+
+
+async def gather_limited(func: Callable[[T], Awaitable[R]], items: Iterable[T], concurrency: int) -> List[Any]:
+    """items마다 func를 최대 concurrency개씩 동시에 실행하고 결과를 입력 순서대로 반환합니다.
+
+    한 항목의 실패가 나머지 항목을 취소하지 않도록, 실패한 항목 자리에는 결과 대신 예외 객체가 들어갑니다.
+    """
+    import asyncio
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def limited(item: T):
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(limited(item) for item in items), return_exceptions=True)
+
+
+def shutdown_stage_executor():
+    """공유 스레드 풀을 종료합니다 (다음 사용 시 새로 생성)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor:
+        executor.shutdown(wait=True)
+
+
+# --- 단계 레지스트리 ---
+
+STAGE_KINDS = ('scraper', 'processor', 'formatter', 'sender')
+# 단계 종류 -> 생성 함수에 넘기는 설정 섹션 (config[섹션])
+STAGE_CONFIG_SECTIONS = {'scraper': 'rss', 'processor': 'ai', 'formatter': 'delivery', 'sender': 'delivery'}
+# 단계 종류 -> 이름 -> 생성 함수 (설정 섹션을 받아 단계 객체를 반환)
+STAGE_FACTORIES: Dict[str, Dict[str, Callable[[Mapping], Any]]] = {kind: {} for kind in STAGE_KINDS}
+
+
+def register_stage(kind: str, name: str, factory: Callable[[Mapping], Any]):
+    """단계 생성 함수를 (종류, 이름)으로 등록합니다. 같은 이름이 있으면 교체합니다."""
+    if kind not in STAGE_FACTORIES:
+        raise ValueError(f"알 수 없는 단계 종류입니다: {kind} (사용 가능: {', '.join(STAGE_KINDS)})")
+    STAGE_FACTORIES[kind][name] = factory
+
+
+def create_stage(kind: str, name: str, config: Mapping) -> Any:
+    """등록된 생성 함수로 단계를 만듭니다.
+
+    Args:
+        kind (str): 단계 종류 ('scraper', 'processor', 'formatter', 'sender')
+        name (str): 등록 이름 (예: 'rss', 'gemini', 'template', 'console')
+        config (Mapping): 전체 설정 (생성 함수에는 STAGE_CONFIG_SECTIONS[kind] 섹션만 전달)
+
+    Raises:
+        ValueError: 등록되지 않은 종류나 이름인 경우
+    """
+    factories = STAGE_FACTORIES.get(kind)
+    if factories is None:
+        raise ValueError(f"알 수 없는 단계 종류입니다: {kind} (사용 가능: {', '.join(STAGE_KINDS)})")
+    factory = factories.get(name)
+    if factory is None:
+        raise ValueError(f"알 수 없는 {kind} 단계입니다: {name} (사용 가능: {', '.join(factories)})")
+    return factory(config.get(STAGE_CONFIG_SECTIONS[kind], {}))
+
+
+# 기본 구현 등록. 구현 모듈은 단계를 만들 때 임포트합니다 (requests 등 선택 의존성은 해당 단계를 쓸 때만 로드).
+
+def _make_rss_scraper(rss_config: Mapping):
+    from core.data_acquisition.rss_scraper import RssScraper
+    return RssScraper(**rss_config)
+
+
+def _make_gemini_processor(ai_config: Mapping):
+    from core.processing.ai_processor import AiProcessor
+    return AiProcessor.from_config(ai_config)
+
+
+def _make_template_formatter(delivery_config: Mapping):
+    from core.formatting.template_formatter import TemplateFormatter
+    return TemplateFormatter(delivery_config.get('format', 'text'))
+
+
+def _make_console_sender(delivery_config: Mapping):
+    from core.delivery.console_sender import ConsoleSender
+    return ConsoleSender()
+
+
+def _make_slack_sender(delivery_config: Mapping):
+    from core.delivery.slack_sender import SlackSender # requests는 Slack 채널을 쓸 때만 로드
+    slack_config = delivery_config.get('slack')
+    if not slack_config:
+        raise ValueError("slack 채널을 사용하려면 SLACK_WEBHOOK_URL이 필요합니다.")
+    return SlackSender(**slack_config)
+
+
+def _make_site_sender(delivery_config: Mapping):
+    from core.delivery.static_site_sender import StaticSiteSender
+    site_config = delivery_config.get('site')
+    if not site_config:
+        raise ValueError("site 채널을 사용하려면 SITE_OUTPUT_DIR이 필요합니다.")
+    return StaticSiteSender(**site_config)
+
+
+register_stage('scraper', 'rss', _make_rss_scraper)
+register_stage('processor', 'gemini', _make_gemini_processor)
+register_stage('formatter', 'template', _make_template_formatter)
+register_stage('sender', 'console', _make_console_sender)
+register_stage('sender', 'slack', _make_slack_sender)
+register_stage('sender', 'site', _make_site_sender)
@@ -1,30 +1,69 @@
 import logging
-from typing import List, Optional, Dict
-import google.generativeai as genai
+import threading
+import time
+from datetime import timedelta
+from typing import Any, List, Mapping, Optional, Dict, Tuple
 
 from .base_processor import BaseProcessor
-# 여기에 사용할 생성형 AI 라이브러리 import (예: from google.generativeai import GenerativeModel)
+from .prompts import PromptTemplate, resolve_prompts
+from core.models import Article, ArticleStatus
+from utils.error_handler import ProcessingError
+from utils.logger import get_item_logger
+from utils.metrics import record_llm_call
+from utils.tracing import traced
+
+item_log = get_item_logger(__name__) # 기사별 프롬프트/응답 디버그 로그 (샘플링 대상)
+FULL_TEXT_PROMPT_CHARS = 4000 # 원문 본문을 사용할 때 프롬프트에 넣는 최대 글자 수 (요약은 1500자)
+PROMPT_MODES = ('inline', 'system', 'cached') # 정적 지시문 전송 방식 (앞쪽일수록 지원 범위가 넓음)
+# google.generativeai는 임포트 비용이 커서 모델 초기화 시점(_initialize_model)에 지연 임포트합니다.
 
 class AiProcessor(BaseProcessor):
     """생성형 AI를 사용하여 텍스트에서 "도파민 포인트"를 추출하는 클래스"""
 
-    def __init__(self, api_key: Optional[str] = None, model_name: str = "gemini-1.5-flash"): # 기본 모델 이름 변경
+    def __init__(self, api_key: Optional[str] = None, model_name: str = "gemini-1.5-flash", # 기본 모델 이름 변경
+                 prompt_mode: str = 'system', prompt_versions: Optional[Mapping[str, int]] = None,
+                 prompt_cache_ttl_minutes: float = 60.0):
         """AI 프로세서 초기화
         Args:
             api_key (Optional[str]): Google AI API 키
             model_name (str): 사용할 Gemini 모델 이름
+            prompt_mode (str): 프롬프트의 정적 지시문 전송 방식
+                - 'inline': 지시문과 기사별 본문을 한 문자열로 매번 전송
+                - 'system': 템플릿마다 system instruction으로 지시문을 등록하고 본문만 전송
+                - 'cached': 지시문을 캐시된 콘텐츠로 만들어 재사용 (실패하면 'system', 그것도 안 되면 'inline')
+            prompt_versions (Optional[Mapping[str, int]]): 템플릿 이름별 고정 버전 (없으면 최신 버전)
+            prompt_cache_ttl_minutes (float): 'cached' 방식에서 캐시 유지 시간
         """
+        if prompt_mode not in PROMPT_MODES:
+            raise ValueError(f"prompt_mode는 {', '.join(PROMPT_MODES)} 중 하나여야 합니다: {prompt_mode}")
         self.api_key = api_key
         self.model_name = model_name
+        self.prompt_mode = prompt_mode
+        self.prompt_cache_ttl_minutes = prompt_cache_ttl_minutes
+        self.prompts = resolve_prompts(prompt_versions)
+        self._prompt_models: Dict[str, Tuple[Any, str]] = {} # 템플릿 key -> (모델, 실제 전송 방식)
+        self._prompt_lock = threading.Lock()
         self.model = self._initialize_model() # 모델 초기화 호출
         # logging.info(f"AI Processor 초기화 완료 (모델: {self.model_name})") # _initialize_model 내부 로깅으로 대체
 
+    @classmethod
+    def from_config(cls, ai_config: Mapping) -> "AiProcessor":
+        """config['ai']로 프로세서를 만듭니다."""
+        return cls(
+            api_key=ai_config.get('api_key'),
+            model_name=ai_config.get('model_name') or "gemini-1.5-flash",
+            prompt_mode=ai_config.get('prompt_mode', 'system'),
+            prompt_versions=ai_config.get('prompt_versions'),
+            prompt_cache_ttl_minutes=ai_config.get('prompt_cache_ttl_minutes', 60.0),
+        )
+
     def _initialize_model(self):
         """Google Generative AI 모델 클라이언트를 초기화합니다."""
         if not self.api_key:
             logging.warning("AI API 키가 제공되지 않았습니다. AI 기능이 제한됩니다.")
             return None
         try:
+            import google.generativeai as genai # 첫 사용 시점에 지연 임포트
             genai.configure(api_key=self.api_key)
             model = genai.GenerativeModel(self.model_name)
             logging.info(f"Google Generative AI 모델({self.model_name}) 초기화 완료.")
@@ -33,83 +72,123 @@ class AiProcessor(BaseProcessor):
             logging.error(f"Google Generative AI 모델 ({self.model_name}) 초기화 실패: {e}", exc_info=True)
             return None
 
-    def process(self, data: dict) -> dict:
-        """단일 기사 데이터를 받아 도파민 포인트를 추출하여 반환합니다.
+    def process(self, data: Article) -> Article:
+        """단일 기사를 받아 도파민 포인트를 채워 반환합니다.
            BaseProcessor의 process 메서드를 구체화합니다.
-        """
-        title = data.get('title', '')
-        content = data.get('summary', '') # 요약이나 본문 사용
-        link = data.get('link', '')
-
-        dopamine_points = self.extract_dopamine_points(title, content)
+           요약, 발행일, 출처 등 나머지 필드는 그대로 유지됩니다.
 
-        return {
-            'title': title,
-            'link': link,
-            'dopamine_points': dopamine_points
-        }
-
-    def extract_dopamine_points(self, title: str, content: str) -> List[str]:
+        Raises:
+            ProcessingError: AI 모델 호출에 실패했거나 도파민 포인트를 얻지 못한 경우 (기사는 변경되지 않음)
+        """
+        if data.content: # ArticleFetcher가 원문 본문을 가져온 경우 요약 대신 본문 사용
+            data.dopamine_points = self.extract_dopamine_points(data.title, data.content, content_label='기사 본문',
+                                                                max_content_chars=FULL_TEXT_PROMPT_CHARS)
+        else:
+            data.dopamine_points = self.extract_dopamine_points(data.title, data.summary)
+        data.status = ArticleStatus.PROCESSED
+        return data
+
+    @traced('llm.dopamine_points')
+    def extract_dopamine_points(self, title: str, content: str, content_label: str = '내용 요약',
+                                max_content_chars: int = 1500) -> List[str]:
         """기사 제목과 내용을 바탕으로 도파민 포인트를 추출합니다.
 
         Args:
             title (str): 기사 제목
             content (str): 기사 내용 (요약 또는 본문)
+            content_label (str): 프롬프트에서 내용 앞에 붙일 이름
+            max_content_chars (int): 프롬프트에 넣을 내용의 최대 글자 수
 
         Returns:
             List[str]: 추출된 도파민 포인트 문자열 리스트
+
+        Raises:
+            ProcessingError: 제목과 내용이 모두 없거나, 모델이 초기화되지 않았거나, 호출에 실패했거나,
+                             응답에서 포인트를 파싱하지 못한 경우.
+                             빈 결과를 처리 완료로 저장하지 않도록 호출자가 재시도 큐에 넣어야 합니다.
         """
         if not title and not content:
-            logging.warning("도파민 포인트를 추출할 제목이나 내용이 없습니다.")
-            return []
+            raise ProcessingError("도파민 포인트를 추출할 제목이나 내용이 없습니다.")
 
         if not self.model:
-            logging.error("AI 모델이 초기화되지 않아 도파민 포인트를 추출할 수 없습니다.")
-            return ["AI 모델 오류로 추출 실패"]
+            raise ProcessingError("AI 모델이 초기화되지 않아 도파민 포인트를 추출할 수 없습니다.")
 
-        prompt = self._build_prompt(title, content)
-        logging.debug(f"AI 프롬프트 생성:\n{prompt}")
+        template = self.prompts['dopamine_points']
+        prompt = template.render(title=title, content=content[:max_content_chars], content_label=content_label)
+        item_log.debug("AI 프롬프트 생성 (%s):\n%s", template.key, prompt)
 
         try:
             # Gemini API 호출
-            response = self.model.generate_content(prompt)
-            # 로깅 메시지를 별도로 생성
-            log_message = f"AI 응답 수신:\n{response.text}"
-            logging.debug(log_message) # 생성된 메시지로 로깅
-            # 결과 파싱
-            points = self._parse_response(response.text)
-            return points
+            response = self._generate(template, prompt)
+            item_log.debug("AI 응답 수신:\n%s", response.text)
+            response_text = response.text
             # logging.warning("AI 모델 호출 로직이 구현되지 않았습니다. 임시 결과를 반환합니다.")
             # return ["예시 도파민 포인트 1", "예시 도파민 포인트 2"] # 임시 반환값 제거
 
         except Exception as e:
             logging.error(f"AI 모델({self.model_name}) 호출 중 오류 발생: {e}", exc_info=True)
             # API 관련 특정 오류 처리 추가 가능 (예: google.api_core.exceptions.PermissionDenied)
-            return [f"AI 처리 중 오류 발생: {e}"]
-
-    def _build_prompt(self, title: str, content: str) -> str:
-        """AI 모델에 전달할 프롬프트를 생성합니다."""
-        # 사용자 요구사항에 맞춰 프롬프트 상세화 필요
-        prompt = f"""다음 뉴스 기사의 제목과 내용을 분석하여, 독자의 흥미를 유발하고 계속 주목하게 만들 수 있는 핵심적인 '도파민 포인트'를 정확히 2가지 추출해 주세요.
-
-각 포인트는 기사의 핵심 갈등, 궁금증, 또는 놀라운 사실을 간결하게 요약해야 합니다.
-
-결과는 간결하고 흥미를 유발하는 방식으로 표현해 주세요. 예를 들어, 다음과 같은 스타일을 참고할 수 있습니다:
-"백종원 대표의 방송 활동 중단 선언: '기업 경영 집중' 및 논란 수습 의지 표명 vs. '방송 갑질' 의혹 등 외부 비판 의식한 결정?"
-
-아래 형식에 맞춰 도파민 포인트를 작성해주세요.
-
-제목: {title}
-
-내용 요약:
-{content[:1500]}...
-
-도파민 포인트:
-"""
-        return prompt
+            raise ProcessingError(f"AI 처리 중 오류 발생: {type(e).__name__}: {e}") from e
+        # 결과 파싱 (포인트가 없으면 ProcessingError)
+        return self._parse_response(response_text)
+
+    def _generate(self, template: PromptTemplate, prompt: str):
+        """템플릿의 기사별 본문(prompt)으로 generate_content를 호출하고
+        호출 수, 지연 시간, 토큰 사용량(템플릿별 캐시 토큰 포함), 오류를 메트릭에 기록합니다."""
+        model, mode = self._model_for(template)
+        start = time.perf_counter()
+        try:
+            response = model.generate_content(template.instructions + prompt if mode == 'inline' else prompt)
+        except Exception as e:
+            record_llm_call(self.model_name, template.name, time.perf_counter() - start, error=e,
+                            template=template.key, prompt_mode=mode)
+            raise
+        record_llm_call(self.model_name, template.name, time.perf_counter() - start, response=response,
+                        template=template.key, prompt_mode=mode)
+        return response
+
+    def _model_for(self, template: PromptTemplate) -> Tuple[Any, str]:
+        """템플릿의 지시문을 등록한 모델과 실제 전송 방식을 반환합니다 (템플릿마다 처음 한 번만 생성)."""
+        with self._prompt_lock:
+            entry = self._prompt_models.get(template.key)
+            if entry is None:
+                entry = self._prompt_models[template.key] = self._create_prompt_model(template)
+            return entry
+
+    def _create_prompt_model(self, template: PromptTemplate) -> Tuple[Any, str]:
+        """prompt_mode에 맞게 지시문을 등록한 모델을 만들고, 지원되지 않으면 다음 방식으로 물러납니다.
+
+        캐시된 콘텐츠는 모델별 최소 토큰 수보다 짧은 지시문이나 로컬 대용 모델에서는 만들 수 없으므로
+        'cached' -> 'system' -> 'inline' 순서로 시도합니다.
+        """
+        if self.prompt_mode == 'inline':
+            return self.model, 'inline'
+        import google.generativeai as genai # _initialize_model에서 이미 임포트됨
+        if self.prompt_mode == 'cached':
+            try:
+                cache = genai.caching.CachedContent.create(
+                    model=self.model_name, display_name=template.key, system_instruction=template.instructions,
+                    ttl=timedelta(minutes=self.prompt_cache_ttl_minutes),
+                )
+                logging.info(f"프롬프트 '{template.key}'의 지시문을 캐시된 콘텐츠로 등록했습니다 "
+                             f"({self.prompt_cache_ttl_minutes:g}분 유지).")
+                return genai.GenerativeModel.from_cached_content(cached_content=cache), 'cached'
+            except Exception as e:
+                logging.warning(f"프롬프트 '{template.key}'의 캐시를 만들지 못해 system instruction으로 보냅니다: "
+                                f"{type(e).__name__}: {e}")
+        try:
+            return genai.GenerativeModel(self.model_name, system_instruction=template.instructions), 'system'
+        except Exception as e:
+            logging.warning(f"프롬프트 '{template.key}'의 system instruction을 지원하지 않아 지시문을 매번 함께 보냅니다: "
+                            f"{type(e).__name__}: {e}")
+            return self.model, 'inline'
 
     def _parse_response(self, response_text: str) -> List[str]:
-        """AI 모델의 응답 텍스트를 파싱하여 도파민 포인트 리스트로 변환합니다."""
+        """AI 모델의 응답 텍스트를 파싱하여 도파민 포인트 리스트로 변환합니다.
+
+        Raises:
+            ProcessingError: 응답에서 포인트를 하나도 찾지 못한 경우 (빈 결과를 처리 완료로 저장하지 않음)
+        """
         points = []
         lines = response_text.strip().split('\n')
         for line in lines:
@@ -129,10 +208,11 @@ class AiProcessor(BaseProcessor):
 
         if not points:
             logging.warning(f"AI 응답에서 유효한 포인트를 파싱하지 못했습니다. 원본 응답: {response_text}")
-            return ["추출된 포인트 없음"]
+            raise ProcessingError("AI 응답에서 도파민 포인트를 파싱하지 못했습니다.")
 
         return points
 
+    @traced('llm.image_keywords')
     def extract_image_keywords(self, title: str) -> List[str]:
         """뉴스 제목에서 이미지 생성에 적합한 핵심 키워드를 2~3개 추출합니다.
 
@@ -151,19 +231,14 @@ class AiProcessor(BaseProcessor):
             return []
 
         # 키워드 추출을 위한 프롬프트
-        prompt = f"""다음 뉴스 헤드라인을 분석하여, 이 내용을 시각적으로 가장 잘 나타낼 수 있는 핵심 키워드(명사, 고유명사 위주)를 2~3개 추출해주세요.
-결과는 쉼표(,)로 구분된 키워드 목록으로만 답해주세요. 예를 들어 '키워드1, 키워드2, 키워드3' 형식입니다.
-
-헤드라인: "{title}"
-
-추출된 키워드:"""
-        
-        logging.debug(f"이미지 키워드 추출 프롬프트:\n{prompt}")
+        template = self.prompts['image_keywords']
+        prompt = template.render(title=title)
+        item_log.debug("이미지 키워드 추출 프롬프트 (%s):\n%s", template.key, prompt)
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate(template, prompt)
             response_text = response.text.strip()
-            logging.debug(f"이미지 키워드 추출 응답: {response_text}")
+            item_log.debug("이미지 키워드 추출 응답: %s", response_text)
 
             # 응답 파싱 (쉼표로 구분된 리스트)
             if response_text:
@@ -1,7 +1,27 @@
 from abc import ABC, abstractmethod
+from typing import Iterable, List
+
+from core.pipeline import gather_limited, run_in_thread
 
 class BaseProcessor(ABC):
+    """처리 단계의 기본 클래스. process만 구현하면 일괄/비동기 메서드는 기본 구현(순차 실행/스레드 풀)을 사용합니다."""
+
     @abstractmethod
     def process(self, data):
         """입력 데이터를 처리합니다."""
-        pass 
\ No newline at end of file
+        pass
+
+    def process_many(self, items: Iterable) -> List:
+        """여러 항목을 처리해 입력 순서대로 반환합니다. 일괄 API가 있는 구현은 재정의합니다 (기본 구현은 순서대로 process)."""
+        return [self.process(item) for item in items]
+
+    async def aprocess(self, data):
+        """process의 비동기 버전. 기본 구현은 process를 공유 스레드 풀에서 실행합니다."""
+        return await run_in_thread(self.process, data)
+
+    async def aprocess_many(self, items: Iterable, concurrency: int = 4) -> List:
+        """여러 항목을 최대 concurrency개씩 동시에 aprocess로 처리해 입력 순서대로 반환합니다.
+
+        한 항목이 실패해도 나머지는 계속 처리하며, 실패한 항목 자리에는 결과 대신 예외 객체가 들어갑니다.
+        """
+        return await gather_limited(self.aprocess, items, concurrency)
@@ -0,0 +1,203 @@
+"""같은 소식을 다룬 기사를 묶어 AI 처리를 묶음당 한 번만 하는 클러스터링 단계
+
+제목과 요약을 정규화한 문자 n-gram(기본 2~3글자) TF-IDF 희소 벡터(NumPy/SciPy)의 코사인 유사도로 기사를 묶습니다.
+한국어는 띄어쓰기/조사 때문에 단어 단위 비교가 잘 맞지 않아 문자 n-gram을 사용합니다.
+
+- 새 기사는 먼저 최근 window_hours(기본 24시간) 안의 기존 묶음 중심 벡터와 비교해 가장 가까운 묶음에 배정하고,
+  threshold 이상인 묶음이 없으면 새 기사끼리 묶어 새 묶음을 만듭니다 (증분 클러스터링).
+- 묶음의 도파민 포인트는 대표 기사(묶음에서 우선순위가 가장 높은 기사) 하나만 AI 처리해 추출하고,
+  나머지 기사는 그 포인트를 물려받습니다 (articles.cluster_id로 묶음을 참조).
+"""
+import html
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+
+from core.models import Article, ArticleStatus
+from utils.database import get_cluster_members, new_pending_cluster_ids
+
+if TYPE_CHECKING:
+    from scipy import sparse
+# NumPy/SciPy는 임포트 비용이 커서(약 250ms) 묶기를 실행할 때 지연 임포트합니다 (main/retry_queue 기동 시간 유지).
+
+_CODEPOINT_BASE = 0x110000 # 유니코드 코드 포인트 개수. n-gram을 정수 하나로 인코딩할 때의 자릿수
+MAX_NGRAM = 3 # 3글자 n-gram까지 int64 하나에 담을 수 있음 (0x110000 ** 3 < 2 ** 63)
+MIN_DOCS_FOR_MAX_DF = 10
+SIMILARITY_BLOCK_ROWS = 512 # 새 기사끼리 묶을 때 한 번에 계산하는 유사도 행 수 (메모리 상한: 행 수 x 기사 수)
+_TAGS = re.compile(r'<[^>]+>')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_text(title: str, summary: str = '', max_summary_chars: int = 300) -> str:
+    """HTML 태그/엔티티, 문장 부호를 제거하고 소문자로 바꾼 '제목 제목 요약' 문자열 (제목을 두 번 넣어 가중치를 줌)"""
+    summary = html.unescape(_TAGS.sub(' ', summary or ''))[:max_summary_chars]
+    text = unicodedata.normalize('NFKC', f"{title} {title} {summary}").lower()
+    return f" {_NON_WORD.sub(' ', text).strip()} "
+
+
+def tfidf_matrix(texts: Sequence[str], ngram_range: Tuple[int, int] = (2, MAX_NGRAM),
+                 max_df: float = 0.2) -> "sparse.csr_matrix":
+    """문자 n-gram TF-IDF 행렬 (행마다 L2 정규화, 행 사이 내적이 코사인 유사도)
+
+    모든 문서를 이어 붙인 코드 포인트 배열에서 n-gram을 정수로 인코딩해 한 번에 세므로
+    문서/n-gram마다 파이썬 루프를 돌지 않습니다. TF는 1 + log(tf), IDF는 log((1 + N) / (1 + df)) + 1 (smooth idf).
+    문서의 max_df 비율보다 많이 나오는 n-gram('했다', '에서' 등)은 구분에 도움이 되지 않고
+    유사도 행렬만 빽빽하게 만들므로 제외합니다 (문서가 10건 미만이면 제외하지 않음).
+    """
+    import numpy as np
+    from scipy import sparse
+
+    low, high = ngram_range
+    if not 1 <= low <= high <= MAX_NGRAM:
+        raise ValueError(f"ngram_range는 1 <= min <= max <= {MAX_NGRAM} 이어야 합니다: {ngram_range}")
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    doc_of = np.repeat(np.arange(len(texts)), lengths)
+
+    rows, grams = [], []
+    for n in range(low, high + 1):
+        count = len(codes) - n + 1
+        if count <= 0:
+            continue
+        gram = codes[:count].copy()
+        for offset in range(1, n):
+            gram = gram * _CODEPOINT_BASE + codes[offset:offset + count]
+        within_doc = doc_of[:count] == doc_of[n - 1:] # 문서 경계를 넘는 n-gram 제외
+        rows.append(doc_of[:count][within_doc])
+        grams.append(gram[within_doc])
+    if not rows or not sum(len(row) for row in rows):
+        return sparse.csr_matrix((len(texts), 0))
+
+    vocabulary, columns = np.unique(np.concatenate(grams), return_inverse=True)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(columns)), (np.concatenate(rows), columns)), shape=(len(texts), len(vocabulary)),
+    ) # 같은 (문서, n-gram) 항목은 더해져 개수가 됨
+    matrix.sum_duplicates()
+    document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    if len(texts) >= MIN_DOCS_FOR_MAX_DF:
+        common = document_frequency > max_df * len(texts)
+        if common.any():
+            matrix = matrix[:, np.flatnonzero(~common)].tocsr()
+            document_frequency = document_frequency[~common]
+    matrix.data = 1.0 + np.log(matrix.data)
+    matrix.data *= (np.log((1.0 + len(texts)) / (1.0 + document_frequency)) + 1.0)[matrix.indices]
+    return _normalize_rows(matrix)
+
+
+def _normalize_rows(matrix: "sparse.csr_matrix") -> "sparse.csr_matrix":
+    import numpy as np
+    from scipy import sparse
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+class StoryClusterer:
+    """새 기사를 최근 묶음에 배정하거나 새 묶음으로 묶어 article.cluster_id를 채웁니다.
+
+    Args:
+        threshold (float): 같은 묶음으로 볼 최소 코사인 유사도 (0~1)
+        window_hours (float): 새 기사와 비교할 기존 묶음의 범위 (이 시간 안에 수집된 묶음 기사 기준)
+        max_summary_chars (int): 비교에 쓰는 요약의 최대 글자 수
+        max_window_articles (int): 비교할 기존 묶음 기사 수 상한 (최신순)
+    """
+
+    def __init__(self, threshold: float = 0.7, window_hours: float = 24.0, max_summary_chars: int = 300,
+                 max_window_articles: int = 5000):
+        self.threshold = threshold
+        self.window_hours = window_hours
+        self.max_summary_chars = max_summary_chars
+        self.max_window_articles = max_window_articles
+
+    def assign(self, articles: List[Article]) -> int:
+        """cluster_id가 없는 기사마다 묶음을 배정합니다 (DB에 쓰지 않음).
+
+        기존 묶음에 들어간 기사는 그 묶음 ID를, 새 묶음의 기사는 임시 ID(음수)를 받습니다.
+        새 묶음의 story_clusters 행은 save_article이 그 묶음의 첫 기사를 저장할 때 만듭니다.
+
+        Returns:
+            int: 새로 만든 묶음 수
+        """
+        articles = [article for article in articles if article.cluster_id is None]
+        if not articles:
+            return 0
+        import numpy as np
+        from scipy import sparse
+
+        since = (datetime.now() - timedelta(hours=self.window_hours)).isoformat(sep=' ', timespec='seconds')
+        recent = get_cluster_members(since, limit=self.max_window_articles)
+        vectors = tfidf_matrix([normalize_text(article.title, article.summary, self.max_summary_chars)
+                                for article in recent + articles])
+        new_vectors = vectors[len(recent):]
+
+        # 1. 기존 묶음 중심 벡터(묶음 기사 벡터의 합을 정규화)와 비교
+        unassigned = np.arange(len(articles))
+        joined = 0
+        if recent:
+            cluster_ids, labels = np.unique([article.cluster_id for article in recent], return_inverse=True)
+            membership = sparse.csr_matrix((np.ones(len(recent)), (labels, np.arange(len(recent)))),
+                                           shape=(len(cluster_ids), len(recent)))
+            centroids = _normalize_rows(membership @ vectors[:len(recent)])
+            similarity = (new_vectors @ centroids.T).toarray()
+            best = similarity.argmax(axis=1)
+            matched = similarity[np.arange(len(articles)), best] >= self.threshold
+            for index in np.flatnonzero(matched):
+                articles[index].cluster_id = int(cluster_ids[best[index]])
+            joined = int(matched.sum())
+            unassigned = np.flatnonzero(~matched)
+
+        # 2. 남은 기사끼리 묶기: 앞쪽(아직 묶이지 않은) 기사를 대표로, 대표와 유사한 기사를 같은 묶음에 넣음
+        groups = np.full(len(unassigned), -1)
+        if len(unassigned):
+            remaining = new_vectors[unassigned]
+            remaining_t = remaining.T.tocsc()
+            block_start, block = 0, None
+            group_count = 0
+            for leader in range(len(unassigned)):
+                if groups[leader] >= 0:
+                    continue
+                if block is None or leader >= block_start + SIMILARITY_BLOCK_ROWS:
+                    # 대표가 될 수 있는 행부터 블록 단위로 유사도를 계산 (기사 수 x 기사 수 행렬을 한 번에 만들지 않음)
+                    block_start = leader
+                    block = (remaining[leader:leader + SIMILARITY_BLOCK_ROWS] @ remaining_t).toarray()
+                members = (groups < 0) & (block[leader - block_start] >= self.threshold)
+                members[leader] = True
+                groups[members] = group_count
+                group_count += 1
+            new_ids = new_pending_cluster_ids(group_count) # 묶음 행은 기사를 저장할 때 만듦
+            for position, index in enumerate(unassigned):
+                articles[index].cluster_id = new_ids[groups[position]]
+        else:
+            group_count = 0
+
+        logging.info(f"기사 묶음: 새 기사 {len(articles)}건 중 기존 묶음 배정 {joined}건, "
+                     f"새 묶음 {group_count}개 (최근 {self.window_hours:g}시간 묶음 기사 {len(recent)}건과 비교)")
+        return group_count
+
+
+def split_representatives(ranked: Sequence[Article]) -> Tuple[List[Article], Dict[int, List[Article]]]:
+    """우선순위 순서의 기사를 묶음별 대표(묶음에서 가장 앞선 기사)와 나머지 기사로 나눕니다.
+
+    Returns:
+        Tuple[List[Article], Dict[int, List[Article]]]: (AI 처리할 대표 기사 순서대로, 묶음 ID별 포인트를 물려받을 기사)
+    """
+    representatives = []
+    followers: Dict[int, List[Article]] = {}
+    for article in ranked:
+        if article.cluster_id is None:
+            representatives.append(article)
+        elif article.cluster_id in followers:
+            followers[article.cluster_id].append(article)
+        else:
+            followers[article.cluster_id] = []
+            representatives.append(article)
+    return representatives, followers
+
+
+def inherit_cluster_points(article: Article, dopamine_points: List[str]):
+    """묶음의 도파민 포인트를 기사에 반영하고 processed 상태로 바꿉니다 (AI 호출/DB 저장 없음, 저장은 호출한 쪽에서)."""
+    article.dopamine_points = list(dopamine_points)
+    article.status = ArticleStatus.PROCESSED
@@ -1,24 +1,28 @@
 import logging
-from google import genai # 사용자 제공 예시처럼 from google import genai 사용
-# from google.generativeai import types as genai_types # genai.types 사용 시도, 없으면 아래에서 처리
-from PIL import Image as PIL_Image
+import time
+# google.genai와 PIL은 임포트 비용이 커서 실제로 사용하는 시점에 지연 임포트합니다.
+# (이미지 생성이 비활성화된 실행에서는 전혀 로드되지 않음)
 from io import BytesIO
 from typing import Optional
 
-from configs.settings import load_config
+from configs.settings import get_config
+from utils.logger import get_item_logger
+from utils.metrics import record_image_call
+from utils.tracing import span, traced
+
+item_log = get_item_logger(__name__) # 이미지별 프롬프트 디버그 로그 (샘플링 대상)
 
 class ImageGenerator:
     """Google AI (genai.Client, 사용자 제공 예시)를 사용하여 이미지를 생성하는 클래스"""
 
-    def __init__(self, image_model_name: str = "imagen-3.0-generate-002"):
+    def __init__(self, image_model_name: str = "imagen-3.0-generate-002", api_key: Optional[str] = None):
         """
         ImageGenerator 초기화 (사용자 제공 genai.Client 예시 기반)
         Args:
             image_model_name (str): 사용할 Imagen 모델 이름. (예: "imagen-3.0-generate-002")
+            api_key (Optional[str]): Google AI API 키. 생략하면 캐시된 설정(ai.api_key)을 사용합니다.
         """
-        self.config = load_config()
-        self.ai_config = self.config.get('ai', {})
-        self.api_key = self.ai_config.get('api_key')
+        self.api_key = api_key or get_config().get('ai', {}).get('api_key')
         
         if not self.api_key:
             logging.error("ImageGenerator: AI API 키가 설정 파일에 없습니다 (ai.api_key).")
@@ -28,15 +32,44 @@ class ImageGenerator:
 
         self.image_model_name = image_model_name
         try:
+            from google import genai # 사용자 제공 예시처럼 from google import genai 사용 (지연 임포트)
             self.client = genai.Client(api_key=self.api_key)
             logging.info(f"ImageGenerator: genai.Client (사용자 예시 스타일) 초기화 완료. 사용할 모델: {self.image_model_name}")
-        except AttributeError as ae:
+        except (ImportError, AttributeError) as ae:
             logging.error(f"ImageGenerator: 'genai.Client'를 찾을 수 없습니다. ({ae}). 'google.generativeai'와 다른 'google.genai' 모듈이 필요할 수 있습니다.", exc_info=True)
             self.client = None
         except Exception as e:
             logging.error(f"ImageGenerator: genai.Client (사용자 예시 스타일) 초기화 실패: {e}", exc_info=True)
             self.client = None
 
+    def _generate_images(self, full_prompt: str, img_config_obj):
+        """generate_images를 호출하고 호출 수, 지연 시간, 이미지 크기, 오류를 메트릭에 기록합니다."""
+        start = time.perf_counter()
+        try:
+            if img_config_obj:
+                response = self.client.models.generate_images(
+                    model=self.image_model_name,
+                    prompt=full_prompt,
+                    config=img_config_obj
+                )
+            else:
+                # GenerateImagesConfig 사용 불가 시, number_of_images 직접 전달 시도 (API가 지원해야 함)
+                # 또는 다른 필수 파라미터가 있다면 추가 필요
+                response = self.client.models.generate_images(
+                    model=self.image_model_name,
+                    prompt=full_prompt,
+                    # 예시에서는 config에 number_of_images가 있었으므로, 직접 파라미터로 시도
+                    number_of_images=1 
+                )
+        except Exception as e:
+            record_image_call(self.image_model_name, time.perf_counter() - start, error=e)
+            raise
+        generated = getattr(response, 'generated_images', None) if response else None
+        image_bytes = generated[0].image.image_bytes if generated else None
+        record_image_call(self.image_model_name, time.perf_counter() - start, image_bytes=len(image_bytes or b''))
+        return response
+
+    @traced('image.generate')
     def generate_halftone_image(self, subject_prompt: str, output_image_path: str) -> bool:
         """
         주어진 텍스트 기반으로 하프톤 이미지를 생성 (genai.Client, 사용자 예시 스타일).
@@ -56,7 +89,7 @@ class ImageGenerator:
                 f"The background must be a solid color: {background_color_hex} ({background_color_rgb_description}). "
                 f"The image must contain absolutely no text, letters, or numbers."
             ) # Prompt changed to English to emphasize halftone style and other requirements.
-            logging.debug(f"genai.Client image generation prompt:\n{full_prompt}")
+            item_log.debug("genai.Client image generation prompt:\n%s", full_prompt)
 
             genai_types_module = None
             try:
@@ -82,21 +115,8 @@ class ImageGenerator:
             except TypeError as te:
                 logging.warning(f"'{genai_types_module.__name__}.GenerateImagesConfig' 생성 실패 ({te}). config 없이 호출합니다.")
 
-            if img_config_obj:
-                response = self.client.models.generate_images(
-                    model=self.image_model_name,
-                    prompt=full_prompt,
-                    config=img_config_obj
-                )
-            else:
-                # GenerateImagesConfig 사용 불가 시, number_of_images 직접 전달 시도 (API가 지원해야 함)
-                # 또는 다른 필수 파라미터가 있다면 추가 필요
-                response = self.client.models.generate_images(
-                    model=self.image_model_name,
-                    prompt=full_prompt,
-                    # 예시에서는 config에 number_of_images가 있었으므로, 직접 파라미터로 시도
-                    number_of_images=1 
-                )
+            with span('image.imagen'):
+                response = self._generate_images(full_prompt, img_config_obj)
 
             if not response or not hasattr(response, 'generated_images') or not response.generated_images:
                 logging.error("genai.Client: 모델에서 이미지를 생성하지 못했거나 응답 형식이 올바르지 않습니다.")
@@ -111,23 +131,25 @@ class ImageGenerator:
             
             logging.info(f"genai.Client: 이미지 바이트 데이터 수신 (크기: {len(generated_image_data)} bytes)")
 
-            initial_image = PIL_Image.open(BytesIO(generated_image_data)).convert("RGBA")
-            
-            processed_image_data = []
-            target_rgb = (49, 0, 255)
-            tolerance = 45
-
-            for item in initial_image.getdata():
-                distance = abs(item[0] - target_rgb[0]) + \
-                           abs(item[1] - target_rgb[1]) + \
-                           abs(item[2] - target_rgb[2])
+            with span('image.chroma_key'):
+                from PIL import Image as PIL_Image # 지연 임포트
+                initial_image = PIL_Image.open(BytesIO(generated_image_data)).convert("RGBA")
                 
-                if distance < tolerance:
-                    processed_image_data.append((item[0], item[1], item[2], 0))
-                else:
-                    processed_image_data.append(item)
-            
-            initial_image.putdata(processed_image_data)
+                processed_image_data = []
+                target_rgb = (49, 0, 255)
+                tolerance = 45
+
+                for item in initial_image.getdata():
+                    distance = abs(item[0] - target_rgb[0]) + \
+                               abs(item[1] - target_rgb[1]) + \
+                               abs(item[2] - target_rgb[2])
+                    
+                    if distance < tolerance:
+                        processed_image_data.append((item[0], item[1], item[2], 0))
+                    else:
+                        processed_image_data.append(item)
+                
+                initial_image.putdata(processed_image_data)
             
             if not output_image_path.lower().endswith(".png"):
                 logging.warning(f"출력 파일 경로 '{output_image_path}'가 .png로 끝나지 않습니다.")
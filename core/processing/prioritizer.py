@@ -0,0 +1,284 @@
+"""유료 호출(Gemini/Imagen) 전에 기사 우선순위를 매기고 예산/마감 안에서 처리할 기사를 고르는 단계
+
+- ArticleScorer: 최신성, 출처 가중치, 브랜드 주제 키워드, 여러 피드에 함께 실린 정도(교차 보도)로
+  기사마다 로컬 점수를 계산해 내림차순으로 정렬합니다 (네트워크/API 호출 없음).
+- BudgetScheduler: 실행당/일일 호출 예산과 실행 마감 시각 안에서 상위 기사만 처리하고 나머지는 미룹니다.
+  호출은 api_budget 장부에 미리 예약하므로 여러 프로세스(샤드 워커)가 동시에 실행되어도 일일 예산을 넘지 않습니다.
+"""
+import logging
+import math
+import re
+import time
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from core.models import Article
+from utils.database import get_articles_without_gen_image, release_api_budget, reserve_api_budget
+from utils.logger import get_item_logger
+from utils.sharding import Shard
+
+item_log = get_item_logger(__name__) # 기사별 점수 디버그 로그 (샘플링 대상)
+
+T = TypeVar('T')
+
+UNKNOWN_RECENCY = 0.5 # 발행일을 알 수 없는 기사의 최신성 점수 (반감기 1회 지난 기사와 같음)
+TOPIC_SATURATION = 3 # 주제 키워드 점수가 1이 되는 적중 수 (제목 적중은 2, 요약 적중은 1로 계산)
+COVERAGE_SATURATION = 2 # 교차 보도 점수가 1이 되는 추가 피드 수
+IMAGE_CANDIDATE_FACTOR = 4 # 이미지 생성 후보로 조회할 기사 수 (처리 한도의 배수)
+MIN_TITLE_KEY_CHARS = 8 # 이보다 짧은 제목은 교차 보도 비교에 쓰지 않음 (예: '속보', '오늘의 날씨')
+_TITLE_TAGS = re.compile(r'\[[^\]]*\]|\([^)]*\)|【[^】]*】')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """RSS(RFC 822)/Atom(ISO 8601) 발행일 또는 DB scraped_at 문자열을 시간대가 있는 datetime으로 변환"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.astimezone() # 시간대가 없으면 로컬 시간으로 간주
+
+
+def _link_key(link: str) -> str:
+    parts = urlsplit(link)
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+
+
+def _title_key(title: str) -> Optional[str]:
+    """'[속보]' 같은 머리말과 문장 부호/공백을 뺀 제목 (다른 매체의 같은 기사 비교용)"""
+    key = _NON_WORD.sub('', _TITLE_TAGS.sub('', title or '')).lower()
+    return key if len(key) >= MIN_TITLE_KEY_CHARS else None
+
+
+class ArticleScorer:
+    """기사 우선순위 점수 계산기
+
+    점수 = 출처 가중치 x (recency_weight x 최신성 + topic_weight x 주제 적합도 + coverage_weight x 교차 보도)
+    각 항목은 0~1 범위입니다.
+
+    Args:
+        topics (Sequence[str]): 브랜드 주제 키워드 (제목/요약에 포함되면 가산)
+        source_weights (Optional[Mapping[str, float]]): 피드 URL 또는 도메인별 가중치 (없으면 1.0)
+        half_life_hours (float): 최신성 점수가 절반이 되는 시간
+        recency_weight, topic_weight, coverage_weight (float): 항목별 가중치
+    """
+
+    def __init__(self, topics: Sequence[str] = (), source_weights: Optional[Mapping[str, float]] = None,
+                 half_life_hours: float = 12.0, recency_weight: float = 0.4, topic_weight: float = 0.4,
+                 coverage_weight: float = 0.2):
+        self.topics = [topic.lower() for topic in topics if topic]
+        self.source_weights = {key.lower(): float(weight) for key, weight in (source_weights or {}).items()}
+        self.half_life_hours = half_life_hours
+        self.recency_weight = recency_weight
+        self.topic_weight = topic_weight
+        self.coverage_weight = coverage_weight
+        self._weight_cache: Dict[str, float] = {}
+
+    def rank(self, articles: Iterable[T], corpus: Optional[Iterable[Article]] = None) -> List[T]:
+        """점수가 높은 순으로 정렬한 기사 목록 (동점이면 입력 순서 유지)
+
+        Args:
+            articles (Iterable[Article]): 정렬할 기사
+            corpus (Optional[Iterable[Article]]): 교차 보도를 셀 기사 집합 (예: 이번 실행에서 수집한 전체 기사).
+                생략하면 articles 안에서만 셉니다.
+        """
+        articles = list(articles)
+        coverage = self._coverage_index(articles if corpus is None else list(corpus) + articles)
+        now = datetime.now(timezone.utc)
+        scored = [(self.score(article, now, coverage), index, article) for index, article in enumerate(articles)]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        for score, _, article in scored:
+            item_log.debug("우선순위 %.3f: '%s'", score, article.title)
+        return [article for _, _, article in scored]
+
+    def score(self, article: Article, now: Optional[datetime] = None,
+              coverage: Optional[Dict[str, Set[str]]] = None) -> float:
+        now = now or datetime.now(timezone.utc)
+        coverage = coverage if coverage is not None else self._coverage_index([article])
+        return self.source_weight(article) * (
+            self.recency_weight * self.recency(article, now)
+            + self.topic_weight * self.topic_relevance(article)
+            + self.coverage_weight * self.cross_feed_coverage(article, coverage)
+        )
+
+    def recency(self, article: Article, now: datetime) -> float:
+        published = _parse_datetime(article.published) or _parse_datetime(article.scraped_at)
+        if published is None:
+            return UNKNOWN_RECENCY
+        age_hours = max(0.0, (now - published).total_seconds() / 3600)
+        return math.pow(0.5, age_hours / self.half_life_hours) if self.half_life_hours > 0 else 1.0
+
+    def topic_relevance(self, article: Article) -> float:
+        if not self.topics:
+            return 0.0
+        title = (article.title or '').lower()
+        summary = (article.summary or '').lower()
+        hits = sum(2 if topic in title else 1 if topic in summary else 0 for topic in self.topics)
+        return min(1.0, hits / TOPIC_SATURATION)
+
+    def cross_feed_coverage(self, article: Article, coverage: Dict[str, Set[str]]) -> float:
+        feeds = set(coverage.get(_link_key(article.link), ()))
+        title_key = _title_key(article.title)
+        if title_key:
+            feeds |= coverage.get(title_key, set())
+        return min(1.0, max(0, len(feeds) - 1) / COVERAGE_SATURATION)
+
+    def source_weight(self, article: Article) -> float:
+        source = article.source_url or article.link or ''
+        weight = self._weight_cache.get(source)
+        if weight is None:
+            host = urlsplit(source).netloc.lower()
+            weight = 1.0
+            for key, value in self.source_weights.items():
+                if source.lower() == key or host == key or host.endswith(f".{key}"):
+                    weight = value
+                    break
+            self._weight_cache[source] = weight
+        return weight
+
+    @staticmethod
+    def _coverage_index(articles: Iterable[Article]) -> Dict[str, Set[str]]:
+        """링크/정규화한 제목별로 그 기사를 실은 피드 집합"""
+        index: Dict[str, Set[str]] = {}
+        for article in articles:
+            feed = article.source_url or _link_key(article.link)
+            index.setdefault(_link_key(article.link), set()).add(feed)
+            title_key = _title_key(article.title)
+            if title_key:
+                index.setdefault(title_key, set()).add(feed)
+        return index
+
+
+class BudgetScheduler(Generic[T]):
+    """호출 예산과 실행 마감 안에서 우선순위가 높은 항목부터 처리하도록 고르는 스케줄러
+
+    사용 순서:
+        planned = scheduler.plan(ranked)          # 예산 안의 상위 항목 (나머지는 scheduler.deferred)
+        for item in scheduler.run(planned):       # 마감 전에 끝낼 수 있는 동안만 항목을 넘김
+            ...                                   # 항목당 유료 호출 1회
+        scheduler.close()                         # 쓰지 않은 예약 반환, 미룬 건수 기록
+
+    다른 단계에 딸린 호출은 plan/run 대신 호출 직전에 acquire()로 1건씩 예약합니다
+    (같은 실행의 스케줄러를 넘겨 받아 사용하면 실행 예산을 AI 처리와 함께 나눠 씁니다).
+
+    Args:
+        api (str): 장부에 기록할 API 이름 ('gemini' 또는 'imagen')
+        run_budget (int): 이 실행에서 쓸 수 있는 최대 호출 수 (0이면 제한 없음)
+        daily_budget (int): 하루 최대 호출 수, api_budget 장부 기준 (0이면 제한 없이 기록만)
+        deadline (Optional[float]): time.monotonic() 기준 마감 시각 (None이면 없음)
+    """
+
+    def __init__(self, api: str, run_budget: int = 0, daily_budget: int = 0, deadline: Optional[float] = None):
+        self.api = api
+        self.run_budget = run_budget
+        self.daily_budget = daily_budget
+        self.deadline = deadline
+        self.spent = 0 # 이번 실행에서 run()이 넘긴 항목 수 (= 사용한 호출 수)
+        self.deferred: List[T] = []
+        self.reserved = 0 # 장부에 예약한 호출 수
+        self._day: Optional[str] = None # 예약한 장부 날짜 (자정을 넘겨도 같은 날짜로 정산)
+        self._planned: List[T] = []
+        self._item_seconds: Optional[float] = None # 항목 하나 처리 시간 추정치 (지수 이동 평균)
+
+    @classmethod
+    def from_config(cls, api: str, budget_config: Mapping, started_at: Optional[float] = None,
+                    max_calls: int = 0) -> "BudgetScheduler":
+        """config['budget']으로 스케줄러를 만듭니다.
+
+        Args:
+            started_at (Optional[float]): 실행 시작 시각 (time.monotonic(), 마감 시각 계산 기준)
+            max_calls (int): 설정과 별도로 이 실행의 호출 수를 더 제한할 때 (예: image_processing_limit)
+        """
+        run_budget = budget_config.get(f'{api}_run_calls', 0)
+        if max_calls > 0:
+            run_budget = min(run_budget, max_calls) if run_budget > 0 else max_calls
+        deadline_seconds = budget_config.get('deadline_seconds', 0)
+        deadline = (started_at if started_at is not None else time.monotonic()) + deadline_seconds \
+            if deadline_seconds > 0 else None
+        return cls(api, run_budget=run_budget, daily_budget=budget_config.get(f'{api}_daily_calls', 0), deadline=deadline)
+
+    def plan(self, ranked: Sequence[T]) -> List[T]:
+        """남은 실행/일일 예산만큼 앞쪽 항목을 예약해 돌려주고, 나머지는 deferred에 추가합니다."""
+        wanted = len(ranked)
+        if self.run_budget > 0:
+            wanted = min(wanted, max(0, self.run_budget - self.reserved))
+        self._day = self._day or date.today().isoformat()
+        granted = reserve_api_budget(self._day, self.api, wanted, self.daily_budget) if wanted else 0
+        self.reserved += granted
+        self._planned = list(ranked[:granted])
+        self.deferred.extend(ranked[granted:])
+        if granted < len(ranked):
+            reason = '실행 예산' if granted == wanted and wanted < len(ranked) else '일일 예산'
+            logging.info(f"{self.api} 예산: {len(ranked)}건 중 상위 {granted}건 처리, {len(ranked) - granted}건 연기 ({reason})")
+        return self._planned
+
+    def run(self, items: Iterable[T]) -> Iterator[T]:
+        """plan()이 고른 항목(또는 같은 순서로 가공한 스트림)을 마감 전에 끝낼 수 있는 동안만 넘깁니다.
+
+        마감에 걸리면 남은 항목을 deferred에 추가하고 멈춥니다.
+        """
+        planned = self._planned
+        handed = 0
+        for item in items:
+            if self.deadline is not None and time.monotonic() + (self._item_seconds or 0.0) > self.deadline:
+                break
+            started = time.monotonic()
+            self.spent += 1
+            handed += 1
+            yield item
+            elapsed = time.monotonic() - started
+            self._item_seconds = elapsed if self._item_seconds is None else 0.8 * self._item_seconds + 0.2 * elapsed
+        if handed < len(planned):
+            self.deferred.extend(planned[handed:])
+            logging.info(f"{self.api} 마감: {handed}/{len(planned)}건 처리 후 {len(planned) - handed}건 연기")
+        self._planned = []
+
+    def acquire(self) -> bool:
+        """plan()/run()을 거치지 않는 부가 호출(예: 이미지 키워드 추출) 1회의 예산을 바로 예약해 사용합니다.
+
+        실행/일일 예산이 남아 있지 않으면 False를 반환합니다 (호출하지 말 것).
+        호출을 건너뛸 뿐 항목을 미루는 것은 아니므로 deferred에는 추가하지 않습니다.
+        """
+        if self.run_budget > 0 and self.reserved >= self.run_budget:
+            return False
+        self._day = self._day or date.today().isoformat()
+        if not reserve_api_budget(self._day, self.api, 1, self.daily_budget):
+            return False
+        self.reserved += 1
+        self.spent += 1
+        return True
+
+    def close(self):
+        """쓰지 않은 예약을 장부에 반환하고, 미룬 항목 수를 기록합니다."""
+        if self.reserved or self.deferred:
+            release_api_budget(self._day or date.today().isoformat(), self.api,
+                               unused=self.reserved - self.spent, deferred=len(self.deferred))
+            logging.info(f"{self.api} 예산 사용: {self.spent}건 처리, {len(self.deferred)}건 연기")
+        self.reserved = self.spent = 0
+        self.deferred = []
+
+
+def plan_image_batch(config: Mapping, limit: int, shard: Optional[Shard] = None,
+                     started_at: Optional[float] = None) -> Tuple[BudgetScheduler, List[Article]]:
+    """gen_image가 없는 기사 중 우선순위가 높은 기사부터 이미지 생성 예산을 예약합니다.
+
+    최신 limit건만 고르지 않도록 limit x IMAGE_CANDIDATE_FACTOR건을 후보로 조회해 점수순으로 정렬한 뒤,
+    Imagen 실행/일일 예산(최대 limit건) 안의 기사만 돌려줍니다. 반환된 스케줄러로 run()/close()를 호출해야 합니다.
+
+    Args:
+        config (Mapping): 전체 설정 (config['priority'], config['budget'] 사용)
+        limit (int): 이번 실행에서 생성할 최대 이미지 수
+        shard (Optional[Shard]): 지정하면 이 샤드 몫의 기사만 후보로 조회
+        started_at (Optional[float]): 실행 시작 시각 (time.monotonic(), 마감 계산 기준)
+    """
+    candidates = get_articles_without_gen_image(limit=limit * IMAGE_CANDIDATE_FACTOR, shard=shard)
+    scorer = ArticleScorer(**config.get('priority', {}))
+    scheduler = BudgetScheduler.from_config('imagen', config.get('budget', {}), started_at=started_at, max_calls=limit)
+    return scheduler, scheduler.plan(scorer.rank(candidates))
@@ -0,0 +1,106 @@
+"""버전이 있는 Gemini 프롬프트 템플릿 레지스트리
+
+프롬프트를 호출마다 같은 정적 지시문(instructions: 작업 설명, 형식 규칙, 스타일 예시)과
+기사마다 달라지는 본문(body: 제목/내용 등 str.format 필드)으로 나눕니다.
+AiProcessor는 지시문을 system instruction이나 캐시된 콘텐츠(cached content)로 한 번만 등록하고
+호출마다 본문만 보내며, 둘 다 지원하지 않는 모델에는 instructions + body를 한 문자열로 보냅니다.
+
+instructions + body는 분리 전의 단일 프롬프트와 같아야 합니다 (기록된 카세트 재생과 응답 품질 유지).
+지시문을 바꿀 때는 기존 버전을 고치지 말고 version을 올려 새로 등록합니다 (PROMPT_VERSIONS로 버전 고정 가능).
+"""
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """정적 지시문과 기사별 본문으로 나눈 프롬프트
+
+    Args:
+        name (str): 템플릿 이름 (메트릭의 operation과 같음, 예: 'dopamine_points')
+        version (int): 템플릿 버전 (지시문이나 본문 형식이 바뀔 때마다 올림)
+        instructions (str): 호출마다 같은 앞부분 (system instruction / 캐시 대상)
+        body (str): 호출마다 채우는 뒷부분 (str.format 문자열)
+    """
+    name: str
+    version: int
+    instructions: str
+    body: str
+
+    @property
+    def key(self) -> str:
+        """메트릭 라벨과 캐시 이름에 쓰는 '이름@v버전'"""
+        return f"{self.name}@v{self.version}"
+
+    def render(self, **variables) -> str:
+        """기사별 본문만 채워 반환합니다."""
+        return self.body.format(**variables)
+
+    def full_text(self, **variables) -> str:
+        """지시문과 본문을 이어 붙인 단일 프롬프트 (지시문을 따로 보낼 수 없는 모델용)"""
+        return self.instructions + self.render(**variables)
+
+
+PROMPTS: Dict[str, Dict[int, PromptTemplate]] = {}
+
+def register_prompt(template: PromptTemplate):
+    """템플릿을 (이름, 버전)으로 등록합니다. 같은 이름과 버전이 있으면 교체합니다."""
+    PROMPTS.setdefault(template.name, {})[template.version] = template
+
+
+def get_prompt(name: str, version: Optional[int] = None) -> PromptTemplate:
+    """이름과 버전으로 템플릿을 찾습니다. version을 생략하면 최신 버전을 반환합니다.
+
+    Raises:
+        ValueError: 등록되지 않은 이름이나 버전인 경우
+    """
+    versions = PROMPTS.get(name)
+    if not versions:
+        raise ValueError(f"알 수 없는 프롬프트 템플릿입니다: {name} (사용 가능: {', '.join(PROMPTS)})")
+    if version is None:
+        version = max(versions)
+    if version not in versions:
+        raise ValueError(f"프롬프트 템플릿 {name}에 버전 {version}이 없습니다 (사용 가능: {sorted(versions)})")
+    return versions[version]
+
+
+def resolve_prompts(versions: Optional[Mapping[str, int]] = None) -> Dict[str, PromptTemplate]:
+    """등록된 모든 템플릿 이름에 대해 versions에 고정된 버전(없으면 최신)을 골라 반환합니다."""
+    versions = versions or {}
+    return {name: get_prompt(name, versions.get(name)) for name in PROMPTS}
+
+
+# 도파민 포인트 추출 (AiProcessor.extract_dopamine_points). content는 max_content_chars로 자른 요약/본문
+register_prompt(PromptTemplate(
+    name='dopamine_points',
+    version=1,
+    instructions="""다음 뉴스 기사의 제목과 내용을 분석하여, 독자의 흥미를 유발하고 계속 주목하게 만들 수 있는 핵심적인 '도파민 포인트'를 정확히 2가지 추출해 주세요.
+
+각 포인트는 기사의 핵심 갈등, 궁금증, 또는 놀라운 사실을 간결하게 요약해야 합니다.
+
+결과는 간결하고 흥미를 유발하는 방식으로 표현해 주세요. 예를 들어, 다음과 같은 스타일을 참고할 수 있습니다:
+"백종원 대표의 방송 활동 중단 선언: '기업 경영 집중' 및 논란 수습 의지 표명 vs. '방송 갑질' 의혹 등 외부 비판 의식한 결정?"
+
+아래 형식에 맞춰 도파민 포인트를 작성해주세요.
+
+""",
+    body="""제목: {title}
+
+{content_label}:
+{content}...
+
+도파민 포인트:
+""",
+))
+# 이미지 생성용 키워드 추출 (AiProcessor.extract_image_keywords)
+register_prompt(PromptTemplate(
+    name='image_keywords',
+    version=1,
+    instructions="""다음 뉴스 헤드라인을 분석하여, 이 내용을 시각적으로 가장 잘 나타낼 수 있는 핵심 키워드(명사, 고유명사 위주)를 2~3개 추출해주세요.
+결과는 쉼표(,)로 구분된 키워드 목록으로만 답해주세요. 예를 들어 '키워드1, 키워드2, 키워드3' 형식입니다.
+
+""",
+    body="""헤드라인: "{title}"
+
+추출된 키워드:""",
+))
@@ -0,0 +1,268 @@
+"""재시도 큐 작업(AI 처리/이미지 생성)과 묶음 도파민 포인트 물려주기 실행 함수
+
+main.py, retry_queue.py, batch_image_processor.py가 함께 사용합니다 (스크립트끼리 서로 임포트하지 않음).
+"""
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from core.models import Article, QueueTask
+from core.processing.ai_processor import AiProcessor
+from core.processing.base_processor import BaseProcessor
+from core.processing.clustering import inherit_cluster_points, split_representatives
+from core.processing.image_generator import ImageGenerator
+from core.processing.prioritizer import ArticleScorer, BudgetScheduler, plan_image_batch
+from utils.database import (
+    get_due_tasks, record_task_failure, complete_task, save_article, update_article_dopamine_points,
+    update_article_gen_image, get_article_contents, get_cluster_points, set_cluster_points,
+)
+from utils.error_handler import ProcessingError
+from utils.profiling import Profiler
+from utils.sharding import Shard
+from utils.tracing import article_context
+
+GENERATED_IMAGES_DIR = "generated_images"  # 생성된 이미지 저장 디렉토리
+
+
+def ensure_dir_exists(directory_path: str):
+    """주어진 경로의 디렉토리가 없으면 생성합니다."""
+    if not os.path.exists(directory_path):
+        try:
+            os.makedirs(directory_path)
+            logging.info(f"디렉토리 생성: {directory_path}")
+        except OSError as e:
+            logging.error(f"디렉토리 생성 실패 ({directory_path}): {e}", exc_info=True)
+            raise
+
+
+def load_stored_contents(articles: List[Article]):
+    """처음 처리할 때 가져온 원문 본문이 있으면 article.content에 채웁니다 (다시 요청하지 않음)."""
+    contents = get_article_contents([article.link for article in articles])
+    for article in articles:
+        if article.link in contents:
+            article.content = contents[article.link].text
+
+
+def retry_ai_article(processor: BaseProcessor, article: Article, retry_config: dict) -> bool:
+    """재시도 큐의 기사 1건을 다시 AI 처리합니다.
+
+    성공하면 DB에 도파민 포인트를 반영하고 큐에서 제거하며,
+    다시 실패하면 attempt 수를 늘려 재등록합니다 (한도 초과 시 dead letter).
+
+    Returns:
+        bool: 처리와 DB 반영에 성공했으면 True
+    """
+    try:
+        processor.process(article)
+    except ProcessingError as e:
+        record_task_failure(article.id, QueueTask.AI, str(e), **retry_config)
+        return False
+
+    if update_article_dopamine_points(article.id, article.dopamine_points, article.status):
+        logging.info(f"기사 ID {article.id} ('{article.title}') AI 재처리 성공")
+        return True
+    logging.error(f"기사 ID {article.id}의 AI 재처리 결과 DB 반영 실패.")
+    return False
+
+
+def save_inherited_points(article: Article) -> bool:
+    """묶음의 도파민 포인트를 물려받은 기사를 저장합니다 (inherit_cluster_points 다음에 호출).
+
+    새 기사는 processed 상태로 저장하고, 재시도 큐에서 온 기사(id가 있는 기사)는 포인트를 갱신하고 큐에서 제거합니다.
+
+    Returns:
+        bool: 저장에 성공했으면 True
+    """
+    if article.id is None:
+        return save_article(article)
+    return update_article_dopamine_points(article.id, article.dopamine_points, article.status)
+
+
+def inherit_known_cluster_points(articles: List[Article]) -> Tuple[List[Article], List[Article]]:
+    """이미 도파민 포인트가 추출된 묶음의 기사는 AI 호출 없이 포인트를 물려받아 저장합니다.
+
+    Returns:
+        Tuple[List[Article], List[Article]]: (물려받아 저장한 기사, AI 처리가 필요한 나머지 기사)
+    """
+    cluster_points = get_cluster_points([article.cluster_id for article in articles])
+    inherited, remaining = [], []
+    for article in articles:
+        points = cluster_points.get(article.cluster_id)
+        if points is None:
+            remaining.append(article)
+            continue
+        inherit_cluster_points(article, points)
+        if save_inherited_points(article):
+            inherited.append(article)
+    if inherited:
+        logging.info(f"기존 묶음의 도파민 포인트를 물려받은 기사 {len(inherited)}건 (AI 호출 생략)")
+    return inherited, remaining
+
+
+def share_cluster_points(representative: Article, followers: List[Article]) -> List[Article]:
+    """AI 처리한 대표 기사의 포인트를 묶음에 기록하고 같은 묶음의 나머지 기사에 물려줍니다.
+
+    Returns:
+        List[Article]: 포인트를 물려받아 저장한 기사
+    """
+    set_cluster_points(representative.cluster_id, representative.id, representative.dopamine_points)
+    inherited = []
+    for article in followers:
+        with article_context(article):
+            inherit_cluster_points(article, representative.dopamine_points)
+            if save_inherited_points(article):
+                inherited.append(article)
+    if followers:
+        logging.info(f"'{representative.title}' 묶음의 기사 {len(followers)}건이 도파민 포인트를 물려받음")
+    return inherited
+
+
+def drain_ai_queue(processor: BaseProcessor, retry_config: dict, limit: int, shard: Optional[Shard] = None,
+                   scheduler: Optional[BudgetScheduler] = None, scorer: Optional[ArticleScorer] = None) -> List[Article]:
+    """재시도 시각이 도래한 AI 처리 작업을 다시 실행합니다.
+
+    scheduler가 주어지면 (scorer가 있으면 우선순위대로 정렬한 뒤) 예산/마감 안의 작업만 처리하고,
+    나머지는 큐에 그대로 남겨 다음 실행에서 처리합니다.
+    같은 묶음(cluster_id)의 기사는 묶음의 포인트를 물려받으므로 묶음당 AI 호출은 한 번입니다.
+
+    Args:
+        processor (BaseProcessor): 초기화된 AI 프로세서
+        retry_config (dict): 재시도 정책 (config['retry'])
+        limit (int): 한 번에 처리할 최대 작업 수
+        shard (Optional[Shard]): 지정하면 이 샤드 몫(기사 id % N == i)의 작업만 처리
+        scheduler (Optional[BudgetScheduler]): Gemini 호출 예산/마감 스케줄러 (호출한 쪽에서 close)
+        scorer (Optional[ArticleScorer]): 처리 순서를 정할 우선순위 점수 계산기
+
+    Returns:
+        List[Article]: 이번에 처리에 성공한 기사 리스트
+    """
+    due_articles = get_due_tasks(QueueTask.AI, limit=limit, shard=shard)
+    if not due_articles:
+        logging.info("재시도할 AI 처리 작업이 없습니다.")
+        return []
+
+    logging.info(f"{len(due_articles)}건의 AI 처리 작업을 재시도합니다.")
+    load_stored_contents(due_articles)
+    # 묶음의 포인트가 이미 있으면 물려받고, 없으면 묶음당 대표 1건만 다시 처리
+    recovered, pending = inherit_known_cluster_points(due_articles)
+    if scorer:
+        pending = scorer.rank(pending)
+    representatives, followers = split_representatives(pending)
+    attempted = 0
+    for article in scheduler.run(scheduler.plan(representatives)) if scheduler else representatives:
+        attempted += 1
+        with article_context(article):
+            if not retry_ai_article(processor, article, retry_config):
+                continue
+        recovered.append(article)
+        if article.cluster_id is not None:
+            recovered.extend(share_cluster_points(article, followers.pop(article.cluster_id, [])))
+
+    logging.info(f"AI 재처리 완료: {len(recovered)}/{len(due_articles)}건 성공 (AI 호출 {attempted}건)")
+    return recovered
+
+
+def batch_generate_missing_images(config: dict, limit: int, profiler: Optional[Profiler] = None,
+                                  started_at: Optional[float] = None, shard: Optional[Shard] = None,
+                                  gemini_scheduler: Optional[BudgetScheduler] = None):
+    """gen_image가 없는 기사에 대해 이미지를 생성하고 DB를 업데이트합니다 (shard 지정 시 그 샤드 몫의 기사만).
+       실패한 기사는 재시도 큐에 기록되어 다음 시도 시각 전까지 다시 선택되지 않습니다.
+       profiler가 주어지면 키워드 추출/이미지 생성/DB 갱신 단계를 각각 프로파일링합니다.
+       started_at(time.monotonic())이 주어지면 config['budget']의 실행 마감을 그 시각부터 계산합니다.
+       gemini_scheduler가 주어지면 키워드 추출 호출을 그 스케줄러의 남은 예산에서 예약합니다 (close는 호출한 쪽에서).
+       생략하면 이 함수만의 gemini 스케줄러를 만들어 씁니다 (이미지 생성만 실행하는 스크립트용).
+    """
+    profiler = profiler or Profiler(enabled=False)
+    logging.info("--- 일괄 이미지 생성 프로세스 시작 ---")
+    ai_config = config.get('ai', {})
+    api_key = ai_config.get('api_key')
+    retry_config = config.get('retry', {})
+
+    # AiProcessor 초기화 (키워드 추출용, text 모델 설정과 프롬프트 템플릿 설정 사용)
+    ai_processor = AiProcessor.from_config(ai_config)
+    if not ai_processor.model: # AiProcessor 초기화 성공 여부 확인
+        logging.error("AiProcessor 초기화에 실패하여 키워드 추출을 진행할 수 없습니다.")
+        # 이미지 생성은 키워드 없이 진행하거나 중단할 수 있음 - 여기서는 중단하지 않고 원본 제목 사용
+        # return
+
+    # ImageGenerator 초기화 (Vertex AI 또는 genai.Client 방식)
+    image_generator = ImageGenerator(api_key=api_key)
+
+    # ImageGenerator가 성공적으로 초기화되었는지 확인 (client 속성 확인)
+    if not image_generator.client:
+        logging.error("ImageGenerator 초기화에 실패하여 이미지 생성을 진행할 수 없습니다.")
+        return
+
+    try:
+        ensure_dir_exists(GENERATED_IMAGES_DIR)
+    except Exception:
+        logging.error(f"{GENERATED_IMAGES_DIR} 디렉토리 준비 실패.")
+        return
+
+    with profiler.stage('select'):
+        # 우선순위가 높은 기사부터 Imagen 예산/실행 마감 안에서 처리 (나머지는 다음 실행으로)
+        image_scheduler, articles_to_process = plan_image_batch(config, limit, shard, started_at)
+    if not articles_to_process:
+        logging.info("이미지를 생성할 대상 기사가 없습니다.")
+        image_scheduler.close()
+        return
+
+    logging.info(f"{len(articles_to_process)}건의 기사에 대해 이미지 생성을 시도합니다 (최대 {limit}건).")
+    # 키워드 추출도 Gemini 호출이므로 같은 실행의 gemini 예산에서 1건씩 예약 (예산이 없으면 원본 제목 사용)
+    keyword_budget = gemini_scheduler or BudgetScheduler.from_config('gemini', config.get('budget', {}), started_at=started_at)
+
+    for article in image_scheduler.run(articles_to_process):
+        article_id = article.id
+        title = article.title
+
+        if not article_id or not title:
+            logging.warning(f"ID 또는 제목 누락 데이터: {article}")
+            continue
+
+        # LLM으로 이미지 생성용 키워드 추출
+        subject_prompt = title # 기본값은 원본 제목
+        if not ai_processor.model:
+            logging.warning("AiProcessor가 초기화되지 않아 원본 제목을 이미지 프롬프트로 사용합니다.")
+        elif not keyword_budget.acquire():
+            logging.info(f"Gemini 예산이 남지 않아 '{title}'의 원본 제목을 이미지 프롬프트로 사용합니다.")
+        else: # AiProcessor가 초기화되었고 예산이 있는 경우에만 시도
+            try:
+                with profiler.stage('image_keywords'), article_context(article):
+                    keywords = ai_processor.extract_image_keywords(title)
+                if keywords:
+                    # 추출된 키워드를 이미지 프롬프트로 사용 (쉼표와 공백으로 연결)
+                    subject_prompt = ", ".join(keywords)
+                    logging.info(f"키워드 기반 이미지 프롬프트 사용: '{subject_prompt}'")
+                else:
+                    logging.warning(f"'{title}'에 대한 이미지 키워드를 추출하지 못했습니다. 원본 제목을 사용합니다.")
+            except Exception as keyword_e:
+                logging.error(f"'{title}' 키워드 추출 중 예외 발생: {keyword_e}. 원본 제목 사용.")
+
+        image_filename = f"article_img_{article_id}.png"
+        output_image_path = os.path.join(GENERATED_IMAGES_DIR, image_filename)
+
+        logging.info(f"기사 ID {article_id} ('{title}') 이미지 생성 시도 -> {output_image_path}")
+
+        # 생성된 subject_prompt 사용
+        try:
+            with profiler.stage('image_generate'), article_context(article):
+                success = image_generator.generate_halftone_image(subject_prompt, output_image_path)
+            if success:
+                logging.info(f"기사 ID {article_id} 이미지 생성 성공: {output_image_path}")
+                with profiler.stage('db_update'):
+                    update_success = update_article_gen_image(article_id, output_image_path)
+                if update_success:
+                    complete_task(article_id, QueueTask.IMAGE)
+                else:
+                    logging.error(f"기사 ID {article_id}의 gen_image DB 업데이트 실패.")
+            else:
+                logging.error(f"기사 ID {article_id} ('{title}') 이미지 생성 실패.")
+                record_task_failure(article_id, QueueTask.IMAGE, "이미지 생성 실패", **retry_config)
+        except Exception as e:
+            logging.error(f"기사 ID {article_id} ('{title}') 이미지 생성 중 예외 발생: {e}", exc_info=True)
+            record_task_failure(article_id, QueueTask.IMAGE, f"{type(e).__name__}: {e}", **retry_config)
+    image_scheduler.close()
+    if gemini_scheduler is None:
+        keyword_budget.close()
+
+    logging.info("--- 일괄 이미지 생성 프로세스 완료 ---")
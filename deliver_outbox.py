@@ -0,0 +1,32 @@
+import logging
+import argparse
+
+from configs.settings import get_config
+from core.delivery.dispatcher import DeliveryDispatcher
+from utils.database import initialize_db, get_outbox_stats
+from utils.logger import setup_logging
+from utils.tracing import configure_tracing, flush_traces
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전송 outbox에 남은 항목을 수집/AI 처리 없이 설정된 채널로 다시 전송합니다.")
+    parser.add_argument("--stats", action="store_true", help="전송하지 않고 채널별 outbox 현황만 출력합니다.")
+    args = parser.parse_args()
+
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+    configure_tracing(**config_data.get('tracing', {}))
+    initialize_db()
+
+    if args.stats:
+        for channel, counts in sorted(get_outbox_stats().items()):
+            print(f"{channel}: " + ", ".join(f"{status} {count}건" for status, count in sorted(counts.items())))
+    else:
+        dispatcher = DeliveryDispatcher.from_config(config_data.get('delivery', {}))
+        try:
+            sent = dispatcher.dispatch_pending()
+            logging.info(f"outbox 전송 완료: {sent or '전송할 항목 없음'}")
+        except Exception as e:
+            logging.critical(f"outbox 전송 중 심각한 오류 발생: {e}", exc_info=True)
+        finally:
+            dispatcher.close()
+            flush_traces()
@@ -1,181 +1,311 @@
 import logging
 import os # os 모듈 추가
+import argparse # 명령줄 인자 처리 (--profile, --record)
+import sys
+import time
+from typing import Dict, List, Optional
 
-from configs.settings import load_config
-from core.data_acquisition.rss_scraper import RssScraper
-from core.processing.ai_processor import AiProcessor
-from core.processing.image_generator import ImageGenerator # ImageGenerator 임포트
-from core.formatting.default_formatter import DefaultFormatter
-from core.delivery.console_sender import ConsoleSender
+from configs.settings import get_config
+from core.data_acquisition.article_fetcher import ArticleFetcher
+from core.processing.base_processor import BaseProcessor
+from core.processing.prioritizer import ArticleScorer, BudgetScheduler
+from core.processing.clustering import StoryClusterer, split_representatives
+from core.delivery.dispatcher import DeliveryDispatcher
+from core.pipeline import create_stage
+from core.tasks import (
+    batch_generate_missing_images, inherit_known_cluster_points, load_stored_contents, retry_ai_article, share_cluster_points,
+)
+from core.models import Article, ArticleStatus, QueueTask
 from utils.logger import setup_logging
-from utils.database import initialize_db, save_article, get_articles_without_gen_image, update_article_gen_image # DB 함수 임포트
-
-GENERATED_IMAGES_DIR = "generated_images" # 생성된 이미지 저장 디렉토리
-
-def ensure_dir_exists(directory_path: str):
-    """주어진 경로의 디렉토리가 없으면 생성합니다."""
-    if not os.path.exists(directory_path):
-        try:
-            os.makedirs(directory_path)
-            logging.info(f"디렉토리 생성: {directory_path}")
-        except OSError as e:
-            logging.error(f"디렉토리 생성 실패 ({directory_path}): {e}", exc_info=True)
-            # 디렉토리 생성 실패 시 예외를 다시 발생시키거나, 프로그램 흐름을 조정할 수 있음
-            raise # 일단은 예외를 다시 발생시켜 문제 인지를 명확히 함
-
-def process_missing_images(config: dict):
-    """gen_image가 없는 기사에 대해 이미지를 생성하고 DB를 업데이트합니다."""
-    logging.info("--- 누락된 이미지 생성 프로세스 시작 ---")
-    ai_config = config.get('ai', {})
-    api_key = ai_config.get('api_key')
-    # ImageGenerator는 자체적으로 모델명을 가지고 있으므로, config에서 가져올 필요는 없음
-    # image_model_name = ai_config.get('image_model_name') # 필요시 설정에서 모델명 오버라이드 가능
-
-    if not api_key:
-        logging.error("AI API 키가 설정되지 않아 이미지 생성을 건너뛸 수 없습니다.")
-        return
+from utils.metrics import export_metrics, start_metrics_server
+from utils.tracing import article_context, configure_tracing, flush_traces, span
+from utils.profiling import Profiler
+from utils.sharding import Shard, spawn_shards
+from utils.error_handler import ProcessingError
+from utils.database import ( # DB 함수 임포트
+    initialize_db, save_article, record_task_failure, defer_task, get_due_tasks,
+    get_existing_links,
+)
 
+
+def process_and_save_article(processor: BaseProcessor, article: Article, retry_config, claim: bool = False) -> bool:
+    """기사 1건을 AI 처리한 뒤 DB에 저장합니다.
+
+    AI 처리에 실패하면 오류 문구를 도파민 포인트로 저장하지 않고 미처리 상태로 저장한 뒤 재시도 큐에 등록합니다.
+    claim이 True면 (샤드 워커) AI 호출 전에 미처리 상태로 먼저 저장해 링크를 선점하고, 다른 샤드가 먼저 저장한
+    기사는 처리하지 않습니다. 같은 링크가 여러 샤드의 피드에 있어도 유료 호출은 한 워커만 합니다.
+
+    Returns:
+        bool: AI 처리에 성공해 processed 상태로 저장되었으면 True (이미 저장된 기사면 False)
+    """
+    if claim:
+        article.status = ArticleStatus.AI_PENDING
+        # 처리 도중 워커가 중단되면 첫 재시도 대기 시간 뒤에 재시도 큐에서 다시 처리됨
+        if not save_article(article, claim_seconds=retry_config.get('base_delay_seconds', 300)):
+            return False
+        return retry_ai_article(processor, article, retry_config)
+
+    failure = None
     try:
-        ensure_dir_exists(GENERATED_IMAGES_DIR) # 이미지 저장 디렉토리 확인/생성
-    except Exception:
-        logging.error(f"{GENERATED_IMAGES_DIR} 디렉토리 준비 실패. 이미지 생성을 진행할 수 없습니다.")
-        return
-        
-    image_generator = ImageGenerator(api_key=api_key)
-    # image_generator = ImageGenerator(api_key=api_key, image_model_name=image_model_name) # 모델명 오버라이드 시
-
-    articles_to_process = get_articles_without_gen_image(limit=config.get('image_processing_limit', 5)) # 한 번에 처리할 이미지 수
-    if not articles_to_process:
-        logging.info("이미지를 생성할 대상 기사가 없습니다.")
-        return
-
-    logging.info(f"{len(articles_to_process)}건의 기사에 대해 이미지 생성을 시도합니다.")
-
-    for article in articles_to_process:
-        article_id = article.get('id')
-        title = article.get('title')
-        link = article.get('link') # 로그용
-
-        if not article_id or not title:
-            logging.warning(f"이미지 생성을 위한 ID 또는 제목이 누락된 기사 데이터: {article}")
+        processor.process(article)
+    except ProcessingError as e:
+        failure = str(e)
+        article.status = ArticleStatus.AI_PENDING
+    # DB에 저장 시도
+    save_successful = save_article(article)
+    if failure:
+        if save_successful:
+            record_task_failure(article.id, QueueTask.AI, failure, **retry_config)
+        return False
+    # 전송 대상은 DB의 채널별 미전송 기사에서 고르므로, 이미 저장된(중복) 기사는 다시 전송되지 않음
+    return save_successful
+
+
+def filter_new_articles(articles: List[Article]) -> List[Article]:
+    """같은 링크가 여러 번 수집된 기사와 이미 DB에 저장된 기사를 제외합니다 (중복 기사에 AI 호출을 쓰지 않도록)."""
+    unique: Dict[str, Article] = {}
+    for article in articles:
+        unique.setdefault(article.link, article) # 링크별 첫 기사 유지
+    existing = get_existing_links(list(unique))
+    new_articles = [article for link, article in unique.items() if link not in existing]
+    if len(new_articles) < len(articles):
+        logging.info(f"수집한 기사 {len(articles)}건 중 새 기사 {len(new_articles)}건 (중복/저장된 기사 제외)")
+    return new_articles
+
+
+def defer_articles(articles: List[Article]):
+    """예산/마감 때문에 이번 실행에서 AI 처리하지 않은 기사를 미처리 상태로 저장하고 재시도 큐에 등록합니다.
+
+    재시도 큐에서 온 기사(id가 있는 기사)는 이미 큐에 있으므로 그대로 둡니다.
+    """
+    for article in articles:
+        if article.id:
             continue
+        article.status = ArticleStatus.AI_PENDING
+        if save_article(article):
+            defer_task(article.id, QueueTask.AI, "예산/마감으로 연기")
+
+
+def deliver_results(dispatcher: DeliveryDispatcher, config_data, profiler: Profiler):
+    """채널별로 아직 전송하지 않은 기사를 포맷팅해 outbox에 등록하고 모든 채널로 전송합니다."""
+    # 3. 결과 포맷팅 (채널별로 아직 전송하지 않은 기사만 모아 채널의 출력 형식으로 outbox에 등록)
+    formatter_name = config_data.get('pipeline', {}).get('formatter', 'template')
+    delivery_config = config_data.get('delivery', {})
+
+    def formatter_for(output_format: str):
+        return create_stage('formatter', formatter_name, {'delivery': {**delivery_config, 'format': output_format}})
+
+    with profiler.stage('format'):
+        dispatcher.enqueue_undelivered(formatter_for)
+    logging.info("데이터 포맷팅 완료")
+
+    # 4. 결과 전송 (outbox의 대기 항목을 모든 채널로 동시에 전송)
+    with profiler.stage('send'), span('send'):
+        sent = dispatcher.dispatch_pending()
+    logging.info(f"결과 전송 완료: {sent}")
+
+
+def main(profiler: Optional[Profiler] = None, shard: Optional[Shard] = None):
+    """메인 실행 함수
 
-        # 이미지 파일명 생성 (예: article_123.png)
-        # 링크에서 파일명으로 부적합한 문자 제거 또는 해시 사용 고려 가능
-        # 간단하게 ID 기반으로 파일명 생성
-        image_filename = f"article_img_{article_id}.png"
-        output_image_path = os.path.join(GENERATED_IMAGES_DIR, image_filename)
-
-        logging.info(f"기사 ID {article_id} ('{title}') 이미지 생성 시도 -> {output_image_path}")
-        
-        # 이미지 생성 주제는 기사 제목을 사용 (또는 요약 등)
-        subject_prompt = title 
-        # subject_prompt = article.get('summary', title) # 요약이 있으면 요약 사용
-
-        try:
-            success = image_generator.generate_halftone_image(subject_prompt, output_image_path)
-            if success:
-                logging.info(f"기사 ID {article_id} 이미지 생성 성공: {output_image_path}")
-                # DB에 이미지 경로 업데이트
-                update_success = update_article_gen_image(article_id, output_image_path)
-                if not update_success:
-                    logging.error(f"기사 ID {article_id}의 gen_image DB 업데이트 실패.")
-            else:
-                logging.error(f"기사 ID {article_id} ('{title}') 이미지 생성 실패.")
-        except Exception as e:
-            logging.error(f"기사 ID {article_id} ('{title}') 이미지 생성 중 예외 발생: {e}", exc_info=True)
-    
-    logging.info("--- 누락된 이미지 생성 프로세스 완료 ---")
-
-
-
-def main():
-    """메인 실행 함수"""
+    Args:
+        profiler (Optional[Profiler]): 단계별 프로파일러 (--profile 실행 시 전달, 생략하면 비활성)
+        shard (Optional[Shard]): 샤드 워커로 실행할 때 이 워커의 몫 (--shard i/N).
+            지정하면 자기 몫의 피드/재시도 작업/이미지만 처리하고, 포맷팅/전송은 감독 프로세스(run_sharded)에 맡깁니다.
+    """
+    started_at = time.monotonic() # 실행 마감(config['budget']['deadline_seconds']) 기준 시각
+    profiler = profiler or Profiler(enabled=False)
     # 설정 로드
-    config_data = load_config() # 변수명 변경 (config는 dict)
-    setup_logging()
+    config_data = get_config() # 캐시된 읽기 전용 설정 스냅샷
+    setup_logging(**config_data.get('logging', {})) # QueueListener 기반 비동기 로깅
+    configure_tracing(**config_data.get('tracing', {}))
     initialize_db() # 프로그램 시작 시 DB 및 테이블 초기화
+    metrics_config = config_data.get('metrics', {})
+    if shard:
+        # 메트릭 포트/textfile은 감독 프로세스가 사용 (워커 사용량은 api_usage 테이블에 합산됨)
+        metrics_config = {**metrics_config, 'port': 0, 'textfile': None}
+    if metrics_config.get('port'):
+        start_metrics_server(metrics_config['port'])
 
-    logging.info("자동 마케팅 프로세스 시작")
+    logging.info(f"자동 마케팅 프로세스 시작{f' (샤드 {shard})' if shard else ''}")
+    dispatcher = None if shard else DeliveryDispatcher.from_config(config_data.get('delivery', {}))
+    scraper = None
+    fetcher = None
+    # AI 처리와 이미지 키워드 추출이 이 실행의 gemini 실행 예산을 함께 나눠 씀 (종료 시 한 번에 정산)
+    gemini_scheduler = BudgetScheduler.from_config('gemini', config_data.get('budget', {}), started_at=started_at)
 
     try:
+        # 0. 이전 실행에서 전송하지 못한 outbox 항목을 먼저 전송 (수집/AI 처리를 다시 하지 않음)
+        if not shard:
+            with profiler.stage('send_resume'), span('send.resume'):
+                dispatcher.dispatch_pending()
+
         # 1. 데이터 수집 (RSS)
         rss_urls = config_data.get('rss_feeds', [])
         if not rss_urls:
             logging.warning("설정 파일 또는 .env 파일에 RSS 피드 URL(RSS_FEED_n)이 없습니다.")
             return
+        if shard:
+            rss_urls = shard.select_urls(rss_urls)
+            logging.info(f"샤드 {shard}: RSS 피드 {len(rss_urls)}개 담당")
 
-        scraper = RssScraper()
+        pipeline_config = config_data.get('pipeline', {})
+        scraper = create_stage('scraper', pipeline_config.get('scraper', 'rss'), config_data)
         articles = []
-        for url in rss_urls:
-            try:
-                logging.info(f"{url} 에서 기사 수집 중...")
-                fetched_articles = scraper.scrape(url)
+        logging.info(f"RSS 피드 {len(rss_urls)}개에서 기사 수집 중...")
+        with profiler.stage('scrape'):
+            for url, fetched_articles in scraper.scrape_many(rss_urls):
                 articles.extend(fetched_articles)
-                logging.info(f"기사 {len(fetched_articles)}건 수집 완료")
-            except Exception as e:
-                logging.error(f"{url} 스크래핑 중 오류 발생: {e}", exc_info=True)
+                logging.info(f"{url} 에서 기사 {len(fetched_articles)}건 수집 완료")
 
         if not articles:
             logging.info("수집된 기사가 없습니다.")
-            return
+            if not shard:
+                return # 샤드 워커는 새 기사가 없어도 자기 몫의 재시도 작업/이미지를 처리
 
         # 2. 데이터 처리 (AI 도파민 포인트 추출) 및 저장
         ai_config = config_data.get('ai', {})
         api_key = ai_config.get('api_key')
-        model_name = ai_config.get('model_name')
-
-        processed_articles_for_output = [] # 최종 출력을 위한 리스트
 
         if not api_key:
             logging.error("AI API 키가 설정되지 않아 AI 처리를 건너뛸 수 없습니다.")
             # AI 처리 없이 DB 저장 시도 (선택적: 요약만 저장 등)
             # for article in articles:
             #     save_article(article) # dopamine_points 없이 저장 (필요시 save_article 수정)
-            processed_articles_for_output = articles # 원본 데이터를 출력
         else:
-            processor = AiProcessor(api_key=api_key, model_name=model_name)
-            for article in articles:
+            processor = create_stage('processor', pipeline_config.get('processor', 'gemini'), config_data)
+            retry_config = config_data.get('retry', {})
+            # 이미 저장된 기사는 유료 호출 전에 제외하고, 재시도 시각이 도래한 기사와 함께 우선순위대로 정렬
+            new_articles = filter_new_articles(articles)
+            backlog = get_due_tasks(QueueTask.AI, limit=config_data.get('retry_drain_limit', 20), shard=shard)
+            load_stored_contents(backlog)
+            clustering_config = dict(config_data.get('clustering', {}))
+            if clustering_config.pop('enabled', True):
+                # 같은 소식을 다룬 기사는 묶음당 대표 1건만 AI 처리하고 나머지는 포인트를 물려받음
+                with profiler.stage('cluster'), span('cluster'):
+                    StoryClusterer(**clustering_config).assign(new_articles)
+            _, candidates = inherit_known_cluster_points(new_articles + backlog)
+            with profiler.stage('prioritize'), span('prioritize'):
+                scorer = ArticleScorer(**config_data.get('priority', {}))
+                ranked = scorer.rank(candidates, corpus=articles)
+            representatives, followers = split_representatives(ranked)
+            planned = gemini_scheduler.plan(representatives)
+            # 원문 본문을 동시에 가져오며 앞쪽 기사부터 AI 처리 (저장된 본문은 재사용, deadline이 지나면 요약만 사용)
+            fulltext_config = dict(config_data.get('fulltext', {}))
+            if fulltext_config.pop('enabled', True):
+                fetcher = ArticleFetcher(**fulltext_config)
+                planned = fetcher.fetch(planned)
+            for article in gemini_scheduler.run(planned):
+                cluster_key = article.cluster_id # 새 묶음의 임시 ID는 저장하면서 실제 묶음 ID로 바뀜
                 try:
-                    processed_article = processor.process(article)
-                    # DB에 저장 시도
-                    save_successful = save_article(processed_article)
-                    # DB에 새로 저장된 기사만 출력 리스트에 추가 (선택 사항)
-                    # if save_successful:
-                    #    processed_articles_for_output.append(processed_article)
-                    processed_articles_for_output.append(processed_article) # 모든 처리 결과를 출력 (중복 포함)
-
-                    logging.debug(f"'{article['title']}' 처리 및 저장 시도 완료")
+                    if article.id:
+                        # 이전 실행에서 실패했거나 미뤄진 기사
+                        with profiler.stage('ai_retry'), article_context(article):
+                            retry_ai_article(processor, article, retry_config)
+                    else:
+                        with profiler.stage('ai_process'), article_context(article):
+                            process_and_save_article(processor, article, retry_config, claim=bool(shard and shard.count > 1))
+                    if article.cluster_id is not None and article.status == ArticleStatus.PROCESSED:
+                        share_cluster_points(article, followers.pop(cluster_key, []))
+                    logging.debug(f"'{article.title}' 처리 및 저장 시도 완료")
                 except Exception as e:
-                    logging.error(f"'{article['title']}' 처리 또는 저장 중 오류 발생: {e}", exc_info=True)
-                    error_result = {
-                        'title': article['title'],
-                        'link': article['link'],
-                        'summary': article.get('summary', ''),
-                        'dopamine_points': [f"처리/저장 오류: {e}"]
-                    }
-                    processed_articles_for_output.append(error_result)
-
-        # 3. 결과 포맷팅 (출력할 데이터 기준)
-        formatter = DefaultFormatter()
-        formatted_output = formatter.format(processed_articles_for_output)
-        logging.info("데이터 포맷팅 완료")
-
-        # 4. 결과 전송 (콘솔 출력)
-        sender = ConsoleSender()
-        sender.send(formatted_output)
-        logging.info("결과 전송 완료")
+                    logging.error(f"'{article.title}' 처리 또는 저장 중 오류 발생: {e}", exc_info=True)
+            # 대표 기사가 미뤄지거나 실패한 묶음의 나머지 기사도 함께 미룸 (다음 실행에서 포인트를 물려받거나 처리)
+            defer_articles(gemini_scheduler.deferred + [article for members in followers.values() for article in members])
+
+        # 3~4. 결과 포맷팅 및 전송 (샤드 워커는 감독 프로세스가 모든 샤드의 결과를 모아 한 번에 전송)
+        if not shard:
+            deliver_results(dispatcher, config_data, profiler)
 
         # --- 추가: 누락된 이미지 생성 프로세스 호출 ---
         if config_data.get('enable_image_generation', True): # 설정에서 이미지 생성 기능 활성화 여부 확인
-            process_missing_images(config_data)
+            with profiler.stage('images'):
+                batch_generate_missing_images(config_data, limit=config_data.get('image_processing_limit', 5), shard=shard,
+                                              started_at=started_at, gemini_scheduler=gemini_scheduler)
         else:
             logging.info("이미지 생성 기능이 비활성화되어 있습니다 (config: enable_image_generation).")
 
     except Exception as e:
         logging.critical(f"메인 프로세스 실행 중 심각한 오류 발생: {e}", exc_info=True)
     finally:
+        gemini_scheduler.close()
+        if scraper:
+            scraper.close()
+        if fetcher:
+            fetcher.close()
+        if dispatcher:
+            dispatcher.close()
+        flush_traces() # 단계별 span을 traces 테이블에 일괄 기록
+        export_metrics(metrics_config) # API 사용량을 api_usage 테이블에 합산하고 textfile 기록
+        profiler.report()
+        logging.info("자동 마케팅 프로세스 종료")
+
+def run_sharded(shard_count: int, worker_argv: List[str], profiler: Optional[Profiler] = None) -> bool:
+    """샤드 워커 shard_count개를 띄워 파이프라인을 나누어 실행하고, 끝나면 모든 샤드의 결과를 모아 전송합니다.
+
+    Args:
+        shard_count (int): 워커 수 (N)
+        worker_argv (List[str]): 워커 실행 인자 (각 워커에 '--shard i/N'이 덧붙음)
+        profiler (Optional[Profiler]): 감독 프로세스의 단계별 프로파일러
+
+    Returns:
+        bool: 모든 워커가 정상 종료했는지 여부 (일부 워커가 실패해도 나머지 샤드의 결과는 전송함)
+    """
+    profiler = profiler or Profiler(enabled=False)
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+    configure_tracing(**config_data.get('tracing', {}))
+    initialize_db() # 워커들이 동시에 스키마를 만들거나 마이그레이션하지 않도록 먼저 초기화
+    metrics_config = config_data.get('metrics', {})
+    if metrics_config.get('port'):
+        start_metrics_server(metrics_config['port'])
+
+    logging.info(f"자동 마케팅 프로세스 시작 (샤드 {shard_count}개)")
+    dispatcher = DeliveryDispatcher.from_config(config_data.get('delivery', {}))
+    codes = []
+    try:
+        with profiler.stage('send_resume'), span('send.resume'):
+            dispatcher.dispatch_pending()
+        with profiler.stage('shards'), span('shards'):
+            codes = spawn_shards(shard_count, worker_argv)
+        # 각 샤드가 DB에 저장한 기사를 채널별 미전송 기사 조회로 한 번에 모아 전송
+        deliver_results(dispatcher, config_data, profiler)
+    except Exception as e:
+        logging.critical(f"샤드 감독 프로세스 실행 중 심각한 오류 발생: {e}", exc_info=True)
+    finally:
+        dispatcher.close()
+        flush_traces()
+        export_metrics(metrics_config) # 워커 사용량은 이미 api_usage에 합산됨. 할당량 게이지와 textfile 기록
+        profiler.report()
         logging.info("자동 마케팅 프로세스 종료")
+    return bool(codes) and all(code == 0 for code in codes)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="RSS 수집 → AI 처리 → 포맷팅 → 전송 파이프라인을 실행합니다.")
+    parser.add_argument("--profile", action="store_true", help="단계별 cProfile/tracemalloc 프로파일을 수집합니다.")
+    parser.add_argument("--profile-dir", default="profiles", help="프로파일 결과 상위 디렉토리 (기본값: profiles)")
+    parser.add_argument("--profile-top", type=int, default=15, help="단계별로 출력할 핫스팟 수 (기본값: 15)")
+    parser.add_argument("--record", metavar="CASSETTE", help="피드 본문/LLM 응답/이미지를 카세트 파일(.jsonl.gz)에 기록합니다 (benchmarks.replay로 재생).")
+    parser.add_argument("--shard", type=Shard.parse, metavar="i/N", help="N개 샤드 중 i번째(0부터) 몫의 피드/재시도 작업/이미지만 처리합니다 (전송은 하지 않음).")
+    parser.add_argument("--shards", type=int, metavar="N", help="샤드 워커 N개를 띄워 나누어 처리한 뒤 결과를 모아 전송합니다.")
+    args = parser.parse_args()
+    if args.shards is not None and (args.shards < 1 or args.shard or args.record):
+        parser.error("--shards는 1 이상이어야 하며 --shard, --record와 함께 쓸 수 없습니다.")
+
+    if args.shards:
+        worker_argv = [os.path.abspath(__file__), '--profile-dir', args.profile_dir, '--profile-top', str(args.profile_top)]
+        if args.profile:
+            worker_argv.append('--profile')
+        ok = run_sharded(args.shards, worker_argv, Profiler(enabled=args.profile, output_root=args.profile_dir, top_n=args.profile_top))
+        sys.exit(0 if ok else 1)
+
+    recorder = None
+    if args.record:
+        from utils.cassette import CassetteRecorder
+        recorder = CassetteRecorder(args.record).install()
+    profile_dir = os.path.join(args.profile_dir, f"shard-{args.shard.index}") if args.shard else args.profile_dir
+    try:
+        main(Profiler(enabled=args.profile, output_root=profile_dir, top_n=args.profile_top), shard=args.shard)
+    finally:
+        if recorder:
+            recorder.save()
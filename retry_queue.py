@@ -0,0 +1,58 @@
+import logging
+import argparse
+import time
+from datetime import date
+
+from configs.settings import get_config
+from core.models import QueueTask
+from core.processing.ai_processor import AiProcessor
+from core.processing.prioritizer import ArticleScorer, BudgetScheduler
+from core.tasks import batch_generate_missing_images, drain_ai_queue
+from utils.database import initialize_db, get_queue_stats, get_api_budget
+from utils.logger import setup_logging
+from utils.metrics import export_metrics, start_metrics_server
+from utils.tracing import configure_tracing, flush_traces
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="재시도 큐에서 시각이 도래한 AI 처리/이미지 생성 작업을 처리합니다.")
+    parser.add_argument("--task", choices=[QueueTask.AI, QueueTask.IMAGE, "all"], default="all", help="처리할 작업 종류 (기본값: all)")
+    parser.add_argument("--limit", type=int, default=20, help="작업 종류별 한 번에 처리할 최대 건수 (기본값: 20)")
+    parser.add_argument("--stats", action="store_true", help="작업을 처리하지 않고 큐/dead letter 현황만 출력합니다.")
+    args = parser.parse_args()
+
+    started_at = time.monotonic()
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+    configure_tracing(**config_data.get('tracing', {}))
+    initialize_db()
+    metrics_config = config_data.get('metrics', {})
+    if metrics_config.get('port'):
+        start_metrics_server(metrics_config['port'])
+
+    if args.stats:
+        for task, counts in sorted(get_queue_stats().items()):
+            print(f"{task}: 재시도 대기 {counts['queued']}건, dead letter {counts['dead']}건")
+        for api, budget in get_api_budget(date.today().isoformat()).items():
+            print(f"{api}: 오늘 예산 사용 {budget['spent']}건, 연기 {budget['deferred']}건")
+    else:
+        # AI 재시도와 이미지 키워드 추출이 이 실행의 gemini 실행 예산을 함께 나눠 씀
+        scheduler = BudgetScheduler.from_config('gemini', config_data.get('budget', {}), started_at=started_at)
+        try:
+            if args.task in (QueueTask.AI, "all"):
+                ai_config = config_data.get('ai', {})
+                processor = AiProcessor.from_config(ai_config)
+                if processor.model:
+                    drain_ai_queue(processor, config_data.get('retry', {}), limit=args.limit, scheduler=scheduler,
+                                   scorer=ArticleScorer(**config_data.get('priority', {})))
+                else:
+                    logging.error("AiProcessor 초기화에 실패하여 AI 재시도 작업을 건너뜁니다.")
+            if args.task in (QueueTask.IMAGE, "all"):
+                # gen_image 없는 기사 조회 시 재시도 시각이 도래한 작업만 포함되므로 일괄 생성 로직을 그대로 사용
+                batch_generate_missing_images(config_data, limit=args.limit, started_at=started_at, gemini_scheduler=scheduler)
+        except Exception as e:
+            logging.critical(f"재시도 큐 처리 중 심각한 오류 발생: {e}", exc_info=True)
+        finally:
+            scheduler.close()
+            flush_traces()
+            export_metrics(metrics_config)
@@ -0,0 +1,31 @@
+import logging
+import argparse
+import asyncio
+
+from configs.settings import get_config
+from utils.api_server import ArticleApiServer
+from utils.logger import setup_logging
+
+GENERATED_IMAGES_DIR = "generated_images" # 생성된 이미지 저장 디렉토리
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB의 기사와 생성된 이미지를 읽기 전용 HTTP API로 제공합니다.")
+    parser.add_argument("--host", help="바인드할 주소 (기본값: API_HOST 또는 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="바인드할 포트 (기본값: API_PORT 또는 8081)")
+    args = parser.parse_args()
+
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+
+    api_config = dict(config_data.get('api', {}))
+    if args.host:
+        api_config['host'] = args.host
+    if args.port is not None:
+        api_config['port'] = args.port
+    server = ArticleApiServer(images_dir=GENERATED_IMAGES_DIR, **api_config)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logging.info("기사 API 서버를 중지합니다.")
+    except Exception as e:
+        logging.critical(f"기사 API 서버 실행 중 심각한 오류 발생: {e}", exc_info=True)
@@ -0,0 +1,33 @@
+import argparse
+
+from configs.settings import get_config
+from utils.database import initialize_db, get_trace_durations
+from utils.logger import setup_logging
+from utils.tracing import percentile
+
+def print_latency_report(last_runs: int, group_by: str):
+    """traces 테이블의 최근 실행 기록으로 단계별(또는 단계·피드별) 지연 시간 백분위수를 출력합니다."""
+    durations = get_trace_durations(last_runs=last_runs, group_by=group_by)
+    if not durations:
+        print("기록된 트레이스가 없습니다.")
+        return
+
+    key_width = max(len("stage"), *(len(key) for key in durations))
+    print(f"최근 {last_runs}회 실행 기준 지연 시간 (ms)")
+    print(f"{'stage':<{key_width}}  {'count':>7}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'total':>11}")
+    for key, values in sorted(durations.items(), key=lambda item: sum(item[1]), reverse=True):
+        print(
+            f"{key:<{key_width}}  {len(values):>7}  {percentile(values, 50):>9.1f}  "
+            f"{percentile(values, 95):>9.1f}  {percentile(values, 99):>9.1f}  {sum(values):>11.1f}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 지연 시간(p50/p95/p99)을 출력합니다.")
+    parser.add_argument("--runs", type=int, default=20, help="집계할 최근 실행 수 (기본값: 20)")
+    parser.add_argument("--by", choices=["stage", "feed"], default="stage", help="집계 기준 (기본값: stage, feed는 단계·피드별)")
+    args = parser.parse_args()
+
+    config_data = get_config()
+    setup_logging(**config_data.get('logging', {}))
+    initialize_db()
+    print_latency_report(args.runs, args.by)
@@ -0,0 +1,348 @@
+"""기사/생성 이미지 읽기 전용 HTTP API
+
+automkt.db와 generated_images/를 직접 읽는 대신 사용할 수 있는 작은 asyncio HTTP/1.1 서버입니다.
+    GET /articles?page=1&per_page=20[&status=processed]   최신 수집 순 기사 목록
+    GET /articles/by-link?url=<기사 링크>                  링크로 기사 조회
+    GET /search?q=<검색어>&page=1&per_page=20              제목/요약 검색
+    GET /images/<파일명>                                   generated_images/의 이미지
+    GET /health
+
+- DB는 전용 스레드 하나에서 읽기 전용(mode=ro) 연결 하나로만 읽으며 파이프라인의 쓰기 연결을 막지 않습니다 (WAL 모드).
+- 모든 응답에 ETag/Last-Modified가 붙고, If-None-Match/If-Modified-Since가 맞으면 304를 반환합니다.
+- 조회 결과는 PRAGMA data_version 별로 LRU 캐시에 보관되어, 파이프라인이 커밋하기 전까지 같은 요청은 DB를 읽지 않습니다.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from core.models import Article
+from utils.database import get_article_by_link, get_data_version, get_readonly_connection, list_articles, search_articles
+
+MAX_PER_PAGE = 100
+MAX_HEADER_LINES = 100
+API_CACHE_CONTROL = "no-cache" # 캐시는 하되 매번 ETag로 재검증
+IMAGE_CACHE_CONTROL = "public, max-age=300"
+
+# (상태 코드, 헤더, 본문)
+Response = Tuple[int, Dict[str, str], bytes]
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+# /articles/by-link에서 기사가 없을 때의 본문 (404로 응답)
+MISSING_ARTICLE_BODY = json.dumps({'article': None}, ensure_ascii=False).encode('utf-8')
+
+
+class BadRequest(ValueError):
+    """잘못된 요청 파라미터 (400 응답)"""
+
+
+def _http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def _json_response(status: int, payload) -> Response:
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return status, {'Content-Type': 'application/json; charset=utf-8'}, body
+
+
+def _not_modified(request_headers: Dict[str, str], etag: str, modified_at: float) -> bool:
+    """조건부 요청 헤더가 현재 표현과 일치하는지 판단합니다 (If-None-Match가 있으면 If-Modified-Since는 무시)."""
+    if_none_match = request_headers.get('if-none-match')
+    if if_none_match is not None:
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+    if_modified_since = request_headers.get('if-modified-since')
+    if if_modified_since:
+        try:
+            return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ArticleApiServer:
+    """기사 읽기 전용 HTTP API 서버
+
+    Args:
+        host (str): 바인드할 주소
+        port (int): 바인드할 포트 (0이면 임의의 빈 포트)
+        images_dir (str): /images/로 제공할 이미지 디렉토리
+        cache_size (int): 조회 결과 LRU 캐시에 보관할 최대 응답 수 (0이면 캐시하지 않음)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8081, images_dir: str = 'generated_images',
+                 cache_size: int = 256):
+        self.host = host
+        self.port = port
+        self.images_dir = os.path.abspath(images_dir)
+        self.cache_size = cache_size
+        # DB 접근은 이 스레드 하나에서만 하므로 연결/캐시/버전 상태에 잠금이 필요 없음
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='api-db')
+        self._conn = None
+        self._data_version: Optional[int] = None
+        self._modified_at = time.time()
+        self._cache: "OrderedDict[str, Tuple[bytes, str, float]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._routes: Dict[str, Callable] = {
+            '/articles': self._list_articles,
+            '/articles/by-link': self._article_by_link,
+            '/search': self._search,
+            '/health': self._health,
+        }
+
+    # --- DB 스레드에서 실행 ---
+
+    def _cached_query(self, key: str, query: Callable[[object], object]) -> Optional[Tuple[bytes, str, float]]:
+        """DB 스레드에서 실행: data_version이 같으면 캐시된 (본문, ETag, 변경 시각)을, 아니면 query(conn)로 새로 만듭니다.
+
+        query가 None을 반환하면 DB 오류로 보고 캐시하지 않고 None을 반환합니다.
+        """
+        if self._conn is None:
+            self._conn = get_readonly_connection()
+            if self._conn is None:
+                return None
+        version = get_data_version(self._conn)
+        if version is None:
+            self._conn.close()
+            self._conn = None # 다음 요청에서 다시 연결
+            return None
+        if version != self._data_version:
+            # 첫 조회이거나 다른 연결(파이프라인)이 커밋한 뒤: 이 시각을 Last-Modified로 사용
+            if self._data_version is not None:
+                self._modified_at = time.time()
+            self._data_version = version
+            self._cache.clear()
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return entry
+        self.cache_misses += 1
+        payload = query(self._conn)
+        if payload is None:
+            return None
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        entry = (body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', self._modified_at)
+        if self.cache_size > 0:
+            self._cache[key] = entry
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
+
+    def _close_connection(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- 라우트 ---
+
+    def _article_json(self, article: Article) -> Dict:
+        data = asdict(article)
+        image_name = os.path.basename(article.gen_image) if article.gen_image else None
+        data['image_url'] = f"/images/{image_name}" if image_name else None
+        return data
+
+    def _page_json(self, articles: Optional[List[Article]], page: int, per_page: int) -> Optional[Dict]:
+        """per_page + 1건을 조회한 결과로 다음 페이지 존재 여부를 판단해 목록 응답을 만듭니다."""
+        if articles is None:
+            return None
+        return {
+            'page': page,
+            'per_page': per_page,
+            'next_page': page + 1 if len(articles) > per_page else None,
+            'items': [self._article_json(article) for article in articles[:per_page]],
+        }
+
+    @staticmethod
+    def _pagination(params: Dict[str, List[str]]) -> Tuple[int, int]:
+        try:
+            page = int(params.get('page', ['1'])[0])
+            per_page = int(params.get('per_page', ['20'])[0])
+        except ValueError:
+            raise BadRequest("page, per_page는 정수여야 합니다.")
+        if page < 1 or not 1 <= per_page <= MAX_PER_PAGE:
+            raise BadRequest(f"page는 1 이상, per_page는 1~{MAX_PER_PAGE} 사이여야 합니다.")
+        return page, per_page
+
+    async def _query(self, key: str, query: Callable[[object], object]) -> Optional[Tuple[bytes, str, float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, self._cached_query, key, query)
+
+    async def _list_articles(self, params: Dict[str, List[str]], headers: Dict[str, str]):
+        page, per_page = self._pagination(params)
+        status = params.get('status', [''])[0] or None
+        return await self._query(f"articles:{status}:{page}:{per_page}", lambda conn: self._page_json(
+            list_articles((page - 1) * per_page, per_page + 1, status, conn=conn), page, per_page))
+
+    async def _search(self, params: Dict[str, List[str]], headers: Dict[str, str]):
+        query = params.get('q', [''])[0].strip()
+        if not query:
+            raise BadRequest("검색어(q)가 필요합니다.")
+        page, per_page = self._pagination(params)
+        return await self._query(f"search:{page}:{per_page}:{query}", lambda conn: self._page_json(
+            search_articles(query, (page - 1) * per_page, per_page + 1, conn=conn), page, per_page))
+
+    async def _article_by_link(self, params: Dict[str, List[str]], headers: Dict[str, str]):
+        link = params.get('url', [''])[0]
+        if not link:
+            raise BadRequest("기사 링크(url)가 필요합니다.")
+
+        def query(conn):
+            article = get_article_by_link(link, conn=conn)
+            # 없는 기사도 캐시해 두되, 404로 응답할 수 있게 표시 (get_article_by_link는 오류와 미존재를 구분하지 않음)
+            return {'article': self._article_json(article) if article else None}
+        return await self._query(f"link:{link}", query)
+
+    async def _health(self, params: Dict[str, List[str]], headers: Dict[str, str]):
+        return await self._query("health", lambda conn: {'status': 'ok'})
+
+    async def _image(self, name: str, headers: Dict[str, str]) -> Response:
+        path = os.path.realpath(os.path.join(self.images_dir, name))
+        if not name or os.path.dirname(path) != os.path.realpath(self.images_dir):
+            return _json_response(404, {'error': "이미지를 찾을 수 없습니다."})
+        try:
+            stat = await asyncio.to_thread(os.stat, path)
+        except OSError:
+            return _json_response(404, {'error': "이미지를 찾을 수 없습니다."})
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        response_headers = {
+            'ETag': etag,
+            'Last-Modified': _http_date(stat.st_mtime),
+            'Cache-Control': IMAGE_CACHE_CONTROL,
+            'Content-Type': mimetypes.guess_type(path)[0] or 'application/octet-stream',
+        }
+        if _not_modified(headers, etag, stat.st_mtime):
+            return 304, response_headers, b""
+        try:
+            body = await asyncio.to_thread(self._read_file, path)
+        except OSError as e:
+            logging.error(f"이미지 읽기 실패 ({path}): {e}")
+            return _json_response(404, {'error': "이미지를 찾을 수 없습니다."})
+        return 200, response_headers, body
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """요청 하나를 처리해 (상태 코드, 헤더, 본문)을 반환합니다."""
+        if method not in ('GET', 'HEAD'):
+            status, response_headers, body = _json_response(405, {'error': "GET/HEAD만 지원합니다."})
+            response_headers['Allow'] = 'GET, HEAD'
+            return status, response_headers, body
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path.startswith('/images/'):
+            return await self._image(path[len('/images/'):], headers)
+        route = self._routes.get(path.rstrip('/') or '/')
+        if route is None:
+            return _json_response(404, {'error': f"알 수 없는 경로입니다: {path}"})
+        try:
+            entry = await route(parse_qs(url.query), headers)
+        except BadRequest as e:
+            return _json_response(400, {'error': str(e)})
+        if entry is None:
+            return _json_response(503, {'error': "데이터베이스를 읽을 수 없습니다."})
+        body, etag, modified_at = entry
+        status = 404 if body == MISSING_ARTICLE_BODY else 200
+        response_headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'ETag': etag,
+            'Last-Modified': _http_date(modified_at),
+            'Cache-Control': API_CACHE_CONTROL,
+        }
+        if status == 200 and _not_modified(headers, etag, modified_at):
+            return 304, response_headers, b""
+        return status, response_headers, body
+
+    # --- HTTP/1.1 연결 처리 ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._write_response(writer, *_json_response(400, {'error': "잘못된 요청 줄입니다."}), keep_alive=False)
+                    break
+                headers: Dict[str, str] = {}
+                for _ in range(MAX_HEADER_LINES):
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length', '0').isdigit() and int(headers.get('content-length', '0')) > 0:
+                    await reader.readexactly(int(headers['content-length'])) # 본문은 사용하지 않음
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                try:
+                    status, response_headers, body = await self.handle(method.upper(), target, headers)
+                except Exception as e:
+                    logging.error(f"API 요청 처리 실패 ({method} {target}): {e}", exc_info=True)
+                    status, response_headers, body = _json_response(500, {'error': "서버 오류"})
+                await self._write_response(writer, status, response_headers, body if method.upper() != 'HEAD' else None,
+                                           keep_alive=keep_alive, content_length=len(body))
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _write_response(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: Optional[bytes],
+                              keep_alive: bool = True, content_length: Optional[int] = None):
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        headers = {**headers, 'Content-Length': str(len(body or b"") if content_length is None else content_length),
+                   'Connection': 'keep-alive' if keep_alive else 'close'}
+        if status == 304:
+            headers.pop('Content-Length')
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        if body:
+            writer.write(body)
+        await writer.drain()
+
+    # --- 수명 주기 ---
+
+    async def start(self):
+        """서버 소켓을 열고 실제 바인드된 포트를 self.port에 기록합니다."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"기사 API 서버 시작: http://{self.host}:{self.port}/articles")
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await asyncio.get_running_loop().run_in_executor(self._db_executor, self._close_connection)
+        self._db_executor.shutdown(wait=False)
+        logging.info(f"기사 API 서버 종료 (캐시 적중 {self.cache_hits}건, 미적중 {self.cache_misses}건)")
@@ -0,0 +1,170 @@
+"""실제 실행의 외부 입출력을 기록/재생하는 카세트 (--record 옵션, benchmarks.replay)
+
+기록 모드(CassetteRecorder)는 다음 세 지점을 감싸서 원본 데이터와 소요 시간을 모읍니다.
+- feed:  RssScraper.fetch(url) -> 원본 피드 바이트 (파싱은 재생 시 다시 실행)
+- llm:   AiProcessor._generate -> 프롬프트(템플릿 지시문 + 기사별 본문), 응답 텍스트, usage_metadata, 오류
+- image: ImageGenerator._generate_images -> 프롬프트, 이미지 바이트, 오류
+
+llm/image 항목에는 그 호출을 일으킨 공개 메서드와 인자(call)도 함께 저장되므로
+(예: extract_dopamine_points(title, content), generate_halftone_image(subject)),
+재생 시 같은 메서드를 같은 인자로 다시 호출해 프롬프트 생성/응답 파싱까지 그대로 실행할 수 있습니다.
+
+카세트 파일은 gzip으로 압축한 JSON Lines이며 바이트 데이터는 base64로 저장합니다.
+첫 줄은 {"kind": "meta", ...} 헤더입니다.
+"""
+import base64
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+CASSETTE_VERSION = 1
+
+
+def encode_bytes(data: Optional[bytes]) -> Optional[str]:
+    return base64.b64encode(data).decode('ascii') if data is not None else None
+
+
+def decode_bytes(data: Optional[str]) -> Optional[bytes]:
+    return base64.b64decode(data) if data is not None else None
+
+
+def read_cassette(path: str) -> Iterator[Dict]:
+    """카세트 파일의 항목(meta 헤더 제외)을 기록 순서대로 돌려줍니다."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry.get('kind') == 'meta':
+                if entry.get('version') != CASSETTE_VERSION:
+                    raise ValueError(f"지원하지 않는 카세트 버전입니다: {entry.get('version')} ({path})")
+                continue
+            yield entry
+
+
+class CassetteRecorder:
+    """피드/LLM/이미지 호출을 가로채 카세트에 기록하는 레코더
+
+    install()로 가로채기를 시작하고 save()로 파일에 기록합니다 (save는 가로채기도 해제함).
+
+    Args:
+        path (str): 저장할 카세트 파일 경로 (보통 .jsonl.gz)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local() # 현재 실행 중인 공개 메서드 호출 (llm/image 항목의 call)
+        self._restore: List[tuple] = []
+
+    def _add(self, entry: Dict):
+        with self._lock:
+            self.entries.append(entry)
+
+    def _patch(self, owner, name: str, replacement):
+        self._restore.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def install(self) -> "CassetteRecorder":
+        from core.data_acquisition.rss_scraper import RssScraper
+        from core.processing.ai_processor import AiProcessor
+        from core.processing.image_generator import ImageGenerator
+
+        recorder = self
+        original_fetch = RssScraper.fetch
+        original_generate = AiProcessor._generate
+        original_images = ImageGenerator._generate_images
+
+        def fetch(scraper, url: str):
+            start = time.perf_counter()
+            document = original_fetch(scraper, url)
+            entry = {'kind': 'feed', 'url': url, 'elapsed': time.perf_counter() - start}
+            if document.error:
+                recorder._add({**entry, 'error': document.error})
+            else:
+                recorder._add({**entry, 'content_type': document.content_type, 'body': encode_bytes(document.body)})
+            return document
+
+        def generate(processor, template, prompt: str):
+            # 지시문 전송 방식(prompt_mode)과 관계없이 같은 키로 재생되도록 전체 프롬프트를 기록
+            entry = {'kind': 'llm', 'model': processor.model_name, 'operation': template.name, 'template': template.key,
+                     'prompt': template.instructions + prompt, 'call': getattr(recorder._local, 'call', None)}
+            start = time.perf_counter()
+            try:
+                response = original_generate(processor, template, prompt)
+            except Exception as e:
+                recorder._add({**entry, 'elapsed': time.perf_counter() - start, 'error': f"{type(e).__name__}: {e}"})
+                raise
+            usage = getattr(response, 'usage_metadata', None)
+            recorder._add({
+                **entry, 'elapsed': time.perf_counter() - start, 'text': response.text,
+                'usage': {name: int(getattr(usage, name, 0) or 0)
+                          for name in ('prompt_token_count', 'candidates_token_count', 'total_token_count')},
+            })
+            return response
+
+        def generate_images(generator, full_prompt: str, img_config_obj):
+            entry = {'kind': 'image', 'model': generator.image_model_name, 'prompt': full_prompt,
+                     'call': getattr(recorder._local, 'call', None)}
+            start = time.perf_counter()
+            try:
+                response = original_images(generator, full_prompt, img_config_obj)
+            except Exception as e:
+                recorder._add({**entry, 'elapsed': time.perf_counter() - start, 'error': f"{type(e).__name__}: {e}"})
+                raise
+            generated = getattr(response, 'generated_images', None) if response else None
+            image_bytes = generated[0].image.image_bytes if generated else None
+            recorder._add({**entry, 'elapsed': time.perf_counter() - start, 'image': encode_bytes(image_bytes)})
+            return response
+
+        self._patch(RssScraper, 'fetch', fetch)
+        self._patch(AiProcessor, '_generate', generate)
+        self._patch(ImageGenerator, '_generate_images', generate_images)
+        self._patch_call(AiProcessor, 'extract_dopamine_points', ('title', 'content', 'content_label', 'max_content_chars'))
+        self._patch_call(AiProcessor, 'extract_image_keywords', ('title',))
+        self._patch_call(ImageGenerator, 'generate_halftone_image', ('subject_prompt',))
+        logging.info(f"카세트 기록 시작: {self.path}")
+        return self
+
+    def _patch_call(self, owner, name: str, arg_names: tuple):
+        """owner.name 실행 중에 (메서드 이름, 앞쪽 인자)를 기록해 두어 내부 API 호출 항목의 call로 남깁니다."""
+        recorder = self
+        original = getattr(owner, name)
+
+        def wrapper(instance, *args, **kwargs):
+            values = list(args[:len(arg_names)]) + [kwargs[arg] for arg in arg_names[len(args):] if arg in kwargs]
+            previous = getattr(recorder._local, 'call', None)
+            recorder._local.call = {'method': name, 'args': values}
+            try:
+                return original(instance, *args, **kwargs)
+            finally:
+                recorder._local.call = previous
+
+        self._patch(owner, name, wrapper)
+
+    def uninstall(self):
+        while self._restore:
+            owner, name, original = self._restore.pop()
+            setattr(owner, name, original)
+
+    def save(self) -> str:
+        """가로채기를 해제하고 기록한 항목을 카세트 파일에 저장합니다. 저장한 경로를 반환합니다."""
+        self.uninstall()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            meta = {'kind': 'meta', 'version': CASSETTE_VERSION, 'recorded_at': datetime.now().isoformat(timespec='seconds')}
+            f.write(json.dumps(meta) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        counts: Dict[str, int] = {}
+        for entry in entries:
+            counts[entry['kind']] = counts.get(entry['kind'], 0) + 1
+        logging.info(f"카세트 저장 완료: {self.path} ({', '.join(f'{kind} {count}건' for kind, count in sorted(counts.items())) or '항목 없음'})")
+        return self.path
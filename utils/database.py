@@ -1,27 +1,63 @@
+import os
 import sqlite3
 import logging
+import itertools
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-import os # 설정 로드를 위해 os 추가
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Set
+from urllib.parse import quote
 
-from core.models import ARTICLES_TABLE_SCHEMA # 모델 스키마 임포트
-from configs.settings import load_config # 설정 로드를 위해 임포트
+from core.models import ( # 모델 스키마 임포트
+    ARTICLES_TABLE_SCHEMA, ARTICLES_TABLE_MIGRATIONS, ARTICLE_SELECT_COLUMNS, ARTICLE_INSERT_COLUMNS, Article,
+    ArticleStatus, QueueTask, PROCESSING_QUEUE_TABLE_SCHEMA, PROCESSING_QUEUE_INDEX_SCHEMA, DEAD_LETTERS_TABLE_SCHEMA,
+    TRACES_TABLE_SCHEMA, TRACES_INDEX_SCHEMA, API_USAGE_TABLE_SCHEMA, DELIVERY_OUTBOX_TABLE_SCHEMA,
+    DELIVERY_OUTBOX_INDEX_SCHEMA, Delivery, OutboxStatus, ARTICLES_STATUS_INDEX_SCHEMA, ARTICLE_DELIVERIES_TABLE_SCHEMA,
+    ARTICLE_DELIVERIES_INDEX_SCHEMA, ARTICLES_SCRAPED_INDEX_SCHEMA, ARTICLE_CONTENTS_TABLE_SCHEMA, ArticleContent,
+    API_BUDGET_TABLE_SCHEMA, STORY_CLUSTERS_TABLE_SCHEMA, ARTICLES_CLUSTER_INDEX_SCHEMA, decode_dopamine_points,
+    LEGACY_AI_ERROR_MARKERS,
+)
+from utils.sharding import Shard
+from utils.tracing import traced
+from configs.settings import get_config # 설정 로드를 위해 임포트
 
-# 전역 변수 대신 함수 호출 시 파일명 전달 방식으로 변경 고려 가능
-# 또는 설정에서 파일명을 읽어오는 함수 추가
-config = load_config() # 초기 설정 로드
-DATABASE_FILE = config.get('database', {}).get('file_name', 'automkt.db') # 설정에서 DB 파일명 읽기
+DB_BUSY_TIMEOUT_SECONDS = 30
+
+# 저장 전 새 묶음의 임시 ID(음수, 프로세스 안에서 재사용하지 않음) -> 저장 시 만든 story_clusters.id
+_pending_cluster_ids = itertools.count(-1, -1)
+_saved_pending_clusters: Dict[int, int] = {}
+_pending_clusters_lock = threading.Lock()
+
+def get_database_file() -> str:
+    """캐시된 설정 스냅샷에서 DB 파일명을 읽어 반환합니다 (임포트 시점에는 설정을 읽지 않음)."""
+    return get_config().get('database', {}).get('file_name', 'automkt.db')
 
 def get_db_connection() -> Optional[sqlite3.Connection]:
     """SQLite 데이터베이스 연결을 생성하고 반환합니다."""
+    db_file = get_database_file()
     try:
-        db_file = DATABASE_FILE # 전역 또는 설정에서 가져온 파일명 사용
-        conn = sqlite3.connect(db_file)
+        # 샤드 워커 여러 개가 같은 DB에 쓸 수 있으므로 잠금이 풀리기를 기본값(5초)보다 오래 기다림
+        conn = sqlite3.connect(db_file, timeout=DB_BUSY_TIMEOUT_SECONDS)
         conn.row_factory = sqlite3.Row
         return conn
     except sqlite3.Error as e:
-        logging.error(f"데이터베이스 연결 실패 ({DATABASE_FILE}): {e}", exc_info=True)
+        logging.error(f"데이터베이스 연결 실패 ({db_file}): {e}", exc_info=True)
+        return None
+
+def get_readonly_connection() -> Optional[sqlite3.Connection]:
+    """읽기 전용(mode=ro) SQLite 연결을 생성합니다. DB 파일이 없으면 만들지 않고 None을 반환합니다.
+
+    WAL 모드 DB에서는 읽기 연결이 파이프라인의 쓰기를 막지 않습니다 (읽기 전용 API 서버용).
+    연결을 만든 스레드에서만 사용해야 합니다.
+    """
+    db_file = get_database_file()
+    try:
+        conn = sqlite3.connect(f"file:{quote(os.path.abspath(db_file))}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+    except sqlite3.Error as e:
+        logging.error(f"읽기 전용 데이터베이스 연결 실패 ({db_file}): {e}", exc_info=True)
         return None
 
 def initialize_db():
@@ -34,140 +70,315 @@ def initialize_db():
 
     try:
         cursor = conn.cursor()
+        # WAL 모드는 DB 파일에 유지되며, 읽기 연결(읽기 전용 API 등)과 쓰기 연결이 서로를 막지 않게 함
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # 컬럼 추가와 기존 행 보정이 함께 반영되도록 스키마 작업 전체를 한 트랜잭션으로 실행
+        cursor.execute("BEGIN")
         # core.models 에서 가져온 스키마 사용
         cursor.execute(ARTICLES_TABLE_SCHEMA)
+        added_columns = _apply_column_migrations(cursor, 'articles', ARTICLES_TABLE_MIGRATIONS)
+        cursor.execute(ARTICLES_STATUS_INDEX_SCHEMA)
+        cursor.execute(ARTICLES_SCRAPED_INDEX_SCHEMA)
+        cursor.execute(ARTICLES_CLUSTER_INDEX_SCHEMA)
+        cursor.execute(STORY_CLUSTERS_TABLE_SCHEMA)
+        cursor.execute(PROCESSING_QUEUE_TABLE_SCHEMA)
+        cursor.execute(PROCESSING_QUEUE_INDEX_SCHEMA)
+        if 'status' in added_columns:
+            _backfill_article_status(cursor)
+        cursor.execute(DEAD_LETTERS_TABLE_SCHEMA)
+        cursor.execute(TRACES_TABLE_SCHEMA)
+        cursor.execute(TRACES_INDEX_SCHEMA)
+        cursor.execute(API_USAGE_TABLE_SCHEMA)
+        cursor.execute(API_BUDGET_TABLE_SCHEMA)
+        cursor.execute(DELIVERY_OUTBOX_TABLE_SCHEMA)
+        cursor.execute(DELIVERY_OUTBOX_INDEX_SCHEMA)
+        cursor.execute(ARTICLE_DELIVERIES_TABLE_SCHEMA)
+        cursor.execute(ARTICLE_DELIVERIES_INDEX_SCHEMA)
+        cursor.execute(ARTICLE_CONTENTS_TABLE_SCHEMA)
         # 필요시 다른 테이블 스키마도 여기에 추가
         # cursor.execute(USERS_TABLE_SCHEMA)
         conn.commit()
-        logging.info(f"데이터베이스 테이블({DATABASE_FILE}) 초기화 완료 (또는 이미 존재)")
+        logging.info(f"데이터베이스 테이블({get_database_file()}) 초기화 완료 (또는 이미 존재)")
     except sqlite3.Error as e:
         logging.error(f"테이블 생성 실패: {e}", exc_info=True)
     finally:
         if conn:
             conn.close()
 
-def save_article(article_data: Dict[str, Any]) -> bool:
-    """처리된 기사 데이터를 데이터베이스에 저장합니다.
+def _apply_column_migrations(cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]) -> List[str]:
+    """기존 테이블에 없는 컬럼을 ALTER TABLE로 추가하고 추가한 컬럼 이름을 반환합니다."""
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for column, definition in columns.items():
+        if column not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logging.info(f"{table} 테이블에 컬럼 추가: {column}")
+            added.append(column)
+    return added
+
+def _backfill_article_status(cursor: sqlite3.Cursor):
+    """status 컬럼을 새로 추가한 기존 DB의 기사 상태를 한 번 채웁니다.
+
+    이전 버전은 AI 처리에 성공한 기사만 저장하면서 실패 시 오류 문구를 dopamine_points에 넣었으므로,
+    오류 문구(LEGACY_AI_ERROR_MARKERS)가 든 기사는 AI_FAILED로 표시하고 바로 재시도하도록 큐에 등록하며
+    나머지 기사는 모두 PROCESSED로 표시합니다.
+    """
+    condition = " OR ".join("dopamine_points LIKE ?" for _ in LEGACY_AI_ERROR_MARKERS)
+    params = tuple(f"%{marker}%" for marker in LEGACY_AI_ERROR_MARKERS)
+    cursor.execute(f"UPDATE articles SET status = ? WHERE {condition}", (ArticleStatus.AI_FAILED, *params))
+    failed = cursor.rowcount
+    cursor.execute("""
+        INSERT OR IGNORE INTO processing_queue (article_id, task, attempts, next_attempt_at, last_error)
+        SELECT id, ?, 0, ?, dopamine_points FROM articles WHERE status = ?
+    """, (QueueTask.AI, _now(), ArticleStatus.AI_FAILED))
+    cursor.execute("UPDATE articles SET status = ? WHERE status = ?", (ArticleStatus.PROCESSED, ArticleStatus.NEW))
+    logging.info(f"기존 기사 상태 보정: AI 처리 실패 {failed}건은 재시도 큐에 등록, {cursor.rowcount}건은 처리 완료로 표시")
+
+@traced('db.save_article')
+def save_article(article: Article, claim_seconds: float = 0) -> bool:
+    """처리된 기사를 데이터베이스에 저장합니다.
+
+    새로 삽입된 경우 article.id에 생성된 ID를 채워 넣습니다.
 
     Args:
-        article_data (Dict[str, Any]): 저장할 기사 데이터 ('title', 'link', 'summary', 'dopamine_points')
+        article (Article): 저장할 기사 (이전 방식의 딕셔너리도 허용)
+        claim_seconds (float): 0보다 크면 AI 처리 전에 링크를 선점하는 저장으로, 같은 트랜잭션에서 AI 작업을
+            claim_seconds 뒤 시각으로 재시도 큐에 등록합니다 (처리 도중 워커가 중단되어도 그 뒤에 다시 처리됨).
 
     Returns:
         bool: 저장 성공 여부
     """
-    required_fields = ['title', 'link', 'dopamine_points']
-    if not all(field in article_data for field in required_fields):
-        logging.warning(f"저장에 필요한 필드가 누락되었습니다: {article_data}")
+    if isinstance(article, dict):
+        article = Article.from_dict(article)
+    if not article.title or not article.link:
+        logging.warning(f"저장에 필요한 필드가 누락되었습니다: {article}")
         return False
 
     conn = get_db_connection()
     if conn is None:
         return False
 
+    pending_cluster = article.cluster_id if article.cluster_id is not None and article.cluster_id < 0 else None
+    saved = False
     try:
         cursor = conn.cursor()
-
-        # dopamine_points 리스트를 JSON 문자열로 변환
-        dopamine_points_json = json.dumps(article_data.get('dopamine_points', []), ensure_ascii=False)
+        if pending_cluster is not None:
+            # 새 묶음의 첫 기사면 묶음 행을 기사와 같은 트랜잭션에서 만듦 (저장되지 않으면 함께 롤백)
+            with _pending_clusters_lock:
+                article.cluster_id = _saved_pending_clusters.get(pending_cluster)
+            if article.cluster_id is None:
+                cursor.execute("INSERT INTO story_clusters (created_at) VALUES (?)", (_now(),))
+                article.cluster_id = cursor.lastrowid
 
         # 링크 기준으로 중복 확인 후 삽입 시도 (INSERT OR IGNORE)
-        cursor.execute("""
-            INSERT OR IGNORE INTO articles (title, link, summary, dopamine_points, scraped_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (
-            article_data['title'],
-            article_data['link'],
-            article_data.get('summary', ''), # 요약은 없을 수도 있음
-            dopamine_points_json,
-            datetime.now()
-        ))
-
-        conn.commit()
+        cursor.execute(
+            f"INSERT OR IGNORE INTO articles ({', '.join(ARTICLE_INSERT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(ARTICLE_INSERT_COLUMNS))})",
+            article.to_row(scraped_at=datetime.now().isoformat(sep=' ')),
+        )
 
         # 변경된 행의 수를 확인하여 실제로 삽입되었는지 확인
         if cursor.rowcount > 0:
-            logging.info(f"기사 저장 성공: '{article_data['title']}'")
+            article_id = cursor.lastrowid
+            if claim_seconds > 0:
+                retry_at = (datetime.now() + timedelta(seconds=claim_seconds)).isoformat(sep=' ', timespec='seconds')
+                cursor.execute("""
+                    INSERT OR IGNORE INTO processing_queue (article_id, task, attempts, next_attempt_at, last_error)
+                    VALUES (?, ?, 0, ?, ?)
+                """, (article_id, QueueTask.AI, retry_at, "AI 처리 중 (선점)"))
+            conn.commit()
+            saved = True
+            article.id = article_id
+            if pending_cluster is not None:
+                with _pending_clusters_lock:
+                    _saved_pending_clusters.setdefault(pending_cluster, article.cluster_id)
+            logging.info(f"기사 저장 성공: '{article.title}'")
             return True
         else:
-            logging.info(f"이미 존재하는 기사 또는 저장 실패: '{article_data['title']}' (link: {article_data['link']})")
+            conn.rollback()
+            logging.info(f"이미 존재하는 기사 또는 저장 실패: '{article.title}' (link: {article.link})")
             return False # 이미 존재하거나 다른 이유로 저장 안 됨
 
     except sqlite3.Error as e:
-        logging.error(f"기사 저장 실패: {e} - 데이터: {article_data}", exc_info=True)
-        return False
-    except json.JSONDecodeError as e:
-        logging.error(f"Dopamine points JSON 변환 실패: {e} - 데이터: {article_data.get('dopamine_points')}", exc_info=True)
+        logging.error(f"기사 저장 실패: {e} - 데이터: {article}", exc_info=True)
         return False
     finally:
+        if pending_cluster is not None and not saved:
+            article.cluster_id = pending_cluster # 다음 저장 시도에서 다시 묶음 행을 찾거나 만듦
         if conn:
             conn.close()
 
 # --- 데이터 조회 함수 (선택 사항) ---
-def get_article_by_link(link: str) -> Optional[Dict[str, Any]]:
-    """링크를 기준으로 기사를 조회합니다."""
-    conn = get_db_connection()
+def get_article_by_link(link: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Article]:
+    """링크를 기준으로 기사를 조회합니다.
+
+    Args:
+        link (str): 기사 링크
+        conn (Optional[sqlite3.Connection]): 사용할 연결 (생략하면 새로 열고 닫음, 넘긴 연결은 닫지 않음)
+    """
+    own_conn = conn is None
+    if own_conn: conn = get_db_connection()
     if conn is None: return None
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE link = ?", (link,))
+        cursor.execute(f"SELECT {ARTICLE_SELECT_COLUMNS} FROM articles WHERE link = ?", (link,))
         row = cursor.fetchone()
-        if row:
-            article = dict(row)
-            # JSON 문자열을 다시 파이썬 리스트로 변환
-            if article.get('dopamine_points'):
-                try:
-                    article['dopamine_points'] = json.loads(article['dopamine_points'])
-                except json.JSONDecodeError:
-                    logging.warning(f"DB에서 조회한 dopamine_points JSON 파싱 실패: link={link}")
-                    article['dopamine_points'] = [] # 파싱 실패 시 빈 리스트
-            return article
-        else:
-            return None
+        return Article.from_row(row) if row else None
     except sqlite3.Error as e:
         logging.error(f"링크로 기사 조회 실패: {e}", exc_info=True)
         return None
+    finally:
+        if own_conn and conn: conn.close()
+
+def get_existing_links(links: List[str]) -> Set[str]:
+    """links 중 이미 articles 테이블에 저장된 link 집합을 반환합니다 (조회 실패 시 빈 집합)."""
+    if not links:
+        return set()
+    conn = get_db_connection()
+    if conn is None: return set()
+    existing = set()
+    try:
+        unique_links = list(dict.fromkeys(links))
+        for start in range(0, len(unique_links), 500): # SQLite 바인딩 변수 개수 제한 이하로 나눠 조회
+            chunk = unique_links[start:start + 500]
+            cursor = conn.execute(f"SELECT link FROM articles WHERE link IN ({','.join('?' * len(chunk))})", chunk)
+            existing.update(row[0] for row in cursor)
+        return existing
+    except sqlite3.Error as e:
+        logging.error(f"저장된 기사 링크 조회 실패: {e}", exc_info=True)
+        return existing
     finally:
         if conn: conn.close()
 
-def get_all_articles(limit: int = 100) -> List[Dict[str, Any]]:
+def list_articles(offset: int = 0, limit: int = 20, status: Optional[str] = None,
+                  conn: Optional[sqlite3.Connection] = None) -> Optional[List[Article]]:
+    """기사를 최신 수집 순으로 페이지 단위로 조회합니다 (scraped_at 또는 (status, scraped_at) 인덱스 사용).
+
+    Args:
+        offset (int): 건너뛸 기사 수
+        limit (int): 조회할 최대 기사 수
+        status (Optional[str]): 이 처리 상태(ArticleStatus)의 기사만 조회 (생략하면 전부)
+        conn (Optional[sqlite3.Connection]): 사용할 연결 (생략하면 새로 열고 닫음)
+
+    Returns:
+        Optional[List[Article]]: 조회 결과. DB 오류 시 None (빈 결과와 구분)
+    """
+    own_conn = conn is None
+    if own_conn: conn = get_db_connection()
+    if conn is None: return None
+    try:
+        if status:
+            cursor = conn.execute(
+                f"SELECT {ARTICLE_SELECT_COLUMNS} FROM articles WHERE status = ? ORDER BY scraped_at DESC, id DESC LIMIT ? OFFSET ?",
+                (status, limit, offset),
+            )
+        else:
+            cursor = conn.execute(
+                f"SELECT {ARTICLE_SELECT_COLUMNS} FROM articles ORDER BY scraped_at DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            )
+        return [Article.from_row(row) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"기사 목록 조회 실패: {e}", exc_info=True)
+        return None
+    finally:
+        if own_conn and conn: conn.close()
+
+def search_articles(query: str, offset: int = 0, limit: int = 20,
+                    conn: Optional[sqlite3.Connection] = None) -> Optional[List[Article]]:
+    """제목 또는 요약에 검색어가 포함된 기사를 최신 수집 순으로 조회합니다 (ASCII는 대소문자 무시).
+
+    Args:
+        query (str): 검색어 (%, _는 와일드카드가 아닌 문자 그대로 검색)
+        offset (int): 건너뛸 기사 수
+        limit (int): 조회할 최대 기사 수
+        conn (Optional[sqlite3.Connection]): 사용할 연결 (생략하면 새로 열고 닫음)
+
+    Returns:
+        Optional[List[Article]]: 조회 결과. DB 오류 시 None
+    """
+    own_conn = conn is None
+    if own_conn: conn = get_db_connection()
+    if conn is None: return None
+    pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    try:
+        cursor = conn.execute(f"""
+            SELECT {ARTICLE_SELECT_COLUMNS} FROM articles
+            WHERE title LIKE ? ESCAPE '\\' OR summary LIKE ? ESCAPE '\\'
+            ORDER BY scraped_at DESC, id DESC LIMIT ? OFFSET ?
+        """, (pattern, pattern, limit, offset))
+        return [Article.from_row(row) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"기사 검색 실패 ({query}): {e}", exc_info=True)
+        return None
+    finally:
+        if own_conn and conn: conn.close()
+
+def get_data_version(conn: sqlite3.Connection) -> Optional[int]:
+    """PRAGMA data_version 값을 반환합니다. 다른 연결이 커밋할 때마다 바뀌므로 조회 결과 캐시 무효화에 사용합니다.
+
+    값은 연결마다 독립적이라 같은 연결에서 읽은 값끼리만 비교할 수 있습니다. DB 오류 시 None.
+    """
+    try:
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+    except sqlite3.Error as e:
+        logging.error(f"data_version 조회 실패: {e}", exc_info=True)
+        return None
+
+def get_all_articles(limit: int = 100) -> List[Article]:
     """모든 기사를 조회합니다 (최근 N개)."""
     conn = get_db_connection()
     if conn is None: return []
-    articles = []
     try:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles ORDER BY scraped_at DESC LIMIT ?", (limit,))
-        rows = cursor.fetchall()
-        for row in rows:
-            article = dict(row)
-            if article.get('dopamine_points'):
-                try:
-                    article['dopamine_points'] = json.loads(article['dopamine_points'])
-                except json.JSONDecodeError:
-                     article['dopamine_points'] = []
-            articles.append(article)
-        return articles
+        cursor.execute(f"SELECT {ARTICLE_SELECT_COLUMNS} FROM articles ORDER BY scraped_at DESC LIMIT ?", (limit,))
+        return [Article.from_row(row) for row in cursor.fetchall()]
     except sqlite3.Error as e:
         logging.error(f"모든 기사 조회 실패: {e}", exc_info=True)
         return []
     finally:
         if conn: conn.close()
 
-def get_articles_without_gen_image(limit: int = 10) -> List[Dict[str, Any]]:
-    """gen_image 필드가 비어있거나 NULL인 기사를 조회합니다."""
+def get_processed_articles(since: Optional[str] = None) -> List[Article]:
+    """AI 처리가 끝난 기사를 최신 수집 순으로 조회합니다 (articles (status, scraped_at) 인덱스 사용).
+
+    Args:
+        since (Optional[str]): 이 시각 이후 수집된 기사만 ('YYYY-MM-DD HH:MM:SS' 형식, 생략하면 전부)
+    """
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        cursor = conn.execute(
+            f"SELECT {ARTICLE_SELECT_COLUMNS} FROM articles WHERE status = ? AND scraped_at >= ? ORDER BY scraped_at DESC, id DESC",
+            (ArticleStatus.PROCESSED, since or ''),
+        )
+        return [Article.from_row(row) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"처리된 기사 조회 실패: {e}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def get_articles_without_gen_image(limit: int = 10, shard: Optional[Shard] = None) -> List[Article]:
+    """gen_image 필드가 비어있거나 NULL인 기사를 조회합니다.
+
+    이미지 생성에 실패해 재시도 대기 중(next_attempt_at 이전)이거나
+    dead letter로 이동한 기사는 제외합니다. shard를 지정하면 그 샤드 몫(id % N == i)의 기사만 조회합니다.
+    """
     conn = get_db_connection()
     if conn is None: return []
-    articles = []
+    shard_sql, shard_params = shard.sql_condition('id') if shard else ('', ())
     try:
         cursor = conn.cursor()
-        # gen_image가 NULL이거나 빈 문자열인 경우를 조회
-        cursor.execute("SELECT id, title, link, summary FROM articles WHERE gen_image IS NULL OR gen_image = '' ORDER BY scraped_at DESC LIMIT ?", (limit,))
-        rows = cursor.fetchall()
-        for row in rows:
-            article = dict(row) # row_factory에 의해 이미 dict일 수 있음
-            # dopamine_points는 이미지 생성에 직접 필요하지 않으므로 여기서는 제외 (필요시 추가 조회)
-            articles.append(article)
-        return articles
+        # gen_image가 NULL이거나 빈 문자열이고, 재시도 시각이 도래했거나 실패 이력이 없는 경우를 조회
+        cursor.execute(f"""
+            SELECT {ARTICLE_SELECT_COLUMNS} FROM articles
+            WHERE (gen_image IS NULL OR gen_image = '')
+              AND id NOT IN (SELECT article_id FROM processing_queue WHERE task = ? AND next_attempt_at > ?)
+              AND id NOT IN (SELECT article_id FROM dead_letters WHERE task = ?){shard_sql}
+            ORDER BY scraped_at DESC LIMIT ?
+        """, (QueueTask.IMAGE, _now(), QueueTask.IMAGE, *shard_params, limit))
+        return [Article.from_row(row) for row in cursor.fetchall()]
     except sqlite3.Error as e:
         logging.error(f"gen_image 없는 기사 조회 실패: {e}", exc_info=True)
         return []
@@ -210,6 +421,581 @@ def update_article_gen_image(article_id: int, gen_image_path: str) -> bool:
     finally:
         if conn: conn.close()
 
+def update_article_dopamine_points(article_id: int, dopamine_points: List[str], status: str = ArticleStatus.PROCESSED) -> bool:
+    """ID를 기준으로 기사의 dopamine_points와 처리 상태를 업데이트합니다 (AI 재처리 결과 반영용).
+
+    같은 트랜잭션에서 그 기사의 AI 작업을 재시도 큐에서 제거합니다.
+    """
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE articles SET dopamine_points = ?, status = ? WHERE id = ?",
+            (json.dumps(dopamine_points, ensure_ascii=False), status, article_id),
+        )
+        updated = cursor.rowcount > 0
+        if updated:
+            cursor.execute("DELETE FROM processing_queue WHERE article_id = ? AND task = ?", (article_id, QueueTask.AI))
+        conn.commit()
+        return updated
+    except sqlite3.Error as e:
+        logging.error(f"기사 dopamine_points 업데이트 실패: {e} - id={article_id}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+# --- 재시도 큐 / dead letter 함수 ---
+def _now() -> str:
+    """큐 시각 비교에 사용하는 현재 시각 문자열 (문자열 비교로 대소 판단이 가능한 형식)"""
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+def record_task_failure(article_id: int, task: str, error: str, max_attempts: int = 5,
+                        base_delay_seconds: int = 300, max_delay_seconds: int = 21600) -> bool:
+    """작업 실패를 재시도 큐에 기록합니다.
+
+    실패할 때마다 attempts를 1 늘리고 다음 시도 시각을 지수적으로 늦춥니다
+    (base_delay_seconds * 2^(attempts-1), 최대 max_delay_seconds).
+    attempts가 max_attempts에 도달하면 큐에서 제거하고 dead_letters로 옮깁니다.
+
+    Args:
+        article_id (int): 실패한 기사 ID
+        task (str): 작업 종류 (QueueTask)
+        error (str): 오류 메시지
+        max_attempts (int): dead letter로 이동하기 전 최대 시도 횟수
+        base_delay_seconds (int): 첫 재시도까지의 대기 시간 (초)
+        max_delay_seconds (int): 재시도 대기 시간 상한 (초)
+
+    Returns:
+        bool: dead letter로 이동했으면 True
+    """
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        cursor = conn.cursor()
+        row = cursor.execute(
+            "SELECT attempts FROM processing_queue WHERE article_id = ? AND task = ?", (article_id, task)
+        ).fetchone()
+        attempts = (row['attempts'] if row else 0) + 1
+
+        if attempts >= max_attempts:
+            cursor.execute("DELETE FROM processing_queue WHERE article_id = ? AND task = ?", (article_id, task))
+            cursor.execute("""
+                INSERT OR REPLACE INTO dead_letters (article_id, task, attempts, last_error, failed_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (article_id, task, attempts, error, _now()))
+            if task == QueueTask.AI:
+                cursor.execute("UPDATE articles SET status = ? WHERE id = ?", (ArticleStatus.AI_FAILED, article_id))
+            conn.commit()
+            logging.error(f"기사(id={article_id}) '{task}' 작업이 {attempts}회 실패하여 dead letter로 이동했습니다: {error}")
+            return True
+
+        delay = min(base_delay_seconds * (2 ** (attempts - 1)), max_delay_seconds)
+        next_attempt_at = (datetime.now() + timedelta(seconds=delay)).isoformat(sep=' ', timespec='seconds')
+        cursor.execute("""
+            INSERT INTO processing_queue (article_id, task, attempts, next_attempt_at, last_error)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (article_id, task) DO UPDATE SET
+                attempts = excluded.attempts,
+                next_attempt_at = excluded.next_attempt_at,
+                last_error = excluded.last_error
+        """, (article_id, task, attempts, next_attempt_at, error))
+        conn.commit()
+        logging.warning(f"기사(id={article_id}) '{task}' 작업 실패 {attempts}/{max_attempts}회, {next_attempt_at}에 재시도 예정: {error}")
+        return False
+    except sqlite3.Error as e:
+        logging.error(f"재시도 큐 기록 실패: {e} - id={article_id}, task={task}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def defer_task(article_id: int, task: str, reason: str) -> bool:
+    """예산/마감 때문에 이번 실행에서 처리하지 않은 작업을 바로 처리 가능한 상태로 큐에 등록합니다.
+
+    실패가 아니므로 attempts는 늘리지 않으며, 이미 큐에 있는 작업은 그대로 둡니다.
+    """
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.execute("""
+            INSERT OR IGNORE INTO processing_queue (article_id, task, attempts, next_attempt_at, last_error)
+            VALUES (?, ?, 0, ?, ?)
+        """, (article_id, task, _now(), reason))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"작업 연기 기록 실패: {e} - id={article_id}, task={task}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def complete_task(article_id: int, task: str) -> bool:
+    """작업이 성공하면 재시도 큐에서 해당 항목을 제거합니다."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM processing_queue WHERE article_id = ? AND task = ?", (article_id, task))
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logging.error(f"재시도 큐 항목 제거 실패: {e} - id={article_id}, task={task}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def get_due_tasks(task: str, limit: int = 10, shard: Optional[Shard] = None) -> List[Article]:
+    """재시도 시각이 도래한 작업의 기사를 다음 시도 시각 순으로 조회합니다 (shard 지정 시 그 샤드 몫만)."""
+    conn = get_db_connection()
+    if conn is None: return []
+    columns = ", ".join(f"a.{column}" for column in ARTICLE_SELECT_COLUMNS.split(", "))
+    shard_sql, shard_params = shard.sql_condition('q.article_id') if shard else ('', ())
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT {columns} FROM processing_queue q JOIN articles a ON a.id = q.article_id
+            WHERE q.task = ? AND q.next_attempt_at <= ?{shard_sql}
+            ORDER BY q.next_attempt_at LIMIT ?
+        """, (task, _now(), *shard_params, limit))
+        return [Article.from_row(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logging.error(f"재시도 대상 작업 조회 실패: {e} - task={task}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def get_queue_stats() -> Dict[str, Dict[str, int]]:
+    """작업 종류별 재시도 대기 건수와 dead letter 건수를 반환합니다."""
+    conn = get_db_connection()
+    if conn is None: return {}
+    stats: Dict[str, Dict[str, int]] = {}
+    try:
+        cursor = conn.cursor()
+        for row in cursor.execute("SELECT task, COUNT(*) AS n FROM processing_queue GROUP BY task"):
+            stats.setdefault(row['task'], {'queued': 0, 'dead': 0})['queued'] = row['n']
+        for row in cursor.execute("SELECT task, COUNT(*) AS n FROM dead_letters GROUP BY task"):
+            stats.setdefault(row['task'], {'queued': 0, 'dead': 0})['dead'] = row['n']
+        return stats
+    except sqlite3.Error as e:
+        logging.error(f"재시도 큐 통계 조회 실패: {e}", exc_info=True)
+        return {}
+    finally:
+        if conn: conn.close()
+
+# --- 트레이스 함수 ---
+def save_traces(spans: List[tuple]) -> bool:
+    """utils.tracing에서 수집한 span 목록을 traces 테이블에 일괄 저장합니다."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.executemany("""
+            INSERT INTO traces (run_id, stage, article_link, feed_url, started_at, duration_ms, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, spans)
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"트레이스 저장 실패: {e}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def get_trace_durations(last_runs: int = 20, group_by: str = 'stage') -> Dict[str, List[float]]:
+    """최근 N회 실행의 span 소요 시간(ms)을 그룹별로 정렬하여 반환합니다.
+
+    Args:
+        last_runs (int): 조회할 최근 실행 수
+        group_by (str): 'stage' 또는 'feed' (피드별 그룹은 'stage @ feed_url' 키 사용)
+
+    Returns:
+        Dict[str, List[float]]: 그룹 키 -> 오름차순 정렬된 소요 시간 목록
+    """
+    conn = get_db_connection()
+    if conn is None: return {}
+    key_sql = "stage" if group_by == 'stage' else "stage || ' @ ' || COALESCE(feed_url, '-')"
+    durations: Dict[str, List[float]] = {}
+    try:
+        cursor = conn.execute(f"""
+            SELECT {key_sql} AS group_key, duration_ms FROM traces
+            WHERE run_id IN (
+                SELECT run_id FROM traces GROUP BY run_id ORDER BY MAX(started_at) DESC LIMIT ?
+            )
+            ORDER BY group_key, duration_ms
+        """, (last_runs,))
+        for row in cursor:
+            durations.setdefault(row['group_key'], []).append(row['duration_ms'])
+        return durations
+    except sqlite3.Error as e:
+        logging.error(f"트레이스 조회 실패: {e}", exc_info=True)
+        return {}
+    finally:
+        if conn: conn.close()
+
+def add_api_usage(day: str, rows: List[tuple]) -> bool:
+    """API 사용량을 api_usage 테이블의 해당 날짜 값에 더합니다.
+
+    Args:
+        day (str): 날짜 (YYYY-MM-DD)
+        rows (List[tuple]): (api, model, calls, errors, prompt_tokens, output_tokens, image_bytes) 목록
+    """
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.executemany("""
+            INSERT INTO api_usage (day, api, model, calls, errors, prompt_tokens, output_tokens, image_bytes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(day, api, model) DO UPDATE SET
+                calls = calls + excluded.calls,
+                errors = errors + excluded.errors,
+                prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                output_tokens = output_tokens + excluded.output_tokens,
+                image_bytes = image_bytes + excluded.image_bytes
+        """, [(day, *row) for row in rows])
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"API 사용량 저장 실패: {e}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def get_api_usage(day: str) -> List[tuple]:
+    """해당 날짜의 (api, model, calls) 목록을 반환합니다."""
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        cursor = conn.execute("SELECT api, model, calls FROM api_usage WHERE day = ? ORDER BY api, model", (day,))
+        return [(row['api'], row['model'], row['calls']) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"API 사용량 조회 실패: {e}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+# --- API 예산 장부 함수 ---
+def reserve_api_budget(day: str, api: str, calls: int, daily_limit: int = 0) -> int:
+    """api_budget 장부에서 calls건의 호출을 예약하고 실제로 승인된 건수를 반환합니다.
+
+    daily_limit이 있으면 그날 이미 사용/예약된 호출 수를 넘지 않는 만큼만 승인합니다 (0이면 제한 없이 기록만).
+    여러 프로세스(샤드 워커)가 동시에 예약해도 한도를 넘지 않도록 쓰기 잠금을 잡은 트랜잭션에서 처리합니다.
+    """
+    conn = get_db_connection()
+    if conn is None: return 0
+    try:
+        conn.isolation_level = None # BEGIN IMMEDIATE를 직접 실행
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT spent FROM api_budget WHERE day = ? AND api = ?", (day, api)).fetchone()
+        spent = row['spent'] if row else 0
+        granted = calls if daily_limit <= 0 else max(0, min(calls, daily_limit - spent))
+        if granted:
+            conn.execute("""
+                INSERT INTO api_budget (day, api, spent, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(day, api) DO UPDATE SET spent = spent + excluded.spent, updated_at = excluded.updated_at
+            """, (day, api, granted, _now()))
+        conn.execute("COMMIT")
+        return granted
+    except sqlite3.Error as e:
+        logging.error(f"API 예산 예약 실패: {e} - day={day}, api={api}", exc_info=True)
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return 0
+    finally:
+        if conn: conn.close()
+
+def release_api_budget(day: str, api: str, unused: int = 0, deferred: int = 0) -> bool:
+    """실행 종료 시 쓰지 않은 예약(unused)을 반환하고, 미룬 기사 수(deferred)를 장부에 더합니다."""
+    if not unused and not deferred:
+        return True
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.execute("""
+            INSERT INTO api_budget (day, api, spent, deferred, updated_at) VALUES (?, ?, 0, ?, ?)
+            ON CONFLICT(day, api) DO UPDATE SET
+                spent = MAX(0, spent - ?), deferred = deferred + excluded.deferred, updated_at = excluded.updated_at
+        """, (day, api, deferred, _now(), unused))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"API 예산 반환 실패: {e} - day={day}, api={api}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def get_api_budget(day: str) -> Dict[str, Dict[str, int]]:
+    """해당 날짜의 API별 {'spent': 사용 호출 수, 'deferred': 미룬 기사 수}를 반환합니다."""
+    conn = get_db_connection()
+    if conn is None: return {}
+    try:
+        cursor = conn.execute("SELECT api, spent, deferred FROM api_budget WHERE day = ? ORDER BY api", (day,))
+        return {row['api']: {'spent': row['spent'], 'deferred': row['deferred']} for row in cursor}
+    except sqlite3.Error as e:
+        logging.error(f"API 예산 장부 조회 실패: {e}", exc_info=True)
+        return {}
+    finally:
+        if conn: conn.close()
+
+# --- 기사 묶음(story cluster) 함수 ---
+def get_cluster_members(since: str, limit: int = 5000) -> List[Article]:
+    """since 이후 수집된 기사 중 묶음에 속한 기사를 최신순으로 조회합니다 (새 기사를 기존 묶음에 배정할 때 비교 대상)."""
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        cursor = conn.execute(f"""
+            SELECT {ARTICLE_SELECT_COLUMNS} FROM articles
+            WHERE scraped_at >= ? AND cluster_id IS NOT NULL
+            ORDER BY scraped_at DESC, id DESC LIMIT ?
+        """, (since, limit))
+        return [Article.from_row(row) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"묶음 기사 조회 실패: {e}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def new_pending_cluster_ids(count: int) -> List[int]:
+    """새 묶음 count개의 임시 ID(음수)를 발급합니다.
+
+    story_clusters 행은 그 묶음의 기사가 처음 저장될 때 save_article이 같은 트랜잭션에서 만들고,
+    같은 묶음의 다음 기사는 그 행을 사용합니다. 기사가 하나도 저장되지 않은 묶음은 행이 생기지 않습니다.
+    """
+    return [next(_pending_cluster_ids) for _ in range(count)]
+
+def get_cluster_points(cluster_ids: List[int]) -> Dict[int, List[str]]:
+    """도파민 포인트가 이미 추출된 묶음의 {묶음 ID: 포인트}를 반환합니다."""
+    unique_ids = list(dict.fromkeys(cluster_id for cluster_id in cluster_ids if cluster_id is not None))
+    if not unique_ids:
+        return {}
+    conn = get_db_connection()
+    if conn is None: return {}
+    points = {}
+    try:
+        for start in range(0, len(unique_ids), 500): # SQLite 바인딩 변수 개수 제한 이하로 나눠 조회
+            chunk = unique_ids[start:start + 500]
+            cursor = conn.execute(
+                f"SELECT id, dopamine_points FROM story_clusters "
+                f"WHERE dopamine_points IS NOT NULL AND id IN ({','.join('?' * len(chunk))})", chunk)
+            points.update((row['id'], decode_dopamine_points(row['dopamine_points'])) for row in cursor)
+        return points
+    except sqlite3.Error as e:
+        logging.error(f"묶음 도파민 포인트 조회 실패: {e}", exc_info=True)
+        return points
+    finally:
+        if conn: conn.close()
+
+def set_cluster_points(cluster_id: int, representative_id: Optional[int], dopamine_points: List[str]) -> bool:
+    """대표 기사에서 추출한 도파민 포인트를 묶음에 기록합니다 (이미 기록된 묶음은 바꾸지 않음)."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        cursor = conn.execute(
+            "UPDATE story_clusters SET dopamine_points = ?, representative_id = ? WHERE id = ? AND dopamine_points IS NULL",
+            (json.dumps(dopamine_points, ensure_ascii=False), representative_id, cluster_id))
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logging.error(f"묶음 도파민 포인트 기록 실패: {e} - cluster_id={cluster_id}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+# --- 전송 outbox 함수 ---
+def get_undelivered_articles(channel: str, since: str, limit: Optional[int] = None) -> List[Article]:
+    """since 이후 수집된 processed 기사 중 channel로 아직 전송(또는 outbox 등록)하지 않은 기사를 ID 순으로 조회합니다.
+
+    articles (status, scraped_at) 인덱스로 범위를 좁히고, article_deliveries 기본 키로 전송 여부를 확인합니다.
+
+    Args:
+        channel (str): 전송 채널 이름
+        since (str): 이 시각 이후 수집된 기사만 대상 (scraped_at과 같은 'YYYY-MM-DD HH:MM:SS' 형식)
+        limit (Optional[int]): 최대 건수 (생략하면 전부)
+    """
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        cursor = conn.execute(f"""
+            SELECT {ARTICLE_SELECT_COLUMNS} FROM articles a
+            WHERE a.status = ? AND a.scraped_at >= ?
+              AND NOT EXISTS (SELECT 1 FROM article_deliveries d WHERE d.article_id = a.id AND d.channel = ?)
+            ORDER BY a.id LIMIT ?
+        """, (ArticleStatus.PROCESSED, since, channel, -1 if limit is None else limit))
+        return [Article.from_row(row) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"미전송 기사 조회 실패: {e} - channel={channel}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def enqueue_deliveries(channels: List[str], payload: str, article_ids: List[int] = ()) -> List[int]:
+    """같은 전송 내용을 채널마다 delivery_outbox에 pending 상태로 등록하고,
+    포함된 기사를 article_deliveries에 (전송 대기 상태로) 기록합니다. 모두 한 트랜잭션으로 처리합니다.
+
+    Args:
+        channels (List[str]): 전송 채널 이름 목록
+        payload (str): 포맷팅된 전송 내용
+        article_ids (List[int]): payload에 포함된 기사 ID
+
+    Returns:
+        List[int]: 등록된 outbox 항목 ID (실패 시 빈 리스트)
+    """
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        cursor = conn.cursor()
+        ids = []
+        for channel in channels:
+            cursor.execute("INSERT INTO delivery_outbox (channel, payload, status) VALUES (?, ?, ?)",
+                           (channel, payload, OutboxStatus.PENDING))
+            outbox_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO article_deliveries (article_id, channel, outbox_id) VALUES (?, ?, ?)",
+                               [(article_id, channel, outbox_id) for article_id in article_ids])
+            ids.append(outbox_id)
+        conn.commit()
+        return ids
+    except sqlite3.Error as e:
+        conn.rollback()
+        logging.error(f"전송 outbox 등록 실패: {e} - channels={channels}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def get_pending_deliveries(channels: List[str]) -> List[Delivery]:
+    """주어진 채널의 pending 항목을 등록 순서대로 조회합니다."""
+    if not channels: return []
+    conn = get_db_connection()
+    if conn is None: return []
+    try:
+        placeholders = ", ".join("?" for _ in channels)
+        cursor = conn.execute(f"""
+            SELECT id, channel, payload, attempts FROM delivery_outbox
+            WHERE status = ? AND channel IN ({placeholders}) ORDER BY id
+        """, (OutboxStatus.PENDING, *channels))
+        return [Delivery(row['id'], row['channel'], row['payload'], row['attempts']) for row in cursor]
+    except sqlite3.Error as e:
+        logging.error(f"전송 대기 항목 조회 실패: {e}", exc_info=True)
+        return []
+    finally:
+        if conn: conn.close()
+
+def mark_delivery_sent(delivery_id: int) -> bool:
+    """outbox 항목과 그 항목에 포함된 기사들의 채널 전송 기록을 전송 완료로 표시합니다."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        now = _now()
+        cursor = conn.execute("UPDATE delivery_outbox SET status = ?, delivered_at = ? WHERE id = ?",
+                              (OutboxStatus.SENT, now, delivery_id))
+        conn.execute("UPDATE article_deliveries SET delivered_at = ? WHERE outbox_id = ?", (now, delivery_id))
+        conn.commit()
+        return cursor.rowcount > 0
+    except sqlite3.Error as e:
+        logging.error(f"전송 완료 표시 실패: {e} - id={delivery_id}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def record_delivery_failure(delivery_id: int, error: str, max_attempts: int) -> bool:
+    """outbox 항목의 전송 실패를 기록합니다. attempts가 max_attempts에 도달하면 failed로 바꾸고,
+    포함된 기사의 전송 기록을 지워 다음 실행에서 다시 전송 대상이 되도록 합니다.
+
+    Returns:
+        bool: failed로 바뀌어 더 이상 재시도하지 않으면 True
+    """
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE delivery_outbox SET attempts = attempts + 1, last_error = ?,
+                status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END
+            WHERE id = ?
+        """, (error, max_attempts, OutboxStatus.FAILED, delivery_id))
+        row = cursor.execute("SELECT status FROM delivery_outbox WHERE id = ?", (delivery_id,)).fetchone()
+        failed = row is not None and row['status'] == OutboxStatus.FAILED
+        if failed:
+            cursor.execute("DELETE FROM article_deliveries WHERE outbox_id = ?", (delivery_id,))
+        conn.commit()
+        return failed
+    except sqlite3.Error as e:
+        logging.error(f"전송 실패 기록 실패: {e} - id={delivery_id}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def get_outbox_stats() -> Dict[str, Dict[str, int]]:
+    """채널별·상태별 outbox 항목 수를 반환합니다."""
+    conn = get_db_connection()
+    if conn is None: return {}
+    stats: Dict[str, Dict[str, int]] = {}
+    try:
+        for row in conn.execute("SELECT channel, status, COUNT(*) AS n FROM delivery_outbox GROUP BY channel, status"):
+            stats.setdefault(row['channel'], {})[row['status']] = row['n']
+        return stats
+    except sqlite3.Error as e:
+        logging.error(f"전송 outbox 통계 조회 실패: {e}", exc_info=True)
+        return {}
+    finally:
+        if conn: conn.close()
+
+def get_article_contents(links: List[str]) -> Dict[str, ArticleContent]:
+    """link별로 저장된 원문 본문을 압축을 풀어 조회합니다. 저장되지 않은 link는 결과에 없습니다."""
+    if not links:
+        return {}
+    conn = get_db_connection()
+    if conn is None: return {}
+    contents = {}
+    try:
+        unique_links = list(dict.fromkeys(links))
+        for start in range(0, len(unique_links), 500): # SQLite 바인딩 변수 개수 제한 이하로 나눠 조회
+            chunk = unique_links[start:start + 500]
+            cursor = conn.execute(
+                f"SELECT link, body, etag, last_modified, fetched_at FROM article_contents WHERE link IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for link, body, etag, last_modified, fetched_at in cursor:
+                try:
+                    text = zlib.decompress(body).decode('utf-8')
+                except (zlib.error, UnicodeDecodeError) as e:
+                    logging.warning(f"저장된 원문 본문 압축 해제 실패 ({link}): {e}")
+                    continue
+                contents[link] = ArticleContent(link, text, etag, last_modified, fetched_at)
+        return contents
+    except sqlite3.Error as e:
+        logging.error(f"원문 본문 조회 실패: {e}", exc_info=True)
+        return contents
+    finally:
+        if conn: conn.close()
+
+def save_article_content(link: str, text: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> bool:
+    """추출한 원문 본문을 zlib 압축해 저장합니다 (같은 link가 있으면 교체)."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.execute("""
+            INSERT OR REPLACE INTO article_contents (link, body, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)
+        """, (link, zlib.compress(text.encode('utf-8'), 6), etag, last_modified, _now()))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"원문 본문 저장 실패 ({link}): {e}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
+def touch_article_content(link: str) -> bool:
+    """조건부 요청에 304를 받은 경우 본문은 그대로 두고 확인 시각만 갱신합니다."""
+    conn = get_db_connection()
+    if conn is None: return False
+    try:
+        conn.execute("UPDATE article_contents SET fetched_at = ? WHERE link = ?", (_now(), link))
+        conn.commit()
+        return True
+    except sqlite3.Error as e:
+        logging.error(f"원문 본문 확인 시각 갱신 실패 ({link}): {e}", exc_info=True)
+        return False
+    finally:
+        if conn: conn.close()
+
 """
 # --- 미디어 정보 업데이트 함수 (추후 구현 시 활성화) ---
 def update_article_media(link: str, media_data: Dict[str, Optional[str]]) -> bool:
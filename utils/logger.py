@@ -1,7 +1,18 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
 import yaml
+from datetime import datetime, timezone
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# 기사 단위(per-item) 디버그 로그용 로거 이름 접두사. 이 접두사 아래의 로그는 샘플링/속도 제한 대상입니다.
+ITEM_LOGGER_PREFIX = 'items'
 
 DEFAULT_LOGGING_CONFIG = {
     'version': 1,
@@ -40,12 +51,96 @@ DEFAULT_LOGGING_CONFIG = {
     }
 }
 
-def setup_logging(config_path: str = 'configs/logging_config.yaml'):
+# LogRecord 기본 속성 (JsonFormatter에서 extra 필드를 구분하기 위해 사용)
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[QueueListener] = None
+_sampling_filter: Optional["SamplingFilter"] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 레코드를 한 줄짜리 JSON 객체로 출력하는 포맷터 (extra로 전달한 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRS and not key.startswith('_'):
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """ITEM_LOGGER_PREFIX 아래 로거의 DEBUG 이하 로그를 샘플링하고 로거별로 초당 건수를 제한하는 필터.
+
+    WARNING 이상 로그와 일반 로거의 로그는 항상 통과시킵니다.
+
+    Args:
+        sample_rate (float): 남길 비율 (0~1). 예: 0.01이면 100건 중 1건
+        max_per_second (float): 로거별 초당 최대 출력 건수 (0 이하면 제한 없음)
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_per_second: float = 0.0):
+        super().__init__()
+        self.every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+        self.max_per_second = max_per_second
+        self._counters: Dict[str, int] = {}
+        self._buckets: Dict[str, list] = {} # 로거별 [남은 토큰, 마지막 충전 시각]
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not record.name.startswith(ITEM_LOGGER_PREFIX):
+            return True
+        with self._lock:
+            count = self._counters.get(record.name, 0)
+            self._counters[record.name] = count + 1
+            keep = self.every > 0 and count % self.every == 0
+            if keep and self.max_per_second > 0:
+                now = time.monotonic()
+                bucket = self._buckets.setdefault(record.name, [self.max_per_second, now])
+                bucket[0] = min(self.max_per_second, bucket[0] + (now - bucket[1]) * self.max_per_second)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                else:
+                    keep = False
+            if not keep:
+                self.dropped += 1
+            return keep
+
+
+def get_item_logger(name: str) -> logging.Logger:
+    """기사 단위 디버그 로그용 로거를 반환합니다 (샘플링/속도 제한 적용 대상).
+
+    Args:
+        name (str): 모듈 이름 (보통 __name__)
+    """
+    return logging.getLogger(f"{ITEM_LOGGER_PREFIX}.{name}")
+
+
+def setup_logging(config_path: str = 'configs/logging_config.yaml', level: Optional[str] = None,
+                  json_format: bool = False, item_sample_rate: float = 1.0, item_max_per_second: float = 0.0):
     """로깅 설정을 로드하고 적용합니다.
 
+    root 로거의 핸들러는 QueueListener 백그라운드 스레드로 옮겨지고, root에는 QueueHandler만 남습니다.
+    따라서 로그를 남기는 스레드는 큐에 넣기만 하고 콘솔/파일 I/O를 기다리지 않습니다.
+
     Args:
         config_path (str): 로깅 설정 파일 경로. 파일이 없으면 기본 설정을 사용합니다.
+        level (Optional[str]): root 로거와 root 핸들러에 적용할 레벨 (예: 'INFO', 'DEBUG'). 생략하면 설정 파일 값을 사용합니다.
+        json_format (bool): True면 모든 root 핸들러를 JsonFormatter로 출력합니다.
+        item_sample_rate (float): 기사 단위 디버그 로그를 남길 비율 (SamplingFilter 참고)
+        item_max_per_second (float): 기사 단위 디버그 로그의 로거별 초당 최대 건수
     """
+    shutdown_logging()
     try:
         with open(config_path, 'rt') as f:
             logging_config = yaml.safe_load(f.read())
@@ -60,4 +155,51 @@ def setup_logging(config_path: str = 'configs/logging_config.yaml'):
         logging.basicConfig(level=logging.INFO)
         logging.warning("기본 로깅 설정으로 대체합니다.")
 
-# setup_logging() 호출은 main.py에서 수행 
\ No newline at end of file
+    root = logging.getLogger()
+    if level:
+        root.setLevel(level.upper())
+        for handler in root.handlers:
+            handler.setLevel(level.upper())
+    _start_queue_listener(root, json_format, item_sample_rate, item_max_per_second)
+
+def _start_queue_listener(root: logging.Logger, json_format: bool, item_sample_rate: float, item_max_per_second: float):
+    """root 로거의 핸들러를 QueueListener로 옮기고 root에는 QueueHandler를 연결합니다."""
+    global _listener, _sampling_filter
+    handlers = list(root.handlers)
+    if not handlers:
+        return
+    if json_format:
+        for handler in handlers:
+            handler.setFormatter(JsonFormatter())
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    _sampling_filter = SamplingFilter(item_sample_rate, item_max_per_second)
+    queue_handler.addFilter(_sampling_filter)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def shutdown_logging():
+    """QueueListener를 멈추고 큐에 남은 로그를 모두 출력합니다 (프로세스 종료 시 자동 호출)."""
+    global _listener, _sampling_filter
+    if _listener is None:
+        return
+    if _sampling_filter is not None and _sampling_filter.dropped:
+        logging.info(f"기사 단위 디버그 로그 {_sampling_filter.dropped}건이 샘플링/속도 제한으로 생략되었습니다.")
+    listener, _listener, _sampling_filter = _listener, None, None
+    listener.stop()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    # 큐 뒤에 있던 핸들러를 root에 되돌려 종료 이후의 로그도 출력되도록 함
+    for handler in listener.handlers:
+        root.addHandler(handler)
+
+atexit.register(shutdown_logging)
+
+# setup_logging() 호출은 main.py에서 수행
@@ -0,0 +1,352 @@
+"""Gemini/Imagen 호출 수, 토큰, 지연 시간, 오류, 할당량 사용률 메트릭
+
+프로세스 내 레지스트리에 카운터/히스토그램/게이지를 모아 Prometheus 텍스트 형식으로 내보냅니다.
+- node_exporter textfile collector용 파일 기록: write_textfile (METRICS_TEXTFILE)
+- 로컬 /metrics 엔드포인트: start_metrics_server (METRICS_PORT)
+
+일일 누적 사용량은 실행 종료 시 api_usage 테이블에 합산되어(flush_usage) 할당량 게이지 계산에 쓰입니다.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class _Metric:
+    """라벨 조합별 값을 가지는 메트릭의 공통 부분"""
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Mapping[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _format_labels(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self._render_samples()
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)} {value:g}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """임의로 설정 가능한 게이지"""
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{self._format_labels(key)} {value:g}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelValues, List[float]] = {} # 버킷별 개수 + [합계, 전체 개수]
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def _render_samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        for key, state in items:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', f'{bound:g}'))} {cumulative:g}")
+            lines.append(f"{self.name}_bucket{self._format_labels(key, ('le', '+Inf'))} {state[-1]:g}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {state[-2]:g}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {state[-1]:g}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 모음. 같은 이름으로 다시 등록하면 기존 메트릭을 반환합니다."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric_cls, name: str, *args, **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = metric_cls(name, *args, **kwargs)
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식(exposition format)으로 직렬화합니다."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+API_CALLS = registry.counter('workfit_api_calls_total', 'Gemini/Imagen API 호출 수', ('api', 'model', 'operation', 'status'))
+API_ERRORS = registry.counter('workfit_api_errors_total', 'API 호출 오류 수 (예외 타입별)', ('api', 'model', 'error_type'))
+API_LATENCY = registry.histogram('workfit_api_latency_seconds', 'API 호출 지연 시간', ('api', 'model', 'operation'))
+LLM_TOKENS = registry.counter('workfit_llm_tokens_total', 'Gemini 토큰 사용량', ('model', 'operation', 'kind'))
+PROMPT_CALLS = registry.counter('workfit_llm_prompt_calls_total', '프롬프트 템플릿별 Gemini 호출 수 (mode: 지시문 전송 방식)',
+                                ('model', 'template', 'mode'))
+PROMPT_TOKENS = registry.counter('workfit_llm_prompt_tokens_total',
+                                 '프롬프트 템플릿별 입력 토큰 (input: 전체 입력, cached: 캐시에서 읽어 다시 보내지 않은 입력)',
+                                 ('model', 'template', 'kind'))
+IMAGE_BYTES = registry.counter('workfit_image_bytes_total', '생성된 이미지 바이트 수', ('model',))
+QUOTA_USED = registry.gauge('workfit_api_daily_calls', '오늘 누적 API 호출 수 (api_usage 테이블 기준)', ('api', 'model'))
+QUOTA_RATIO = registry.gauge('workfit_api_daily_quota_ratio', '오늘 누적 호출 수 / 일일 할당량', ('api', 'model'))
+LAST_EXPORT = registry.gauge('workfit_metrics_last_export_timestamp_seconds', '마지막 메트릭 내보내기 시각')
+
+# 실행 중 누적되는 (api, model)별 사용량: [호출 수, 오류 수, 입력 토큰, 출력 토큰, 이미지 바이트]
+_usage: Dict[Tuple[str, str], List[int]] = {}
+_usage_lock = threading.Lock()
+# 실행 중 누적되는 프롬프트 템플릿별 사용량: [호출 수, 입력 토큰, 캐시 토큰]
+_prompt_usage: Dict[str, List[int]] = {}
+
+
+def _add_usage(api: str, model: str, calls: int = 0, errors: int = 0,
+               prompt_tokens: int = 0, output_tokens: int = 0, image_bytes: int = 0):
+    with _usage_lock:
+        usage = _usage.setdefault((api, model), [0, 0, 0, 0, 0])
+        usage[0] += calls
+        usage[1] += errors
+        usage[2] += prompt_tokens
+        usage[3] += output_tokens
+        usage[4] += image_bytes
+
+
+def record_llm_call(model: str, operation: str, latency_seconds: float, response=None,
+                    error: Optional[BaseException] = None, template: Optional[str] = None, prompt_mode: str = ''):
+    """Gemini generate_content 호출 1건을 기록합니다.
+
+    Args:
+        model (str): 모델 이름
+        operation (str): 호출 목적 (예: 'dopamine_points', 'image_keywords')
+        latency_seconds (float): 호출 소요 시간
+        response: generate_content 응답 (usage_metadata가 있으면 토큰 수 기록)
+        error (Optional[BaseException]): 호출 중 발생한 예외
+        template (Optional[str]): 프롬프트 템플릿 key (예: 'dopamine_points@v1'). 있으면 템플릿별 입력/캐시 토큰도 기록
+        prompt_mode (str): 지시문 전송 방식 ('inline', 'system', 'cached')
+    """
+    if template:
+        PROMPT_CALLS.inc(model=model, template=template, mode=prompt_mode)
+    status = 'error' if error else 'ok'
+    API_CALLS.inc(api='gemini', model=model, operation=operation, status=status)
+    API_LATENCY.observe(latency_seconds, api='gemini', model=model, operation=operation)
+    if error:
+        API_ERRORS.inc(api='gemini', model=model, error_type=type(error).__name__)
+        _add_usage('gemini', model, calls=1, errors=1)
+        return
+    usage = getattr(response, 'usage_metadata', None)
+    prompt_tokens = int(getattr(usage, 'prompt_token_count', 0) or 0)
+    output_tokens = int(getattr(usage, 'candidates_token_count', 0) or 0)
+    total_tokens = int(getattr(usage, 'total_token_count', 0) or 0) or prompt_tokens + output_tokens
+    if template:
+        # prompt_token_count는 캐시에서 읽은 토큰을 포함하므로 cached / 호출 수가 호출당 다시 보내지 않은 입력 토큰
+        cached_tokens = int(getattr(usage, 'cached_content_token_count', 0) or 0)
+        PROMPT_TOKENS.inc(prompt_tokens, model=model, template=template, kind='input')
+        PROMPT_TOKENS.inc(cached_tokens, model=model, template=template, kind='cached')
+        with _usage_lock:
+            prompt_usage = _prompt_usage.setdefault(template, [0, 0, 0])
+            prompt_usage[0] += 1
+            prompt_usage[1] += prompt_tokens
+            prompt_usage[2] += cached_tokens
+    LLM_TOKENS.inc(prompt_tokens, model=model, operation=operation, kind='prompt')
+    LLM_TOKENS.inc(output_tokens, model=model, operation=operation, kind='completion')
+    LLM_TOKENS.inc(total_tokens, model=model, operation=operation, kind='total')
+    _add_usage('gemini', model, calls=1, prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+
+
+def record_image_call(model: str, latency_seconds: float, image_bytes: int = 0,
+                      error: Optional[BaseException] = None):
+    """Imagen generate_images 호출 1건을 기록합니다."""
+    status = 'error' if error else 'ok'
+    API_CALLS.inc(api='imagen', model=model, operation='generate_images', status=status)
+    API_LATENCY.observe(latency_seconds, api='imagen', model=model, operation='generate_images')
+    if error:
+        API_ERRORS.inc(api='imagen', model=model, error_type=type(error).__name__)
+    else:
+        IMAGE_BYTES.inc(image_bytes, model=model)
+    _add_usage('imagen', model, calls=1, errors=1 if error else 0, image_bytes=image_bytes)
+
+
+def prompt_usage_summary() -> Dict[str, Dict[str, float]]:
+    """이번 실행의 프롬프트 템플릿별 성공 호출 수와 호출당 입력/캐시 토큰 평균"""
+    with _usage_lock:
+        items = sorted((template, list(values)) for template, values in _prompt_usage.items())
+    return {
+        template: {
+            'calls': calls,
+            'input_tokens_per_call': round(prompt_tokens / calls, 1),
+            'cached_tokens_per_call': round(cached_tokens / calls, 1),
+        }
+        for template, (calls, prompt_tokens, cached_tokens) in items if calls
+    }
+
+
+def log_prompt_usage():
+    """프롬프트 템플릿별로 호출당 캐시 덕분에 다시 보내지 않은 입력 토큰 수를 로그로 남깁니다."""
+    for template, usage in prompt_usage_summary().items():
+        input_tokens, cached_tokens = usage['input_tokens_per_call'], usage['cached_tokens_per_call']
+        ratio = f" ({cached_tokens / input_tokens:.0%})" if input_tokens else ""
+        logging.info(f"프롬프트 {template}: 호출 {usage['calls']}건, 호출당 입력 {input_tokens:g}토큰 중 "
+                     f"캐시 {cached_tokens:g}토큰{ratio}")
+
+
+def flush_usage(quotas: Optional[Mapping[str, int]] = None):
+    """이번 실행의 사용량을 api_usage 테이블에 합산하고 일일 호출 수/할당량 게이지를 갱신합니다.
+
+    Args:
+        quotas (Optional[Mapping[str, int]]): api 이름('gemini', 'imagen')별 일일 호출 할당량 (0이면 비율 생략)
+    """
+    from utils.database import add_api_usage, get_api_usage # 순환 임포트 방지
+    with _usage_lock:
+        rows = [(api, model, *values) for (api, model), values in _usage.items()]
+        _usage.clear()
+    today = date.today().isoformat()
+    if rows:
+        add_api_usage(today, rows)
+    quotas = quotas or {}
+    for api, model, calls in get_api_usage(today):
+        QUOTA_USED.set(calls, api=api, model=model)
+        quota = quotas.get(api) or 0
+        if quota > 0:
+            QUOTA_RATIO.set(calls / quota, api=api, model=model)
+
+
+def write_textfile(path: str):
+    """node_exporter textfile collector가 읽을 수 있도록 메트릭을 파일에 원자적으로 기록합니다."""
+    LAST_EXPORT.set(time.time())
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+    logging.info(f"메트릭 textfile 기록 완료: {path}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args): # 요청마다 stderr에 출력하지 않음
+        logging.debug("metrics %s - %s", self.address_string(), format % args)
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> Optional[ThreadingHTTPServer]:
+    """백그라운드 스레드에서 /metrics 엔드포인트를 제공합니다. 실패 시 None."""
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logging.error(f"메트릭 서버 시작 실패 ({host}:{port}): {e}")
+        return None
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    logging.info(f"메트릭 엔드포인트 시작: http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def export_metrics(metrics_config: Mapping):
+    """실행 종료 시 호출: 사용량을 DB에 합산하고, 설정되어 있으면 textfile을 기록합니다.
+
+    Args:
+        metrics_config (Mapping): config['metrics'] (textfile, gemini_daily_quota, imagen_daily_quota)
+    """
+    try:
+        log_prompt_usage()
+        flush_usage({
+            'gemini': metrics_config.get('gemini_daily_quota', 0),
+            'imagen': metrics_config.get('imagen_daily_quota', 0),
+        })
+        if metrics_config.get('textfile'):
+            write_textfile(metrics_config['textfile'])
+    except Exception as e:
+        logging.error(f"메트릭 내보내기 실패: {e}", exc_info=True)
@@ -0,0 +1,145 @@
+"""엔트리 포인트용 단계별 프로파일러 (--profile 옵션)
+
+단계(stage)마다 cProfile CPU 프로파일, 벽시계/CPU 시간, tracemalloc 최대 메모리를 수집하여
+profiles/<타임스탬프>/ 디렉토리에 저장하고 상위 N개 핫스팟 요약을 출력합니다.
+
+같은 이름의 단계는 여러 번 들어가도 하나로 누적되므로 기사별 루프 안에서도 사용할 수 있습니다.
+단, cProfile 특성상 단계를 중첩해서 사용하면 안 됩니다.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+
+def _short_path(filename: str) -> str:
+    """프로젝트 파일은 상대 경로로, 외부 라이브러리는 site-packages 이후 경로로 줄입니다."""
+    if not os.path.isabs(filename):
+        return filename
+    relative = os.path.relpath(filename)
+    if not relative.startswith('..'):
+        return relative
+    marker = 'site-packages' + os.sep
+    return filename.split(marker, 1)[1] if marker in filename else os.path.basename(filename)
+
+
+class _StageStats:
+    """단계 하나의 누적 측정값"""
+    __slots__ = ('profile', 'calls', 'wall_ms', 'cpu_ms', 'peak_bytes', 'snapshot')
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.calls = 0
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self.peak_bytes = 0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+
+class Profiler:
+    """단계별 CPU/메모리 프로파일러. enabled=False면 stage()는 아무 일도 하지 않습니다.
+
+    Args:
+        enabled (bool): 프로파일링 활성화 여부
+        output_root (str): 결과를 저장할 상위 디렉토리 (실행마다 타임스탬프 하위 디렉토리 생성)
+        top_n (int): 요약 출력 시 단계별로 보여줄 핫스팟/메모리 할당 위치 수
+    """
+
+    def __init__(self, enabled: bool = False, output_root: str = 'profiles', top_n: int = 15):
+        self.enabled = enabled
+        self.top_n = top_n
+        self.output_dir = os.path.join(output_root, time.strftime('%Y%m%d-%H%M%S'))
+        self._stages: Dict[str, _StageStats] = {}
+        self._started_tracemalloc = False
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    @contextmanager
+    def stage(self, name: str):
+        """name 단계의 실행을 프로파일링합니다."""
+        if not self.enabled:
+            yield
+            return
+        stats = self._stages.setdefault(name, _StageStats())
+        tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        stats.profile.enable()
+        try:
+            yield
+        finally:
+            stats.profile.disable()
+            stats.calls += 1
+            stats.wall_ms += (time.perf_counter() - wall_start) * 1000
+            stats.cpu_ms += (time.process_time() - cpu_start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            if peak > stats.peak_bytes or stats.snapshot is None:
+                # 최대 메모리를 갱신한 시점의 할당 위치만 보관 (스냅샷 비용이 커서 매번 찍지 않음)
+                stats.peak_bytes = max(peak, stats.peak_bytes)
+                stats.snapshot = tracemalloc.take_snapshot()
+
+    def report(self) -> Optional[str]:
+        """측정 결과를 파일로 저장하고 요약을 출력합니다. 저장한 디렉토리 경로를 반환합니다."""
+        if not self.enabled or not self._stages:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = {}
+        for name, stats in self._stages.items():
+            safe_name = name.replace('/', '_').replace(' ', '_')
+            stats.profile.dump_stats(os.path.join(self.output_dir, f"{safe_name}.prof"))
+            allocations = self._top_allocations(stats)
+            with open(os.path.join(self.output_dir, f"{safe_name}.mem.txt"), 'w', encoding='utf-8') as f:
+                f.write("\n".join(allocations) + "\n")
+            summary[name] = {
+                'calls': stats.calls,
+                'wall_ms': round(stats.wall_ms, 1),
+                'cpu_ms': round(stats.cpu_ms, 1),
+                'peak_memory_mib': round(stats.peak_bytes / 1024 / 1024, 2),
+                'hotspots': self._top_functions(stats),
+                'top_allocations': allocations,
+            }
+        with open(os.path.join(self.output_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        self._print_summary(summary)
+        logging.info(f"프로파일 결과 저장: {self.output_dir}")
+        return self.output_dir
+
+    def _top_functions(self, stats: _StageStats) -> List[dict]:
+        """자체 실행 시간(tottime)이 큰 순서로 상위 N개 함수를 반환합니다."""
+        raw = pstats.Stats(stats.profile).stats
+        rows = sorted(raw.items(), key=lambda item: item[1][2], reverse=True)[:self.top_n]
+        return [{
+            'function': f"{_short_path(filename)}:{line}({func})",
+            'ncalls': ncalls,
+            'tottime_ms': round(tottime * 1000, 1),
+            'cumtime_ms': round(cumtime * 1000, 1),
+        } for (filename, line, func), (_, ncalls, tottime, cumtime, _) in rows]
+
+    def _top_allocations(self, stats: _StageStats) -> List[str]:
+        """최대 메모리 시점 스냅샷에서 할당량이 큰 코드 위치 상위 N개를 반환합니다."""
+        if stats.snapshot is None:
+            return []
+        snapshot = stats.snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        return [str(stat) for stat in snapshot.statistics('lineno')[:self.top_n]]
+
+    def _print_summary(self, summary: dict):
+        print(f"=== 프로파일 요약 ({self.output_dir}) ===")
+        print(f"{'stage':<20} {'calls':>6} {'wall(ms)':>11} {'cpu(ms)':>11} {'peak(MiB)':>10}")
+        for name, item in sorted(summary.items(), key=lambda kv: kv[1]['wall_ms'], reverse=True):
+            print(f"{name:<20} {item['calls']:>6} {item['wall_ms']:>11.1f} {item['cpu_ms']:>11.1f} {item['peak_memory_mib']:>10.2f}")
+        for name, item in summary.items():
+            print(f"\n--- {name}: 상위 {len(item['hotspots'])}개 핫스팟 (tottime 기준) ---")
+            for hotspot in item['hotspots']:
+                print(f"{hotspot['tottime_ms']:>10.1f} ms  {hotspot['ncalls']:>8}회  {hotspot['function']}")
@@ -0,0 +1,86 @@
+"""여러 프로세스로 파이프라인을 나누어 실행하기 위한 샤드 분할
+
+`python main.py --shard i/N`로 실행한 워커는 다음 작업 중 자기 몫만 처리합니다.
+- RSS 피드: 피드 URL의 안정적인 해시(blake2b) % N == i 인 피드
+- 재시도 대기 AI 작업, 이미지가 없는 기사: 기사 id % N == i 인 기사
+
+같은 설정이면 실행마다, 프로세스마다 같은 분할이 나오므로 워커끼리 같은 피드나 기사를 중복 처리하지 않습니다.
+`python main.py --shards N`은 N개 워커를 띄우는 감독(supervisor) 프로세스이며, 워커가 모두 끝나면
+DB에 모인 샤드별 결과를 한 번에 포맷팅/전송합니다 (spawn_shards).
+"""
+import hashlib
+import logging
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    """N개 중 index번째 샤드 (0부터 시작)"""
+    index: int
+    count: int
+
+    def __post_init__(self):
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"잘못된 샤드 지정입니다: {self.index}/{self.count} (0 <= i < N)")
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """'i/N' 형식의 문자열을 Shard로 변환합니다 (예: '0/4')."""
+        try:
+            index, count = (int(value) for value in spec.split('/'))
+        except ValueError:
+            raise ValueError(f"샤드는 'i/N' 형식이어야 합니다: {spec!r}") from None
+        return cls(index, count)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def owns_url(self, url: str) -> bool:
+        """피드 URL이 이 샤드 몫인지 여부 (hash()와 달리 프로세스마다 값이 바뀌지 않는 해시 사용)"""
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') % self.count == self.index
+
+    def owns_id(self, article_id: int) -> bool:
+        return article_id % self.count == self.index
+
+    def select_urls(self, urls: Iterable[str]) -> List[str]:
+        return [url for url in urls if self.owns_url(url)]
+
+    def sql_condition(self, column: str = 'id') -> Tuple[str, tuple]:
+        """WHERE 절에 붙일 ' AND <column> % N = i' 조건과 파라미터"""
+        return f" AND {column} % ? = ?", (self.count, self.index)
+
+
+def spawn_shards(count: int, argv: List[str]) -> List[int]:
+    """`python <argv> --shard i/N` 워커 count개를 동시에 실행하고 모두 끝날 때까지 기다립니다.
+
+    Args:
+        count (int): 워커 수 (N)
+        argv (List[str]): 파이썬 인터프리터 뒤에 붙일 인자 (예: ['main.py', '--profile'])
+
+    Returns:
+        List[int]: 샤드 순서대로 워커 종료 코드
+    """
+    start = time.perf_counter()
+    workers = [
+        subprocess.Popen([sys.executable, *argv, '--shard', str(Shard(index, count))])
+        for index in range(count)
+    ]
+    logging.info(f"샤드 워커 {count}개 시작 (pid: {', '.join(str(worker.pid) for worker in workers)})")
+    try:
+        codes = [worker.wait() for worker in workers]
+    except BaseException:
+        # 감독 프로세스가 중단되면 (Ctrl+C 등) 워커도 함께 종료
+        for worker in workers:
+            if worker.poll() is None:
+                worker.terminate()
+        raise
+    failed = [str(Shard(index, count)) for index, code in enumerate(codes) if code != 0]
+    if failed:
+        logging.error(f"샤드 워커 실패: {', '.join(failed)} (종료 코드 {[code for code in codes if code != 0]})")
+    logging.info(f"샤드 워커 {count}개 종료 ({time.perf_counter() - start:.1f}s)")
+    return codes
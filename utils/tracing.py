@@ -0,0 +1,123 @@
+"""파이프라인 단계별 경량 span 계측
+
+각 단계(span)의 시작 시각, 소요 시간, 대상 기사/피드를 메모리에 모았다가
+실행 종료 시 traces 테이블에 한 번에 기록합니다 (flush_traces).
+
+사용 예:
+    with article_context(article):
+        with span('llm.dopamine_points'):
+            ...
+"""
+import contextvars
+import functools
+import logging
+import math
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+# 현재 처리 중인 기사/피드 (중첩된 span이 기사 정보를 따로 넘겨받지 않아도 되도록 함)
+_current_article: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('trace_article', default=None)
+_current_feed: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('trace_feed', default=None)
+
+# (run_id, stage, article_link, feed_url, started_at, duration_ms, status)
+SpanRow = Tuple[str, str, Optional[str], Optional[str], float, float, str]
+
+
+class Tracer:
+    """span을 수집하는 트레이서. 프로세스마다 하나의 run_id를 가집니다."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self._spans: List[SpanRow] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, article_link: Optional[str] = None, feed_url: Optional[str] = None):
+        """stage 실행 시간을 기록하는 컨텍스트 매니저. 예외가 발생하면 status='error'로 기록하고 다시 던집니다."""
+        if not self.enabled:
+            yield
+            return
+        started_at = time.time()
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            row = (self.run_id, stage, article_link or _current_article.get(), feed_url or _current_feed.get(),
+                   started_at, duration_ms, status)
+            with self._lock:
+                self._spans.append(row)
+
+    def drain(self) -> List[SpanRow]:
+        """수집된 span을 반환하고 버퍼를 비웁니다."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+
+tracer = Tracer()
+
+
+def span(stage: str, article_link: Optional[str] = None, feed_url: Optional[str] = None):
+    """기본 트레이서의 span (Tracer.span 참고)"""
+    return tracer.span(stage, article_link, feed_url)
+
+
+def traced(stage: str) -> Callable:
+    """함수 호출 전체를 하나의 span으로 기록하는 데코레이터"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def article_context(article: Any):
+    """블록 안에서 기록되는 span에 기사 링크와 출처 피드를 연결합니다.
+
+    Args:
+        article: link/source_url 속성을 가진 기사 (core.models.Article)
+    """
+    link_token = _current_article.set(getattr(article, 'link', None))
+    feed_token = _current_feed.set(getattr(article, 'source_url', None) or _current_feed.get())
+    try:
+        yield
+    finally:
+        _current_article.reset(link_token)
+        _current_feed.reset(feed_token)
+
+
+def configure_tracing(enabled: bool = True):
+    """기본 트레이서의 활성화 여부를 설정합니다."""
+    tracer.enabled = enabled
+
+
+def flush_traces() -> int:
+    """수집된 span을 traces 테이블에 일괄 저장하고 저장한 건수를 반환합니다."""
+    spans = tracer.drain()
+    if not spans:
+        return 0
+    from utils.database import save_traces # utils.database -> utils.tracing 순환 임포트 방지
+    if save_traces(spans):
+        logging.info(f"트레이스 {len(spans)}건 저장 완료 (run_id={tracer.run_id})")
+        return len(spans)
+    return 0
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """정렬된 값 목록에서 nearest-rank 방식의 백분위수를 반환합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]